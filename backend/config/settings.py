@@ -172,6 +172,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'diary.middleware.AuditLogMiddleware', # 감사 로그 (사용자 활동 추적)
+    'diary.utils.decryption_cache.DecryptionMemoMiddleware', # 요청 단위 복호화 메모
+    'diary.utils.preference_cache.PreferenceMemoMiddleware', # 요청 단위 사용자 설정 메모
     'django_prometheus.middleware.PrometheusAfterMiddleware', # 모니터링 종료
 ]
 
@@ -319,6 +321,19 @@ GEMINI_IMAGE_MODEL = os.environ.get('GEMINI_IMAGE_MODEL', 'gemini-2.5-flash-imag
 # Gemini Text Model (Emotion/Summary/Template)
 GEMINI_TEXT_MODEL = os.environ.get('GEMINI_TEXT_MODEL', 'gemini-3-flash-preview')
 
+# Gemini 게이트웨이: 공유 클라이언트의 동시 호출 상한 / 타임아웃 / 대기열 (워커 프로세스 단위)
+GEMINI_GATEWAY = {
+    'MAX_CONCURRENCY': int(os.environ.get('GEMINI_MAX_CONCURRENCY', 16)),
+    'MODEL_CONCURRENCY': int(os.environ.get('GEMINI_MODEL_CONCURRENCY', 8)),
+    'MODEL_LIMITS': {
+        # 이미지 생성은 느리고 비싸므로 별도로 낮게 제한
+        GEMINI_IMAGE_MODEL: int(os.environ.get('GEMINI_IMAGE_CONCURRENCY', 2)),
+    },
+    'TIMEOUT': float(os.environ.get('GEMINI_TIMEOUT', 30)),
+    'MAX_QUEUE': int(os.environ.get('GEMINI_MAX_QUEUE', 64)),
+    'QUEUE_TIMEOUT': float(os.environ.get('GEMINI_QUEUE_TIMEOUT', 10)),
+}
+
 # 일기 내용 암호화 키 (32바이트 Base64 인코딩)
 # 프로덕션에서는 반드시 환경 변수로 설정할 것!
 # 생성 방법: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
@@ -336,6 +351,17 @@ DIARY_ENCRYPTION_KEYS = {
 # 현재 활성화된(암호화 시 사용할) 키 버전
 CURRENT_ENCRYPTION_VERSION = 1
 
+# 복호화 결과 캐시 (프로세스 로컬 LRU, 평문은 Redis에 저장하지 않음)
+DECRYPTION_CACHE = {
+    'ENABLED': os.environ.get('DECRYPTION_CACHE_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    'MAX_BYTES': int(os.environ.get('DECRYPTION_CACHE_MAX_BYTES', 16 * 1024 * 1024)),  # 16MB
+    'TTL': int(os.environ.get('DECRYPTION_CACHE_TTL', 300)),  # 5분
+}
+
+# 대량 암복호화 (encrypt_many/decrypt_many): 이 개수 이상이면 프로세스 풀 사용
+ENCRYPTION_PARALLEL_THRESHOLD = int(os.environ.get('ENCRYPTION_PARALLEL_THRESHOLD', 2000))
+ENCRYPTION_MAX_WORKERS = int(os.environ.get('ENCRYPTION_MAX_WORKERS', 0)) or None  # None: CPU 코어 수
+
 # =============================================================================
 # 이메일 설정 (비밀번호 재설정용)
 # =============================================================================
@@ -515,6 +541,126 @@ CACHE_TTL = {
     'calendar': 1800,    # 캘린더: 30분
     'heatmap': 3600,     # 히트맵: 1시간
     'popular_tags': 600, # 인기 태그: 10분
+    'annual_report': 3600,  # 연간 리포트: 1시간
+    'analytics': 600,    # 감정 트렌드 분석: 10분
+    'preference': 3600,  # 사용자 설정 스냅샷 (저장 시 write-through): 1시간
+}
+
+# AI 결과 캐시 (diary/utils/ai_cache.py): 같은 내용의 감정 분석/요약/제목/회고 질문 재사용
+AI_RESULT_CACHE = {
+    'ENABLED': os.environ.get('AI_RESULT_CACHE_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    'TTL': int(os.environ.get('AI_RESULT_CACHE_TTL', 7 * 24 * 3600)),  # 공유 캐시: 7일
+    'LOCAL_MAX_BYTES': int(os.environ.get('AI_RESULT_CACHE_LOCAL_MAX_BYTES', 4 * 1024 * 1024)),  # 4MB
+    'LOCAL_TTL': int(os.environ.get('AI_RESULT_CACHE_LOCAL_TTL', 600)),  # 10분
+}
+
+# Stale-while-revalidate (diary/utils/swr_cache.py): CACHE_TTL 이 soft TTL
+CACHE_SWR = {
+    'ENABLED': os.environ.get('CACHE_SWR_ENABLED', 'True').lower() in ('true', '1', 'yes'),
+    # soft TTL 이후 오래된 값을 제공할 수 있는 시간 (초)
+    'STALE_TTL': int(os.environ.get('CACHE_SWR_STALE_TTL', 3600)),
+    'LOCK_TTL': int(os.environ.get('CACHE_SWR_LOCK_TTL', 30)),
+    'WAIT_TIMEOUT': float(os.environ.get('CACHE_SWR_WAIT_TIMEOUT', 3.0)),
+    # XFetch 조기 갱신 계수 (0: 사용 안 함)
+    'BETA': float(os.environ.get('CACHE_SWR_BETA', 1.0)),
+    'BACKGROUND': not IS_TESTING,
+}
+
+# =============================================================================
+# 감사 로그 버퍼 설정 (AuditLogMiddleware)
+# =============================================================================
+# 요청마다 INSERT 하지 않고 프로세스 내 링 버퍼에 모아 bulk_create
+# 테스트에서는 버퍼 없이 즉시 저장
+AUDIT_LOG_BUFFER = {
+    'ENABLED': not IS_TESTING,
+    'CAPACITY': int(os.environ.get('AUDIT_LOG_BUFFER_CAPACITY', 10000)),
+    'BATCH_SIZE': int(os.environ.get('AUDIT_LOG_BATCH_SIZE', 200)),
+    'FLUSH_INTERVAL': float(os.environ.get('AUDIT_LOG_FLUSH_INTERVAL', 2.0)),
+}
+
+# 임베딩 배치 처리 (embedding 큐 워커가 MAX_WAIT_MS 동안 모아 MAX_ITEMS 단위로 encode)
+EMBEDDING_BATCH = {
+    'ENABLED': not IS_TESTING,
+    'MAX_ITEMS': int(os.environ.get('EMBEDDING_BATCH_MAX_ITEMS', 64)),
+    'MAX_WAIT_MS': int(os.environ.get('EMBEDDING_BATCH_MAX_WAIT_MS', 500)),
+}
+
+# 공유 모델 서버 (python manage.py run_model_server). URL 이 비어 있으면 프로세스 내 모델 로드
+MODEL_SERVER = {
+    'URL': '' if IS_TESTING else os.environ.get('MODEL_SERVER_URL', ''),
+    'TIMEOUT': float(os.environ.get('MODEL_SERVER_TIMEOUT', 10)),
+    'MAX_BATCH': int(os.environ.get('MODEL_SERVER_MAX_BATCH', 64)),
+    'MAX_WAIT_MS': int(os.environ.get('MODEL_SERVER_MAX_WAIT_MS', 10)),
+}
+
+# 키워드 후보(n-gram) 임베딩 캐시. PATH 지정 시 build_ngram_cache 로 만든 메모리 맵 사용
+KEYWORD_NGRAM_CACHE = {
+    'MAX_ENTRIES': int(os.environ.get('KEYWORD_NGRAM_CACHE_ENTRIES', 50000)),
+    'PATH': os.environ.get('KEYWORD_NGRAM_CACHE_PATH', ''),
+}
+
+# 본문 블라인드 인덱스 (keyed-HMAC 토큰 검색)
+BLIND_INDEX = {
+    # search_keywords 에 명사 평문을 계속 저장할지 여부 (기본: 저장하지 않음)
+    'STORE_PLAINTEXT_KEYWORDS': os.environ.get('STORE_PLAINTEXT_SEARCH_KEYWORDS', 'False').lower() == 'true',
+    # rebuild_blind_index 백필 전까지 기존 search_keywords 도 함께 검색
+    'LEGACY_KEYWORD_FALLBACK': os.environ.get('BLIND_INDEX_LEGACY_FALLBACK', 'True').lower() == 'true',
+}
+
+# Expo 푸시 대량 발송 (diary/push_service.py PushDispatcher)
+PUSH_DISPATCH = {
+    'ACCESS_TOKEN': os.environ.get('EXPO_ACCESS_TOKEN', ''),
+    'CONCURRENCY': int(os.environ.get('PUSH_DISPATCH_CONCURRENCY', 6)),
+    # 초당 최대 메시지 수 (Expo 프로젝트당 600/s)
+    'RATE_LIMIT': int(os.environ.get('PUSH_DISPATCH_RATE_LIMIT', 600)),
+    'TIMEOUT': int(os.environ.get('PUSH_DISPATCH_TIMEOUT', 30)),
+    # 발송 후 영수증 확인까지 대기 시간 (초)
+    'RECEIPT_DELAY': int(os.environ.get('PUSH_RECEIPT_DELAY', 15 * 60)),
+}
+
+# 일기 작성 리마인더 (diary/services/reminder_service.py)
+REMINDER = {
+    'WINDOW_MINUTES': 15,  # Beat 주기와 동일해야 함
+    'SHARD_SIZE': int(os.environ.get('REMINDER_SHARD_SIZE', 5000)),
+    # 구간 안에서 샤드 실행을 분산시키는 시간 (초)
+    'SPREAD_SECONDS': int(os.environ.get('REMINDER_SPREAD_SECONDS', 600)),
+}
+
+# 비동기 PDF 내보내기 (diary/services/export_job_service.py)
+EXPORT_JOB = {
+    # 결과 파일 디렉토리 (웹 서버와 pdf 워커가 공유해야 함, 비어 있으면 MEDIA_ROOT/exports/jobs)
+    'DIR': os.environ.get('EXPORT_JOB_DIR', ''),
+    'CHUNK_SIZE': int(os.environ.get('EXPORT_JOB_CHUNK_SIZE', 50)),
+    'STALE_SECONDS': 1800,
+}
+
+# 백업 복원 (diary/services/restore_service.py, 업로드 파일은 EXPORT_JOB['DIR'] 에 저장)
+RESTORE = {
+    'CHUNK_SIZE': int(os.environ.get('RESTORE_CHUNK_SIZE', 500)),
+    # 이 크기를 넘는 업로드는 restore 큐의 작업으로 복원
+    'SYNC_MAX_BYTES': int(os.environ.get('RESTORE_SYNC_MAX_BYTES', 1024 * 1024)),
+}
+
+# 요청 제한 / 일일 할당량 / 동시 작업 세마포어 (diary/utils/rate_limit.py)
+RATE_LIMIT = {
+    # locmem: 프로세스 로컬 (캐시와 같이 Redis 를 쓰지 않는 개발/테스트 환경)
+    'BACKEND': 'locmem' if IS_TESTING or (DEBUG and not os.environ.get('USE_REDIS', '')) else 'redis',
+}
+
+# AI 호출 서킷 브레이커 (diary/utils/circuit_breaker.py) - 상태는 Redis 에서 모든 워커가 공유
+CIRCUIT_BREAKER = {
+    'BACKEND': RATE_LIMIT['BACKEND'],
+    'WINDOW': int(os.environ.get('CIRCUIT_BREAKER_WINDOW', 60)),
+    'MIN_CALLS': int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', 10)),
+    'FAILURE_RATE': float(os.environ.get('CIRCUIT_BREAKER_FAILURE_RATE', 0.5)),
+    # 게이트웨이 타임아웃보다 짧게: 타임아웃 직전까지 걸리는 호출도 느린 호출로 집계
+    'SLOW_CALL_THRESHOLD': float(os.environ.get('CIRCUIT_BREAKER_SLOW_CALL', 20)),
+    'OPEN_TIMEOUT': int(os.environ.get('CIRCUIT_BREAKER_OPEN_TIMEOUT', 30)),
+    'OVERRIDES': {
+        # 이미지 생성은 원래 느리므로 느린 호출 기준을 높게
+        f'gemini:{GEMINI_IMAGE_MODEL}:generate_content': {'SLOW_CALL_THRESHOLD': 60},
+        f'gemini:{GEMINI_IMAGE_MODEL}:predict': {'SLOW_CALL_THRESHOLD': 60},
+    },
 }
 
 
@@ -546,6 +692,10 @@ CELERY_TASK_REJECT_ON_WORKER_LOST = True
 CELERY_TASK_ROUTES = {
     'diary.tasks.send_email_async': {'queue': 'email'},
     'diary.tasks.generate_pdf_async': {'queue': 'pdf'},
+    'diary.tasks.generate_pdf_export': {'queue': 'pdf'},
+    'diary.tasks.restore_backup_task': {'queue': 'restore'},
+    'diary.tasks.embed_pending_diaries': {'queue': 'embedding'},
+    'diary.tasks.embed_diaries_task': {'queue': 'embedding'},
 }
 
 # 동시 실행 워커 수 제한
@@ -577,6 +727,13 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(hour=4, minute=0),
         'args': (7,), # 7일 지난 파일 삭제
     },
+    
+    # 4. 일기 작성 리마인더 (15분마다)
+    # 알림 시간이 해당 구간인 사용자 중 오늘 일기를 쓰지 않은 사용자에게 발송
+    'plan-diary-reminders': {
+        'task': 'diary.tasks.plan_diary_reminders',
+        'schedule': crontab(minute='*/15'),
+    },
 }
 
 # =============================================================================
@@ -11,6 +11,19 @@ sys.modules["google.genai"] = module_mock
 def set_testing_flag(settings):
     settings.IS_TESTING = True
 
+@pytest.fixture(autouse=True)
+def clear_django_cache():
+    """
+    Clear the local caches and circuit breaker state before each test.
+    SQLite reuses user IDs after rollback, so per-user cache keys would leak between tests.
+    """
+    from django.core.cache import cache
+    from diary.utils.ai_cache import get_ai_cache
+    from diary.utils.circuit_breaker import reset_breakers
+    cache.clear()
+    get_ai_cache().clear()
+    reset_breakers()
+
 @pytest.fixture(autouse=True)
 def mock_gemini_api(monkeypatch):
     """
@@ -1,87 +1,263 @@
 # diary/cache_utils.py
 """
 캐시 유틸리티 함수
-- 캐시 키 생성
-- 캐시 무효화
+- 사용자별 버전(세대) 네임스페이스를 포함한 캐시 키 생성
+- 날짜 버킷(연/월/주) 버전: 일기 변경 시 해당 날짜가 속한 버킷만 무효화
+- 캐시 무효화 (버전 증가 1회로 사용자의 모든 캐시 무효화)
+- 사용자별 뷰 응답 캐싱 데코레이터 (cached_user_view, stale-while-revalidate)
 """
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .utils.swr_cache import Uncacheable, get_or_compute
+
+VERSION_KEY = 'cache_version:{user_id}'
+BUCKET_VERSION_KEY = 'cache_version:{user_id}:{bucket}'
+
+# 태그 사용 현황 (인기 태그) 버킷
+TAGS_BUCKET = 'tags'
+
 
+def _new_version() -> int:
+    return int(time.time() * 1000)
 
-def get_cache_key(prefix: str, user_id: int, *args) -> str:
+
+def get_user_cache_version(user_id: int) -> int:
+    """
+    사용자 캐시 버전 조회 (없으면 생성)
+
+    버전 키가 축출된 뒤 1부터 다시 시작하면 예전 세대의 캐시가 되살아날 수 있으므로
+    초기값은 현재 시각(ms)으로 설정
+    """
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key) or _new_version()
+    return version
+
+
+def year_bucket(year) -> str:
+    return f"y{int(year)}"
+
+
+def month_bucket(year, month) -> str:
+    return f"m{int(year)}-{int(month)}"
+
+
+def week_bucket(date) -> str:
+    iso_year, iso_week, _ = date.isocalendar()
+    return f"w{iso_year}-{iso_week}"
+
+
+def date_buckets(date) -> set:
+    """로컬 날짜가 속한 연/월/주 버킷"""
+    return {year_bucket(date.year), month_bucket(date.year, date.month), week_bucket(date)}
+
+
+def report_buckets(date) -> set:
+    """
+    본문이 바뀌면 무효화할 버킷 (주간/월간 리포트의 AI 인사이트가 본문을 사용)
+    리포트는 최근 30일 이하를 주 버킷(recent_buckets)으로 캐시하므로 주 버킷만 해당
+    """
+    return {week_bucket(date)}
+
+
+def range_buckets(start, end) -> list:
+    """
+    [start, end] 기간을 덮는 버킷 목록
+
+    일기 변경 시 연/월/주 버킷을 모두 올리므로 기간 길이에 맞는 단위 하나만 사용
+    (두 달 이하: 주, 2년 이하: 월, 그 이상: 연)
+    """
+    if end < start:
+        return []
+    span = (end - start).days
+    if span <= 62:
+        step, bucket = timedelta(days=7), week_bucket
+        end_bucket = week_bucket(end)
+    elif span <= 730:
+        step, bucket = timedelta(days=28), lambda d: month_bucket(d.year, d.month)
+        end_bucket = month_bucket(end.year, end.month)
+    else:
+        return [year_bucket(year) for year in range(start.year, end.year + 1)]
+
+    buckets, date = [], start
+    while True:
+        name = bucket(date)
+        if name not in buckets:
+            buckets.append(name)
+        if name == end_bucket:
+            return buckets
+        date += step
+
+
+def recent_buckets(days: int) -> list:
+    """최근 days 일 (오늘 포함) 을 덮는 버킷 목록"""
+    today = timezone.localdate()
+    return range_buckets(today - timedelta(days=days), today)
+
+
+def get_bucket_versions(user_id: int, buckets) -> list:
+    """버킷 버전 목록 조회 (없는 버킷은 생성)"""
+    keys = [BUCKET_VERSION_KEY.format(user_id=user_id, bucket=bucket) for bucket in buckets]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        version = _new_version()
+        for key in missing:
+            cache.add(key, version, None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def get_cache_key(prefix: str, user_id: int, *args, buckets=()) -> str:
     """
     캐시 키 생성
-    
+
     Args:
         prefix: 캐시 유형 (report, calendar, heatmap 등)
         user_id: 사용자 ID
         *args: 추가 파라미터 (year, month, period 등)
-    
+        buckets: 캐시 데이터가 의존하는 버킷 (버전이 키에 포함됨)
+
     Returns:
-        캐시 키 문자열
+        캐시 키 문자열 (예: calendar:3:v1760000000000:b1760000000001:2026:10)
     """
-    parts = [prefix, str(user_id)] + [str(arg) for arg in args if arg is not None]
+    version = get_user_cache_version(user_id)
+    parts = [prefix, str(user_id), f"v{version}"]
+    if buckets:
+        versions = '.'.join(str(v) for v in get_bucket_versions(user_id, buckets))
+        if len(buckets) > 2:
+            versions = hashlib.md5(versions.encode()).hexdigest()[:16]
+        parts.append(f"b{versions}")
+    parts += [str(arg) for arg in args if arg is not None]
     return ':'.join(parts)
 
 
+def invalidate_cache_buckets(user_id: int, buckets):
+    """
+    지정한 버킷에 의존하는 사용자 캐시만 무효화 (버킷별 버전 증가)
+
+    Args:
+        user_id: 사용자 ID
+        buckets: date_buckets() / TAGS_BUCKET 등
+    """
+    for bucket in set(buckets):
+        key = BUCKET_VERSION_KEY.format(user_id=user_id, bucket=bucket)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _new_version(), None)
+
+
+def schedule_cache_invalidation(user_id: int, buckets):
+    """커밋 후 버킷 무효화 (롤백되면 무효화하지 않음, 트랜잭션 밖이면 즉시)"""
+    if buckets:
+        transaction.on_commit(lambda: invalidate_cache_buckets(user_id, buckets))
+
+
 def invalidate_user_cache(user_id: int):
     """
     사용자의 모든 관련 캐시 무효화
-    일기 생성/수정/삭제 시 호출
-    
+    대량 변경(백업 복원 등) 시 호출, 개별 일기 변경은 signals 에서 버킷 단위로 무효화
+
+    키를 하나씩 삭제하지 않고 버전을 올려 이전 세대의 키를 모두 무효화
+    (이전 세대 캐시는 TTL 만료 또는 LRU 축출로 정리됨)
+
     Args:
         user_id: 사용자 ID
     """
-    from django.utils import timezone
-    
-    now = timezone.now()
-    
-    # 패턴 기반 삭제가 어려우므로 주요 캐시 키를 직접 삭제
-    keys_to_delete = [
-        # 리포트 캐시
-        f"report:{user_id}:week",
-        f"report:{user_id}:month",
-        
-        # 현재 연도 히트맵
-        f"heatmap:{user_id}:{now.year}",
-        
-        # 현재 월 캘린더
-        f"calendar:{user_id}:{now.year}:{now.month}",
-        
-        # 이전 달 캘린더 (월 경계 시점 대비)
-        f"calendar:{user_id}:{now.year}:{now.month - 1}" if now.month > 1 else f"calendar:{user_id}:{now.year - 1}:12",
-        
-        # 인기 태그
-        f"popular_tags:{user_id}",
-    ]
-    
-    cache.delete_many(keys_to_delete)
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # 버전 키가 없음 (축출/미생성): 새 세대로 시작
+        cache.add(key, _new_version(), None)
 
 
 def invalidate_report_cache(user_id: int):
-    """리포트 캐시만 무효화"""
-    cache.delete_many([
-        f"report:{user_id}:week",
-        f"report:{user_id}:month",
-    ])
+    """주간/월간 리포트 캐시 무효화 (최근 30일 버킷)"""
+    invalidate_cache_buckets(user_id, recent_buckets(30))
 
 
 def invalidate_calendar_cache(user_id: int, year: int = None, month: int = None):
-    """캘린더 캐시 무효화"""
-    from django.utils import timezone
-    
-    if year and month:
-        cache.delete(f"calendar:{user_id}:{year}:{month}")
-    else:
-        now = timezone.now()
-        cache.delete(f"calendar:{user_id}:{now.year}:{now.month}")
+    """캘린더 캐시 무효화 (기본: 이번 달)"""
+    if not (year and month):
+        today = timezone.localdate()
+        year, month = today.year, today.month
+    invalidate_cache_buckets(user_id, [month_bucket(year, month)])
 
 
 def invalidate_heatmap_cache(user_id: int, year: int = None):
-    """히트맵 캐시 무효화"""
-    from django.utils import timezone
-    
-    if year:
-        cache.delete(f"heatmap:{user_id}:{year}")
-    else:
-        now = timezone.now()
-        cache.delete(f"heatmap:{user_id}:{now.year}")
+    """히트맵/연간 리포트 캐시 무효화 (기본: 올해)"""
+    invalidate_cache_buckets(user_id, [year_bucket(year or timezone.localdate().year)])
+
+
+def current_year():
+    return timezone.now().year
+
+
+def current_month():
+    return timezone.now().month
+
+
+def cached_user_view(prefix: str, ttl: str = None, params: dict = None, buckets=None):
+    """
+    사용자별 GET 응답 캐싱 데코레이터 (ViewSet 액션용)
+
+    - 키: get_cache_key(prefix, user_id, *쿼리 파라미터 값) → 사용자 버전 네임스페이스 포함
+    - buckets 가 있으면 해당 버킷 버전도 키에 포함 (일기 변경 시 관련 버킷만 무효화)
+    - 200 응답의 data 만 캐시 (400/500 등 오류 응답은 캐시하지 않음)
+    - utils.swr_cache: TTL 이 지나도 오래된 값을 반환하고 요청 하나만 재계산 (동시 미스 합치기)
+
+    Args:
+        prefix: 캐시 유형 (CACHE_TTL 키 기본값)
+        ttl: settings.CACHE_TTL 키 (기본: prefix)
+        params: 키에 포함할 쿼리 파라미터 {이름: 기본값 또는 기본값 함수}
+        buckets: 파라미터 dict → 의존 버킷 목록 함수 (값이 잘못되면 캐시하지 않음)
+
+    사용 예:
+        @action(detail=False, methods=['get'], url_path='calendar')
+        @cached_user_view('calendar', params={'year': current_year, 'month': current_month},
+                          buckets=lambda p: [month_bucket(p['year'], p['month'])])
+        def calendar(self, request): ...
+    """
+    params = params or {}
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            values = {}
+            for name, default in params.items():
+                value = request.query_params.get(name)
+                if value is None:
+                    value = default() if callable(default) else default
+                values[name] = value
+
+            try:
+                depends = buckets(values) if buckets else ()
+            except (TypeError, ValueError, OverflowError):
+                # 잘못된 파라미터: 뷰에서 오류 응답/기본값 처리
+                return view_method(self, request, *args, **kwargs)
+
+            def compute():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    raise Uncacheable(response)
+                return response.data
+
+            cache_key = get_cache_key(prefix, request.user.id, *values.values(), buckets=depends)
+            timeout = getattr(settings, 'CACHE_TTL', {}).get(ttl or prefix, 600)
+            result = get_or_compute(cache_key, compute, timeout)
+            return result if isinstance(result, Response) else Response(result)
+        return wrapper
+    return decorator
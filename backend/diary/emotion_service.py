@@ -8,7 +8,10 @@ import logging
 from typing import Dict, Optional
 from django.conf import settings
 from django.utils import timezone
-from google import genai
+
+from .services.gemini_client import get_gemini_client
+from .utils.ai_cache import get_ai_cache
+from .utils.circuit_breaker import circuit_breaker
 
 logger = logging.getLogger('diary')
 
@@ -41,23 +44,20 @@ class EmotionAnalyzer:
         'love': '사랑',
     }
     
+    # 프롬프트/후처리를 바꾸면 올려서 이전 캐시 결과를 무효화
+    PROMPT_VERSION = 1
+    
     def __init__(self):
         self.client = None
         if settings.GEMINI_API_KEY:
-            self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+            self.client = get_gemini_client()
     
     def analyze(self, content: str) -> Dict:
         """
         일기 내용을 분석하여 감정을 반환합니다.
-        (Circuit Breaker Pattern Applied)
+        (같은 내용은 AI 결과 캐시 재사용, AI 호출은 분산 서킷 브레이커로 보호,
+         차단 중이거나 실패하면 키워드 분석 - 키워드 분석 결과는 캐시하지 않음)
         """
-        from django.core.cache import cache
-        
-        CB_KEY_FAILURES = 'gemini_api_failures'
-        CB_KEY_OPEN = 'gemini_circuit_open'
-        CB_THRESHOLD = 3
-        CB_TIMEOUT = 60 # 60 seconds cooldown
-        
         if not content or len(content.strip()) < 5:
             return {
                 'emotion': 'peaceful',
@@ -66,17 +66,29 @@ class EmotionAnalyzer:
                 'reason': '내용이 너무 짧아 분석이 어렵습니다.',
             }
             
-        # 1. Circuit Open Check (Fail Fast)
-        if cache.get(CB_KEY_OPEN):
-            logger.warning("Circuit Breaker is OPEN. Skipping Gemini API call.")
-            return self._fallback_analysis(content)
-            
         if not settings.GEMINI_API_KEY:
             logger.error("Gemini API Key is not configured for Emotion Analysis.")
             return self._fallback_analysis(content)
         
         try:
-            prompt = f"""당신은 일기 내용을 분석하여 작성자의 감정을 파악하는 전문가입니다.
+            result, cached = get_ai_cache().get_or_compute(
+                'emotion', settings.GEMINI_TEXT_MODEL, self.PROMPT_VERSION, content,
+                lambda: self._analyze_with_ai(content),
+            )
+            return {**result, 'cached': cached}
+        except Exception as e:
+            logger.error(f"Emotion analysis failed: {e}")
+            return self._fallback_analysis(content)
+    
+    @classmethod
+    def lookup_cached(cls, content: str) -> Optional[Dict]:
+        """캐시된 AI 분석 결과 (없으면 None, API 클라이언트를 만들지 않음)"""
+        result, hit = get_ai_cache().get('emotion', settings.GEMINI_TEXT_MODEL, cls.PROMPT_VERSION, content)
+        return {**result, 'cached': True} if hit else None
+    
+    @circuit_breaker('emotion.analyze')
+    def _analyze_with_ai(self, content: str) -> Dict:
+        prompt = f"""당신은 일기 내용을 분석하여 작성자의 감정을 파악하는 전문가입니다.
             
 일기 내용:
 "{content[:2000]}"
@@ -94,60 +106,40 @@ class EmotionAnalyzer:
 반드시 다음 JSON 형식으로만 응답하세요:
 {{"emotion": "감정키", "score": 점수(0-100), "reason": "분석 근거 한 문장"}}"""
 
-            # API Call
-            response = self.client.models.generate_content(
-                model=settings.GEMINI_TEXT_MODEL,
-                contents=prompt
-            )
-            result_text = response.text.strip()
-            
-            # JSON 포맷팅 정리
-            if result_text.startswith('```json'):
-                result_text = result_text[7:]
-            if result_text.startswith('```'):
-                result_text = result_text[3:]
-            if result_text.endswith('```'):
-                result_text = result_text[:-3]
-            
-            result_text = result_text.strip()
-            
-            # JSON 파싱
-            result = json.loads(result_text)
-            
-            # Success -> Reset Failure Count
-            cache.delete(CB_KEY_FAILURES)
-            
-            emotion = result.get('emotion', 'peaceful')
-            if emotion not in self.VALID_EMOTIONS:
-                emotion = 'peaceful'
-            
-            score = result.get('score', 50)
-            if not isinstance(score, int) or score < 0 or score > 100:
-                score = 50
-            
-            return {
-                'emotion': emotion,
-                'emotion_label': self.EMOTION_LABELS.get(emotion, '평온'),
-                'score': score,
-                'reason': result.get('reason', ''),
-            }
-            
-        except Exception as e:
-            logger.error(f"Emotion analysis failed: {e}")
-            
-            # Failure Handling -> Increment Count
-            try:
-                failures = cache.incr(CB_KEY_FAILURES)
-            except ValueError:
-                cache.set(CB_KEY_FAILURES, 1, timeout=300)
-                failures = 1
-                
-            if failures >= CB_THRESHOLD:
-                logger.error(f"Circuit Breaker TRIPPED! Opened for {CB_TIMEOUT}s.")
-                cache.set(CB_KEY_OPEN, True, timeout=CB_TIMEOUT)
-                cache.delete(CB_KEY_FAILURES) # Reset count after trip
-            
-            return self._fallback_analysis(content)
+        # API Call
+        response = self.client.generate_content(
+            model=settings.GEMINI_TEXT_MODEL,
+            contents=prompt
+        )
+        result_text = response.text.strip()
+        
+        # JSON 포맷팅 정리
+        if result_text.startswith('```json'):
+            result_text = result_text[7:]
+        if result_text.startswith('```'):
+            result_text = result_text[3:]
+        if result_text.endswith('```'):
+            result_text = result_text[:-3]
+        
+        result_text = result_text.strip()
+        
+        # JSON 파싱
+        result = json.loads(result_text)
+        
+        emotion = result.get('emotion', 'peaceful')
+        if emotion not in self.VALID_EMOTIONS:
+            emotion = 'peaceful'
+        
+        score = result.get('score', 50)
+        if not isinstance(score, int) or score < 0 or score > 100:
+            score = 50
+        
+        return {
+            'emotion': emotion,
+            'emotion_label': self.EMOTION_LABELS.get(emotion, '평온'),
+            'score': score,
+            'reason': result.get('reason', ''),
+        }
     
     def _fallback_analysis(self, content: str) -> Dict:
         """AI 분석 실패 시 키워드 기반 간단 분석"""
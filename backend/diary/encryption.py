@@ -3,13 +3,77 @@
 일기 내용 암호화/복호화 서비스
 AES-256 (Fernet) 암호화 사용
 """
+import atexit
 import base64
+import hashlib
+import hmac
 import logging
-from cryptography.fernet import Fernet, InvalidToken
+import multiprocessing
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from django.conf import settings
 
 logger = logging.getLogger('diary')
 
+# 이 개수 이상인 버전 그룹은 프로세스 풀에서 처리 (Fernet 은 CPU 바운드 + GIL 점유)
+DEFAULT_PARALLEL_THRESHOLD = 2000
+
+
+def _decrypt_chunk(key: bytes, tokens: list) -> list:
+    """프로세스 풀 워커: 한 키로 복호화, 실패 항목은 None"""
+    cipher = Fernet(key)
+    results = []
+    for token in tokens:
+        try:
+            results.append(cipher.decrypt(token.encode('utf-8')).decode('utf-8'))
+        except InvalidToken:
+            results.append(None)
+    return results
+
+
+# 프로세스 풀 (워커 프로세스마다 처음 필요할 때 한 번 생성해 재사용)
+_process_pool = None
+_process_pool_pid = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """모듈 전역 프로세스 풀 (fork 된 자식에서는 부모의 풀을 쓰지 않고 새로 생성)"""
+    global _process_pool, _process_pool_pid
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_pid != os.getpid():
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+            _process_pool_pid = os.getpid()
+        return _process_pool
+
+
+def _discard_process_pool():
+    """깨진 풀 폐기 (다음 호출에서 새로 생성)"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None and _process_pool_pid == os.getpid():
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_discard_process_pool)
+
+
+def _encrypt_chunk(key: bytes, texts: list) -> list:
+    """프로세스 풀 워커: 한 키로 암호화, 실패 항목은 None"""
+    cipher = Fernet(key)
+    results = []
+    for text in texts:
+        try:
+            results.append(cipher.encrypt(text.encode('utf-8')).decode('utf-8'))
+        except (AttributeError, TypeError, UnicodeError):
+            results.append(None)
+    return results
+
 
 class DiaryEncryptionService:
     """
@@ -20,6 +84,7 @@ class DiaryEncryptionService:
     
     def __init__(self):
         self._ciphers = {} # {version: Fernet}
+        self._keys = {} # {version: key bytes} (프로세스 풀 전달용)
         self._latest_version = getattr(settings, 'CURRENT_ENCRYPTION_VERSION', 1)
         self._initialize_ciphers()
     
@@ -46,6 +111,7 @@ class DiaryEncryptionService:
                     key = base64.urlsafe_b64encode(key_bytes).decode()
                 
                 self._ciphers[version] = Fernet(key.encode())
+                self._keys[version] = key.encode()
                 logger.debug(f"Encryption key version {version} initialized.")
             except Exception as e:
                 logger.error(f"Failed to initialize key version {version}: {e}")
@@ -56,6 +122,34 @@ class DiaryEncryptionService:
     def is_enabled(self) -> bool:
         """암호화가 활성화되어 있는지 확인 (최신 키 존재 여부)"""
         return self._latest_version in self._ciphers
+
+    @property
+    def latest_version(self) -> int:
+        """암호화 시 사용하는 최신 키 버전"""
+        return self._latest_version
+
+    @property
+    def versions(self) -> list:
+        """사용 가능한 키 버전 목록"""
+        return sorted(self._keys)
+
+    def derive_key(self, purpose: str, version: int = None) -> bytes:
+        """
+        암호화 키에서 용도별 하위 키 파생 (HMAC-SHA256)
+        - 블라인드 인덱스 등 암호화 이외의 용도에 원본 키를 직접 쓰지 않기 위함
+        """
+        version = version or self._latest_version
+        key = self._keys.get(version)
+        if key is None:
+            raise EncryptionError(f"Encryption key version {version} not found.")
+        return hmac.new(key, purpose.encode('utf-8'), hashlib.sha256).digest()
+
+    def _fallback_cipher(self, exclude_version):
+        """지정 버전을 제외한 나머지 키를 한 번에 시도하는 MultiFernet (최신 키 우선)"""
+        versions = sorted((v for v in self._ciphers if v != exclude_version), reverse=True)
+        if not versions:
+            return None
+        return MultiFernet([self._ciphers[v] for v in versions])
     
     def encrypt(self, content: str) -> str:
         """
@@ -81,37 +175,144 @@ class DiaryEncryptionService:
         if not self.is_enabled or not encrypted_content:
             return encrypted_content or ""
             
+        token = encrypted_content.encode('utf-8')
         cipher = self._ciphers.get(version)
-        if not cipher:
+        if cipher:
+            try:
+                return cipher.decrypt(token).decode('utf-8')
+            except InvalidToken:
+                # 키 버전이 맞지 않거나 데이터가 깨진 경우 다른 키로 시도 (Optional Safety)
+                logger.warning(f"InvalidToken with version {version}. Trying other keys...")
+        else:
             # 키를 찾을 수 없는 경우 (폐기된 키 등)
             logger.error(f"Decryption key for version {version} not found.")
-            # Fallback: Try all available keys (Rescue strategy)
-            for ver, fallback_cipher in self._ciphers.items():
-                if ver == version: continue
-                try:
-                    return fallback_cipher.decrypt(encrypted_content.encode('utf-8')).decode('utf-8')
-                except:
-                    continue
+
+        # Fallback: 나머지 키 전체를 MultiFernet 으로 한 번에 시도 (Rescue strategy)
+        fallback = self._fallback_cipher(version)
+        if fallback is not None:
+            try:
+                res = fallback.decrypt(token).decode('utf-8')
+                logger.info(f"Recovered content using fallback keys (stored version {version})")
+                return res
+            except InvalidToken:
+                pass
+        if not cipher:
             raise EncryptionError(f"Decryption key version {version} missing and fallback failed.")
-        
-        try:
-            decrypted_bytes = cipher.decrypt(encrypted_content.encode('utf-8'))
-            return decrypted_bytes.decode('utf-8')
-        except InvalidToken:
-             # 키 버전이 맞지 않거나 데이터가 깨진 경우 다른 키로 시도해볼 수 있음 (Optional Safety)
-            logger.warning(f"InvalidToken with version {version}. Trying other keys...")
-            for ver, fallback_cipher in self._ciphers.items():
-                if ver == version: continue
+        raise EncryptionError("Failed to decrypt content: invalid key")
+
+    # ------------------------------------------------------------------
+    # Bulk API
+    # ------------------------------------------------------------------
+    def encrypt_many(self, contents, version: int = None) -> list:
+        """
+        여러 내용을 한 번에 암호화합니다.
+
+        Args:
+            contents: 평문 시퀀스
+            version: 사용할 키 버전 (기본: 최신)
+
+        Returns:
+            list: 입력 순서대로 암호문 또는 EncryptionError (항목별 실패는 배치를 중단하지 않음)
+        """
+        contents = list(contents)
+        if not self.is_enabled:
+            return contents
+
+        version = self._latest_version if version is None else version
+        key = self._keys.get(version)
+        if key is None:
+            error = EncryptionError(f"Encryption key version {version} not found.")
+            return [error] * len(contents)
+
+        encrypted = self._run_batch(_encrypt_chunk, key, contents)
+        return [
+            value if value is not None else EncryptionError("Failed to encrypt content")
+            for value in encrypted
+        ]
+
+    def decrypt_many(self, items) -> list:
+        """
+        (암호문, 키 버전) 시퀀스를 한 번에 복호화합니다.
+        - 키 버전별로 묶어서 처리하고, 큰 그룹은 프로세스 풀 사용
+        - 실패한 항목만 나머지 키로 재시도
+
+        Returns:
+            list: 입력 순서대로 평문 또는 EncryptionError
+        """
+        items = list(items)
+        if not self.is_enabled:
+            return [content or "" for content, _ in items]
+
+        results = [None] * len(items)
+        groups = defaultdict(list)  # version -> [index]
+        for index, (content, version) in enumerate(items):
+            if not content:
+                results[index] = ""
+            else:
+                groups[version].append(index)
+
+        for version, indexes in groups.items():
+            tokens = [items[i][0] for i in indexes]
+            key = self._keys.get(version)
+            if key is not None:
+                decrypted = self._run_batch(_decrypt_chunk, key, tokens)
+            else:
+                logger.error(f"Decryption key for version {version} not found.")
+                decrypted = [None] * len(tokens)
+
+            failed = []
+            for index, value in zip(indexes, decrypted):
+                if value is None:
+                    failed.append(index)
+                else:
+                    results[index] = value
+
+            if failed:
+                self._decrypt_fallback(items, failed, version, results)
+
+        return results
+
+    def _decrypt_fallback(self, items, indexes, version, results):
+        """그룹 키로 실패한 항목만 나머지 키로 재시도"""
+        fallback = self._fallback_cipher(version)
+        recovered = 0
+        for index in indexes:
+            if fallback is not None:
                 try:
-                    res = fallback_cipher.decrypt(encrypted_content.encode('utf-8')).decode('utf-8')
-                    logger.info(f"Recovered content using key version {ver}")
-                    return res
-                except:
+                    results[index] = fallback.decrypt(items[index][0].encode('utf-8')).decode('utf-8')
+                    recovered += 1
                     continue
-            raise EncryptionError("Failed to decrypt content: invalid key")
+                except InvalidToken:
+                    pass
+            results[index] = EncryptionError("Failed to decrypt content: invalid key")
+        logger.warning(
+            f"{len(indexes)} items failed with key version {version}; recovered {recovered} with fallback keys."
+        )
+
+    def _run_batch(self, func, key, values) -> list:
+        """
+        큰 배치는 공유 프로세스 풀로 분할 실행, 작은 배치나 데몬 프로세스(Celery prefork)에서는 직렬 실행
+        (풀은 호출마다 만들지 않고 워커 프로세스당 하나를 재사용)
+        """
+        threshold = getattr(settings, 'ENCRYPTION_PARALLEL_THRESHOLD', DEFAULT_PARALLEL_THRESHOLD)
+        workers = getattr(settings, 'ENCRYPTION_MAX_WORKERS', None) or os.cpu_count() or 1
+
+        # 데몬 프로세스는 자식 프로세스를 만들 수 없음
+        if len(values) < threshold or workers <= 1 or multiprocessing.current_process().daemon:
+            return func(key, values)
+
+        chunk_size = max(1, -(-len(values) // workers))
+        chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+        try:
+            results = []
+            for part in _get_process_pool(workers).map(func, [key] * len(chunks), chunks):
+                results.extend(part)
+            return results
         except Exception as e:
-            logger.error(f"Decryption failed: {e}")
-            raise EncryptionError(f"Failed to decrypt content: {e}")
+            if isinstance(e, BrokenProcessPool):
+                _discard_process_pool()
+            logger.warning(f"Process pool failed, falling back to serial crypto: {e}")
+            return func(key, values)
 
 
 class EncryptionError(Exception):
@@ -125,3 +326,24 @@ def get_encryption_service() -> DiaryEncryptionService:
     if _encryption_service is None:
         _encryption_service = DiaryEncryptionService()
     return _encryption_service
+
+
+def decrypt_diaries(diaries) -> list:
+    """
+    일기 목록의 본문을 한 번에 복호화합니다. (내보내기/PDF 등 대량 처리용)
+    - 암호화되지 않은 일기는 그대로 반환
+    - 복호화에 실패한 항목은 로그를 남기고 빈 문자열로 대체 (전체 작업은 계속)
+    """
+    diaries = list(diaries)
+    encrypted = [d for d in diaries if d.is_encrypted]
+    decrypted = get_encryption_service().decrypt_many(
+        (d.content, d.encryption_version) for d in encrypted
+    )
+    plain_by_id = {}
+    for diary, value in zip(encrypted, decrypted):
+        if isinstance(value, EncryptionError):
+            logger.error(f"Failed to decrypt diary {diary.id}: {value}")
+            value = ""
+        plain_by_id[diary.id] = value
+
+    return [plain_by_id[d.id] if d.is_encrypted else (d.content or "") for d in diaries]
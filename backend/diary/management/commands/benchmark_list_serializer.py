@@ -0,0 +1,102 @@
+# diary/management/commands/benchmark_list_serializer.py
+"""
+일기 목록 직렬화 성능 벤치마크 관리 명령어
+- 기존 목록 경로(DiarySerializer + images / diary_tags 프리페치 + 본문 복호화) 와
+  DiaryListSerializer(컬럼 프로젝션 + 비정규화 이미지 요약) 비교
+- 조회 + 직렬화 + JSON 렌더링까지의 처리량(rows/sec)과 항목당 응답 크기(bytes/row) 측정
+- 벤치마크용 사용자/일기는 bulk_create 로 생성하고 종료 시 삭제
+
+사용법:
+    python manage.py benchmark_list_serializer
+    python manage.py benchmark_list_serializer --rows 1000 --repeat 5 --fields id,title,preview
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from diary.encryption import get_encryption_service
+from diary.models import Diary, DiaryImage, DiaryTag, Tag
+from diary.serializers import DiaryListSerializer, DiarySerializer
+
+CONTENT = '오늘은 공원에서 오래 산책을 했다. 바람이 시원했고 커피도 맛있었다. ' * 20
+
+
+class Command(BaseCommand):
+    help = '일기 목록 직렬화(DiarySerializer vs DiaryListSerializer) 처리량을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--fields', default='', help='DiaryListSerializer 필드 (기본: 기본 필드)')
+        parser.add_argument('--keep', action='store_true', help='벤치마크 데이터 유지')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username='__list_benchmark__')
+        try:
+            self._fill(user, options['rows'])
+            base = Diary.objects.filter(user=user).order_by('-created_at', '-id')
+            fields = DiaryListSerializer.select_fields(options['fields'])
+
+            def full():
+                queryset = base.select_related('user').prefetch_related('images', 'diary_tags__tag')
+                return DiarySerializer(queryset, many=True).data
+
+            def compact():
+                queryset = base.only(*DiaryListSerializer.columns_for(fields))
+                if 'tags' in fields:
+                    queryset = queryset.prefetch_related('diary_tags__tag')
+                return DiaryListSerializer(queryset, many=True, fields=fields).data
+
+            self.stdout.write(f"{'serializer':>22} {'rows/sec':>12} {'bytes/row':>10}")
+            for name, serialize in (('DiarySerializer', full), ('DiaryListSerializer', compact)):
+                rate, size = self._measure(serialize, options)
+                self.stdout.write(f"{name:>22} {rate:>12.0f} {size:>10.0f}")
+        finally:
+            if not options['keep']:
+                user.delete()
+
+    def _fill(self, user, size):
+        """암호화된 본문 + 이미지 2개 + 태그 2개를 가진 일기를 size 개까지 채움 (시그널 없이 bulk_create)"""
+        existing = Diary.objects.filter(user=user).count()
+        if existing >= size:
+            return
+        service = get_encryption_service()
+        tags = [Tag.objects.get_or_create(user=user, name=name)[0] for name in ('산책', '커피')]
+        for start in range(existing, size, 1000):
+            count = min(start + 1000, size) - start
+            contents = service.encrypt_many([CONTENT] * count)
+            diaries = Diary.objects.bulk_create([
+                Diary(
+                    user=user,
+                    title=f"벤치마크 일기 {start + i}",
+                    content=content,
+                    is_encrypted=service.is_enabled,
+                    encryption_version=service.latest_version,
+                    emotion='happy',
+                    emotion_score=70,
+                    image_count=2,
+                    thumbnail_url=f"https://example.com/{start + i}/1.png",
+                )
+                for i, content in enumerate(contents)
+            ])
+            DiaryImage.objects.bulk_create([
+                DiaryImage(diary=diary, image_url=f"https://example.com/{diary.id}/{n}.png", ai_prompt='산책하는 풍경')
+                for diary in diaries for n in range(2)
+            ])
+            DiaryTag.objects.bulk_create([DiaryTag(diary=diary, tag=tag) for diary in diaries for tag in tags])
+
+    def _measure(self, serialize, options):
+        renderer = JSONRenderer()
+        rates, sizes = [], []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            data = serialize()
+            body = renderer.render(data)
+            elapsed = time.perf_counter() - started
+            rates.append(len(data) / elapsed if elapsed else 0)
+            sizes.append(len(body) / max(len(data), 1))
+        return statistics.median(rates), statistics.median(sizes)
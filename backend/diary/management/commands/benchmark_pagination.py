@@ -0,0 +1,97 @@
+# diary/management/commands/benchmark_pagination.py
+"""
+일기 목록 페이지네이션 성능 벤치마크 관리 명령어
+- 페이지 번호 방식(COUNT + OFFSET) 과 키셋 커서 방식을 같은 페이지 위치에서 비교
+- 키셋 방식은 커서(마지막 항목의 created_at, id)만 있으면 되므로 깊은 페이지도 첫 페이지와 같은 비용
+- 벤치마크용 사용자/일기는 bulk_create 로 생성하고 종료 시 삭제
+
+사용법:
+    python manage.py benchmark_pagination
+    python manage.py benchmark_pagination --diaries 20000 --pages 1 100 500 --repeat 20
+"""
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.utils import timezone
+
+from diary.models import Diary
+from diary.paginations import KeysetPagination
+
+ORDERING = ('-created_at', '-id')
+
+
+class Command(BaseCommand):
+    help = '일기 목록 페이지네이션(페이지 번호 vs 키셋 커서) 성능을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--diaries', type=int, default=12000)
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 100, 500])
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--keep', action='store_true', help='벤치마크 데이터 유지')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username='__pagination_benchmark__')
+        page_size = options['page_size']
+        total = max(options['diaries'], max(options['pages']) * page_size)
+
+        self.stdout.write(f"{'page':>6} {'offset ms':>12} {'keyset ms':>12}")
+        try:
+            self._fill(user, total)
+            base = Diary.objects.filter(user=user).order_by(*ORDERING)
+            for page in sorted(options['pages']):
+                cursor = self._cursor_before(base, page, page_size)
+                offset = self._measure(lambda page=page: self._offset_page(base, page, page_size), options)
+                keyset = self._measure(lambda cursor=cursor: self._keyset_page(base, cursor, page_size), options)
+                self.stdout.write(f"{page:>6} {offset:>12.2f} {keyset:>12.2f}")
+        finally:
+            if not options['keep']:
+                user.delete()
+
+    def _fill(self, user, size):
+        """사용자 일기를 size 개까지 채움 (시그널 없이 bulk_create, 1분 간격 작성 시각)"""
+        existing = Diary.objects.filter(user=user).count()
+        now = timezone.now()
+        for start in range(existing, size, 5000):
+            created = Diary.objects.bulk_create([
+                Diary(user=user, title=f"벤치마크 일기 {i}", content='', is_encrypted=False)
+                for i in range(start, min(start + 5000, size))
+            ])
+            # auto_now_add 로 같은 시각이 되므로 작성 시각을 분산
+            for offset, diary in enumerate(created, start=start):
+                diary.created_at = now - timedelta(minutes=offset)
+            Diary.objects.bulk_update(created, ['created_at'], batch_size=1000)
+
+    @staticmethod
+    def _cursor_before(base, page, page_size):
+        """page 직전 페이지 마지막 항목의 커서 (키셋 방식에서 클라이언트가 들고 있는 값)"""
+        if page <= 1:
+            return None
+        last = base.values_list('created_at', 'id')[(page - 1) * page_size - 1]
+        return KeysetPagination.encode_cursor(last)
+
+    @staticmethod
+    def _offset_page(base, page, page_size):
+        """기존 PageNumberPagination 과 같은 쿼리 (COUNT + OFFSET)"""
+        return list(Paginator(base, page_size).page(page).object_list)
+
+    @staticmethod
+    def _keyset_page(base, cursor, page_size):
+        paginator = KeysetPagination(page_size=page_size)
+        queryset = base
+        if cursor:
+            queryset = queryset.filter(paginator.keyset_filter(paginator.decode_cursor(cursor)))
+        return list(queryset[:page_size + 1])
+
+    def _measure(self, fetch, options):
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            fetch()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
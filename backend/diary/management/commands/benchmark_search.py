@@ -0,0 +1,105 @@
+# diary/management/commands/benchmark_search.py
+"""
+일기 검색 성능 벤치마크 관리 명령어
+- 기존 경로(icontains + 태그 JOIN + DISTINCT) 와 DiarySearchService 비교
+- 사용자당 일기 수(기본 1k/10k/100k)를 늘려가며 평균 응답 시간 측정
+- 벤치마크용 사용자/일기는 bulk_create 로 생성하고 종료 시 삭제
+
+사용법:
+    python manage.py benchmark_search
+    python manage.py benchmark_search --sizes 1000 10000 --query 산책 --repeat 20
+"""
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from diary.models import Diary, DiaryTag, Tag
+from diary.services.search_service import DiarySearchService
+
+NOUNS = [
+    '산책', '커피', '회사', '친구', '가족', '여행', '운동', '공부', '음악', '영화',
+    '바다', '하늘', '점심', '저녁', '주말', '출근', '퇴근', '비', '눈', '고양이',
+]
+
+
+def legacy_search(queryset, query):
+    """변경 전 DiaryViewSet.list 의 q 검색 경로"""
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(search_keywords__icontains=query) |
+        Q(diary_tags__tag__name__icontains=query)
+    ).distinct()
+
+
+def optimized_search(queryset, query):
+    """DiarySearchService 경로 (전문 검색/trigram + 태그 EXISTS)"""
+    return queryset.filter(
+        DiarySearchService.text_match(query) | DiarySearchService.tag_match(query)
+    )
+
+
+class Command(BaseCommand):
+    help = '일기 검색 경로(icontains vs 전문 검색) 성능을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--query', default='산책')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--keep', action='store_true', help='벤치마크 데이터 유지')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username='__search_benchmark__')
+        rng = random.Random(42)
+        tags = [
+            Tag.objects.get_or_create(user=user, name=noun)[0]
+            for noun in NOUNS
+        ]
+
+        self.stdout.write(f"{'diaries':>10} {'legacy ms':>12} {'optimized ms':>14} {'rows':>6}")
+        try:
+            for size in sorted(options['sizes']):
+                self._fill(user, tags, size, rng)
+                base = Diary.objects.filter(user=user)
+
+                query = options['query']
+                legacy = self._measure(lambda base=base, query=query: legacy_search(base, query), options)
+                optimized = self._measure(lambda base=base, query=query: optimized_search(base, query), options)
+                rows = optimized_search(base, query).count()
+
+                self.stdout.write(f"{size:>10} {legacy:>12.2f} {optimized:>14.2f} {rows:>6}")
+        finally:
+            if not options['keep']:
+                user.delete()
+
+    def _fill(self, user, tags, size, rng):
+        """사용자 일기를 size 개까지 채움 (시그널 없이 bulk_create)"""
+        existing = Diary.objects.filter(user=user).count()
+        for start in range(existing, size, 5000):
+            diaries = Diary.objects.bulk_create([
+                Diary(
+                    user=user,
+                    title=f"{rng.choice(NOUNS)} 일기 {i}",
+                    content='',
+                    is_encrypted=False,
+                    search_keywords=' '.join(rng.sample(NOUNS, 4)),
+                )
+                for i in range(start, min(start + 5000, size))
+            ])
+            DiaryTag.objects.bulk_create(
+                [DiaryTag(diary=diary, tag=rng.choice(tags)) for diary in diaries],
+                ignore_conflicts=True,
+            )
+
+    def _measure(self, build_queryset, options):
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            list(build_queryset().order_by('-created_at')[:options['page_size']])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
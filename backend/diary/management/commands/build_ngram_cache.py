@@ -0,0 +1,66 @@
+# diary/management/commands/build_ngram_cache.py
+"""
+키워드 후보(n-gram) 임베딩 메모리 맵 생성 관리 명령어
+- 일기 본문에서 자주 등장하는 n-gram 을 모아 미리 임베딩
+- 결과는 KEYWORD_NGRAM_CACHE['PATH'] 에 vectors.f32 + vocab.json 으로 저장
+  (워커들은 읽기 전용 메모리 맵으로 공유)
+
+사용법:
+    python manage.py build_ngram_cache
+    python manage.py build_ngram_cache --top 100000 --path /data/ngram_cache
+"""
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from diary.encryption import decrypt_diaries
+from diary.models import Diary
+from diary.services.analysis_service import ngram_candidates, get_sentence_transformer_model
+from diary.utils.ngram_cache import NgramEmbeddingCache
+
+
+class Command(BaseCommand):
+    help = '자주 쓰이는 n-gram 임베딩을 메모리 맵 파일로 미리 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='저장 디렉토리 (기본: KEYWORD_NGRAM_CACHE PATH)')
+        parser.add_argument('--top', type=int, default=50000, help='저장할 n-gram 수')
+        parser.add_argument('--diaries', type=int, default=20000, help='스캔할 최근 일기 수')
+        parser.add_argument('--batch-size', type=int, default=512, help='encode 배치 크기')
+
+    def handle(self, *args, **options):
+        path = options['path'] or getattr(settings, 'KEYWORD_NGRAM_CACHE', {}).get('PATH')
+        if not path:
+            raise CommandError('--path 또는 KEYWORD_NGRAM_CACHE_PATH 를 지정하세요.')
+
+        model = get_sentence_transformer_model()
+        if model is None:
+            raise CommandError('SentenceTransformer 모델을 불러올 수 없습니다.')
+
+        counts = Counter()
+        recent_ids = list(
+            Diary.objects.order_by('-id').values_list('id', flat=True)[:options['diaries']]
+        )
+        for start in range(0, len(recent_ids), 500):
+            chunk = Diary.objects.filter(id__in=recent_ids[start:start + 500]).only(
+                'id', 'content', 'is_encrypted', 'encryption_version'
+            )
+            for content in decrypt_diaries(chunk):
+                counts.update(ngram_candidates(content or ''))
+
+        terms = [term for term, _ in counts.most_common(options['top'])]
+        if not terms:
+            self.stdout.write(self.style.WARNING('n-gram 후보가 없습니다.'))
+            return
+
+        self.stdout.write(f'{len(terms)}개 n-gram 임베딩 계산 중...')
+        batch_size = options['batch_size']
+        vectors = np.vstack([
+            np.atleast_2d(model.encode(terms[i:i + batch_size]))
+            for i in range(0, len(terms), batch_size)
+        ])
+
+        NgramEmbeddingCache.write_memmap(path, terms, vectors)
+        self.stdout.write(self.style.SUCCESS(f'완료! {len(terms)}개 n-gram -> {path}'))
@@ -0,0 +1,37 @@
+# diary/management/commands/rebuild_aggregates.py
+"""
+일별 감정 집계(DailyEmotionAggregate)를 일기 테이블에서 다시 계산하는 관리 명령어
+- 최초 배포 시 백필
+- 시그널을 거치지 않은 대량 변경(bulk_create/update) 이후 정합성 복구
+
+사용법:
+    python manage.py rebuild_aggregates
+    python manage.py rebuild_aggregates --user 42
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from diary.services.aggregate_service import EmotionAggregateService
+
+
+class Command(BaseCommand):
+    help = '일별 감정 집계를 일기 데이터로부터 다시 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='특정 사용자 ID만 재계산')
+
+    def handle(self, *args, **options):
+        user_id = options.get('user')
+
+        if user_id is not None:
+            row_count = EmotionAggregateService.rebuild(user_id=user_id)
+            self.stdout.write(self.style.SUCCESS(f'완료! 사용자 {user_id}: {row_count}개 집계 행'))
+            return
+
+        # 사용자 단위로 나눠서 트랜잭션을 짧게 유지
+        total_rows = 0
+        user_ids = get_user_model().objects.values_list('id', flat=True).order_by('id')
+        for uid in user_ids.iterator():
+            total_rows += EmotionAggregateService.rebuild(user_id=uid)
+
+        self.stdout.write(self.style.SUCCESS(f'완료! 전체 {total_rows}개 집계 행'))
@@ -0,0 +1,51 @@
+# diary/management/commands/rebuild_blind_index.py
+"""
+일기 본문 블라인드 인덱스 백필/재구축 관리 명령어
+- 기존 일기를 배치 단위로 복호화하여 DiaryBlindIndex 생성 (변경분만 반영)
+- --clear-plaintext: 인덱싱한 일기의 search_keywords 평문 제거
+
+사용법:
+    python manage.py rebuild_blind_index
+    python manage.py rebuild_blind_index --user 42 --clear-plaintext
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from diary.encryption import decrypt_diaries
+from diary.models import Diary
+from diary.services.blind_index_service import BlindIndexService
+
+
+class Command(BaseCommand):
+    help = '일기 본문 블라인드 인덱스를 다시 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='특정 사용자 ID만 재계산')
+        parser.add_argument('--batch-size', type=int, default=500, help='배치 크기')
+        parser.add_argument('--clear-plaintext', action='store_true', help='search_keywords 평문 제거')
+
+    def handle(self, *args, **options):
+        queryset = Diary.objects.all()
+        if options['user'] is not None:
+            queryset = queryset.filter(user_id=options['user'])
+
+        last_id = 0
+        total = 0
+        while True:
+            batch = list(
+                queryset.filter(id__gt=last_id).order_by('id')
+                .only('id', 'user_id', 'content', 'is_encrypted', 'encryption_version')[:options['batch_size']]
+            )
+            if not batch:
+                break
+
+            with transaction.atomic():
+                BlindIndexService.index_many(zip(batch, decrypt_diaries(batch)))
+                if options['clear_plaintext']:
+                    Diary.objects.filter(id__in=[d.id for d in batch]).update(search_keywords=None)
+
+            last_id = batch[-1].id
+            total += len(batch)
+            self.stdout.write(f'{total}개 처리...')
+
+        self.stdout.write(self.style.SUCCESS(f'완료! {total}개 일기 인덱싱'))
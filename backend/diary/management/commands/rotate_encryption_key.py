@@ -1,5 +1,7 @@
 import logging
-from django.core.management.base import BaseCommand
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 from cryptography.fernet import Fernet
 from diary.models import Diary
 
@@ -9,13 +11,26 @@ class Command(BaseCommand):
     help = 'Rotates the Diary Encryption Key by re-encrypting all diary contents.'
 
     def add_arguments(self, parser):
-        parser.add_argument('--old-key', type=str, required=True, help='Current (Old) Encryption Key')
-        parser.add_argument('--new-key', type=str, required=True, help='New Encryption Key')
+        # Versioned rotation (DIARY_ENCRYPTION_KEYS 기반, 권장)
+        parser.add_argument('--target-version', type=int, help='Key version to re-encrypt into (default: CURRENT_ENCRYPTION_VERSION)')
+        parser.add_argument('--shards', type=int, default=1, help='Split pending rows into N id-range shards')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk_update batch')
+        parser.add_argument('--rate', type=float, default=None, help='Throttle each shard to N rows/sec')
+        parser.add_argument('--async', dest='use_celery', action='store_true', help='Dispatch shards as Celery tasks instead of running locally')
+        parser.add_argument('--no-resume', action='store_true', help='Ignore saved checkpoints and start over')
+        # Legacy in-place rotation (same version, explicit keys)
+        parser.add_argument('--old-key', type=str, help='Current (Old) Encryption Key (legacy mode)')
+        parser.add_argument('--new-key', type=str, help='New Encryption Key (legacy mode)')
         parser.add_argument('--dry-run', action='store_true', help='Simulate without saving changes')
 
     def handle(self, *args, **options):
-        old_key = options['old-key']
-        new_key = options['new-key']
+        if not options['old_key'] and not options['new_key']:
+            return self._handle_versioned(options)
+        if not (options['old_key'] and options['new_key']):
+            raise CommandError('--old-key and --new-key must be given together.')
+
+        old_key = options['old_key']
+        new_key = options['new_key']
         dry_run = options['dry_run']
 
         if dry_run:
@@ -88,6 +103,68 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING("This was a dry run. No data was changed."))
 
+    def _handle_versioned(self, options):
+        """KeyRotationService 를 id 범위 샤드로 나눠 실행"""
+        from diary.services.key_rotation_service import KeyRotationService
+
+        target_version = options['target_version']
+        ranges = KeyRotationService.shard_ranges(options['shards'], target_version=target_version)
+        if not ranges:
+            self.stdout.write(self.style.SUCCESS("Nothing to rotate."))
+            return
+
+        self.stdout.write(f"Rotating into key version {target_version or 'current'} with {len(ranges)} shard(s).")
+
+        if options['use_celery']:
+            from diary.tasks import migrate_encryption_key
+            for start_id, end_id in ranges:
+                result = migrate_encryption_key.delay(
+                    target_version=target_version,
+                    batch_size=options['batch_size'],
+                    rows_per_second=options['rate'],
+                    start_id=start_id,
+                    end_id=end_id,
+                    resume=not options['no_resume'],
+                )
+                self.stdout.write(f"  Shard {start_id}-{end_id}: task {result.id}")
+            return
+
+        def _run_shard(bounds):
+            start_id, end_id = bounds
+            rotation = KeyRotationService(
+                target_version=target_version,
+                batch_size=options['batch_size'],
+                rows_per_second=options['rate'],
+                start_id=start_id,
+                end_id=end_id,
+                dry_run=options['dry_run'],
+            )
+            return rotation.run(resume=not options['no_resume'])
+
+        def _run_shard_in_thread(bounds):
+            try:
+                return _run_shard(bounds)
+            finally:
+                connection.close()  # 스레드별 DB 커넥션 정리
+
+        if len(ranges) == 1:
+            results = [_run_shard(ranges[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                results = list(executor.map(_run_shard_in_thread, ranges))
+
+        for (start_id, end_id), state in zip(ranges, results):
+            self.stdout.write(
+                f"  Shard {start_id}-{end_id}: processed={state['processed']} "
+                f"updated={state['updated']} failed={state['failed']}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"\nRotation Complete. Updated: {sum(r['updated'] for r in results)}, "
+            f"Failed: {sum(r['failed'] for r in results)}"
+        ))
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("This was a dry run. No data was changed."))
+
     def _get_fernet(self, key_str):
         import base64
         # Handle 44 char check for URL safe base64
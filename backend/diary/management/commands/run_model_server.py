@@ -0,0 +1,40 @@
+# diary/management/commands/run_model_server.py
+"""
+SentenceTransformer 모델 서버 실행 관리 명령어
+- 임베딩/키워드 모델을 부팅 시 한 번 로드하고 로컬 HTTP 로 encode 제공
+- 웹/Celery 워커는 MODEL_SERVER_URL 로 이 서버를 사용
+
+사용법:
+    python manage.py run_model_server
+    python manage.py run_model_server --host 0.0.0.0 --port 8500
+"""
+from django.core.management.base import BaseCommand
+
+from diary.utils.model_server import ModelServer, get_model_server_config
+
+
+class Command(BaseCommand):
+    help = '임베딩/키워드 모델을 한 번 로드해 공유하는 모델 서버를 실행합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='바인딩 주소')
+        parser.add_argument('--port', type=int, default=8500, help='포트')
+        parser.add_argument('--no-preload', action='store_true', help='첫 요청 시 모델 로드')
+
+    def handle(self, *args, **options):
+        config = get_model_server_config()
+
+        self.stdout.write('모델 로드 중...')
+        server = ModelServer(
+            host=options['host'],
+            port=options['port'],
+            preload=not options['no_preload'],
+            max_batch=config['MAX_BATCH'],
+            max_wait_ms=config['MAX_WAIT_MS'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"모델 서버 시작: http://{options['host']}:{options['port']}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
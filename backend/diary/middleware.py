@@ -2,8 +2,7 @@
 import json
 import logging
 from django.utils.deprecation import MiddlewareMixin
-from django.urls import resolve
-from .models import AuditLog
+from .utils.audit_buffer import get_audit_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -62,8 +61,9 @@ class AuditLogMiddleware(MiddlewareMixin):
             
             # 리소스 식별
             # /api/diaries/123/ -> Diary:123
+            # URL 재해석 없이 디스패치 시 이미 계산된 resolver_match 재사용
             resource = path
-            resolver_match = resolve(path)
+            resolver_match = getattr(request, 'resolver_match', None)
             if resolver_match:
                 view_name = resolver_match.view_name
                 kwargs = resolver_match.kwargs
@@ -75,10 +75,9 @@ class AuditLogMiddleware(MiddlewareMixin):
             # 상태
             status = 'SUCCESS' if 200 <= response.status_code < 400 else 'FAILURE'
             
-            # 비동기로 로그 저장 (DB 부하 고려)
-            # 여기서는 편의상 동기 저장. Celery Task로 위임 권장.
-            AuditLog.objects.create(
-                user=request.user,
+            # 요청 경로에서는 버퍼에 적재만 하고, 저장은 백그라운드 플러셔가 일괄 처리
+            get_audit_buffer().enqueue(
+                user_id=request.user.pk,
                 action=action,
                 resource=resource[:100],
                 ip_address=ip,
@@ -92,6 +91,6 @@ class AuditLogMiddleware(MiddlewareMixin):
             )
             
         except Exception as e:
-            logger.error(f"Failed to create audit log: {e}")
+            logger.error(f"Failed to enqueue audit log: {e}")
             
         return response
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0020_auditlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyEmotionAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('emotion', models.CharField(blank=True, default='', max_length=20, verbose_name='감정')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='일기 수')),
+                ('score_sum', models.IntegerField(default=0, verbose_name='감정 강도 합계')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emotion_aggregates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '일별 감정 집계',
+                'verbose_name_plural': '일별 감정 집계들',
+                'constraints': [models.UniqueConstraint(fields=('user', 'date', 'emotion'), name='emotion_agg_user_date_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+from django.db import migrations
+
+
+# PostgreSQL 전용 검색 인덱스 (SQLite 에서는 건너뜀)
+# diary_search_tsv_idx 표현식은 services/search_service.py 의 SEARCH_VECTOR_SQL 과 동일해야 함
+SEARCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS diary_title_trgm_idx "
+    "ON diary_diary USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS diary_keywords_trgm_idx "
+    "ON diary_diary USING gin (search_keywords gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS diary_search_tsv_idx "
+    "ON diary_diary USING gin (to_tsvector('simple'::regconfig, "
+    "COALESCE(diary_diary.title, '') || ' ' || COALESCE(diary_diary.search_keywords, '')))",
+    "CREATE INDEX IF NOT EXISTS tag_name_trgm_idx "
+    "ON diary_tag USING gin (name gin_trgm_ops)",
+]
+
+DROP_INDEXES = [
+    "DROP INDEX IF EXISTS diary_title_trgm_idx",
+    "DROP INDEX IF EXISTS diary_keywords_trgm_idx",
+    "DROP INDEX IF EXISTS diary_search_tsv_idx",
+    "DROP INDEX IF EXISTS tag_name_trgm_idx",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for sql in SEARCH_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_INDEXES:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0022_diaryembedding_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0023_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaryBlindIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token_hash', models.CharField(max_length=64, verbose_name='토큰 HMAC')),
+                ('key_version', models.IntegerField(default=1, verbose_name='키 버전')),
+                ('diary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blind_index_entries', to='diary.diary')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blind_index_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '블라인드 인덱스',
+                'verbose_name_plural': '블라인드 인덱스들',
+                'indexes': [models.Index(fields=['user', 'token_hash'], name='blind_index_user_token_idx')],
+                'constraints': [models.UniqueConstraint(fields=('diary', 'token_hash'), name='blind_index_diary_token_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0024_diaryblindindex'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userpreference',
+            index=models.Index(condition=models.Q(('daily_reminder_enabled', True), ('push_enabled', True)), fields=['daily_reminder_time', 'last_diary_date'], name='pref_reminder_due_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0025_userpreference_reminder_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('pdf', 'PDF')], default='pdf', max_length=10)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '진행 중'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=10)),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='데이터 지문')),
+                ('total', models.IntegerField(default=0, verbose_name='전체 항목 수')),
+                ('processed', models.IntegerField(default=0, verbose_name='처리한 항목 수')),
+                ('file_path', models.CharField(blank=True, max_length=500, verbose_name='결과 파일 경로')),
+                ('file_size', models.BigIntegerField(default=0, verbose_name='결과 파일 크기')),
+                ('error', models.TextField(blank=True, verbose_name='오류 메시지')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '내보내기 작업',
+                'verbose_name_plural': '내보내기 작업들',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'kind', 'fingerprint'], name='export_job_fingerprint_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0026_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict, verbose_name='체크포인트'),
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='options',
+            field=models.JSONField(blank=True, default=dict, verbose_name='작업 옵션'),
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='source_path',
+            field=models.CharField(blank=True, max_length=500, verbose_name='업로드 파일 경로'),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64, verbose_name='데이터 지문'),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='kind',
+            field=models.CharField(choices=[('pdf', 'PDF'), ('restore', '복원')], default='pdf', max_length=10),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0027_exportjob_restore'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatsession',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='chat_session_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_image_summary(apps, schema_editor):
+    """기존 일기의 이미지 수 / 대표 이미지(가장 최근 이미지) 채우기"""
+    Diary = apps.get_model('diary', 'Diary')
+    DiaryImage = apps.get_model('diary', 'DiaryImage')
+
+    counts = DiaryImage.objects.values('diary_id').annotate(total=Count('id')).order_by()
+    for row in counts.iterator():
+        latest = DiaryImage.objects.filter(diary_id=row['diary_id']).order_by('-created_at', '-id').first()
+        url = latest.uploaded_file.url if latest.uploaded_file else (latest.image_url or '')
+        Diary.objects.filter(pk=row['diary_id']).update(image_count=row['total'], thumbnail_url=url)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diary', '0028_chatsession_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diary',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='이미지 수'),
+        ),
+        migrations.AddField(
+            model_name='diary',
+            name='thumbnail_url',
+            field=models.CharField(blank=True, default='', max_length=500, verbose_name='대표 이미지 URL'),
+        ),
+        migrations.RunPython(fill_image_summary, migrations.RunPython.noop),
+    ]
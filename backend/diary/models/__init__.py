@@ -34,6 +34,15 @@ from .moderation import FlaggedContent, ContentReport
 # 감사 로그 관련
 from .audit_log import AuditLog
 
+# 통계 집계 관련
+from .aggregate import DailyEmotionAggregate
+
+# 검색 인덱스 관련
+from .blind_index import DiaryBlindIndex
+
+# 내보내기 작업 관련
+from .export_job import ExportJob
+
 
 __all__ = [
     # Diary
@@ -62,5 +71,11 @@ __all__ = [
     'ContentReport',
     # Audit Log
     'AuditLog',
+    # Aggregate
+    'DailyEmotionAggregate',
+    # Blind Index
+    'DiaryBlindIndex',
+    # Export Job
+    'ExportJob',
 ]
 
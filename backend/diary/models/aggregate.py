@@ -0,0 +1,39 @@
+# diary/models/aggregate.py
+"""
+통계 집계 모델
+- DailyEmotionAggregate: 사용자별 일별 감정 롤업 (리포트/히트맵/캘린더용)
+"""
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class DailyEmotionAggregate(models.Model):
+    """
+    일별 감정 집계
+    - Diary 생성/수정/삭제 시그널로 증분 갱신 (services/aggregate_service.py)
+    - 리포트/히트맵/캘린더는 일기 행 대신 이 테이블을 조회
+    - emotion='' 은 아직 감정 분석이 되지 않은 일기
+    - date 는 서버 TIME_ZONE 기준 로컬 날짜
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='emotion_aggregates'
+    )
+    date = models.DateField(verbose_name='날짜')
+    emotion = models.CharField(max_length=20, blank=True, default='', verbose_name='감정')
+    count = models.PositiveIntegerField(default=0, verbose_name='일기 수')
+    score_sum = models.IntegerField(default=0, verbose_name='감정 강도 합계')
+
+    class Meta:
+        verbose_name = '일별 감정 집계'
+        verbose_name_plural = '일별 감정 집계들'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'date', 'emotion'],
+                name='emotion_agg_user_date_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.date} {self.emotion or '-'}: {self.count}"
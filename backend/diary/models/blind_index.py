@@ -0,0 +1,45 @@
+# diary/models/blind_index.py
+"""
+검색용 블라인드 인덱스 모델
+- DiaryBlindIndex: (사용자, 토큰 HMAC) -> 일기 (평문 키워드 없이 정확 단어 검색)
+"""
+from django.db import models
+from django.contrib.auth.models import User
+
+from .diary import Diary
+
+
+class DiaryBlindIndex(models.Model):
+    """
+    일기 본문 명사 토큰의 keyed-HMAC 인덱스
+    - token_hash 는 암호화 키에서 파생한 HMAC 키로 계산 (services/blind_index_service.py)
+    - key_version 은 HMAC 키를 파생한 암호화 키 버전 (키 로테이션 시 함께 재계산)
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='blind_index_entries'
+    )
+    diary = models.ForeignKey(
+        Diary,
+        on_delete=models.CASCADE,
+        related_name='blind_index_entries'
+    )
+    token_hash = models.CharField(max_length=64, verbose_name='토큰 HMAC')
+    key_version = models.IntegerField(default=1, verbose_name='키 버전')
+
+    class Meta:
+        verbose_name = '블라인드 인덱스'
+        verbose_name_plural = '블라인드 인덱스들'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['diary', 'token_hash'],
+                name='blind_index_diary_token_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'token_hash'], name='blind_index_user_token_idx'),
+        ]
+
+    def __str__(self):
+        return f"BlindIndex diary={self.diary_id} v{self.key_version}"
@@ -25,6 +25,8 @@ class DiaryEmbedding(models.Model):
     # OpenAI text-embedding-3-small uses 1536 dimensions
     # We will use local model (384) for free implementation
     vector = VectorField(dimensions=384)
+    # 임베딩 입력(제목/본문/감정) 해시 - 변경이 없으면 재임베딩 생략
+    content_hash = models.CharField(max_length=64, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -64,6 +66,10 @@ class ChatSession(models.Model):
         ordering = ['-updated_at']
         verbose_name = '채팅 세션'
         verbose_name_plural = '채팅 세션들'
+        indexes = [
+            # 세션 목록 키셋 페이지네이션 (-created_at, -id)
+            models.Index(fields=['user', '-created_at', '-id'], name='chat_session_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"Chat {self.id}: {self.title[:30]} ({self.user.username})"
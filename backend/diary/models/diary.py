@@ -76,6 +76,10 @@ class Diary(models.Model):
     transcription = models.TextField(null=True, blank=True, verbose_name='음성 변환 텍스트')
     is_transcribing = models.BooleanField(default=False, verbose_name='변환 중 여부')
     
+    # 목록 조회용 이미지 요약 (DiaryImage 저장/삭제 시그널이 갱신, images 조인 없이 표시)
+    image_count = models.PositiveIntegerField(default=0, verbose_name='이미지 수')
+    thumbnail_url = models.CharField(max_length=500, blank=True, default='', verbose_name='대표 이미지 URL')
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -129,9 +133,13 @@ class Diary(models.Model):
             self.is_encrypted = False
 
     def decrypt_content(self) -> str:
-        """암호화된 내용을 복호화하여 반환"""
+        """암호화된 내용을 복호화하여 반환 (프로세스 로컬 캐시 사용)"""
         if not self.is_encrypted:
             return self.content
+        from ..utils.decryption_cache import get_decryption_cache
+        return get_decryption_cache().get_or_decrypt(self, self._decrypt_uncached)
+
+    def _decrypt_uncached(self) -> str:
         from ..encryption import get_encryption_service
         service = get_encryption_service()
         # 저장된 키 버전을 사용하여 복호화
@@ -169,3 +177,13 @@ class DiaryImage(models.Model):
             return self.uploaded_file.url
         return self.image_url
 
+    @classmethod
+    def refresh_diary_summary(cls, diary_id):
+        """일기의 image_count / thumbnail_url(가장 최근 이미지) 갱신"""
+        images = cls.objects.filter(diary_id=diary_id).order_by('-created_at', '-id')
+        latest = images.only('image_url', 'uploaded_file').first()
+        Diary.objects.filter(pk=diary_id).update(
+            image_count=images.count(),
+            thumbnail_url=(latest.url or '') if latest else '',
+        )
+
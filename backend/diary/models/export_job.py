@@ -0,0 +1,70 @@
+# diary/models/export_job.py
+"""
+내보내기 작업 모델
+- ExportJob: 비동기 PDF 내보내기 / 백업 복원 작업의 상태/진행률/결과 파일
+"""
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class ExportJob(models.Model):
+    """
+    비동기 내보내기 작업
+    - fingerprint: (사용자, 일기 최종 수정 시각, 일기 수) 해시
+      같은 fingerprint 의 완료된 결과 파일이 있으면 다시 생성하지 않음
+    - 복원 작업은 업로드 파일(source_path)과 청크별 체크포인트(checkpoint)로 재개 가능
+    """
+    class Kind(models.TextChoices):
+        PDF = 'pdf', 'PDF'
+        RESTORE = 'restore', '복원'
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', '대기'
+        RUNNING = 'running', '진행 중'
+        COMPLETED = 'completed', '완료'
+        FAILED = 'failed', '실패'
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='export_jobs'
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices, default=Kind.PDF)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    fingerprint = models.CharField(max_length=64, blank=True, verbose_name='데이터 지문')
+
+    total = models.IntegerField(default=0, verbose_name='전체 항목 수')
+    processed = models.IntegerField(default=0, verbose_name='처리한 항목 수')
+
+    file_path = models.CharField(max_length=500, blank=True, verbose_name='결과 파일 경로')
+    file_size = models.BigIntegerField(default=0, verbose_name='결과 파일 크기')
+    error = models.TextField(blank=True, verbose_name='오류 메시지')
+
+    # 복원 작업
+    source_path = models.CharField(max_length=500, blank=True, verbose_name='업로드 파일 경로')
+    options = models.JSONField(default=dict, blank=True, verbose_name='작업 옵션')
+    checkpoint = models.JSONField(default=dict, blank=True, verbose_name='체크포인트')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = '내보내기 작업'
+        verbose_name_plural = '내보내기 작업들'
+        indexes = [
+            models.Index(fields=['user', 'kind', 'fingerprint'], name='export_job_fingerprint_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.kind} export ({self.status})"
+
+    @property
+    def progress(self) -> int:
+        """진행률 (0~100)"""
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.total:
+            return 0
+        return min(99, int(self.processed * 100 / self.total))
@@ -5,6 +5,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from ..utils.preference_cache import get_memoized, memoize
+
 
 class UserPreference(models.Model):
     """
@@ -84,12 +86,23 @@ class UserPreference(models.Model):
     class Meta:
         verbose_name = '사용자 설정'
         verbose_name_plural = '사용자 설정들'
+        indexes = [
+            # 리마인더 대상 조회: 알림 시간 구간 + 마지막 작성일 (알림 켠 사용자만)
+            models.Index(
+                fields=['daily_reminder_time', 'last_diary_date'],
+                name='pref_reminder_due_idx',
+                condition=models.Q(daily_reminder_enabled=True, push_enabled=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username}의 설정"
     
     @classmethod
     def get_or_create_for_user(cls, user):
-        """사용자의 설정을 가져오거나 기본값으로 생성"""
-        preference, created = cls.objects.get_or_create(user=user)
+        """사용자의 설정을 가져오거나 기본값으로 생성 (요청 안에서는 한 번만 조회)"""
+        preference = get_memoized(user.pk)
+        if preference is None:
+            preference, created = cls.objects.get_or_create(user=user)
+            memoize(preference)
         return preference
@@ -1,6 +1,164 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    키셋(커서) 페이지네이션 - 기본 정렬 (-created_at, -id)
+    - 마지막 항목의 (created_at, id) 를 커서로 넘겨 다음 페이지를 WHERE 조건으로 조회
+      (COUNT(*) / OFFSET 없이 (user, -created_at) 인덱스를 그대로 사용, 깊은 페이지도 일정한 비용)
+    - 키셋 방식은 cursor / page_size 파라미터가 있을 때만 사용 (opt-in)
+    - 그 밖에는 기존 페이지 번호 방식 (count/previous 포함): page 파라미터가 있거나 없거나,
+      쿼리셋 정렬이 ordering 과 다른 경우(관련도 정렬 등)
+
+    응답: {'next': 다음 페이지 URL 또는 None, 'results': [...]}
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    ordering = ('-created_at', '-id')
+
+    invalid_cursor_message = '잘못된 커서입니다.'
+
+    def __init__(self, ordering=None, page_size=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        if page_size is not None:
+            self.page_size = page_size
+        self.page_mode = None
+        self.next_cursor = None
+
+    def is_requested(self, request) -> bool:
+        """페이지네이션 파라미터(cursor/page_size/page)가 있는지 (없으면 목록 전체를 주는 API 용)"""
+        params = request.query_params
+        return any(
+            name in params
+            for name in (self.cursor_query_param, self.page_size_query_param, self.page_query_param)
+        )
+
+    # ------------------------------------------------------------------
+    # 커서 인코딩
+    # ------------------------------------------------------------------
+    @staticmethod
+    def encode_cursor(values) -> str:
+        raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def keyset_filter(self, values):
+        """
+        (a, b) 이후 항목 조건: a < va OR (a = va AND b < vb)  (내림차순 기준, 오름차순 필드는 >)
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def _value(obj, field):
+        for attr in field.lstrip('-').split('__'):
+            obj = getattr(obj, attr)
+        return obj
+
+    # ------------------------------------------------------------------
+    # DRF 인터페이스
+    # ------------------------------------------------------------------
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def _use_page_mode(self, queryset, request) -> bool:
+        params = request.query_params
+        if self.page_query_param in params:
+            return True
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return True
+        order_by = tuple(queryset.query.order_by) or tuple(queryset.model._meta.ordering)
+        return order_by != self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if self._use_page_mode(queryset, request):
+            self.page_mode = StandardResultsSetPagination()
+            self.page_mode.page_size = self.page_size
+            self.page_mode.page_size_query_param = self.page_size_query_param
+            self.page_mode.max_page_size = self.max_page_size
+            return self.page_mode.paginate_queryset(queryset, request, view)
+
+        self.page_mode = None
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(cursor)))
+
+        # 다음 페이지 존재 여부는 한 건 더 읽어서 판단 (COUNT 생략)
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = (
+            self.encode_cursor([self._value(rows[-1], field) for field in self.ordering])
+            if self.has_next else None
+        )
+        return rows
+
+    def get_next_link(self):
+        if self.page_mode is not None:
+            return self.page_mode.get_next_link()
+        if not self.next_cursor:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        if self.page_mode is not None:
+            return self.page_mode.get_paginated_response(data)
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class AdminKeysetPagination(KeysetPagination):
+    """관리자 목록용 (기존 limit 파라미터를 페이지 크기로 사용)"""
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
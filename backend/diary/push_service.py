@@ -1,15 +1,41 @@
 """
 푸시 알림 서비스
 - Expo Push Notification API 연동
+- PushDispatcher: 대량 발송 (커넥션 풀 Session + gzip + 동시 배치 + 초당 발송 제한)
+- 발송 후 푸시 영수증(receipt)을 확인하여 DeviceNotRegistered 토큰 비활성화
 """
+import gzip
+import json
 import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
 import requests
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from django.conf import settings
 from .models import PushToken
 
 logger = logging.getLogger('diary')
 
 EXPO_PUSH_URL = 'https://exp.host/--/api/v2/push/send'
+EXPO_RECEIPTS_URL = 'https://exp.host/--/api/v2/push/getReceipts'
+
+DEFAULT_PUSH_DISPATCH = {
+    'SEND_URL': EXPO_PUSH_URL,
+    'RECEIPTS_URL': EXPO_RECEIPTS_URL,
+    'ACCESS_TOKEN': '',       # Expo 액세스 토큰 (Enhanced Security 사용 시)
+    'BATCH_SIZE': 100,        # Expo 요청당 최대 메시지 수
+    'CONCURRENCY': 6,         # 동시에 진행하는 배치 요청 수
+    'RATE_LIMIT': 600,        # 초당 최대 메시지 수 (Expo 프로젝트 한도)
+    'TIMEOUT': 30,
+    'RECEIPT_DELAY': 15 * 60, # 영수증 확인까지 대기 (초)
+}
+
+# 영수증 조회 요청당 최대 id 수 (Expo 제한)
+RECEIPT_CHUNK_SIZE = 1000
 
 
 def send_push_notification(
@@ -74,7 +100,7 @@ def send_push_to_user(
     data: Optional[dict] = None,
 ) -> List[dict]:
     """
-    특정 사용자의 모든 활성 기기에 푸시 알림 전송
+    특정 사용자의 모든 활성 기기에 푸시 알림 전송 (기기 수와 관계없이 한 번의 요청)
     
     Args:
         user_id: 사용자 ID
@@ -83,19 +109,30 @@ def send_push_to_user(
         data: 추가 데이터 (선택)
     
     Returns:
-        각 기기별 전송 결과 목록
+        각 기기별 전송 결과(ticket) 목록
     """
-    tokens = PushToken.objects.filter(
+    tokens = list(PushToken.objects.filter(
         user_id=user_id,
         is_active=True
-    ).values_list('token', flat=True)
+    ).values_list('token', flat=True))
+    
+    if not tokens:
+        return []
+    if len(tokens) == 1:
+        return [send_push_notification(tokens[0], title, body, data)]
     
-    results = []
-    for token in tokens:
-        result = send_push_notification(token, title, body, data)
-        results.append(result)
+    dispatcher = get_push_dispatcher()
+    messages = [build_message(token, title, body, data) for token in tokens]
+    try:
+        tickets = dispatcher.send_batch(messages)
+    except requests.RequestException as e:
+        logger.error(f"Push to user {user_id} failed: {e}")
+        return [{'error': str(e)} for _ in tokens]
     
-    return results
+    dispatcher.deactivate_tokens(
+        token for token, ticket in zip(tokens, tickets) if _is_device_not_registered(ticket)
+    )
+    return tickets
 
 
 def send_bulk_push(
@@ -116,56 +153,278 @@ def send_bulk_push(
     Returns:
         전송된 알림 개수
     """
-    tokens = list(PushToken.objects.filter(
+    tokens = PushToken.objects.filter(
         user_id__in=user_ids,
         is_active=True
-    ).values_list('token', flat=True))
+    ).values_list('token', flat=True)
     
-    if not tokens:
-        return 0
-    
-    # Expo는 최대 100개씩 배치 전송 권장
-    batch_size = 100
-    sent_count = 0
-    
-    for i in range(0, len(tokens), batch_size):
-        batch = tokens[i:i + batch_size]
-        messages = [
-            {
-                'to': token,
-                'title': title,
-                'body': body,
-                'sound': 'default',
-                'data': data or {},
-            }
-            for token in batch
-        ]
+    result = dispatch_push(tokens.iterator(chunk_size=2000), title, body, data)
+    return result['sent']
+
+
+def dispatch_push(
+    tokens: Iterable[str],
+    title: str,
+    body: str,
+    data: Optional[dict] = None,
+    check_receipts: bool = True,
+) -> dict:
+    """
+    토큰 스트림 전체에 같은 알림을 발송하고 영수증 확인 태스크 예약
+    
+    Args:
+        tokens: Expo Push Token 이터러블 (queryset.iterator() 권장)
+        check_receipts: True 면 RECEIPT_DELAY 후 check_push_receipts 태스크 예약
+    
+    Returns:
+        dict: sent, failed, deactivated, receipts_key
+    """
+    dispatcher = get_push_dispatcher()
+    result = dispatcher.dispatch(build_message(token, title, body, data) for token in tokens)
+    
+    result['receipts_key'] = None
+    if check_receipts and result['ticket_tokens']:
+        from django.core.cache import cache
+        from .tasks import check_push_receipts
+        
+        # 티켓 목록이 클 수 있으므로 태스크 인자 대신 캐시에 보관
+        key = f"push_receipts:{uuid.uuid4().hex}"
+        cache.set(key, result['ticket_tokens'], dispatcher.receipt_delay + 24 * 60 * 60)
+        check_push_receipts.apply_async((key,), countdown=dispatcher.receipt_delay)
+        result['receipts_key'] = key
+    
+    result.pop('ticket_tokens')
+    logger.info(
+        f"Push dispatch finished: sent={result['sent']} failed={result['failed']} "
+        f"deactivated={result['deactivated']}"
+    )
+    return result
+
+
+def build_message(token: str, title: str, body: str, data: Optional[dict] = None) -> dict:
+    return {
+        'to': token,
+        'title': title,
+        'body': body,
+        'sound': 'default',
+        'data': data or {},
+    }
+
+
+def _is_device_not_registered(ticket_or_receipt: dict) -> bool:
+    return (
+        ticket_or_receipt.get('status') == 'error'
+        and (ticket_or_receipt.get('details') or {}).get('error') == 'DeviceNotRegistered'
+    )
+
+
+class _RateLimiter:
+    """초당 메시지 수 제한 (토큰 버킷, 스레드 안전)"""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, amount: int):
+        if not self.rate:
+            return
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait_seconds = (amount - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+class PushDispatcher:
+    """
+    Expo 대량 발송기
+    - requests.Session 커넥션 풀 재사용 (배치마다 TLS 핸드셰이크 하지 않음)
+    - gzip 요청 본문
+    - 최대 CONCURRENCY 개 배치를 동시에 전송, 초당 RATE_LIMIT 메시지로 제한
+    """
+    
+    def __init__(self, send_url=EXPO_PUSH_URL, receipts_url=EXPO_RECEIPTS_URL, access_token='',
+                 batch_size=100, concurrency=6, rate_limit=600, timeout=30, receipt_delay=900):
+        self.send_url = send_url
+        self.receipts_url = receipts_url
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.receipt_delay = receipt_delay
+        self._limiter = _RateLimiter(rate_limit)
+        
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.concurrency,
+            max_retries=requests.adapters.Retry(
+                total=3,
+                read=0,  # 응답 대기 중 타임아웃은 이미 전송됐을 수 있으므로 재시도하지 않음
+                backoff_factor=0.5,
+                # Expo 는 중복 전송을 걸러주지 않음: 처리 전 거절이 확실한 응답만 재시도,
+                # 나머지 실패는 영수증 확인에 맡김
+                status_forcelist=(429, 503),
+                allowed_methods=None,  # POST 재시도 허용 (연결 실패 / 429 / 503 에 한함)
+            ),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Content-Encoding': 'gzip',
+        })
+        if access_token:
+            self.session.headers['Authorization'] = f'Bearer {access_token}'
+    
+    def _post(self, url, payload):
+        body = gzip.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        response = self.session.post(url, data=body, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def send_batch(self, messages: List[dict]) -> List[dict]:
+        """메시지 배치 하나 전송 -> 메시지 순서대로 ticket 목록"""
+        self._limiter.acquire(len(messages))
+        return self._post(self.send_url, messages).get('data', [])
+    
+    def dispatch(self, messages: Iterable[dict]) -> dict:
+        """
+        메시지 스트림을 배치로 나눠 동시 전송
+        (메모리에는 진행 중인 배치만 유지)
+        
+        Returns:
+            dict: sent, failed, deactivated, ticket_tokens({ticket_id: token})
+        """
+        result = {'sent': 0, 'failed': 0, 'deactivated': 0, 'ticket_tokens': {}}
+        not_registered = []
+        messages = iter(messages)
+        
+        def _collect(future, batch):
+            try:
+                tickets = future.result()
+            except requests.RequestException as e:
+                logger.error(f"Push batch of {len(batch)} failed: {e}")
+                result['failed'] += len(batch)
+                return
+            for message, ticket in zip(batch, tickets):
+                if ticket.get('status') == 'ok':
+                    result['sent'] += 1
+                    if ticket.get('id'):
+                        result['ticket_tokens'][ticket['id']] = message['to']
+                else:
+                    result['failed'] += 1
+                    if _is_device_not_registered(ticket):
+                        not_registered.append(message['to'])
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='push') as executor:
+            in_flight = {}
+            while True:
+                batch = list(islice(messages, self.batch_size))
+                if batch:
+                    in_flight[executor.submit(self.send_batch, batch)] = batch
+                if not batch or len(in_flight) >= self.concurrency:
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _collect(future, in_flight.pop(future))
+                    if not batch and not in_flight:
+                        break
+        
+        result['deactivated'] = self.deactivate_tokens(not_registered)
+        return result
+    
+    def fetch_receipts(self, ticket_ids: List[str]) -> dict:
+        """{ticket_id: receipt} (RECEIPT_CHUNK_SIZE 단위 조회)"""
+        receipts = {}
+        ticket_ids = list(ticket_ids)
+        for i in range(0, len(ticket_ids), RECEIPT_CHUNK_SIZE):
+            chunk = ticket_ids[i:i + RECEIPT_CHUNK_SIZE]
+            try:
+                receipts.update(self._post(self.receipts_url, {'ids': chunk}).get('data', {}))
+            except requests.RequestException as e:
+                logger.error(f"Push receipt fetch failed for {len(chunk)} tickets: {e}")
+        return receipts
+    
+    def process_receipts(self, ticket_tokens: dict) -> dict:
+        """
+        영수증 확인 후 DeviceNotRegistered 토큰 일괄 비활성화
         
-        try:
-            response = requests.post(
-                EXPO_PUSH_URL,
-                json=messages,
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                },
-                timeout=30,
-            )
-            response.raise_for_status()
-            sent_count += len(batch)
-        except requests.RequestException as e:
-            logger.error(f"Bulk push failed: {e}")
-    
-    return sent_count
+        Returns:
+            dict: checked, errors, deactivated
+        """
+        receipts = self.fetch_receipts(ticket_tokens.keys())
+        errors = [tid for tid, receipt in receipts.items() if receipt.get('status') == 'error']
+        dead_tokens = [
+            ticket_tokens[tid] for tid in errors
+            if _is_device_not_registered(receipts[tid]) and tid in ticket_tokens
+        ]
+        return {
+            'checked': len(receipts),
+            'errors': len(errors),
+            'deactivated': self.deactivate_tokens(dead_tokens),
+        }
+    
+    @staticmethod
+    def deactivate_tokens(tokens: Iterable[str]) -> int:
+        """토큰 일괄 비활성화 (1000개 단위 UPDATE)"""
+        tokens = list(dict.fromkeys(tokens))
+        updated = 0
+        for i in range(0, len(tokens), 1000):
+            updated += PushToken.objects.filter(
+                token__in=tokens[i:i + 1000], is_active=True
+            ).update(is_active=False)
+        if updated:
+            logger.info(f"Deactivated {updated} unregistered push tokens")
+        return updated
+
+
+_push_dispatcher = None
+_push_dispatcher_lock = threading.Lock()
+
+
+def get_push_dispatcher() -> PushDispatcher:
+    """프로세스 전역 발송기 (Session 커넥션 풀 재사용)"""
+    global _push_dispatcher
+    if _push_dispatcher is None:
+        with _push_dispatcher_lock:
+            if _push_dispatcher is None:
+                config = {**DEFAULT_PUSH_DISPATCH, **getattr(settings, 'PUSH_DISPATCH', {})}
+                _push_dispatcher = PushDispatcher(
+                    send_url=config['SEND_URL'],
+                    receipts_url=config['RECEIPTS_URL'],
+                    access_token=config['ACCESS_TOKEN'],
+                    batch_size=config['BATCH_SIZE'],
+                    concurrency=config['CONCURRENCY'],
+                    rate_limit=config['RATE_LIMIT'],
+                    timeout=config['TIMEOUT'],
+                    receipt_delay=config['RECEIPT_DELAY'],
+                )
+    return _push_dispatcher
 
 
 # 편의 함수들
+REMINDER_TITLE = '📝 오늘의 일기'
+REMINDER_BODY = '오늘 하루는 어땠나요? 감정을 기록해보세요.'
+
+
 def notify_diary_reminder(user_id: int):
-    """일기 리마인더 알림"""
+    """일기 리마인더 알림 (대량 발송은 services/reminder_service.py)"""
     return send_push_to_user(
         user_id,
-        title='📝 오늘의 일기',
-        body='오늘 하루는 어땠나요? 감정을 기록해보세요.',
+        title=REMINDER_TITLE,
+        body=REMINDER_BODY,
         data={'type': 'diary_reminder'},
     )
 
@@ -2,7 +2,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
-from .models import Diary, DiaryImage, Tag, DiaryTag, UserPreference, DiaryTemplate
+from .cache_utils import TAGS_BUCKET, schedule_cache_invalidation
+from .models import Diary, DiaryImage, Tag, DiaryTag, UserPreference, DiaryTemplate, ExportJob
+from .services.blind_index_service import BlindIndexService, stores_plaintext_keywords
 
 
 
@@ -208,17 +210,19 @@ class DiarySerializer(serializers.ModelSerializer):
         instance = Diary(**validated_data)
         instance.encrypt_content(plain_content)
         
-        # [Option A] 검색용 키워드 추출
-        try:
-            from .services.analysis_service import NounExtractor
-            extractor = NounExtractor()
-            instance.search_keywords = extractor.extract_nouns(plain_content)
-        except Exception as e:
-            # 키워드 추출 실패해도 일기 저장은 진행
-            import logging
-            logging.getLogger('diary').error(f"Keyword extraction failed: {e}")
+        # [Option A] 검색용 키워드 추출 (평문 저장은 설정 시 / 암호화 키가 없을 때만, 기본은 블라인드 인덱스)
+        if stores_plaintext_keywords():
+            try:
+                from .services.analysis_service import NounExtractor
+                extractor = NounExtractor()
+                instance.search_keywords = extractor.extract_nouns(plain_content)
+            except Exception as e:
+                # 키워드 추출 실패해도 일기 저장은 진행
+                import logging
+                logging.getLogger('diary').error(f"Keyword extraction failed: {e}")
         
         instance.save()
+        self._update_blind_index(instance, plain_content)
         
         # 태그 연결
         self._update_tags(instance, tag_ids)
@@ -243,14 +247,16 @@ class DiarySerializer(serializers.ModelSerializer):
             instance.encrypt_content(plain_content)
             content_changed = True
             
-            # [Option A] 검색용 키워드 재추출
-            try:
-                from .services.analysis_service import NounExtractor
-                extractor = NounExtractor()
-                instance.search_keywords = extractor.extract_nouns(plain_content)
-            except Exception as e:
-                import logging
-                logging.getLogger('diary').error(f"Keyword extraction failed (update): {e}")
+            # [Option A] 검색용 키워드 재추출 (평문 저장을 끈 경우 이전 평문 키워드 제거)
+            instance.search_keywords = None
+            if stores_plaintext_keywords():
+                try:
+                    from .services.analysis_service import NounExtractor
+                    extractor = NounExtractor()
+                    instance.search_keywords = extractor.extract_nouns(plain_content)
+                except Exception as e:
+                    import logging
+                    logging.getLogger('diary').error(f"Keyword extraction failed (update): {e}")
         
         for attr, value in validated_data.items():
             if attr == 'version':
@@ -271,6 +277,8 @@ class DiarySerializer(serializers.ModelSerializer):
         # 버전 증가
         instance.version += 1
         instance.save()
+        if content_changed:
+            self._update_blind_index(instance, plain_content)
         
         # 태그 업데이트 (tag_ids가 전달된 경우에만)
         if tag_ids is not None:
@@ -287,6 +295,14 @@ class DiarySerializer(serializers.ModelSerializer):
         
         return instance
     
+    def _update_blind_index(self, diary, plain_content):
+        """본문 블라인드 인덱스 갱신 (실패해도 저장은 유지)"""
+        try:
+            BlindIndexService.index_diary(diary, plain_content)
+        except Exception as e:
+            import logging
+            logging.getLogger('diary').error(f"Blind index update failed: {e}")
+
     def _update_tags(self, diary, tag_ids):
         """일기의 태그를 업데이트"""
         # 기존 태그 연결 삭제
@@ -301,6 +317,87 @@ class DiarySerializer(serializers.ModelSerializer):
             except Tag.DoesNotExist:
                 pass  # 잘못된 태그 ID는 무시
 
+        # 태그 연결 변경: 인기 태그 캐시 무효화
+        schedule_cache_invalidation(user.id, {TAGS_BUCKET})
+
+
+class DiaryListSerializer(serializers.ModelSerializer):
+    """
+    일기 목록용 경량 Serializer (읽기 전용)
+    - 본문 / 음성 / 회고 필드 제외, 이미지는 비정규화된 image_count / thumbnail_url 만
+    - fields 로 응답 필드 선택 (?fields=id,title,preview)
+    - preview(본문 앞부분)는 요청한 경우에만 본문을 읽어 복호화
+    """
+    PREVIEW_LENGTH = 120
+
+    # 기본 응답에서 제외하는 선택 필드
+    OPTIONAL_FIELDS = ('preview',)
+
+    # 응답 필드 -> 조회할 컬럼 (나머지는 같은 이름의 컬럼)
+    FIELD_COLUMNS = {
+        'emotion_emoji': ('emotion',),
+        'preview': ('content', 'is_encrypted', 'encryption_version', 'version'),  # version: 복호화 캐시 키
+        'tags': (),
+    }
+
+    emotion_emoji = serializers.SerializerMethodField()
+    tags = serializers.SerializerMethodField()
+    preview = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Diary
+        fields = [
+            'id', 'title', 'emotion', 'emotion_score', 'emotion_emoji',
+            'location_name', 'latitude', 'longitude',
+            'tags', 'image_count', 'thumbnail_url', 'preview',
+            'created_at', 'updated_at', 'version'
+        ]
+        read_only_fields = fields
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in set(self.fields) - set(self.select_fields(fields)):
+            self.fields.pop(name)
+
+    @classmethod
+    def select_fields(cls, requested=None):
+        """
+        응답 필드 목록 (requested: 쉼표 구분 문자열 또는 목록, 알 수 없는 필드는 무시)
+        id 는 항상 포함
+        """
+        if isinstance(requested, str):
+            requested = [name.strip() for name in requested.split(',')]
+        if not requested:
+            return [name for name in cls.Meta.fields if name not in cls.OPTIONAL_FIELDS]
+        selected = [name for name in cls.Meta.fields if name in requested]
+        return selected if 'id' in selected else ['id'] + selected
+
+    @classmethod
+    def columns_for(cls, fields):
+        """선택한 필드에 필요한 컬럼 (QuerySet.only 인자, 커서 페이지네이션용 created_at 포함)"""
+        columns = {'id', 'created_at'}
+        for name in fields:
+            columns.update(cls.FIELD_COLUMNS.get(name, (name,)))
+        return sorted(columns)
+
+    def get_emotion_emoji(self, obj):
+        """감정 이모지 반환"""
+        return obj.get_emotion_display_emoji() if obj.emotion else None
+
+    def get_tags(self, obj):
+        """일기에 연결된 태그 목록 (prefetch 된 diary_tags__tag 사용)"""
+        return [
+            {'id': dt.tag.id, 'name': dt.tag.name, 'color': dt.tag.color}
+            for dt in obj.diary_tags.all()
+        ]
+
+    def get_preview(self, obj):
+        """본문 앞부분 (PREVIEW_LENGTH 자)"""
+        content = obj.decrypt_content() or ''
+        if len(content) <= self.PREVIEW_LENGTH:
+            return content
+        return content[:self.PREVIEW_LENGTH] + '...'
+
 
 class DiaryTemplateSerializer(serializers.ModelSerializer):
     """
@@ -339,3 +436,36 @@ class DiaryTemplateSerializer(serializers.ModelSerializer):
         validated_data['user'] = self.context['request'].user
         validated_data['template_type'] = 'user'  # 사용자가 생성하면 항상 user 타입
         return super().create(validated_data)
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """
+    내보내기 작업 Serializer (진행률 폴링용)
+    """
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+    restored = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'kind', 'status', 'progress', 'processed', 'total',
+            'file_size', 'error', 'download_url', 'restored',
+            'created_at', 'completed_at'
+        ]
+        read_only_fields = fields
+    
+    def get_download_url(self, obj):
+        """완료된 작업의 다운로드 URL"""
+        if obj.status != ExportJob.Status.COMPLETED or obj.kind != ExportJob.Kind.PDF:
+            return None
+        from django.urls import reverse
+        url = reverse('export-pdf-job-download', kwargs={'job_id': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_restored(self, obj):
+        """복원 작업의 항목별 복원 수 (진행 중이면 지금까지의 수)"""
+        if obj.kind != ExportJob.Kind.RESTORE:
+            return None
+        return (obj.checkpoint or {}).get('counts')
@@ -0,0 +1,158 @@
+"""
+일별 감정 집계 서비스
+- DailyEmotionAggregate 증분 갱신 (Diary 시그널에서 호출)
+- 전체 재계산 (rebuild_aggregates 명령어)
+- 리포트/히트맵/캘린더용 조회 헬퍼
+"""
+import logging
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import DailyEmotionAggregate, Diary
+
+logger = logging.getLogger(__name__)
+
+
+class EmotionAggregateService:
+
+    @staticmethod
+    def snapshot(user_id, created_at, emotion, emotion_score):
+        """
+        집계에 영향을 주는 값만 뽑은 스냅샷
+        (user_id, 로컬 날짜, 감정, 감정 강도)
+        """
+        if created_at is None:
+            return None
+        return (
+            user_id,
+            timezone.localdate(created_at),
+            emotion or '',
+            int(emotion_score or 0),
+        )
+
+    @classmethod
+    def snapshot_for(cls, diary):
+        return cls.snapshot(diary.user_id, diary.created_at, diary.emotion, diary.emotion_score)
+
+    @staticmethod
+    def apply_delta(snapshot, delta):
+        """스냅샷에 해당하는 집계 행에 delta(+1/-1) 반영"""
+        if snapshot is None:
+            return
+        user_id, date, emotion, score = snapshot
+        lookup = {'user_id': user_id, 'date': date, 'emotion': emotion}
+        changes = {
+            'count': F('count') + delta,
+            'score_sum': F('score_sum') + score * delta,
+        }
+
+        updated = DailyEmotionAggregate.objects.filter(**lookup).update(**changes)
+        if not updated and delta > 0:
+            try:
+                with transaction.atomic():
+                    DailyEmotionAggregate.objects.create(
+                        **lookup, count=delta, score_sum=score * delta
+                    )
+            except IntegrityError:
+                # 동시 생성 경합: 다른 요청이 먼저 만든 행에 반영
+                DailyEmotionAggregate.objects.filter(**lookup).update(**changes)
+        elif delta < 0:
+            DailyEmotionAggregate.objects.filter(**lookup, count__lte=0).delete()
+
+    @classmethod
+    def diary_changed(cls, old, new):
+        """Diary 저장 전/후 스냅샷 차이를 집계에 반영"""
+        if old == new:
+            return
+        cls.apply_delta(old, -1)
+        cls.apply_delta(new, +1)
+
+    @staticmethod
+    def rebuild(user_id=None) -> int:
+        """
+        일기 테이블에서 집계를 다시 계산
+
+        Args:
+            user_id: 지정 시 해당 사용자만 재계산
+
+        Returns:
+            int: 생성된 집계 행 수
+        """
+        diaries = Diary.objects.all()
+        aggregates = DailyEmotionAggregate.objects.all()
+        if user_id is not None:
+            diaries = diaries.filter(user_id=user_id)
+            aggregates = aggregates.filter(user_id=user_id)
+
+        # TruncDate 는 현재 TIME_ZONE 기준으로 날짜를 자름
+        rows = (
+            diaries
+            .annotate(day=TruncDate('created_at'))
+            .values('user_id', 'day', 'emotion')
+            .annotate(total=Count('id'), score_total=Sum('emotion_score'))
+            .order_by()
+        )
+
+        merged = defaultdict(lambda: [0, 0])
+        for row in rows:
+            key = (row['user_id'], row['day'], row['emotion'] or '')
+            merged[key][0] += row['total']
+            merged[key][1] += row['score_total'] or 0
+
+        objs = [
+            DailyEmotionAggregate(
+                user_id=uid, date=day, emotion=emotion, count=count, score_sum=score_sum
+            )
+            for (uid, day, emotion), (count, score_sum) in merged.items()
+        ]
+
+        with transaction.atomic():
+            aggregates.delete()
+            DailyEmotionAggregate.objects.bulk_create(objs, batch_size=1000)
+
+        logger.info(f"Rebuilt {len(objs)} emotion aggregate rows (user={user_id or 'all'})")
+        return len(objs)
+
+    # ------------------------------------------------------------------
+    # 조회 헬퍼
+    # ------------------------------------------------------------------
+    @staticmethod
+    def get_rows(user, start_date=None, end_date=None, year=None, month=None):
+        """기간 내 집계 행 (date, emotion, count, score_sum) 목록"""
+        qs = DailyEmotionAggregate.objects.filter(user=user)
+        if year is not None:
+            qs = qs.filter(date__year=year)
+        if month is not None:
+            qs = qs.filter(date__month=month)
+        if start_date is not None:
+            qs = qs.filter(date__gte=start_date)
+        if end_date is not None:
+            qs = qs.filter(date__lte=end_date)
+        return list(qs.order_by('date').values('date', 'emotion', 'count', 'score_sum'))
+
+    @staticmethod
+    def group_by_date(rows):
+        """
+        집계 행을 날짜별로 묶어 반환
+        {date: {'count': int, 'emotions': {emotion: count}}}
+        """
+        days = {}
+        for row in rows:
+            day = days.setdefault(row['date'], {'count': 0, 'emotions': {}})
+            day['count'] += row['count']
+            if row['emotion']:
+                day['emotions'][row['emotion']] = (
+                    day['emotions'].get(row['emotion'], 0) + row['count']
+                )
+        return days
+
+    @staticmethod
+    def dominant(emotion_counts):
+        """가장 많이 기록된 감정 (없으면 None)"""
+        if not emotion_counts:
+            return None
+        return max(emotion_counts, key=emotion_counts.get)
@@ -1,8 +1,12 @@
 import logging
 import json
-from google import genai
+import re
+
+import numpy as np
 from django.conf import settings
 
+from .gemini_client import get_gemini_client
+
 logger = logging.getLogger(__name__)
 
 # Global variable for singleton model
@@ -11,8 +15,13 @@ _SENTENCE_TRANSFORMER_MODEL = None
 def get_sentence_transformer_model():
     """
     SentenceTransformer 모델을 싱글톤으로 로드하여 반환
+    (MODEL_SERVER['URL'] 설정 시 공유 모델 서버 클라이언트 반환)
     """
     global _SENTENCE_TRANSFORMER_MODEL
+    if _SENTENCE_TRANSFORMER_MODEL is None:
+        # 공유 모델 서버가 설정되어 있으면 프로세스 내 로드 생략
+        from ..utils.model_server import get_remote_encoder
+        _SENTENCE_TRANSFORMER_MODEL = get_remote_encoder('keyword')
     if _SENTENCE_TRANSFORMER_MODEL is None:
         try:
             from sentence_transformers import SentenceTransformer
@@ -27,12 +36,30 @@ def get_sentence_transformer_model():
             
     return _SENTENCE_TRANSFORMER_MODEL
 
+# CountVectorizer 기본 토큰 패턴과 동일 (2글자 이상 단어)
+_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def ngram_candidates(text, ngram_range=(1, 2)):
+    """텍스트의 n-gram 후보 (등장 순서 유지, 중복 제거)"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    low, high = ngram_range
+    candidates = {}
+    for n in range(low, high + 1):
+        for i in range(len(tokens) - n + 1):
+            candidates.setdefault(' '.join(tokens[i:i + n]), None)
+    return list(candidates)
+
+
 class KeywordExtractor:
     """
     KeyBERT 방식의 키워드 추출기 (Singleton Model 사용)
     - 문서를 n-gram으로 분할
     - 문서와 n-gram의 임베딩 유사도 계산
     - 가장 유사도가 높은 키워드(구) 추출
+
+    n-gram 임베딩은 프로세스 캐시(get_ngram_cache)에 보관하여 재사용하고,
+    여러 문서를 처리할 때는 문서 + 캐시에 없는 후보를 한 번의 encode 로 계산합니다.
     """
     
     def __init__(self):
@@ -43,37 +70,55 @@ class KeywordExtractor:
         """
         텍스트에서 핵심 키워드/구 추출
         """
+        return self.extract_keywords_batch([text], top_n, keyphrase_ngram_range)[0]
+
+    def extract_keywords_batch(self, texts, top_n=5, keyphrase_ngram_range=(1, 2)):
+        """
+        여러 텍스트의 키워드를 한 번에 추출
+
+        Returns:
+            list[list[str]]: 입력 순서대로 키워드 목록 (유사도 내림차순)
+        """
+        results = [[] for _ in texts]
         model = get_sentence_transformer_model()
-        
-        if not model or not text or len(text) < 10:
-            return []
-            
+        if not model:
+            return results
+
+        docs = [
+            (i, text, ngram_candidates(text, keyphrase_ngram_range))
+            for i, text in enumerate(texts)
+            if text and len(text) >= 10
+        ]
+        docs = [doc for doc in docs if doc[2]]
+        if not docs:
+            return results
+
         try:
-            from sklearn.feature_extraction.text import CountVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
-            
-            # 1. n-gram 후보 생성
-            count = CountVectorizer(ngram_range=keyphrase_ngram_range, stop_words=None).fit([text])
-            candidates = count.get_feature_names_out()
+            from ..utils.ngram_cache import get_ngram_cache, normalize_rows
 
-            # 2. 문서 및 후보 임베딩
-            doc_embedding = model.encode([text])
-            candidate_embeddings = model.encode(candidates)
+            cache = get_ngram_cache()
+            all_candidates = list(dict.fromkeys(c for _, _, cands in docs for c in cands))
+            cached, missing = cache.get_many(all_candidates)
+
+            # 문서 + 캐시에 없는 후보를 한 번에 encode
+            vectors = normalize_rows(model.encode([text for _, text, _ in docs] + missing))
+            doc_vectors = vectors[:len(docs)]
+            new_vectors = vectors[len(docs):]
+            cache.put_many(missing, new_vectors)
+            cached.update(zip(missing, new_vectors))
+
+            for (index, _, candidates), doc_vector in zip(docs, doc_vectors):
+                matrix = np.stack([cached[c] for c in candidates])
+                scores = matrix @ doc_vector
+                k = min(top_n, len(candidates))
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+                results[index] = [candidates[j] for j in top]
+            return results
 
-            # 3. 코사인 유사도 계산
-            distances = cosine_similarity(doc_embedding, candidate_embeddings)
-            
-            # 4. 상위 n개 키워드 추출
-            keywords = []
-            for index in distances.argsort()[0][-top_n:]:
-                keywords.append(candidates[index])
-            
-            # 유사도가 높은 순으로 정렬 (argsort는 오름차순이므로 뒤집음)
-            return keywords[::-1]
-            
         except Exception as e:
             logger.error(f"Keyword extraction failed: {e}")
-            return []
+            return results
 
 
 class NounExtractor:
@@ -137,7 +182,15 @@ class TemplateGenerator:
     @ai_retry_policy
     def _call_gemini(self, client, model, prompt):
         """Gemini API 호출 (재시도 적용)"""
-        return client.models.generate_content(
+        return client.generate_content(
+            model=model,
+            contents=prompt
+        )
+
+    @ai_retry_policy
+    async def _call_gemini_async(self, client, model, prompt):
+        """[Async] Gemini API 호출 (재시도 적용, 이벤트 루프를 막지 않음)"""
+        return await client.agenerate_content(
             model=model,
             contents=prompt
         )
@@ -171,7 +224,7 @@ class TemplateGenerator:
         }.get(style, '적당한 길이로 작성하세요.')
         
         try:
-            client = genai.Client(api_key=settings.GEMINI_API_KEY)
+            client = get_gemini_client()
             
             prompt = f"""당신은 일기 템플릿을 만드는 전문가입니다.
 사용자가 원하는 주제에 맞는 일기 템플릿을 만들어주세요.
@@ -252,7 +305,7 @@ class TemplateGenerator:
         }.get(style, '적당한 길이로 작성하세요.')
         
         try:
-            client = genai.Client(api_key=settings.GEMINI_API_KEY)
+            client = get_gemini_client()
             
             prompt = f"""당신은 일기 템플릿을 만드는 전문가입니다.
 사용자가 원하는 주제에 맞는 일기 템플릿을 만들어주세요.
@@ -275,7 +328,7 @@ class TemplateGenerator:
 - 한국어로 작성하세요"""
 
             # Async call (Retry 적용)
-            response = self._call_gemini(client, settings.GEMINI_TEXT_MODEL, prompt)
+            response = await self._call_gemini_async(client, settings.GEMINI_TEXT_MODEL, prompt)
             content = response.text.strip()
             
             # JSON 파싱 로직 재사용
@@ -360,20 +413,21 @@ class EmotionTrendAnalyzer:
                 'total_entries': int,         # 총 일기 수
             }
         """
-        from datetime import date, timedelta
-        from ..models import Diary
+        from datetime import timedelta
+        from collections import defaultdict
+        from django.utils import timezone
+        from .aggregate_service import EmotionAggregateService
         
-        end_date = date.today()
+        end_date = timezone.localdate()
         start_date = end_date - timedelta(days=days)
         
-        diaries = Diary.objects.filter(
-            user=user,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
-            emotion__isnull=False
-        ).order_by('-created_at')
+        # 일별 감정 집계에서 조회
+        rows = [
+            row for row in EmotionAggregateService.get_rows(user, start_date=start_date, end_date=end_date)
+            if row['emotion']
+        ]
         
-        if not diaries.exists():
+        if not rows:
             return {
                 'consecutive_negative': 0,
                 'needs_alert': False,
@@ -383,25 +437,30 @@ class EmotionTrendAnalyzer:
                 'total_entries': 0,
             }
         
-        emotions = [d.emotion for d in diaries]
-        total_entries = len(emotions)
+        emotion_counts = defaultdict(int)
+        days_emotions = defaultdict(dict)
+        for row in rows:
+            emotion_counts[row['emotion']] += row['count']
+            days_emotions[row['date']][row['emotion']] = row['count']
+        total_entries = sum(emotion_counts.values())
         
-        # 연속 부정적 감정 계산
+        # 연속 부정적 감정 계산 (최근 날짜부터, 하루의 모든 감정이 부정일 때만 이어짐)
         consecutive_negative = 0
-        for emotion in emotions:
-            if emotion in cls.NEGATIVE_EMOTIONS:
-                consecutive_negative += 1
+        for day in sorted(days_emotions, reverse=True):
+            day_emotions = days_emotions[day]
+            if all(emotion in cls.NEGATIVE_EMOTIONS for emotion in day_emotions):
+                consecutive_negative += sum(day_emotions.values())
             else:
                 break  # 연속이 끊기면 중단
         
         # 우세 부정 감정 계산
         negative_counts = {}
         positive_count = 0
-        for emotion in emotions:
+        for emotion, count in emotion_counts.items():
             if emotion in cls.NEGATIVE_EMOTIONS:
-                negative_counts[emotion] = negative_counts.get(emotion, 0) + 1
+                negative_counts[emotion] = count
             elif emotion in cls.POSITIVE_EMOTIONS:
-                positive_count += 1
+                positive_count += count
         
         dominant_negative = max(negative_counts, key=negative_counts.get) if negative_counts else None
         positive_ratio = positive_count / total_entries if total_entries > 0 else 0.0
@@ -431,20 +490,16 @@ class EmotionTrendAnalyzer:
         """
         주간 감정 요약 (시간대별/요일별 통계 포함)
         """
-        from datetime import date, timedelta
+        from datetime import timedelta
         from collections import defaultdict
+        from django.utils import timezone
         from ..models import Diary
+        from .aggregate_service import EmotionAggregateService
         
-        end_date = date.today()
+        end_date = timezone.localdate()
         start_date = end_date - timedelta(days=7)
         
-        diaries = Diary.objects.filter(
-            user=user,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        )
-        
-        # 요일별 감정 분포
+        # 요일별 감정 분포 (일별 집계에서 계산)
         weekday_emotions = defaultdict(list)
         # 시간대별 감정 분포 (0-6: 새벽, 6-12: 아침, 12-18: 오후, 18-24: 저녁)
         hour_emotions = defaultdict(list)
@@ -457,16 +512,26 @@ class EmotionTrendAnalyzer:
             (18, 24): '저녁',
         }
         
-        for diary in diaries:
-            if diary.emotion:
-                weekday = diary.created_at.weekday()
-                weekday_emotions[WEEKDAY_NAMES[weekday]].append(diary.emotion)
-                
-                hour = diary.created_at.hour
-                for (start, end), name in HOUR_RANGES.items():
-                    if start <= hour < end:
-                        hour_emotions[name].append(diary.emotion)
-                        break
+        total_diaries = 0
+        for row in EmotionAggregateService.get_rows(user, start_date=start_date, end_date=end_date):
+            total_diaries += row['count']
+            if row['emotion']:
+                weekday_emotions[WEEKDAY_NAMES[row['date'].weekday()]].extend([row['emotion']] * row['count'])
+        
+        # 시간대는 일별 집계에 없으므로 필요한 두 컬럼만 조회
+        hourly_rows = Diary.objects.filter(
+            user=user,
+            created_at__date__gte=start_date,
+            created_at__date__lte=end_date,
+            emotion__isnull=False
+        ).values_list('created_at', 'emotion')
+        
+        for created_at, emotion in hourly_rows:
+            hour = timezone.localtime(created_at).hour
+            for (start, end), name in HOUR_RANGES.items():
+                if start <= hour < end:
+                    hour_emotions[name].append(emotion)
+                    break
         
         # 각 그룹별 우세 감정 계산
         def get_dominant(emotions_list):
@@ -478,5 +543,5 @@ class EmotionTrendAnalyzer:
         return {
             'weekday_patterns': {day: get_dominant(emotions) for day, emotions in weekday_emotions.items()},
             'hourly_patterns': {period: get_dominant(emotions) for period, emotions in hour_emotions.items()},
-            'total_diaries': diaries.count(),
+            'total_diaries': total_diaries,
         }
@@ -0,0 +1,161 @@
+"""
+블라인드 인덱스 서비스
+- 저장 시 본문 명사 토큰을 keyed-HMAC 으로 해시하여 DiaryBlindIndex 에 기록
+  (평문 키워드는 저장하지 않음, 사용자 id 를 HMAC 입력에 포함해 사용자 간 해시 비교 불가)
+- 검색은 검색어 토큰의 해시로 인덱스만 조회 (복호화 없음, AND/OR)
+- 수정 시 기존/새 해시 차이만 삭제/추가 (증분)
+- 키 로테이션 시 새 키 버전으로 재계산 (KeyRotationService 에서 호출)
+- 본문 키워드 검색(DiarySearchService, ChatService)은 keyword_match 조건을 사용
+"""
+import hmac
+import hashlib
+import logging
+import re
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from ..encryption import get_encryption_service
+from ..models import DiaryBlindIndex
+
+logger = logging.getLogger('diary')
+
+HMAC_PURPOSE = 'diary-blind-index-v1'
+
+# 형태소 분석기가 없을 때 사용하는 단어 패턴 (2글자 이상)
+_WORD_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+DEFAULT_BLIND_INDEX = {
+    'STORE_PLAINTEXT_KEYWORDS': False,  # search_keywords 평문 저장 여부 (하위 호환용)
+    'LEGACY_KEYWORD_FALLBACK': True,    # 인덱스 백필 전 일기를 위해 search_keywords 도 검색
+}
+
+
+def get_blind_index_config() -> dict:
+    return {**DEFAULT_BLIND_INDEX, **getattr(settings, 'BLIND_INDEX', {})}
+
+
+def stores_plaintext_keywords() -> bool:
+    """
+    search_keywords 평문을 저장해야 하는지
+    암호화 키가 없으면 HMAC 키도 없어 인덱스를 만들 수 없으므로 평문 키워드로 검색
+    """
+    return get_blind_index_config()['STORE_PLAINTEXT_KEYWORDS'] or not get_encryption_service().is_enabled
+
+
+class BlindIndexService:
+    """일기 본문 블라인드 인덱스 관리 및 검색"""
+
+    @staticmethod
+    def tokenize(text: str) -> set:
+        """명사 토큰 추출 (Kiwi 미설치 시 단어 단위)"""
+        from .analysis_service import NounExtractor
+
+        if not text:
+            return set()
+        nouns = NounExtractor().extract_nouns(text)
+        words = nouns.split() if nouns else _WORD_PATTERN.findall(text)
+        return {w.lower() for w in words if w}
+
+    @staticmethod
+    def _hmac_key(version):
+        return get_encryption_service().derive_key(HMAC_PURPOSE, version)
+
+    @classmethod
+    def hash_tokens(cls, user_id, tokens, version=None) -> dict:
+        """{token: token_hash}"""
+        key = cls._hmac_key(version)
+        return {
+            token: hmac.new(key, f"{user_id}:{token}".encode('utf-8'), hashlib.sha256).hexdigest()
+            for token in tokens
+        }
+
+    @classmethod
+    def index_diary(cls, diary, plain_content, version=None):
+        """일기 한 개의 인덱스 갱신"""
+        cls.index_many([(diary, plain_content)], version=version)
+
+    @classmethod
+    def index_many(cls, items, version=None):
+        """
+        여러 일기의 인덱스를 한 번에 갱신 (변경된 해시만 삭제/추가)
+
+        Args:
+            items: [(diary, 평문 본문), ...]
+            version: HMAC 키를 파생할 암호화 키 버전 (기본: 최신)
+        """
+        service = get_encryption_service()
+        if not service.is_enabled:
+            return
+        version = version or service.latest_version
+        items = [(diary, plain) for diary, plain in items if diary.pk]
+        if not items:
+            return
+
+        existing = {}
+        for entry_id, diary_id, token_hash in DiaryBlindIndex.objects.filter(
+            diary_id__in=[diary.pk for diary, _ in items]
+        ).values_list('id', 'diary_id', 'token_hash'):
+            existing.setdefault(diary_id, {})[token_hash] = entry_id
+
+        to_delete, to_create = [], []
+        for diary, plain in items:
+            wanted = set(cls.hash_tokens(diary.user_id, cls.tokenize(plain), version).values())
+            current = existing.get(diary.pk, {})
+            to_delete.extend(entry_id for token_hash, entry_id in current.items() if token_hash not in wanted)
+            to_create.extend(
+                DiaryBlindIndex(user_id=diary.user_id, diary_id=diary.pk, token_hash=token_hash, key_version=version)
+                for token_hash in wanted - current.keys()
+            )
+
+        if to_delete:
+            DiaryBlindIndex.objects.filter(id__in=to_delete).delete()
+        if to_create:
+            DiaryBlindIndex.objects.bulk_create(to_create, ignore_conflicts=True)
+
+    @classmethod
+    def matching_diary_ids(cls, user, query: str, mode='and'):
+        """
+        검색어 토큰과 일치하는 일기 id 서브쿼리
+
+        Args:
+            mode: 'and' (모든 토큰 포함) / 'or' (하나 이상 포함)
+        """
+        tokens = cls.tokenize(query)
+        if not tokens:
+            return DiaryBlindIndex.objects.none().values('diary_id')
+
+        # 로테이션 중에는 일기마다 키 버전이 다를 수 있으므로 모든 버전의 해시로 조회
+        hashes = set()
+        for version in get_encryption_service().versions:
+            hashes.update(cls.hash_tokens(user.pk, tokens, version).values())
+
+        entries = DiaryBlindIndex.objects.filter(user=user, token_hash__in=hashes)
+        if mode == 'or':
+            return entries.values('diary_id')
+        # 한 일기의 토큰은 모두 같은 키 버전이므로 일치한 해시 수 == 토큰 수 이면 AND 만족
+        return (
+            entries.values('diary_id')
+            .annotate(matched=Count('token_hash'))
+            .filter(matched__gte=len(tokens))
+            .values('diary_id')
+        )
+
+    @classmethod
+    def keyword_match(cls, user, query: str, mode='and', prefix=''):
+        """
+        본문 키워드 일치 조건 (블라인드 인덱스 + 평문 키워드 폴백)
+
+        Args:
+            prefix: 다른 모델에서 일기를 참조할 때의 경로 (예: 'diary__')
+        """
+        condition = Q(**{f"{prefix}id__in": cls.matching_diary_ids(user, query, mode)})
+        if get_blind_index_config()['LEGACY_KEYWORD_FALLBACK'] or stores_plaintext_keywords():
+            # 인덱스가 아직 없는 이전 일기 / 평문 키워드를 저장하는 설정
+            condition |= Q(**{f"{prefix}search_keywords__icontains": query})
+        return condition
+
+    @classmethod
+    def search(cls, queryset, user, query: str, mode='and'):
+        """queryset 을 블라인드 인덱스 검색 결과로 제한"""
+        return queryset.filter(cls.keyword_match(user, query, mode))
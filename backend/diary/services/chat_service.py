@@ -1,8 +1,10 @@
-from google import genai
 from sentence_transformers import SentenceTransformer
 from django.conf import settings
 from django.db import connection
 from diary.models import DiaryEmbedding, Diary
+from .blind_index_service import BlindIndexService
+from .gemini_client import get_gemini_client
+from ..utils.ai_cache import get_ai_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,9 +22,15 @@ def is_pgvector_available():
 VECTOR_SEARCH_ENABLED = is_pgvector_available()
 
 def get_embedding_model():
+    """
+    임베딩 모델 반환
+    - MODEL_SERVER['URL'] 설정 시 공유 모델 서버 클라이언트 (프로세스에 모델 미로드)
+    - 미설정 시 프로세스 내 싱글톤 로드
+    """
     global EMBEDDING_MODEL
     if EMBEDDING_MODEL is None:
-        EMBEDDING_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
+        from diary.utils.model_server import get_remote_encoder
+        EMBEDDING_MODEL = get_remote_encoder('embedding') or SentenceTransformer('all-MiniLM-L6-v2')
     return EMBEDDING_MODEL
 
 
@@ -35,14 +43,9 @@ class ChatService:
 
     @staticmethod
     def update_diary_embedding(diary):
-        """일기 저장 시 임베딩 업데이트"""
-        text = f"Title: {diary.title}\nContent: {diary.content}\nEmotion: {diary.emotion or 'None'}"
-        vector = ChatService.get_embedding(text)
-        
-        DiaryEmbedding.objects.update_or_create(
-            diary=diary,
-            defaults={'vector': vector}
-        )
+        """일기 임베딩 즉시 업데이트 (배치 경로: EmbeddingService.enqueue)"""
+        from .embedding_service import EmbeddingService
+        EmbeddingService.embed_diaries([diary.id])
         logger.info(f"Updated embedding for diary {diary.id}")
 
     @staticmethod
@@ -81,11 +84,11 @@ class ChatService:
         if keywords:
             keyword_q = Q()
             for k in keywords:
-                # 제목이나 태그(자동생성된 키워드), [New] 검색 전용 키워드 필드에 키워드가 포함된 경우
-                # content는 암호화되어 있어 검색 불가 -> search_keywords 활용 (Option A)
+                # 제목이나 태그(자동생성된 키워드), 본문에 키워드가 포함된 경우
+                # content는 암호화되어 있어 검색 불가 -> 본문 명사 블라인드 인덱스 활용 (Option A)
                 keyword_q |= Q(diary__title__icontains=k) | \
                              Q(diary__diary_tags__tag__name__icontains=k) | \
-                             Q(diary__search_keywords__icontains=k)
+                             BlindIndexService.keyword_match(user, k, prefix='diary__')
             
             keyword_candidate_ids = list(DiaryEmbedding.objects.filter(diary__user=user) \
                 .filter(keyword_q) \
@@ -176,7 +179,7 @@ class ChatService:
         
         keyword_q = Q()
         for k in keywords:
-            keyword_q |= Q(title__icontains=k) | Q(search_keywords__icontains=k)
+            keyword_q |= Q(title__icontains=k) | BlindIndexService.keyword_match(user, k)
         
         diaries = Diary.objects.filter(user=user).filter(keyword_q).order_by('-created_at')[:limit]
         return list(diaries)
@@ -207,8 +210,8 @@ class ChatService:
         return list(summaries)
 
     @staticmethod
-    def generate_chat_response(user, message, history=[]):
-        """RAG 기반 답변 생성 (Gemini) - Streaming & Hybrid"""
+    def build_chat_prompt(user, message, history=()):
+        """RAG 컨텍스트(요약 + 일기 + 대화 히스토리)를 포함한 채팅 프롬프트 구성 (DB 조회)"""
         
         # 1. 계층적 검색 (요약본 검색) - Broad Context
         related_summaries = ChatService.search_summaries(user, message, limit=2)
@@ -261,19 +264,23 @@ class ChatService:
         
         {chat_history_text}
         """
+        return system_prompt.strip() + f"\n\nCurrent Question: {message}"
+
+    @staticmethod
+    def generate_chat_response(user, message, history=[]):
+        """RAG 기반 답변 생성 (Gemini) - Streaming & Hybrid"""
+        prompt = ChatService.build_chat_prompt(user, message, history)
         
         # 3. Gemini API 호출 (Streaming)
         if not settings.GEMINI_API_KEY:
             yield "Gemini API Key is not configured."
             return
 
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        
         try:
-            # stream=True 활성화
-            response = client.models.generate_content_stream(
+            # stream=True 활성화 (게이트웨이 슬롯은 스트림이 끝날 때까지 유지)
+            response = get_gemini_client().generate_content_stream(
                 model=settings.GEMINI_TEXT_MODEL,
-                contents=system_prompt.strip() + f"\n\nCurrent Question: {message}"
+                contents=prompt
             )
             
             for chunk in response:
@@ -284,32 +291,64 @@ class ChatService:
             logger.error(f"Gemini API Error: {e}")
             yield "Sorry, I'm having trouble thinking right now."
 
+    @staticmethod
+    async def generate_chat_response_async(user, message, history=[]):
+        """[Async] RAG 기반 답변 스트리밍 (ASGI 에서 스레드를 점유하지 않음)"""
+        from asgiref.sync import sync_to_async
+        prompt = await sync_to_async(ChatService.build_chat_prompt)(user, message, history)
+
+        if not settings.GEMINI_API_KEY:
+            yield "Gemini API Key is not configured."
+            return
+
+        try:
+            async for chunk in get_gemini_client().agenerate_content_stream(
+                model=settings.GEMINI_TEXT_MODEL,
+                contents=prompt
+            ):
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error(f"Gemini API Error: {e}")
+            yield "Sorry, I'm having trouble thinking right now."
+
+    # 회고 질문 프롬프트를 바꾸면 올려서 이전 캐시 결과를 무효화
+    REFLECTION_PROMPT_VERSION = 1
+
     @staticmethod
     def generate_reflection_question(diary):
-        """일기 내용을 토대로 회고 질문 생성"""
+        """일기 내용을 토대로 회고 질문 생성 (같은 제목/내용/감정은 AI 결과 캐시 재사용)"""
         if not settings.GEMINI_API_KEY:
             return None
 
         # 프롬프트 구성
         # System instructions included directly to avoid dependency on global configs for now
+        entry = f"""Title: {diary.title}
+Content: {diary.decrypt_content()}
+Emotion: {diary.emotion}"""
         prompt = f"""
 You are an empathetic counselor. Read the following diary entry and ask one single, deep question that helps the writer reflect on their emotions or situation.
 The question should be warm, short (under 2 sentences), and in Korean.
 
 Diary:
-Title: {diary.title}
-Content: {diary.content}
-Emotion: {diary.emotion}
+{entry}
 
 Question:
 """
-        try:
-            client = genai.Client(api_key=settings.GEMINI_API_KEY)
-            response = client.models.generate_content(
+
+        def _generate():
+            response = get_gemini_client().generate_content(
                 model=settings.GEMINI_TEXT_MODEL,
                 contents=prompt
             )
             return response.text.strip()
+
+        try:
+            question, _ = get_ai_cache().get_or_compute(
+                'reflection', settings.GEMINI_TEXT_MODEL, ChatService.REFLECTION_PROMPT_VERSION, entry, _generate,
+            )
+            return question
         except Exception as e:
             logger.error(f"Reflection generation failed: {e}")
             return None
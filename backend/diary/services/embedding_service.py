@@ -0,0 +1,136 @@
+"""
+일기 임베딩 배치 서비스
+- 저장 시 일기 id 만 Redis 대기열(set)에 등록 (웹 워커에서는 모델을 로드하지 않음)
+- 임베딩 전용 Celery 워커가 최대 MAX_WAIT_MS 동안 모은 id 를 MAX_ITEMS 단위로
+  한 번의 model.encode(list) 호출로 처리
+- 제목/본문/감정 해시가 이전 임베딩과 같으면 건너뜀
+- DiaryEmbedding 에 bulk upsert
+"""
+import hashlib
+import logging
+
+import numpy as np
+from django.conf import settings
+
+from ..encryption import decrypt_diaries
+from ..models import Diary, DiaryEmbedding
+
+logger = logging.getLogger('diary')
+
+DEFAULT_EMBEDDING_BATCH = {
+    'ENABLED': True,
+    'MAX_ITEMS': 64,      # 한 번에 encode 할 최대 일기 수
+    'MAX_WAIT_MS': 500,   # 첫 등록 후 배치를 모으는 시간
+}
+
+PENDING_KEY = 'embedding:pending'
+SCHEDULED_KEY = 'embedding:scheduled'
+
+
+def get_batch_config() -> dict:
+    return {**DEFAULT_EMBEDDING_BATCH, **getattr(settings, 'EMBEDDING_BATCH', {})}
+
+
+class EmbeddingService:
+    """일기 임베딩 생성/대기열 관리"""
+
+    @staticmethod
+    def build_text(title, content, emotion) -> str:
+        """임베딩 입력 텍스트 (복호화된 본문 기준)"""
+        return f"Title: {title}\nContent: {content}\nEmotion: {emotion or 'None'}"
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _redis():
+        import redis
+        return redis.from_url(settings.REDIS_URL)
+
+    @classmethod
+    def enqueue(cls, diary_id):
+        """
+        임베딩 대상 일기 등록
+        - 배치 모드가 꺼져 있으면(테스트 등) 즉시 동기 처리
+        - Redis 를 쓸 수 없으면 단건 태스크로 대체
+        """
+        config = get_batch_config()
+        if not config['ENABLED']:
+            return cls.embed_diaries([diary_id])
+
+        from ..tasks import embed_diaries_task, embed_pending_diaries
+
+        try:
+            client = cls._redis()
+            client.sadd(PENDING_KEY, diary_id)
+            # 디바운스: 대기 중인 배치 태스크가 없을 때만 예약
+            if client.set(SCHEDULED_KEY, 1, nx=True, px=config['MAX_WAIT_MS'] * 10):
+                embed_pending_diaries.apply_async(countdown=config['MAX_WAIT_MS'] / 1000)
+        except Exception as e:
+            logger.warning(f"[Embedding] Redis unavailable, embedding diary {diary_id} individually: {e}")
+            embed_diaries_task.delay([diary_id])
+
+    @classmethod
+    def drain_pending(cls) -> int:
+        """
+        대기열의 id 를 MAX_ITEMS 단위로 꺼내 임베딩
+        Returns: 새로 임베딩한 일기 수
+        """
+        config = get_batch_config()
+        client = cls._redis()
+        # 새 등록이 다음 배치를 예약할 수 있도록 먼저 플래그 해제
+        client.delete(SCHEDULED_KEY)
+
+        embedded = 0
+        while True:
+            raw_ids = client.spop(PENDING_KEY, config['MAX_ITEMS'])
+            if not raw_ids:
+                break
+            embedded += cls.embed_diaries([int(i) for i in raw_ids])
+        return embedded
+
+    @classmethod
+    def embed_diaries(cls, diary_ids) -> int:
+        """
+        일기 여러 개를 한 번의 encode 호출로 임베딩하고 bulk upsert
+        Returns: 새로 임베딩한 일기 수 (해시가 같아 건너뛴 일기 제외)
+        """
+        from .chat_service import get_embedding_model
+
+        diaries = list(
+            Diary.objects.filter(id__in=diary_ids)
+            .only('id', 'title', 'content', 'emotion', 'is_encrypted', 'encryption_version')
+        )
+        if not diaries:
+            return 0
+
+        existing = dict(
+            DiaryEmbedding.objects.filter(diary_id__in=[d.id for d in diaries])
+            .values_list('diary_id', 'content_hash')
+        )
+
+        targets = []
+        for diary, plain in zip(diaries, decrypt_diaries(diaries)):
+            text = cls.build_text(diary.title, plain, diary.emotion)
+            digest = cls.content_hash(text)
+            if existing.get(diary.id) != digest:
+                targets.append((diary, text, digest))
+
+        if not targets:
+            return 0
+
+        model = get_embedding_model()
+        vectors = np.atleast_2d(model.encode([text for _, text, _ in targets]))
+
+        DiaryEmbedding.objects.bulk_create(
+            [
+                DiaryEmbedding(diary=diary, vector=vector.tolist(), content_hash=digest)
+                for (diary, _, digest), vector in zip(targets, vectors)
+            ],
+            update_conflicts=True,
+            unique_fields=['diary'],
+            update_fields=['vector', 'content_hash', 'updated_at'],
+        )
+        logger.info(f"[Embedding] Embedded {len(targets)} diaries ({len(diaries) - len(targets)} unchanged)")
+        return len(targets)
@@ -0,0 +1,291 @@
+"""
+비동기 PDF 내보내기 작업 서비스
+- 요청 시 ExportJob 생성 후 pdf 큐의 Celery 태스크가 생성
+- 일기를 청크 단위로 조회/복호화하며 페이지를 그려 임시 파일에 저장 (완료 시 원자적 교체)
+- 진행률(processed/total)을 청크마다 기록하여 폴링으로 확인
+- 결과 파일은 (사용자, 일기 최종 수정 시각, 일기 수) fingerprint 로 재사용
+- cleanup 으로 오래되었거나 새 결과로 대체된 파일 삭제
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from ..models import Diary, ExportJob
+from .export_service import ExportService
+
+logger = logging.getLogger('diary')
+
+DEFAULT_EXPORT_JOB = {
+    'DIR': '',             # 결과 파일 디렉토리 (비어 있으면 MEDIA_ROOT/exports/jobs)
+    'CHUNK_SIZE': 50,      # 한 번에 조회/복호화/렌더링하는 일기 수
+    'STALE_SECONDS': 1800, # 이 시간 동안 진행이 없는 작업은 새로 생성
+}
+
+
+def get_export_job_config() -> dict:
+    config = {**DEFAULT_EXPORT_JOB, **getattr(settings, 'EXPORT_JOB', {})}
+    if not config['DIR']:
+        config['DIR'] = os.path.join(settings.MEDIA_ROOT, 'exports', 'jobs')
+    return config
+
+
+class ChunkedPdfRenderer:
+    """
+    reportlab 캔버스에 일기를 순서대로 그리는 렌더러
+    일기 목록 전체의 flowable 을 한 번에 만들지 않고 add_diary 호출마다 그려서 버림
+    """
+
+    def __init__(self, path, total=None):
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import cm
+        from reportlab.pdfgen import canvas
+
+        self.page_size = A4
+        self.margin = 2 * cm
+        self.canvas = canvas.Canvas(path, pagesize=A4, pageCompression=1)
+        font_name = ExportService.register_pdf_font()
+
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'CustomTitle', parent=styles['Heading1'], fontName=font_name,
+            fontSize=24, spaceAfter=30, alignment=1,
+        )
+        self.diary_title_style = ParagraphStyle(
+            'DiaryTitle', parent=styles['Heading2'], fontName=font_name,
+            fontSize=14, spaceBefore=20, spaceAfter=10,
+        )
+        self.content_style = ParagraphStyle(
+            'Content', parent=styles['Normal'], fontName=font_name,
+            fontSize=11, spaceAfter=10, leading=16,
+        )
+        self.date_style = ParagraphStyle(
+            'DateStyle', parent=styles['Normal'], fontName=font_name,
+            fontSize=9, textColor=colors.gray, spaceAfter=5,
+        )
+        self._frame = self._new_frame()
+        self._add_cover(total)
+
+    def _new_frame(self):
+        from reportlab.platypus import Frame
+
+        width, height = self.page_size
+        return Frame(self.margin, self.margin, width - 2 * self.margin, height - 2 * self.margin)
+
+    def _draw(self, flowables):
+        """flowable 을 현재 프레임에 배치 (넘치면 분할 후 새 페이지)"""
+        flowables = list(flowables)
+        while flowables:
+            flowable = flowables.pop(0)
+            if self._frame.add(flowable, self.canvas, trySplit=0):
+                continue
+            parts = self._frame.split(flowable, self.canvas)
+            if parts and self._frame.add(parts[0], self.canvas, trySplit=0):
+                flowables[0:0] = parts[1:]
+            elif self._frame._atTop:
+                # 빈 페이지에도 들어가지 않고 나눌 수도 없는 항목
+                logger.warning("[PDF] Skipping flowable that does not fit on a page")
+                continue
+            else:
+                flowables.insert(0, flowable)
+            self.canvas.showPage()
+            self._frame = self._new_frame()
+
+    def _add_cover(self, total):
+        from reportlab.lib.units import cm
+        from reportlab.platypus import Paragraph, Spacer
+
+        summary = f"Exported on {timezone.now().strftime('%Y-%m-%d %H:%M')}"
+        if total is not None:
+            summary += f" | Total: {total} entries"
+        self._draw([
+            Paragraph("My Diary Export", self.title_style),
+            Paragraph(summary, self.date_style),
+            Spacer(1, 1 * cm),
+        ])
+
+    def add_diary(self, diary, content):
+        from reportlab.lib.units import cm
+        from reportlab.platypus import Paragraph, Spacer
+
+        self._draw([
+            Paragraph(ExportService.pdf_meta_line(diary), self.date_style),
+            Paragraph(ExportService.escape_pdf_text(diary.title), self.diary_title_style),
+            Paragraph(ExportService.escape_pdf_text(content).replace('\n', '<br/>'), self.content_style),
+            Spacer(1, 0.5 * cm),
+        ])
+
+    def save(self):
+        self.canvas.save()
+
+
+def render_diaries_pdf(path, pairs, total=None, progress_callback=None, chunk_size=50):
+    """
+    (diary, 본문) 이터러블을 PDF 파일로 렌더링
+
+    Returns:
+        int: 렌더링한 일기 수
+    """
+    renderer = ChunkedPdfRenderer(path, total)
+    count = 0
+    for diary, content in pairs:
+        renderer.add_diary(diary, content)
+        count += 1
+        if progress_callback and count % chunk_size == 0:
+            progress_callback(count)
+    renderer.save()
+    return count
+
+
+class ExportJobService:
+    """PDF 내보내기 작업 생성/실행/정리"""
+
+    @staticmethod
+    def fingerprint(user):
+        """
+        (사용자, 일기 최종 수정 시각, 최종 감정 분석 시각, 일기 수) 해시
+        감정 분석 결과는 updated_at 을 바꾸지 않고 저장되지만 PDF 에 감정이 표시되므로 함께 포함
+
+        Returns:
+            (fingerprint, 일기 수)
+        """
+        stats = Diary.objects.filter(user=user).aggregate(
+            last=Max('updated_at'), analyzed=Max('emotion_analyzed_at'), count=Count('id'),
+        )
+        last, analyzed = (stats[name].isoformat() if stats[name] else '-' for name in ('last', 'analyzed'))
+        raw = f"{user.pk}:{last}:{analyzed}:{stats['count']}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest(), stats['count']
+
+    @classmethod
+    def request_pdf(cls, user):
+        """
+        PDF 내보내기 요청
+
+        같은 fingerprint 의 완료된 결과 파일이 있으면 그 작업을, 진행 중인 작업이 있으면
+        그 작업을 돌려주고, 없으면 새 작업을 만들어 pdf 큐에 넣습니다.
+
+        Returns:
+            (job, created)
+        """
+        from ..tasks import generate_pdf_export
+
+        fingerprint, count = cls.fingerprint(user)
+        stale_before = timezone.now() - timedelta(seconds=get_export_job_config()['STALE_SECONDS'])
+        for job in ExportJob.objects.filter(
+            user=user, kind=ExportJob.Kind.PDF, fingerprint=fingerprint,
+        ).exclude(status=ExportJob.Status.FAILED):
+            if job.status == ExportJob.Status.COMPLETED and os.path.exists(job.file_path):
+                return job, False
+            if job.status in (ExportJob.Status.PENDING, ExportJob.Status.RUNNING) \
+                    and job.updated_at >= stale_before:
+                return job, False
+
+        job = ExportJob.objects.create(
+            user=user, kind=ExportJob.Kind.PDF, fingerprint=fingerprint, total=count,
+        )
+        transaction.on_commit(lambda: generate_pdf_export.delay(job.id))
+        return job, True
+
+    @staticmethod
+    def artifact_path(job):
+        return os.path.join(get_export_job_config()['DIR'], f"{job.user_id}_{job.fingerprint}.pdf")
+
+    @classmethod
+    def run_pdf_job(cls, job_id):
+        """작업 실행 (Celery 워커)"""
+        job = ExportJob.objects.select_related('user').get(pk=job_id)
+        if job.status == ExportJob.Status.COMPLETED:
+            return job
+
+        config = get_export_job_config()
+        total = Diary.objects.filter(user=job.user).count()
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.Status.RUNNING, total=total, processed=0, updated_at=timezone.now(),
+        )
+
+        path = cls.artifact_path(job)
+        tmp_path = f"{path}.{job.pk}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        def _report(processed):
+            ExportJob.objects.filter(pk=job.pk).update(processed=processed, updated_at=timezone.now())
+
+        try:
+            count = render_diaries_pdf(
+                tmp_path,
+                ExportService.iter_diaries(job.user, config['CHUNK_SIZE'], ordering=('-created_at', '-id')),
+                total=total,
+                progress_callback=_report,
+                chunk_size=config['CHUNK_SIZE'],
+            )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"[ExportJob] PDF job {job.pk} failed: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            ExportJob.objects.filter(pk=job.pk).update(
+                status=ExportJob.Status.FAILED, error=str(e)[:1000], updated_at=timezone.now(),
+            )
+            raise
+
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.Status.COMPLETED,
+            processed=count,
+            file_path=path,
+            file_size=os.path.getsize(path),
+            completed_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        logger.info(f"[ExportJob] PDF job {job.pk} rendered {count} diaries")
+        job.refresh_from_db()
+        return job
+
+    @classmethod
+    def cleanup(cls, days=7) -> int:
+        """
+        오래된 작업과 새 결과로 대체된 결과 파일 삭제
+
+        Returns:
+            int: 삭제한 작업 수
+        """
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = set(ExportJob.objects.filter(created_at__lt=cutoff).values_list('id', flat=True))
+
+        # 사용자별 가장 최근 완료 작업만 남김
+        latest = {}
+        for job_id, user_id, kind in ExportJob.objects.filter(
+            status=ExportJob.Status.COMPLETED,
+        ).order_by('-completed_at', '-id').values_list('id', 'user_id', 'kind'):
+            if (user_id, kind) in latest:
+                expired.add(job_id)
+            else:
+                latest[(user_id, kind)] = job_id
+
+        kept_paths = set(
+            ExportJob.objects.exclude(id__in=expired).exclude(file_path='').values_list('file_path', flat=True)
+        )
+        for path in ExportJob.objects.filter(id__in=expired).exclude(file_path='').values_list('file_path', flat=True):
+            if path not in kept_paths and os.path.exists(path):
+                os.remove(path)
+        deleted, _ = ExportJob.objects.filter(id__in=expired).delete()
+
+        # 작업이 없는 오래된 파일 (중단된 임시 파일 등)
+        job_dir = get_export_job_config()['DIR']
+        if os.path.isdir(job_dir):
+            for filename in os.listdir(job_dir):
+                path = os.path.join(job_dir, filename)
+                if path in kept_paths or not os.path.isfile(path):
+                    continue
+                if datetime.fromtimestamp(os.path.getmtime(path), tz=dt_timezone.utc) < cutoff:
+                    os.remove(path)
+
+        if deleted:
+            logger.info(f"[ExportJob] Cleaned up {deleted} export jobs")
+        return deleted
@@ -1,36 +1,112 @@
 from django.utils import timezone
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from itertools import chain, islice
 import csv
 import io
+import json
 import os
 import logging
+import zlib
 from ..models import Diary, DiaryImage
+from ..encryption import decrypt_diaries
 
 logger = logging.getLogger('diary')
 
+# 스트리밍 내보내기에서 한 번에 조회/복호화하는 일기 수
+STREAM_CHUNK_SIZE = 200
+
+# 일기 레코드에 필요한 필드만 조회 (임베딩/검색 키워드 등 제외)
+EXPORT_FIELDS = (
+    'id', 'title', 'content', 'is_encrypted', 'encryption_version',
+    'emotion', 'emotion_score', 'location_name', 'latitude', 'longitude',
+    'created_at', 'updated_at',
+)
+
+# PDF 감정 표기
+PDF_EMOTION_LABELS = {
+    'happy': 'Happy', 'sad': 'Sad', 'angry': 'Angry',
+    'anxious': 'Anxious', 'peaceful': 'Peaceful',
+    'excited': 'Excited', 'tired': 'Tired', 'love': 'Love'
+}
+
+# 스트리밍 도중 오류가 나면 파일 끝에 기록하는 표시 (잘린 파일이 정상 파일로 보이지 않도록)
+STREAM_ERROR_MESSAGE = '내보내기 중 오류가 발생하여 파일이 완전하지 않습니다. 다시 시도해주세요.'
+
+CSV_HEADER = [
+    'ID', '제목', '내용', '감정', '감정 점수',
+    '위치명', '위도', '경도', '작성일', '수정일'
+]
+
+
+class _Echo:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 버퍼 (스트리밍 CSV 용)"""
+    def write(self, value):
+        return value
+
+
+def gzip_stream(chunks, flush_bytes=64 * 1024):
+    """
+    bytes 스트림을 gzip 으로 압축하며 전달
+    - 첫 조각은 바로 flush 하여 첫 바이트 지연을 줄임
+    - 이후에는 flush_bytes 이상 모일 때마다 flush
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip 헤더
+    pending = 0
+    first = True
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        pending += len(chunk)
+        if first or pending >= flush_bytes:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+            first = False
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 class ExportService:
     @staticmethod
-    def export_json(user):
+    def iter_diaries(user, chunk_size=STREAM_CHUNK_SIZE, ordering=('created_at', 'id')):
+        """
+        (diary, 복호화된 본문) 을 chunk_size 단위로 조회/복호화하며 생성
+        메모리 사용량은 전체 일기 수와 무관하게 chunk_size 에 비례
+        """
+        queryset = (
+            Diary.objects.filter(user=user)
+            .only(*EXPORT_FIELDS)
+            .order_by(*ordering)
+            .iterator(chunk_size=chunk_size)
+        )
+        while True:
+            chunk = list(islice(queryset, chunk_size))
+            if not chunk:
+                return
+            yield from zip(chunk, decrypt_diaries(chunk))  # 청크 단위 일괄 복호화
+
+    @staticmethod
+    def diary_record(diary, content) -> dict:
+        return {
+            'id': diary.id,
+            'title': diary.title,
+            'content': content,
+            'emotion': diary.emotion,
+            'emotion_score': diary.emotion_score,
+            'location_name': diary.location_name,
+            'latitude': diary.latitude,
+            'longitude': diary.longitude,
+            'created_at': diary.created_at.isoformat(),
+            'updated_at': diary.updated_at.isoformat(),
+        }
+
+    @classmethod
+    def export_json(cls, user):
         """
         사용자의 모든 일기를 JSON 형식으로 내보냅니다.
+        (dict 반환, 응답 스트리밍은 stream_json 사용)
         """
-        diaries = Diary.objects.filter(user=user).order_by('created_at')
-        
-        result = []
-        for diary in diaries:
-            result.append({
-                'id': diary.id,
-                'title': diary.title,
-                'content': diary.decrypt_content(), # Decrypt content here
-                'emotion': diary.emotion,
-                'emotion_score': diary.emotion_score,
-                'location_name': diary.location_name,
-                'latitude': diary.latitude,
-                'longitude': diary.longitude,
-                'created_at': diary.created_at.isoformat(),
-                'updated_at': diary.updated_at.isoformat(),
-            })
+        result = [cls.diary_record(diary, content) for diary, content in cls.iter_diaries(user)]
         
         return {
             'exported_at': timezone.now().isoformat(),
@@ -38,47 +114,136 @@ class ExportService:
             'diaries': result
         }
 
+    @classmethod
+    def _iter_primed(cls, user, chunk_size):
+        """
+        iter_diaries 의 첫 청크를 바로 조회/복호화한 뒤 나머지를 이어서 생성
+        (스트림의 첫 조각을 만들 때 실패하면 응답을 보내기 전에 예외가 발생)
+        """
+        diaries = cls.iter_diaries(user, chunk_size)
+        first = next(diaries, None)
+        return chain([first], diaries) if first is not None else iter(())
+
+    @classmethod
+    def stream_json(cls, user, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        export_json 과 같은 구조의 JSON 을 일기 단위로 생성 (bytes)
+        total_diaries 는 개수를 센 뒤 마지막에 기록
+        도중에 실패하면 배열을 닫고 "error" 를 기록 (올바른 JSON 이지만 완전하지 않음을 표시)
+        """
+        diaries = cls._iter_primed(user, chunk_size)
+        yield f'{{"exported_at": {json.dumps(timezone.now().isoformat())}, "diaries": ['.encode('utf-8')
+        total = 0
+        try:
+            for diary, content in diaries:
+                item = json.dumps(cls.diary_record(diary, content), ensure_ascii=False)
+                yield (item if total == 0 else ',\n' + item).encode('utf-8')
+                total += 1
+        except Exception as e:
+            logger.error(f"[Export] JSON stream failed after {total} diaries: {e}")
+            error = json.dumps(STREAM_ERROR_MESSAGE, ensure_ascii=False)
+            yield f'], "total_diaries": {total}, "error": {error}}}'.encode('utf-8')
+            return
+        yield f'], "total_diaries": {total}}}'.encode('utf-8')
+
+    @classmethod
+    def stream_csv(cls, user, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        CSV 행을 일기 단위로 생성 (bytes, Excel 호환 BOM 포함)
+        도중에 실패하면 마지막 행에 오류 표시를 기록
+        """
+        diaries = cls._iter_primed(user, chunk_size)
+        writer = csv.writer(_Echo())
+        yield ('\ufeff' + writer.writerow(CSV_HEADER)).encode('utf-8')
+        try:
+            for diary, content in diaries:
+                yield writer.writerow([
+                    diary.id,
+                    diary.title,
+                    content,
+                    diary.emotion or '',
+                    diary.emotion_score or '',
+                    diary.location_name or '',
+                    diary.latitude or '',
+                    diary.longitude or '',
+                    diary.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    diary.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+                ]).encode('utf-8')
+        except Exception as e:
+            logger.error(f"[Export] CSV stream failed: {e}")
+            yield writer.writerow(['ERROR', STREAM_ERROR_MESSAGE]).encode('utf-8')
+
     @staticmethod
-    def export_csv(user):
+    def streaming_response(chunks, content_type, filename, compress=False):
         """
-        사용자의 모든 일기를 CSV 형식으로 내보냅니다.
+        스트리밍 다운로드 응답 (compress=True 면 gzip 압축하여 전송)
+        첫 조각은 응답을 만들기 전에 생성 - 첫 조회/복호화 실패는 호출한 뷰에서 500 으로 처리
         """
-        diaries = Diary.objects.filter(user=user).order_by('created_at')
-        
-        # CSV 응답 생성 (View에서 처리할 수 있도록 HttpResponse 반환하거나, 컨텐츠만 반환할 수 있음)
-        # 하지만 기존 로직이 HttpResponse를 반환하므로 여기서 생성하여 반환하는 것이 깔끔함.
-        response = HttpResponse(content_type='text/csv; charset=utf-8-sig')
-        filename = f"diary_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if first is not None:
+            chunks = chain([first], chunks)
+        response = StreamingHttpResponse(
+            gzip_stream(chunks) if compress else chunks,
+            content_type=content_type,
+        )
+        if compress:
+            response['Content-Encoding'] = 'gzip'
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        # BOM 추가 (Excel 호환성)
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        
-        # 헤더 작성
-        writer.writerow([
-            'ID', '제목', '내용', '감정', '감정 점수',
-            '위치명', '위도', '경도', '작성일', '수정일'
-        ])
-        
-        # 데이터 작성
-        for diary in diaries:
-            writer.writerow([
-                diary.id,
-                diary.title,
-                diary.decrypt_content(),
-                diary.emotion or '',
-                diary.emotion_score or '',
-                diary.location_name or '',
-                diary.latitude or '',
-                diary.longitude or '',
-                diary.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                diary.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-            ])
-        
         return response
 
+    @classmethod
+    def export_csv(cls, user, compress=False):
+        """
+        사용자의 모든 일기를 CSV 형식으로 내보냅니다. (스트리밍 응답)
+        """
+        filename = f"diary_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        return cls.streaming_response(
+            cls.stream_csv(user), 'text/csv; charset=utf-8', filename, compress,
+        )
+
+    @staticmethod
+    def register_pdf_font():
+        """한글 폰트 등록 후 폰트 이름 반환 (없으면 Helvetica)"""
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        # 폰트 파일 경로 확인 필요. 없으면 기본 폰트로 폴백하거나 시스템 폰트 사용
+        # 여기서는 안전하게 예외처리
+        font_name = 'Helvetica'
+        try:
+            # 기본 경로 가정 (프로젝트 루트나 static)
+            # 실제 배포 환경에 맞춰 폰트 파일이 있어야 함.
+            # 여기서는 예시로 'NanumGothic' 시도
+            font_path = os.path.join(settings.BASE_DIR, 'static', 'fonts', 'NanumGothic.ttf')
+            if os.path.exists(font_path):
+                pdfmetrics.registerFont(TTFont('NanumGothic', font_path))
+                font_name = 'NanumGothic'
+            else:
+                 # Windows 로컬 개발 환경 폰트 시도 (개발 편의성)
+                 import platform
+                 if platform.system() == 'Windows':
+                     font_path = "C:\\Windows\\Fonts\\malgun.ttf"
+                     if os.path.exists(font_path):
+                         pdfmetrics.registerFont(TTFont('MalgunGothic', font_path))
+                         font_name = 'MalgunGothic'
+        except Exception as e:
+            logger.warning(f"Font registration failed, using default: {e}")
+
+        return font_name
+
+    @staticmethod
+    def escape_pdf_text(text):
+        return (text or '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+    @staticmethod
+    def pdf_meta_line(diary):
+        """날짜 | 감정 | 위치 한 줄"""
+        date_str = diary.created_at.strftime('%Y-%m-%d %H:%M')
+        emotion_str = PDF_EMOTION_LABELS.get(diary.emotion, '') if diary.emotion else ''
+        location_str = f" | Location: {diary.location_name}" if diary.location_name else ""
+        return f"{date_str} | {emotion_str}{location_str}"
+
     @staticmethod
     def export_pdf(user):
         """
@@ -89,10 +254,9 @@ class ExportService:
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import cm
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
         
-        diaries = Diary.objects.filter(user=user).order_by('-created_at')
+        diaries = list(Diary.objects.filter(user=user).order_by('-created_at'))
+        contents = decrypt_diaries(diaries)  # 일괄 복호화
         
         # PDF 버퍼 생성
         buffer = io.BytesIO()
@@ -108,28 +272,7 @@ class ExportService:
         # 스타일 설정
         styles = getSampleStyleSheet()
         
-        # 폰트 등록 (한글 지원)
-        # 폰트 파일 경로 확인 필요. 없으면 기본 폰트로 폴백하거나 시스템 폰트 사용
-        # 여기서는 안전하게 예외처리
-        font_name = 'Helvetica'
-        try:
-            # 기본 경로 가정 (프로젝트 루트나 static)
-            # 실제 배포 환경에 맞춰 폰트 파일이 있어야 함.
-            # 여기서는 예시로 'NanumGothic' 시도
-            font_path = os.path.join(settings.BASE_DIR, 'static', 'fonts', 'NanumGothic.ttf')
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont('NanumGothic', font_path))
-                font_name = 'NanumGothic'
-            else:
-                 # Windows 로컬 개발 환경 폰트 시도 (개발 편의성)
-                 import platform
-                 if platform.system() == 'Windows':
-                     font_path = "C:\\Windows\\Fonts\\malgun.ttf"
-                     if os.path.exists(font_path):
-                         pdfmetrics.registerFont(TTFont('MalgunGothic', font_path))
-                         font_name = 'MalgunGothic'
-        except Exception as e:
-            logger.warning(f"Font registration failed, using default: {e}")
+        font_name = ExportService.register_pdf_font()
 
         # 커스텀 스타일
         title_style = ParagraphStyle(
@@ -174,40 +317,20 @@ class ExportService:
         # 제목
         elements.append(Paragraph("My Diary Export", title_style))
         elements.append(Paragraph(
-            f"Exported on {timezone.now().strftime('%Y-%m-%d %H:%M')} | Total: {diaries.count()} entries",
+            f"Exported on {timezone.now().strftime('%Y-%m-%d %H:%M')} | Total: {len(diaries)} entries",
             date_style
         ))
         elements.append(Spacer(1, 1*cm))
         
-        # 감정 이모지 매핑
-        emotion_map = {
-            'happy': 'Happy', 'sad': 'Sad', 'angry': 'Angry',
-            'anxious': 'Anxious', 'peaceful': 'Peaceful',
-            'excited': 'Excited', 'tired': 'Tired', 'love': 'Love'
-        }
-        
         # 각 일기 추가
-        for diary in diaries:
-            # 날짜
-            date_str = diary.created_at.strftime('%Y-%m-%d %H:%M')
-            emotion_str = emotion_map.get(diary.emotion, '') if diary.emotion else ''
-            location_str = f" | Location: {diary.location_name}" if diary.location_name else ""
-            
+        for diary, content in zip(diaries, contents):
+            elements.append(Paragraph(ExportService.pdf_meta_line(diary), date_style))
+            elements.append(Paragraph(ExportService.escape_pdf_text(diary.title), diary_title_style))
             elements.append(Paragraph(
-                f"{date_str} | {emotion_str}{location_str}",
-                date_style
+                ExportService.escape_pdf_text(content).replace('\n', '<br/>'),
+                content_style
             ))
             
-            # 제목
-            safe_title = (diary.title or '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            elements.append(Paragraph(safe_title, diary_title_style))
-            
-            # 내용
-            content = diary.decrypt_content() or ''
-            safe_content = content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            safe_content = safe_content.replace('\n', '<br/>')
-            elements.append(Paragraph(safe_content, content_style))
-            
             # 구분선
             elements.append(Spacer(1, 0.5*cm))
         
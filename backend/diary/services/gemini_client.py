@@ -1,53 +1,414 @@
 """
-Gemini API Client - 통합 클라이언트
+Gemini API Client - 통합 게이트웨이
 
-모든 Gemini API 호출을 통합하여 관리합니다.
-- 텍스트 생성 (감정 분석, 요약, 템플릿)
-- 이미지 생성
-- 재시도 정책 적용
+모든 Gemini API 호출을 하나의 클라이언트로 관리합니다.
+- 텍스트 생성 (감정 분석, 요약, 템플릿), 스트리밍, 이미지 생성, 파일 업로드(STT)
+- genai.Client 하나(HTTP 연결 풀 공유)와 Imagen REST 용 requests.Session 하나를 재사용
+- 프로세스 전체 / 모델별 동시 호출 상한, 모든 호출에 타임아웃
+- 슬롯 대기열 상한(backpressure): 대기열이 가득 차거나 대기 시간이 지나면 GeminiOverloadedError
+- 모델+엔드포인트별 분산 서킷 브레이커: 장애 중에는 대기열/타임아웃 없이 바로 CircuitOpenError
+- 지연 시간 / 대기열 길이 / 오류 지표 (stats)
+- async 변형 (client.aio): 이벤트 루프를 막지 않음
 """
+import asyncio
 import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
 from typing import Optional, Any
 from functools import lru_cache
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+import requests
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception, retry_if_exception_type
 from django.conf import settings
 
+from ..utils.circuit_breaker import FAILURE, IGNORE, SUCCESS, CircuitOpenError, get_breaker
+
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_GEMINI_GATEWAY = {
+    'MAX_CONCURRENCY': 16,    # 프로세스 전체 동시 호출 수
+    'MODEL_CONCURRENCY': 8,   # 모델별 기본 동시 호출 수
+    'MODEL_LIMITS': {},       # 모델별 덮어쓰기 (예: {'imagen-3.0-generate-001': 2})
+    'TIMEOUT': 30,            # 호출 타임아웃 (초)
+    'MAX_QUEUE': 64,          # 슬롯 대기 요청 상한 (초과 시 즉시 거절)
+    'QUEUE_TIMEOUT': 10,      # 슬롯 대기 최대 시간 (초)
+    'POOL_SIZE': 16,          # REST 호출용 HTTP 연결 풀 크기
+}
+
+# 파일 업로드/조회처럼 모델과 무관한 호출의 동시성 키
+FILES_MODEL = 'files'
+
+
+def get_gemini_gateway_config() -> dict:
+    return {**DEFAULT_GEMINI_GATEWAY, **getattr(settings, 'GEMINI_GATEWAY', {})}
+
+
 class GeminiClientError(Exception):
     """Gemini API 호출 실패 시 발생하는 예외"""
     pass
 
 
+class GeminiOverloadedError(GeminiClientError):
+    """동시 호출 슬롯 대기열이 가득 찼거나 대기 시간이 지남 (재시도하지 않음)"""
+    pass
+
+
+class GeminiTimeoutError(GeminiClientError, TimeoutError):
+    """호출 타임아웃"""
+    pass
+
+
+def _is_timeout(error):
+    return isinstance(error, (TimeoutError, requests.exceptions.Timeout)) or 'timeout' in type(error).__name__.lower()
+
+
+class _Limiter:
+    """
+    프로세스 전체 + 모델별 동시 호출 상한
+    슬롯이 없으면 최대 max_queue 개까지 대기하고, 그 이상은 즉시 거절합니다.
+    """
+
+    def __init__(self, max_concurrency, model_concurrency, model_limits, max_queue):
+        self.max_concurrency = max_concurrency
+        self.model_concurrency = model_concurrency
+        self.model_limits = model_limits
+        self.max_queue = max_queue
+
+        self._cond = threading.Condition()
+        self._by_model = defaultdict(int)
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+
+    def _available(self, model):
+        limit = self.model_limits.get(model, self.model_concurrency)
+        return self.in_flight < self.max_concurrency and self._by_model[model] < limit
+
+    def _take(self, model):
+        self.in_flight += 1
+        self._by_model[model] += 1
+
+    def _enqueue(self):
+        if self.waiting >= self.max_queue:
+            raise GeminiOverloadedError('Gemini request queue is full')
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def acquire(self, model, timeout):
+        with self._cond:
+            if self._available(model):
+                self._take(model)
+                return
+            self._enqueue()
+            try:
+                if not self._cond.wait_for(lambda: self._available(model), timeout):
+                    raise GeminiOverloadedError('Timed out waiting for a Gemini slot')
+                self._take(model)
+            finally:
+                self.waiting -= 1
+
+    async def acquire_async(self, model, timeout):
+        """이벤트 루프를 막지 않도록 짧은 간격으로 슬롯 확인"""
+        with self._cond:
+            if self._available(model):
+                self._take(model)
+                return
+            self._enqueue()
+        try:
+            deadline = time.monotonic() + timeout
+            delay = 0.005
+            while True:
+                with self._cond:
+                    if self._available(model):
+                        self._take(model)
+                        return
+                if time.monotonic() >= deadline:
+                    raise GeminiOverloadedError('Timed out waiting for a Gemini slot')
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.1)
+        finally:
+            with self._cond:
+                self.waiting -= 1
+
+    def release(self, model):
+        with self._cond:
+            self.in_flight -= 1
+            self._by_model[model] -= 1
+            self._cond.notify_all()
+
+    def in_flight_by_model(self):
+        with self._cond:
+            return {model: count for model, count in self._by_model.items() if count}
+
+
+class _ModelStats:
+    __slots__ = ('calls', 'errors', 'timeouts', 'rejected', 'short_circuited', 'total_latency', 'max_latency')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.short_circuited = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'rejected': self.rejected,
+            'short_circuited': self.short_circuited,
+            'avg_latency_ms': round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+            'max_latency_ms': round(self.max_latency * 1000, 1),
+        }
+
+
 class GeminiClient:
     """
-    Gemini API 통합 클라이언트
-    
+    Gemini API 통합 게이트웨이
+
     Usage:
         client = get_gemini_client()
-        response = client.generate_text("프롬프트")
+        response = client.generate_content(model=settings.GEMINI_TEXT_MODEL, contents="프롬프트")
+        text = client.generate_text("프롬프트")
+        response = await client.agenerate_content(model=..., contents=...)
     """
-    
-    def __init__(self, text_model: str = None, image_model: str = None):
+
+    def __init__(self, text_model: str = None, image_model: str = None, config: dict = None):
         self.text_model = text_model or getattr(settings, 'GEMINI_TEXT_MODEL', 'gemini-1.5-flash')
         self.image_model = image_model or getattr(settings, 'GEMINI_IMAGE_MODEL', 'imagen-3.0-generate-001')
+        self.config = config or get_gemini_gateway_config()
         self._client = None
-    
+        self._session = None
+        self._init_lock = threading.Lock()
+
+        self._limiter = _Limiter(
+            self.config['MAX_CONCURRENCY'],
+            self.config['MODEL_CONCURRENCY'],
+            self.config['MODEL_LIMITS'],
+            self.config['MAX_QUEUE'],
+        )
+        self._stats = defaultdict(_ModelStats)
+        self._stats_lock = threading.Lock()
+
     @property
     def client(self):
-        """Lazy initialization of Gemini client"""
+        """Lazy initialization of Gemini client (프로세스 공유, 요청 타임아웃 적용)"""
         if self._client is None:
-            try:
-                from google import genai
-                api_key = getattr(settings, 'GEMINI_API_KEY', '')
-                if not api_key:
-                    raise GeminiClientError("GEMINI_API_KEY is not configured")
-                self._client = genai.Client(api_key=api_key)
-            except ImportError:
-                raise GeminiClientError("google-genai package is not installed")
+            with self._init_lock:
+                if self._client is None:
+                    try:
+                        from google import genai
+                        from google.genai import types
+                    except ImportError:
+                        raise GeminiClientError("google-genai package is not installed")
+                    api_key = getattr(settings, 'GEMINI_API_KEY', '')
+                    if not api_key:
+                        raise GeminiClientError("GEMINI_API_KEY is not configured")
+                    self._client = genai.Client(
+                        api_key=api_key,
+                        http_options=types.HttpOptions(timeout=int(self.config['TIMEOUT'] * 1000)),
+                    )
         return self._client
-    
+
+    @property
+    def session(self):
+        """REST 호출용 공유 세션 (연결 풀 재사용)"""
+        if self._session is None:
+            with self._init_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=self.config['POOL_SIZE'], pool_maxsize=self.config['POOL_SIZE']
+                    )
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    # =========================================================================
+    # 동시성 제한 + 지표
+    # =========================================================================
+
+    def _record(self, model, latency, error=None):
+        with self._stats_lock:
+            stats = self._stats[model]
+            stats.calls += 1
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            if error is not None:
+                stats.errors += 1
+                if _is_timeout(error):
+                    stats.timeouts += 1
+
+    def _reject(self, model):
+        with self._stats_lock:
+            self._stats[model].rejected += 1
+
+    def _check_circuit(self, model, endpoint):
+        """모델+엔드포인트별 차단기 확인 (열려 있으면 대기열에 들어가지 않고 바로 CircuitOpenError)"""
+        breaker = get_breaker(f"gemini:{model}:{endpoint}")
+        allowed, probe, retry = breaker.allow()
+        if not allowed:
+            with self._stats_lock:
+                self._stats[model].short_circuited += 1
+            raise CircuitOpenError(breaker.name, retry)
+        return breaker, probe
+
+    def _finish(self, model, breaker, probe, started, error=None, completed=True, measure_latency=True):
+        """
+        슬롯 반납 + 지표/차단기 기록
+        (completed=False: 취소/중단되어 결과를 모름 - 차단기에는 반영하지 않음)
+        """
+        self._limiter.release(model)
+        latency = time.monotonic() - started
+        self._record(model, latency, error)
+        outcome = FAILURE if error is not None else (SUCCESS if completed else IGNORE)
+        breaker.record(outcome, latency=latency if measure_latency else None, probe=probe)
+
+    @contextmanager
+    def _slot(self, model, endpoint, measure_latency=True):
+        breaker, probe = self._check_circuit(model, endpoint)
+        try:
+            self._limiter.acquire(model, self.config['QUEUE_TIMEOUT'])
+        except GeminiOverloadedError:
+            # 로컬 backpressure 는 상대 서비스 장애가 아니므로 차단기에 반영하지 않음
+            self._reject(model)
+            breaker.record(IGNORE, probe=probe)
+            raise
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._finish(model, breaker, probe, started, error=e, measure_latency=measure_latency)
+            raise
+        except BaseException:
+            self._finish(model, breaker, probe, started, completed=False)
+            raise
+        self._finish(model, breaker, probe, started, measure_latency=measure_latency)
+
+    async def _acquire_async(self, model, breaker, probe):
+        try:
+            await self._limiter.acquire_async(model, self.config['QUEUE_TIMEOUT'])
+        except GeminiOverloadedError:
+            self._reject(model)
+            breaker.record(IGNORE, probe=probe)
+            raise
+        except BaseException:
+            breaker.record(IGNORE, probe=probe)
+            raise
+
+    async def _acall(self, model, endpoint, make_coroutine):
+        breaker, probe = self._check_circuit(model, endpoint)
+        await self._acquire_async(model, breaker, probe)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(make_coroutine(), self.config['TIMEOUT'])
+        except asyncio.TimeoutError as e:
+            self._finish(model, breaker, probe, started, error=e)
+            raise GeminiTimeoutError(f"Gemini call to {model} timed out")
+        except Exception as e:
+            self._finish(model, breaker, probe, started, error=e)
+            raise
+        except BaseException:
+            self._finish(model, breaker, probe, started, completed=False)
+            raise
+        self._finish(model, breaker, probe, started)
+        return result
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            models = {model: stats.as_dict() for model, stats in self._stats.items()}
+        return {
+            'in_flight': self._limiter.in_flight,
+            'in_flight_by_model': self._limiter.in_flight_by_model(),
+            'queued': self._limiter.waiting,
+            'max_queued': self._limiter.max_waiting,
+            'max_concurrency': self.config['MAX_CONCURRENCY'],
+            'max_queue': self.config['MAX_QUEUE'],
+            'models': models,
+        }
+
+    # =========================================================================
+    # 원시 호출 (각 서비스가 사용)
+    # =========================================================================
+
+    def generate_content(self, model: str, contents: Any, config: dict = None):
+        with self._slot(model, 'generate_content'):
+            return self.client.models.generate_content(model=model, contents=contents, config=config)
+
+    async def agenerate_content(self, model: str, contents: Any, config: dict = None):
+        return await self._acall(
+            model, 'generate_content', lambda: self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+        )
+
+    def generate_content_stream(self, model: str, contents: Any, config: dict = None):
+        """스트리밍 응답 (소비가 끝나거나 닫힐 때까지 슬롯 유지, 전체 시간은 느린 호출로 세지 않음)"""
+        with self._slot(model, 'stream', measure_latency=False):
+            for chunk in self.client.models.generate_content_stream(model=model, contents=contents, config=config):
+                yield chunk
+
+    async def agenerate_content_stream(self, model: str, contents: Any, config: dict = None):
+        """[Async] 스트리밍 응답 (청크 사이 대기도 TIMEOUT 으로 제한)"""
+        breaker, probe = self._check_circuit(model, 'stream')
+        await self._acquire_async(model, breaker, probe)
+        started = time.monotonic()
+        try:
+            stream = await asyncio.wait_for(
+                self.client.aio.models.generate_content_stream(model=model, contents=contents, config=config),
+                self.config['TIMEOUT'],
+            )
+            iterator = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), self.config['TIMEOUT'])
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        except asyncio.TimeoutError as e:
+            self._finish(model, breaker, probe, started, error=e, measure_latency=False)
+            raise GeminiTimeoutError(f"Gemini stream from {model} timed out")
+        except Exception as e:
+            self._finish(model, breaker, probe, started, error=e, measure_latency=False)
+            raise
+        except BaseException:
+            self._finish(model, breaker, probe, started, completed=False)
+            raise
+        self._finish(model, breaker, probe, started, measure_latency=False)
+
+    def generate_images(self, model: str, prompt: str, config: dict = None):
+        with self._slot(model, 'generate_images'):
+            return self.client.models.generate_images(model=model, prompt=prompt, config=config)
+
+    def predict(self, model: str, payload: dict) -> dict:
+        """Imagen REST predict 호출 (공유 세션, 타임아웃 적용)"""
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:predict"
+        with self._slot(model, 'predict'):
+            response = self.session.post(
+                url,
+                headers={"Content-Type": "application/json", "x-goog-api-key": settings.GEMINI_API_KEY},
+                json=payload,
+                timeout=self.config['TIMEOUT'],
+            )
+            response.raise_for_status()
+            return response.json()
+
+    def upload_file(self, path: str):
+        with self._slot(FILES_MODEL, 'upload'):
+            return self.client.files.upload(file=path)
+
+    def get_file(self, name: str):
+        with self._slot(FILES_MODEL, 'get'):
+            return self.client.files.get(name=name)
+
+    # =========================================================================
+    # 편의 메서드
+    # =========================================================================
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -55,21 +416,21 @@ class GeminiClient:
         reraise=True
     )
     def generate_text(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         system_instruction: str = None,
         temperature: float = 0.7,
         max_tokens: int = 1000
     ) -> str:
         """
         텍스트 생성 (감정 분석, 요약, 템플릿 등)
-        
+
         Args:
             prompt: 사용자 프롬프트
             system_instruction: 시스템 지시사항
             temperature: 창의성 정도 (0.0 ~ 1.0)
             max_tokens: 최대 토큰 수
-            
+
         Returns:
             생성된 텍스트
         """
@@ -78,50 +439,49 @@ class GeminiClient:
                 "temperature": temperature,
                 "max_output_tokens": max_tokens,
             }
-            
+
             contents = prompt
             if system_instruction:
                 contents = f"{system_instruction}\n\n{prompt}"
-            
-            response = self.client.models.generate_content(
-                model=self.text_model,
-                contents=contents,
-                config=config
-            )
-            
+
+            response = self.generate_content(model=self.text_model, contents=contents, config=config)
+
             if response and response.text:
                 return response.text.strip()
-            
+
             raise GeminiClientError("Empty response from Gemini API")
-            
+
+        except (GeminiOverloadedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"[GeminiClient] Text generation failed: {e}")
             raise GeminiClientError(f"Text generation failed: {str(e)}")
-    
+
     @retry(
         stop=stop_after_attempt(2),
         wait=wait_exponential(multiplier=2, min=3, max=15),
+        retry=retry_if_exception(lambda e: not isinstance(e, (GeminiOverloadedError, CircuitOpenError))),
         reraise=True
     )
     def generate_image(
-        self, 
+        self,
         prompt: str,
         aspect_ratio: str = "1:1",
         safety_filter: str = "block_only_high"
     ) -> Optional[bytes]:
         """
         이미지 생성
-        
+
         Args:
             prompt: 이미지 설명 프롬프트
             aspect_ratio: 이미지 비율 ("1:1", "16:9", "9:16", "4:3", "3:4")
             safety_filter: 안전 필터 수준
-            
+
         Returns:
             생성된 이미지 바이트 데이터 또는 None
         """
         try:
-            response = self.client.models.generate_images(
+            response = self.generate_images(
                 model=self.image_model,
                 prompt=prompt,
                 config={
@@ -130,21 +490,23 @@ class GeminiClient:
                     "safety_filter_level": safety_filter,
                 }
             )
-            
+
             if response.generated_images and len(response.generated_images) > 0:
                 return response.generated_images[0].image.image_bytes
-            
+
             logger.warning("[GeminiClient] No images generated")
             return None
-            
+
+        except (GeminiOverloadedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"[GeminiClient] Image generation failed: {e}")
             raise GeminiClientError(f"Image generation failed: {str(e)}")
-    
+
     def analyze_emotion(self, text: str) -> dict:
         """
         텍스트에서 감정 분석
-        
+
         Returns:
             {"emotion": "happy", "score": 85, "label": "행복"}
         """
@@ -152,26 +514,26 @@ class GeminiClient:
         당신은 감정 분석 전문가입니다. 주어진 텍스트에서 주요 감정을 분석하세요.
         반드시 다음 JSON 형식으로만 응답하세요:
         {"emotion": "감정영어명", "score": 0-100, "label": "감정한글명"}
-        
+
         감정 종류: happy(행복), sad(슬픔), angry(화남), anxious(불안), calm(평온), excited(신남), tired(피곤), love(사랑)
         """
-        
+
         try:
             response = self.generate_text(
                 prompt=f"다음 텍스트의 감정을 분석하세요:\n\n{text}",
                 system_instruction=system_instruction,
                 temperature=0.3
             )
-            
+
             import json
             # JSON 파싱 시도
             start = response.find('{')
             end = response.rfind('}') + 1
             if start != -1 and end > start:
                 return json.loads(response[start:end])
-            
+
             return {"emotion": "calm", "score": 50, "label": "평온"}
-            
+
         except Exception as e:
             logger.error(f"[GeminiClient] Emotion analysis failed: {e}")
             return {"emotion": "calm", "score": 50, "label": "평온"}
@@ -180,6 +542,6 @@ class GeminiClient:
 @lru_cache(maxsize=1)
 def get_gemini_client() -> GeminiClient:
     """
-    Gemini 클라이언트 싱글톤 인스턴스 반환
+    Gemini 게이트웨이 싱글톤 인스턴스 반환 (모든 서비스가 공유)
     """
     return GeminiClient()
@@ -6,7 +6,9 @@ import requests
 from datetime import datetime
 from django.conf import settings
 from django.core.files.base import ContentFile
-from google import genai
+
+from .gemini_client import get_gemini_client
+from ..utils.circuit_breaker import get_breaker
 
 # 순환 참조 방지를 위해 모델은 메서드 내부에서 import 하거나 필요시 import
 
@@ -34,6 +36,8 @@ class ImageGenerator:
            - 원문 대신 핵심 키워드를 사용하여 재사용성을 높임
         2. 캐싱 (Caching)
            - 동일한 프롬프트로 생성된 이미지가 있다면 API 호출 없이 URL 재사용
+        3. 서킷 브레이커
+           - Gemini 차단 중에는 바로 DALL-E 로 대체, 둘 다 차단 중이면 CircuitOpenError
         """
         
         logger.debug(f"Generating image for: {diary_content[:50]}...")
@@ -93,10 +97,8 @@ class ImageGenerator:
             
             # Gemini 모델 (예: gemini-3-pro-image-preview) 사용 시
             if settings.GEMINI_IMAGE_MODEL.lower().startswith('gemini'):
-                client = genai.Client(api_key=settings.GEMINI_API_KEY)
-                
                 # Gemini 3 Image Generation Prompt
-                response = client.models.generate_content(
+                response = get_gemini_client().generate_content(
                     model=settings.GEMINI_IMAGE_MODEL,
                     contents=f"Draw the following: {prompt}"
                 )
@@ -115,13 +117,7 @@ class ImageGenerator:
                     raise ValueError("No image data found in Gemini response")
 
             else:
-                # 기존 Imagen REST API 호출 (imagen-*)
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/{settings.GEMINI_IMAGE_MODEL}:predict?key={settings.GEMINI_API_KEY}"
-                
-                headers = {
-                    "Content-Type": "application/json"
-                }
-                
+                # 기존 Imagen REST API 호출 (imagen-*, 공유 세션 + 타임아웃)
                 payload = {
                     "instances": [
                         {
@@ -134,10 +130,7 @@ class ImageGenerator:
                     }
                 }
                 
-                response = requests.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                
-                result = response.json()
+                result = get_gemini_client().predict(settings.GEMINI_IMAGE_MODEL, payload)
                 
                 if 'predictions' not in result or not result['predictions']:
                     logger.error(f"Imagen API Error: {result}")
@@ -207,7 +200,7 @@ class ImageGenerator:
         except Exception as e:
             # 통합된 에러 처리 및 Fallback 로직
             error_msg = str(e)
-            if 'requests' in locals() and isinstance(e, requests.exceptions.HTTPError):
+            if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
                 error_msg = f"HTTP Error: {e.response.text}"
                 
             logger.error(f"Gemini (Imagen) Image Generation failed: {error_msg}")
@@ -222,13 +215,15 @@ class ImageGenerator:
                 import openai
                 client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
                 
-                response = client.images.generate(
-                    model="dall-e-3",
-                    prompt=prompt or diary_content[:500],
-                    size="1024x1024",
-                    quality="standard",
-                    n=1,
-                )
+                # 대체 경로도 차단기로 보호 (두 공급자가 모두 장애일 때 바로 실패)
+                with get_breaker('openai:dall-e-3:images').guard():
+                    response = client.images.generate(
+                        model="dall-e-3",
+                        prompt=prompt or diary_content[:500],
+                        size="1024x1024",
+                        quality="standard",
+                        n=1,
+                    )
                 
                 image_url = response.data[0].url
                 return {
@@ -0,0 +1,212 @@
+"""
+암호화 키 로테이션 서비스
+- id 기준 키셋 페이지네이션 (id > last_id) 으로 배치 조회
+- 배치 단위 일괄 복호화/재암호화 후 bulk_update 한 번으로 저장
+- 진행 상황을 캐시에 체크포인트로 저장하여 중단 후 재개
+- 초당 처리 행 수(rows/sec) 기반 스로틀링, 진행률/ETA 보고
+- id 범위(start_id~end_id) 지정으로 병렬 샤드 실행
+- 블라인드 인덱스 HMAC 도 같은 배치에서 새 키 버전으로 재계산
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..encryption import EncryptionError, get_encryption_service
+from ..models import Diary
+from .blind_index_service import BlindIndexService
+
+logger = logging.getLogger('diary')
+
+# 체크포인트 보관 기간 (중단된 로테이션을 재개할 수 있는 기간)
+CHECKPOINT_TTL = 60 * 60 * 24 * 7
+
+
+class KeyRotationService:
+    """
+    일기 본문을 target_version 키로 재암호화하는 로테이션 엔진
+
+    실패한 행은 last_id 가 지나가므로 다시 조회되지 않습니다.
+    (실패 건수는 통계에 남고, 원인 해결 후 --no-resume 으로 재실행)
+    """
+
+    def __init__(self, target_version=None, batch_size=500, rows_per_second=None,
+                 start_id=None, end_id=None, dry_run=False):
+        self.target_version = target_version or getattr(settings, 'CURRENT_ENCRYPTION_VERSION', 1)
+        self.batch_size = batch_size
+        self.rows_per_second = rows_per_second
+        self.start_id = start_id
+        self.end_id = end_id
+        self.dry_run = dry_run
+
+    @property
+    def checkpoint_key(self) -> str:
+        return (
+            f"key_rotation:v{self.target_version}:"
+            f"{self.start_id or 0}-{self.end_id or 'max'}"
+        )
+
+    def load_checkpoint(self):
+        return cache.get(self.checkpoint_key)
+
+    def reset_checkpoint(self):
+        cache.delete(self.checkpoint_key)
+
+    def _save_checkpoint(self, state):
+        if not self.dry_run:
+            cache.set(self.checkpoint_key, state, CHECKPOINT_TTL)
+
+    def pending_queryset(self):
+        """재암호화 대상 (target_version 보다 낮은 키로 암호화된 일기)"""
+        qs = Diary.objects.filter(
+            is_encrypted=True,
+            encryption_version__lt=self.target_version,
+        )
+        if self.start_id is not None:
+            qs = qs.filter(id__gte=self.start_id)
+        if self.end_id is not None:
+            qs = qs.filter(id__lte=self.end_id)
+        return qs
+
+    def run(self, resume=True, progress_callback=None) -> dict:
+        """
+        로테이션 실행
+
+        Args:
+            resume: 저장된 체크포인트부터 이어서 실행
+            progress_callback: 배치마다 진행 상태 dict 를 받는 콜백 (Celery update_state 등)
+
+        Returns:
+            dict: 처리 통계
+        """
+        service = get_encryption_service()
+        checkpoint = self.load_checkpoint() if resume else None
+
+        state = {
+            'target_version': self.target_version,
+            'last_id': 0,
+            'processed': 0,
+            'updated': 0,
+            'failed': 0,
+            'done': False,
+        }
+        if checkpoint and not checkpoint.get('done'):
+            state.update(checkpoint)
+            logger.info(f"[KeyRotation] Resuming {self.checkpoint_key} from id > {state['last_id']}")
+
+        base = self.pending_queryset()
+        remaining = base.filter(id__gt=state['last_id']).count()
+        state['total'] = state['processed'] + remaining
+        logger.info(f"[KeyRotation] {remaining} diaries to re-encrypt with key version {self.target_version}")
+
+        started = time.monotonic()
+        processed_this_run = 0
+
+        while True:
+            batch = list(
+                base.filter(id__gt=state['last_id'])
+                .order_by('id')
+                .only('id', 'user_id', 'content', 'is_encrypted', 'encryption_version')[:self.batch_size]
+            )
+            if not batch:
+                break
+
+            updated, failed = self._rotate_batch(service, batch)
+
+            state['last_id'] = batch[-1].id
+            state['processed'] += len(batch)
+            state['updated'] += updated
+            state['failed'] += failed
+            processed_this_run += len(batch)
+
+            elapsed = time.monotonic() - started
+            rate = processed_this_run / elapsed if elapsed > 0 else 0.0
+            left = max(state['total'] - state['processed'], 0)
+            state['rate'] = round(rate, 1)
+            state['eta_seconds'] = round(left / rate) if rate else None
+
+            self._save_checkpoint(state)
+            logger.info(
+                f"[KeyRotation] {state['processed']}/{state['total']} "
+                f"(updated={state['updated']}, failed={state['failed']}, "
+                f"{state['rate']} rows/s, ETA {state['eta_seconds']}s)"
+            )
+            if progress_callback:
+                progress_callback(dict(state))
+
+            self._throttle(processed_this_run, started)
+
+        state['done'] = True
+        self._save_checkpoint(state)
+        logger.info(f"[KeyRotation] Completed {self.checkpoint_key}: {state}")
+        return state
+
+    def _rotate_batch(self, service, batch):
+        """배치 하나를 메모리에서 재암호화하고 bulk_update 로 저장"""
+        plain_contents = service.decrypt_many((d.content, d.encryption_version) for d in batch)
+
+        candidates = []
+        failed = 0
+        for diary, plain in zip(batch, plain_contents):
+            if isinstance(plain, EncryptionError):
+                logger.error(f"[KeyRotation] Failed to decrypt diary {diary.id}: {plain}")
+                failed += 1
+            else:
+                candidates.append((diary, plain))
+
+        encrypted = service.encrypt_many([plain for _, plain in candidates], version=self.target_version)
+
+        to_update = []
+        for (diary, _), cipher_text in zip(candidates, encrypted):
+            if isinstance(cipher_text, EncryptionError):
+                logger.error(f"[KeyRotation] Failed to encrypt diary {diary.id}: {cipher_text}")
+                failed += 1
+                continue
+            diary.content = cipher_text
+            diary.encryption_version = self.target_version
+            to_update.append(diary)
+
+        if to_update and not self.dry_run:
+            plain_by_id = {diary.id: plain for diary, plain in candidates}
+            with transaction.atomic():
+                Diary.objects.bulk_update(to_update, ['content', 'encryption_version'])
+                # 블라인드 인덱스도 새 키 버전의 HMAC 으로 재계산
+                BlindIndexService.index_many(
+                    [(diary, plain_by_id[diary.id]) for diary in to_update],
+                    version=self.target_version,
+                )
+
+        return len(to_update), failed
+
+    def _throttle(self, processed, started):
+        """rows_per_second 를 넘지 않도록 필요한 만큼만 대기"""
+        if not self.rows_per_second:
+            return
+        expected_elapsed = processed / self.rows_per_second
+        actual_elapsed = time.monotonic() - started
+        if expected_elapsed > actual_elapsed:
+            time.sleep(expected_elapsed - actual_elapsed)
+
+    @classmethod
+    def shard_ranges(cls, shards, target_version=None):
+        """
+        대상 일기의 id 범위를 shards 개 구간으로 분할
+        Returns: [(start_id, end_id), ...]
+        """
+        from django.db.models import Max, Min
+
+        bounds = cls(target_version=target_version).pending_queryset().aggregate(
+            min_id=Min('id'), max_id=Max('id')
+        )
+        if bounds['min_id'] is None:
+            return []
+
+        min_id, max_id = bounds['min_id'], bounds['max_id']
+        shards = max(1, shards)
+        step = -(-(max_id - min_id + 1) // shards)
+        return [
+            (start, min(start + step - 1, max_id))
+            for start in range(min_id, max_id + 1, step)
+        ]
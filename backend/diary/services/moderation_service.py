@@ -4,9 +4,9 @@ AI를 활용한 유해 콘텐츠 자동 감지
 """
 import re
 from typing import Dict, List, Optional
-from google import genai
 from django.conf import settings
 from ..models.moderation import FlaggedContent
+from .gemini_client import get_gemini_client
 
 
 class ContentModerationService:
@@ -38,8 +38,8 @@ class ContentModerationService:
     }
     
     def __init__(self):
-        """Gemini 클라이언트 초기화"""
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        """공유 Gemini 게이트웨이 사용"""
+        self.client = get_gemini_client()
         self.model_name = getattr(settings, 'GEMINI_TEXT_MODEL', 'gemini-2.0-flash-exp')
     
     def analyze_content(self, content: str) -> Dict:
@@ -132,7 +132,7 @@ class ContentModerationService:
 점수가 0.7 이상이면 유해한 것으로 간주합니다.
 일기의 맥락을 고려하여 판단해주세요. 단순히 감정 표현이나 일상적인 내용은 유해하지 않습니다."""
 
-            response = self.client.models.generate_content(
+            response = self.client.generate_content(
                 model=self.model_name,
                 contents=prompt
             )
@@ -0,0 +1,176 @@
+"""
+일기 작성 리마인더 파이프라인
+- Celery Beat 가 WINDOW_MINUTES 마다 plan_window 실행
+- 알림 시간(daily_reminder_time)이 현재 구간에 속한 사용자 중
+  오늘 일기를 쓰지 않은 사용자만 DB 에서 선별 (UserPreference.last_diary_date 기준, 부분 인덱스 사용)
+- 사용자 id 범위로 샤드를 나눠 구간 안에서 시차를 두고 실행 (SPREAD_SECONDS)
+- 샤드는 활성 푸시 토큰을 스트리밍하여 dispatch_push 로 대량 발송
+- 실행(run)별 scanned / skipped / notified / sent / failed 지표를 캐시에 기록
+
+사용자별 시간대 필드가 없으므로 알림 시간은 서버 TIME_ZONE 기준입니다.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, Max, Min, OuterRef, Q
+from django.utils import timezone
+
+from ..models import PushToken, UserPreference
+
+logger = logging.getLogger('diary')
+
+DEFAULT_REMINDER = {
+    'WINDOW_MINUTES': 15,   # Beat 실행 주기 = 알림 시간 버킷 크기
+    'SHARD_SIZE': 5000,     # 샤드당 사용자 id 범위
+    'SPREAD_SECONDS': 600,  # 샤드 실행을 분산시키는 시간 (구간 길이 이하)
+}
+
+METRIC_NAMES = ('scanned', 'skipped', 'notified', 'sent', 'failed', 'deactivated')
+
+# 실행 지표 보관 기간
+METRICS_TTL = 60 * 60 * 24 * 2
+
+
+def get_reminder_config() -> dict:
+    return {**DEFAULT_REMINDER, **getattr(settings, 'REMINDER', {})}
+
+
+class ReminderService:
+    """리마인더 대상 선별 / 샤드 계획 / 발송"""
+
+    @staticmethod
+    def window(now=None, minutes=None):
+        """
+        now 가 속한 알림 시간 구간
+
+        Returns:
+            (run_id, today, start_time, end_time) - end_time 이 None 이면 자정까지
+        """
+        minutes = minutes or get_reminder_config()['WINDOW_MINUTES']
+        now = timezone.localtime(now)
+        start = now.replace(minute=now.minute - now.minute % minutes, second=0, microsecond=0)
+        end = start + timedelta(minutes=minutes)
+        run_id = start.strftime('%Y%m%d%H%M')
+        return run_id, start.date(), start.time(), end.time() if end.date() == start.date() else None
+
+    @staticmethod
+    def bucket_queryset(start_time, end_time):
+        """알림 시간이 구간에 속하고 푸시/리마인더를 켠 사용자 설정"""
+        qs = UserPreference.objects.filter(
+            daily_reminder_enabled=True,
+            push_enabled=True,
+            daily_reminder_time__gte=start_time,
+        )
+        if end_time is not None:
+            qs = qs.filter(daily_reminder_time__lt=end_time)
+        return qs
+
+    @staticmethod
+    def not_written_today(today):
+        """오늘 일기를 쓰지 않은 조건 (last_diary_date 비교만, 일기 테이블 조인 없음)"""
+        return Q(last_diary_date__isnull=True) | Q(last_diary_date__lt=today)
+
+    @classmethod
+    def plan_window(cls, now=None) -> dict:
+        """
+        현재 구간의 샤드 태스크 예약 (같은 구간은 한 번만)
+
+        Returns:
+            dict: run_id, shards (중복 실행이면 shards=0, duplicate=True)
+        """
+        from ..tasks import send_reminder_shard
+
+        config = get_reminder_config()
+        run_id, today, start_time, end_time = cls.window(now, config['WINDOW_MINUTES'])
+        # Beat 중복 실행/재시작 시 같은 구간을 두 번 계획하지 않음
+        if not cache.add(f"reminder:planned:{run_id}", True, METRICS_TTL):
+            logger.info(f"[Reminder] Window {run_id} already planned")
+            return {'run_id': run_id, 'shards': 0, 'duplicate': True}
+
+        bounds = cls.bucket_queryset(start_time, end_time).aggregate(
+            low=Min('user_id'), high=Max('user_id'),
+        )
+        shards = []
+        if bounds['low'] is not None:
+            size = config['SHARD_SIZE']
+            shards = [(low, min(low + size - 1, bounds['high']))
+                      for low in range(bounds['low'], bounds['high'] + 1, size)]
+
+        spread = min(config['SPREAD_SECONDS'], config['WINDOW_MINUTES'] * 60)
+        step = spread / len(shards) if shards else 0
+        window_args = (run_id, today.isoformat(), start_time.isoformat(),
+                       end_time.isoformat() if end_time else None)
+        for i, (low, high) in enumerate(shards):
+            send_reminder_shard.apply_async((*window_args, low, high), countdown=int(i * step))
+
+        cache.set(f"reminder:shards:{run_id}", len(shards), METRICS_TTL)
+        cache.set('reminder:last_run', run_id, METRICS_TTL)
+        logger.info(f"[Reminder] Window {run_id}: planned {len(shards)} shards")
+        return {'run_id': run_id, 'shards': len(shards), 'duplicate': False}
+
+    @classmethod
+    def send_shard(cls, run_id, today, start_time, end_time, start_id, end_id) -> dict:
+        """
+        사용자 id 범위 한 개 처리
+
+        Returns:
+            dict: 샤드 지표 (METRIC_NAMES)
+        """
+        from ..push_service import REMINDER_BODY, REMINDER_TITLE, dispatch_push
+
+        bucket = cls.bucket_queryset(start_time, end_time).filter(
+            user_id__gte=start_id, user_id__lte=end_id,
+        )
+        due = bucket.filter(cls.not_written_today(today))
+        scanned = bucket.count()
+        due_count = due.count()
+        notified = due.filter(
+            Exists(PushToken.objects.filter(user_id=OuterRef('user_id'), is_active=True))
+        ).count()
+
+        tokens = PushToken.objects.filter(
+            is_active=True,
+            user_id__in=due.values('user_id'),
+        ).order_by('id').values_list('token', flat=True)
+        result = dispatch_push(
+            tokens.iterator(chunk_size=2000),
+            REMINDER_TITLE, REMINDER_BODY, {'type': 'diary_reminder'},
+        )
+
+        metrics = {
+            'scanned': scanned,
+            'skipped': scanned - due_count,
+            'notified': notified,
+            'sent': result['sent'],
+            'failed': result['failed'],
+            'deactivated': result['deactivated'],
+        }
+        cls.record_metrics(run_id, metrics)
+        return metrics
+
+    @staticmethod
+    def record_metrics(run_id, metrics):
+        """실행 지표 누적 (샤드가 여러 워커에서 동시에 끝나도 원자적으로 증가)"""
+        for name in METRIC_NAMES:
+            key = f"reminder:{run_id}:{name}"
+            cache.add(key, 0, METRICS_TTL)
+            if metrics.get(name):
+                cache.incr(key, metrics[name])
+        key = f"reminder:{run_id}:shards_done"
+        cache.add(key, 0, METRICS_TTL)
+        cache.incr(key)
+
+    @staticmethod
+    def get_metrics(run_id=None) -> dict:
+        """실행 지표 (run_id 생략 시 마지막 실행)"""
+        run_id = run_id or cache.get('reminder:last_run')
+        if not run_id:
+            return {}
+        names = [*METRIC_NAMES, 'shards_done']
+        values = cache.get_many([f"reminder:{run_id}:{name}" for name in names])
+        metrics = {name: values.get(f"reminder:{run_id}:{name}", 0) for name in names}
+        metrics['run_id'] = run_id
+        metrics['shards'] = cache.get(f"reminder:shards:{run_id}", 0)
+        return metrics
@@ -1,8 +1,14 @@
-from django.db.models import Count
+from collections import defaultdict
 from django.utils import timezone
 from datetime import timedelta
 from django.conf import settings
 from ..models import Diary
+from .aggregate_service import EmotionAggregateService
+
+EMOTION_EMOJIS = {
+    'happy': '😊', 'sad': '😢', 'angry': '😡', 'anxious': '😰',
+    'peaceful': '😌', 'excited': '🥳', 'tired': '😴', 'love': '🥰',
+}
 
 class ReportService:
     @staticmethod
@@ -18,21 +24,20 @@ class ReportService:
             period_label = '일주일'
             recommended_count = 7
         
-        # 해당 기간 일기 조회
-        diaries = Diary.objects.filter(
-            user=user,
-            created_at__gte=start_date,
-            emotion__isnull=False
-        )
+        # 감정별 통계 (일별 집계 테이블에서 조회)
+        rows = EmotionAggregateService.get_rows(user, start_date=timezone.localdate(start_date))
+        counts = {}
+        for row in rows:
+            if row['emotion']:
+                counts[row['emotion']] = counts.get(row['emotion'], 0) + row['count']
+        emotion_counts = [
+            {'emotion': emotion, 'count': count}
+            for emotion, count in sorted(counts.items(), key=lambda item: -item[1])
+        ]
         
-        total_count = diaries.count()
+        total_count = sum(counts.values())
         data_sufficient = total_count >= recommended_count
         
-        # 감정별 통계
-        emotion_counts = diaries.values('emotion').annotate(
-            count=Count('emotion')
-        ).order_by('-count')
-        
         emotion_labels = {
             'happy': '행복', 'sad': '슬픔', 'angry': '화남', 'anxious': '불안',
             'peaceful': '평온', 'excited': '신남', 'tired': '피곤', 'love': '사랑',
@@ -63,6 +68,11 @@ class ReportService:
             # AI 인사이트 생성 (SummaryService 활용)
             try:
                 from ..services.summary_service import SummaryService
+                diaries = Diary.objects.filter(
+                    user=user,
+                    created_at__gte=start_date,
+                    emotion__isnull=False
+                )
                 insight = SummaryService.generate_report_insight(diaries, period_label)
             except Exception:
                 # AI 분석 실패 시 기본 멘트
@@ -85,30 +95,29 @@ class ReportService:
     @staticmethod
     def get_calendar_data(user, year, month):
         """캘린더 데이터 생성"""
-        # 해당 월의 일기 조회 (본인 것만!)
-        diaries = Diary.objects.filter(
+        # 날짜별 개수/감정은 일별 집계에서 조회
+        rows = EmotionAggregateService.get_rows(user, year=year, month=month)
+        grouped = EmotionAggregateService.group_by_date(rows)
+        
+        # 상세 이동용 일기 ID 목록 (필요한 컬럼만 조회)
+        diary_ids = defaultdict(list)
+        for diary_id, created_at in Diary.objects.filter(
             user=user,
             created_at__year=year,
             created_at__month=month
-        ).order_by('created_at')
+        ).order_by('created_at').values_list('id', 'created_at'):
+            diary_ids[timezone.localdate(created_at)].append(diary_id)
         
-        # 날짜별 요약 생성
+        # 날짜별 요약 생성 (여러 일기가 있으면 가장 많이 기록된 감정 사용)
         days = {}
-        for diary in diaries:
-            date_str = diary.created_at.strftime('%Y-%m-%d')
-            if date_str not in days:
-                days[date_str] = {
-                    'count': 0,
-                    'emotion': diary.emotion,
-                    'emoji': diary.get_emotion_display_emoji() if diary.emotion else '',
-                    'diary_ids': []
-                }
-            days[date_str]['count'] += 1
-            days[date_str]['diary_ids'].append(diary.id)
-            # 여러 일기가 있으면 마지막 일기의 감정 사용
-            if diary.emotion:
-                days[date_str]['emotion'] = diary.emotion
-                days[date_str]['emoji'] = diary.get_emotion_display_emoji()
+        for date, info in grouped.items():
+            emotion = EmotionAggregateService.dominant(info['emotions'])
+            days[date.strftime('%Y-%m-%d')] = {
+                'count': info['count'],
+                'emotion': emotion,
+                'emoji': EMOTION_EMOJIS.get(emotion, ''),
+                'diary_ids': diary_ids.get(date, []),
+            }
         
         return {
             'year': year,
@@ -119,33 +128,30 @@ class ReportService:
     @staticmethod
     def get_annual_report(user, year):
         """연간 리포트 데이터 생성"""
-        # 해당 연도의 일기 조회
-        diaries = Diary.objects.filter(
-            user=user,
-            created_at__year=year
-        )
+        # 해당 연도의 일별 집계 조회
+        rows = EmotionAggregateService.get_rows(user, year=year)
+        
+        total_count = sum(row['count'] for row in rows)
         
-        total_count = diaries.count()
+        # 월별 / 연간 감정 집계
+        month_counts = defaultdict(int)
+        month_emotions = defaultdict(dict)
+        annual_counts = {}
+        for row in rows:
+            month = row['date'].month
+            month_counts[month] += row['count']
+            if row['emotion']:
+                emotions = month_emotions[month]
+                emotions[row['emotion']] = emotions.get(row['emotion'], 0) + row['count']
+                annual_counts[row['emotion']] = annual_counts.get(row['emotion'], 0) + row['count']
         
         # 월별 통계
         monthly_stats = []
         for month in range(1, 13):
-            month_diaries = diaries.filter(created_at__month=month)
-            month_count = month_diaries.count()
-            
-            # 해당 월의 주요 감정
-            dominant_emotion = None
-            if month_count > 0:
-                emotion_counts = month_diaries.filter(emotion__isnull=False).values('emotion').annotate(
-                    count=Count('emotion')
-                ).order_by('-count').first()
-                if emotion_counts:
-                    dominant_emotion = emotion_counts['emotion']
-            
             monthly_stats.append({
                 'month': month,
-                'count': month_count,
-                'dominant_emotion': dominant_emotion
+                'count': month_counts[month],
+                'dominant_emotion': EmotionAggregateService.dominant(month_emotions[month]),
             })
         
         # 연간 감정 통계
@@ -154,9 +160,10 @@ class ReportService:
             'peaceful': '평온', 'excited': '신남', 'tired': '피곤', 'love': '사랑',
         }
         
-        annual_emotions = diaries.filter(emotion__isnull=False).values('emotion').annotate(
-            count=Count('emotion')
-        ).order_by('-count')
+        annual_emotions = [
+            {'emotion': emotion, 'count': count}
+            for emotion, count in sorted(annual_counts.items(), key=lambda item: -item[1])
+        ]
         
         emotion_stats = []
         for item in annual_emotions:
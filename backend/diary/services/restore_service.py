@@ -0,0 +1,480 @@
+"""
+백업 파일 복원 서비스
+- 업로드 파일을 통째로 읽지 않고 섹션(tags / diaries / templates) 배열을 항목 단위로 스트리밍 파싱
+- CHUNK_SIZE 단위로 검증 -> 기존 데이터 한 번에 조회(중복 판정) -> bulk_create / bulk_update
+- 청크마다 별도 트랜잭션으로 커밋하고 같은 트랜잭션에서 체크포인트 저장 (중단 시 이어서 복원)
+- 큰 파일은 ExportJob(kind=restore) 으로 Celery 워커에서 실행하며 진행률 기록
+
+bulk 저장은 Diary 시그널을 거치지 않으므로 블라인드 인덱스 / 임베딩 / 키워드 추출 /
+감정 집계는 청크 단위로 직접 갱신합니다.
+"""
+import logging
+import os
+import re
+import uuid
+from datetime import datetime, time as dt_time
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_time
+
+from ..cache_utils import invalidate_user_cache
+from ..encryption import EncryptionError, get_encryption_service
+from ..models import Diary, DiaryTemplate, ExportJob, Tag, UserPreference
+from ..utils.json_stream import JSONStreamError, iter_array, read_value
+from .aggregate_service import EmotionAggregateService
+from .blind_index_service import BlindIndexService
+from .export_job_service import get_export_job_config
+
+logger = logging.getLogger('diary')
+
+DEFAULT_RESTORE = {
+    'CHUNK_SIZE': 500,                 # 한 트랜잭션에서 검증/저장하는 항목 수
+    'SYNC_MAX_BYTES': 1024 * 1024,     # 이 크기 이하의 업로드는 요청 안에서 바로 복원
+}
+
+# 복원 순서 (체크포인트의 section 값)
+SECTIONS = ('tags', 'diaries', 'templates')
+
+_HEX_COLOR = re.compile(r'^#[0-9A-Fa-f]{6}$')
+
+EMOTIONS = {value for value, _ in Diary.EMOTION_CHOICES}
+TEMPLATE_CATEGORIES = {value for value, _ in DiaryTemplate.CATEGORY_CHOICES}
+THEMES = {value for value, _ in UserPreference.THEME_CHOICES}
+LANGUAGES = {value for value, _ in UserPreference.LANGUAGE_CHOICES}
+PREFERENCE_FLAGS = (
+    'push_enabled', 'daily_reminder_enabled', 'auto_emotion_analysis', 'show_location',
+)
+
+# 이전 백업 형식의 설정 키
+LEGACY_PREFERENCE_KEYS = {
+    'notification_enabled': 'push_enabled',
+    'reminder_time': 'daily_reminder_time',
+}
+
+
+def get_restore_config() -> dict:
+    return {**DEFAULT_RESTORE, **getattr(settings, 'RESTORE', {})}
+
+
+class BackupFormatError(ValueError):
+    """복원할 수 없는 백업 파일"""
+    pass
+
+
+def _chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _text(value, max_length=None):
+    if value is None:
+        return ''
+    value = str(value).strip()
+    return value[:max_length] if max_length else value
+
+
+def _clean_datetime(value):
+    """ISO 문자열 -> aware datetime (없으면 현재 시각, 잘못된 값이면 None)"""
+    if not value:
+        return timezone.now()
+    parsed = parse_datetime(str(value)) if not isinstance(value, datetime) else value
+    if parsed is None:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _clean_float(value):
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clean_diary(item):
+    """백업 일기 항목 검증 (잘못된 항목이면 None)"""
+    if not isinstance(item, dict):
+        return None
+    title = _text(item.get('title'))
+    if not title or len(title) > 200:
+        return None
+    created_at = _clean_datetime(item.get('created_at'))
+    if created_at is None:
+        return None
+
+    emotion = item.get('emotion') or None
+    if emotion is not None and emotion not in EMOTIONS:
+        emotion = None
+    score = item.get('emotion_score')
+    if score is not None:
+        try:
+            score = int(score)
+        except (TypeError, ValueError):
+            score = None
+        else:
+            score = score if 0 <= score <= 100 else None
+
+    return {
+        'title': title,
+        'content': item.get('content') if isinstance(item.get('content'), str) else '',
+        'emotion': emotion,
+        'emotion_score': score,
+        'location_name': _text(item.get('location_name'), 200) or None,
+        'latitude': _clean_float(item.get('latitude')),
+        'longitude': _clean_float(item.get('longitude')),
+        'created_at': created_at,
+    }
+
+
+class RestoreService:
+    """백업 파일(JSON) 복원 - 요청 안에서 바로 실행하거나 ExportJob 으로 실행"""
+
+    def __init__(self, user, fileobj, overwrite=False, chunk_size=None, job=None):
+        self.user = user
+        self.fileobj = fileobj
+        self.overwrite = overwrite
+        self.chunk_size = chunk_size or get_restore_config()['CHUNK_SIZE']
+        self.job = job
+        self.state = {
+            'cleared': False,
+            'section': SECTIONS[0],
+            'offset': 0,
+            'processed': 0,
+            'counts': {'tags': 0, 'diaries': 0, 'updated': 0, 'templates': 0, 'skipped': 0},
+        }
+        if job and job.checkpoint:
+            self.state.update(job.checkpoint)
+
+    # ------------------------------------------------------------------
+    # 파일 검증
+    # ------------------------------------------------------------------
+    @staticmethod
+    def validate(fileobj):
+        """메타데이터(version) 확인"""
+        try:
+            metadata = read_value(fileobj, 'metadata')
+        except JSONStreamError as e:
+            raise BackupFormatError('올바른 JSON 파일이 아닙니다.') from e
+        if not isinstance(metadata, dict) or 'version' not in metadata:
+            raise BackupFormatError('올바른 백업 파일 형식이 아닙니다.')
+        return metadata
+
+    @staticmethod
+    def count_items(fileobj) -> int:
+        """복원 대상 항목 수 (진행률 계산용, 항목을 하나씩 세므로 메모리 사용은 일정)"""
+        return sum(sum(1 for _ in iter_array(fileobj, section)) for section in SECTIONS)
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def run(self):
+        """
+        체크포인트 이후부터 복원
+
+        Returns:
+            dict: counts (tags / diaries / updated / templates / skipped)
+        """
+        if self.overwrite and not self.state['cleared']:
+            with transaction.atomic():
+                Diary.objects.filter(user=self.user).delete()
+                Tag.objects.filter(user=self.user).delete()
+                DiaryTemplate.objects.filter(user=self.user).delete()
+                self.state['cleared'] = True
+                self._save_checkpoint()
+
+        handlers = {
+            'tags': self._restore_tags,
+            'diaries': self._restore_diaries,
+            'templates': self._restore_templates,
+        }
+        start = SECTIONS.index(self.state['section']) if self.state['section'] in SECTIONS else len(SECTIONS)
+        for section in SECTIONS[start:]:
+            offset = self.state['offset'] if section == self.state['section'] else 0
+            items = islice(iter_array(self.fileobj, section), offset, None)
+            for chunk in _chunks(items, self.chunk_size):
+                with transaction.atomic():
+                    handlers[section](chunk)
+                    self.state.update(
+                        section=section,
+                        offset=offset + len(chunk),
+                        processed=self.state['processed'] + len(chunk),
+                    )
+                    offset += len(chunk)
+                    self._save_checkpoint()
+            # 다음 섹션 시작
+            self.state.update(section=self._next_section(section), offset=0)
+
+        with transaction.atomic():
+            self._restore_preferences(read_value(self.fileobj, 'preferences'))
+            EmotionAggregateService.rebuild(self.user.id)
+        # 리포트/캘린더/히트맵 등 사용자 캐시 세대 교체
+        transaction.on_commit(lambda: invalidate_user_cache(self.user.id))
+        return self.state['counts']
+
+    @staticmethod
+    def _next_section(section):
+        index = SECTIONS.index(section) + 1
+        return SECTIONS[index] if index < len(SECTIONS) else 'done'
+
+    def _save_checkpoint(self):
+        if self.job is None:
+            return
+        ExportJob.objects.filter(pk=self.job.pk).update(
+            checkpoint=self.state,
+            processed=self.state['processed'],
+            updated_at=timezone.now(),
+        )
+
+    # ------------------------------------------------------------------
+    # 섹션별 복원 (청크 단위)
+    # ------------------------------------------------------------------
+    def _restore_tags(self, items):
+        counts = self.state['counts']
+        wanted = {}
+        for item in items:
+            name = _text(item.get('name'), 50) if isinstance(item, dict) else ''
+            if not name:
+                counts['skipped'] += 1
+                continue
+            color = _text(item.get('color'))
+            wanted.setdefault(name, color if _HEX_COLOR.match(color) else '#6366F1')
+
+        existing = set(
+            Tag.objects.filter(user=self.user, name__in=wanted).values_list('name', flat=True)
+        )
+        Tag.objects.bulk_create(
+            [Tag(user=self.user, name=name, color=color) for name, color in wanted.items() if name not in existing],
+            ignore_conflicts=True,
+        )
+        counts['tags'] += len(wanted)
+
+    def _restore_diaries(self, items):
+        counts = self.state['counts']
+        cleaned = {}
+        for item in items:
+            record = clean_diary(item)
+            if record is None:
+                counts['skipped'] += 1
+                continue
+            # 같은 청크 안의 중복은 마지막 항목 기준
+            cleaned[(record['title'], record['created_at'])] = record
+        if not cleaned:
+            return
+
+        service = get_encryption_service()
+        records = list(cleaned.values())
+        encrypted = service.encrypt_many([record['content'] for record in records])
+
+        # 중복 판정: (제목, 작성 시각) 이 같은 기존 일기는 갱신
+        existing = {
+            (diary.title, diary.created_at): diary
+            for diary in Diary.objects.filter(
+                user=self.user, created_at__in={record['created_at'] for record in records},
+            ).only('id', 'user_id', 'title', 'created_at')
+        }
+
+        now = timezone.now()
+        to_create, to_update, plains = [], [], {}
+        for record, cipher_text in zip(records, encrypted):
+            if isinstance(cipher_text, EncryptionError):
+                logger.error(f"[Restore] Failed to encrypt diary '{record['title']}': {cipher_text}")
+                counts['skipped'] += 1
+                continue
+            diary = existing.get((record['title'], record['created_at']))
+            if diary is None:
+                diary = Diary(user=self.user)
+                to_create.append(diary)
+            else:
+                to_update.append(diary)
+            for field, value in record.items():
+                setattr(diary, field, value)
+            diary.content = cipher_text
+            diary.is_encrypted = service.is_enabled
+            diary.encryption_version = service.latest_version
+            diary.updated_at = now
+            plains[id(diary)] = record['content']
+
+        if to_create:
+            created_at = [diary.created_at for diary in to_create]
+            Diary.objects.bulk_create(to_create)
+            # auto_now_add 가 bulk_create 에서 created_at 을 덮어쓰므로 백업 값으로 되돌림
+            for diary, value in zip(to_create, created_at):
+                diary.created_at = value
+            Diary.objects.bulk_update(to_create, ['created_at'])
+        if to_update:
+            Diary.objects.bulk_update(to_update, [
+                'content', 'is_encrypted', 'encryption_version', 'emotion', 'emotion_score',
+                'location_name', 'latitude', 'longitude', 'updated_at',
+            ])
+            from ..utils.decryption_cache import get_decryption_cache
+            cache = get_decryption_cache()
+            for diary in to_update:
+                cache.invalidate(diary.pk)
+
+        touched = to_create + to_update
+        BlindIndexService.index_many([(diary, plains[id(diary)]) for diary in touched])
+        diary_ids = [diary.pk for diary in touched]
+        transaction.on_commit(lambda: self._after_diaries(diary_ids))
+
+        counts['diaries'] += len(to_create)
+        counts['updated'] += len(to_update)
+
+    @staticmethod
+    def _after_diaries(diary_ids):
+        """커밋 후 임베딩 / 키워드 추출 (시그널 대신 청크 단위 배치)"""
+        from ..tasks import embed_diaries_task, extract_keywords_batch_task
+        from .embedding_service import EmbeddingService, get_batch_config
+
+        if get_batch_config()['ENABLED']:
+            embed_diaries_task.delay(diary_ids)
+        else:
+            try:
+                EmbeddingService.embed_diaries(diary_ids)
+            except Exception as e:
+                logger.error(f"[Restore] Error embedding {len(diary_ids)} restored diaries: {e}")
+        extract_keywords_batch_task.delay(diary_ids)
+
+    def _restore_templates(self, items):
+        counts = self.state['counts']
+        wanted = {}
+        for item in items:
+            if not isinstance(item, dict):
+                counts['skipped'] += 1
+                continue
+            # 이전 백업 형식은 name 대신 title
+            name = _text(item.get('name') or item.get('title'), 50)
+            content = item.get('content')
+            if not name or not isinstance(content, str):
+                counts['skipped'] += 1
+                continue
+            category = item.get('category')
+            wanted.setdefault(name, DiaryTemplate(
+                user=self.user,
+                template_type='user',
+                category=category if category in TEMPLATE_CATEGORIES else 'custom',
+                name=name,
+                emoji=_text(item.get('emoji'), 10) or '📝',
+                description=_text(item.get('description'), 200),
+                content=content,
+            ))
+
+        existing = set(
+            DiaryTemplate.objects.filter(user=self.user, name__in=wanted).values_list('name', flat=True)
+        )
+        DiaryTemplate.objects.bulk_create(
+            [template for name, template in wanted.items() if name not in existing]
+        )
+        counts['templates'] += len(wanted)
+
+    def _restore_preferences(self, data):
+        if not isinstance(data, dict) or not data:
+            return
+        data = {LEGACY_PREFERENCE_KEYS.get(key, key): value for key, value in data.items()}
+
+        values = {}
+        if data.get('theme') in THEMES:
+            values['theme'] = data['theme']
+        if data.get('language') in LANGUAGES:
+            values['language'] = data['language']
+        for flag in PREFERENCE_FLAGS:
+            if isinstance(data.get(flag), bool):
+                values[flag] = data[flag]
+        reminder_time = data.get('daily_reminder_time')
+        if isinstance(reminder_time, str):
+            reminder_time = parse_time(reminder_time)
+        if isinstance(reminder_time, dt_time):
+            values['daily_reminder_time'] = reminder_time
+
+        if values:
+            UserPreference.objects.update_or_create(user=self.user, defaults=values)
+
+    # ------------------------------------------------------------------
+    # 동기 복원 / 작업
+    # ------------------------------------------------------------------
+    @classmethod
+    def restore(cls, user, fileobj, overwrite=False):
+        """
+        요청 안에서 바로 복원 (작은 파일, 전체를 하나의 트랜잭션으로 처리)
+
+        Raises:
+            BackupFormatError: 백업 형식이 아님
+        """
+        cls.validate(fileobj)
+        try:
+            with transaction.atomic():
+                return cls(user, fileobj, overwrite=overwrite).run()
+        except JSONStreamError as e:
+            raise BackupFormatError('올바른 JSON 파일이 아닙니다.') from e
+
+    @classmethod
+    def create_job(cls, user, upload, overwrite=False):
+        """
+        업로드 파일을 작업 디렉토리에 저장하고 복원 작업 생성 (restore 큐)
+
+        Raises:
+            BackupFormatError: 백업 형식이 아님
+        """
+        from ..tasks import restore_backup_task
+
+        cls.validate(upload)
+        job_dir = get_export_job_config()['DIR']
+        os.makedirs(job_dir, exist_ok=True)
+        path = os.path.join(job_dir, f"restore_{user.pk}_{uuid.uuid4().hex}.json")
+        upload.seek(0)
+        with open(path, 'wb') as f:
+            for block in upload.chunks():
+                f.write(block)
+
+        job = ExportJob.objects.create(
+            user=user,
+            kind=ExportJob.Kind.RESTORE,
+            source_path=path,
+            options={'overwrite': overwrite},
+        )
+        transaction.on_commit(lambda: restore_backup_task.delay(job.id))
+        return job
+
+    @classmethod
+    def run_job(cls, job_id):
+        """복원 작업 실행 (Celery 워커, 실패 후 재실행하면 체크포인트부터 이어서 진행)"""
+        job = ExportJob.objects.select_related('user').get(pk=job_id, kind=ExportJob.Kind.RESTORE)
+        if job.status == ExportJob.Status.COMPLETED:
+            return job
+
+        try:
+            with open(job.source_path, 'rb') as f:
+                total = job.total or cls.count_items(f)
+                ExportJob.objects.filter(pk=job.pk).update(
+                    status=ExportJob.Status.RUNNING, total=total, error='', updated_at=timezone.now(),
+                )
+                counts = cls(
+                    job.user, f, overwrite=job.options.get('overwrite', False), job=job,
+                ).run()
+        except Exception as e:
+            logger.error(f"[Restore] Job {job.pk} failed: {e}")
+            ExportJob.objects.filter(pk=job.pk).update(
+                status=ExportJob.Status.FAILED, error=str(e)[:1000], updated_at=timezone.now(),
+            )
+            raise
+
+        if os.path.exists(job.source_path):
+            os.remove(job.source_path)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.Status.COMPLETED,
+            source_path='',
+            completed_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        logger.info(f"[Restore] Job {job.pk} restored {counts}")
+        job.refresh_from_db()
+        return job
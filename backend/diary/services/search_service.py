@@ -0,0 +1,126 @@
+"""
+일기 검색 서비스
+- PostgreSQL: title + search_keywords 전문 검색(tsvector, 'simple' 설정) + 접두어 매칭
+  * NounExtractor 로 검색어에서 명사를 뽑아 '명사:*' 형태로 질의 (한국어 어절 변형 대응)
+  * pg_trgm GIN 인덱스로 부분 문자열(icontains) 매칭도 인덱스 스캔
+  * ts_rank 기반 관련도 정렬 (sort=relevance)
+- SQLite(테스트/개발): icontains 폴백
+- 태그 검색은 JOIN + DISTINCT 대신 EXISTS 서브쿼리
+- 본문 키워드는 블라인드 인덱스로 매칭 (user 를 넘긴 경우, search_keywords 평문은 이전 일기용)
+
+인덱스는 migrations/0023_search_indexes.py 에서 PostgreSQL 일 때만 생성합니다.
+"""
+import logging
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, Exists, FloatField, OuterRef, Q, Value
+from django.db.models.expressions import RawSQL
+
+from ..models import Diary, DiaryTag
+from .blind_index_service import BlindIndexService
+
+logger = logging.getLogger(__name__)
+
+# 0023_search_indexes.py 의 diary_search_tsv_idx 표현식과 반드시 동일해야 인덱스를 사용함
+SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple'::regconfig, "
+    "COALESCE({table}.title, '') || ' ' || COALESCE({table}.search_keywords, ''))"
+)
+
+_TERM_PATTERN = re.compile(r'[^\w]+', re.UNICODE)
+
+
+def is_full_text_search_available() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+class DiarySearchService:
+    """일기 queryset 에 검색 조건을 적용"""
+
+    @staticmethod
+    def query_terms(query: str) -> list:
+        """
+        검색어를 전문 검색 토큰으로 변환
+        명사 추출이 되면 명사를, 아니면 공백 단위 단어를 사용
+        """
+        from .analysis_service import NounExtractor
+
+        nouns = NounExtractor().extract_nouns(query)
+        words = nouns.split() if nouns else query.split()
+        terms = [_TERM_PATTERN.sub('', w).lower() for w in words]
+        return list(dict.fromkeys(t for t in terms if t))
+
+    @classmethod
+    def _tsquery(cls, query: str) -> str:
+        """'term1:* & term2:*' 형태의 접두어 tsquery"""
+        return ' & '.join(f"{term}:*" for term in cls.query_terms(query))
+
+    @staticmethod
+    def _vector_sql():
+        return SEARCH_VECTOR_SQL.format(table=connection.ops.quote_name(Diary._meta.db_table))
+
+    @staticmethod
+    def keyword_match(query: str, user=None):
+        """본문 키워드 조건 (user 가 있으면 블라인드 인덱스 토큰 일치, 없으면 평문 키워드 부분 일치)"""
+        if user is None:
+            return Q(search_keywords__icontains=query)
+        return BlindIndexService.keyword_match(user, query)
+
+    @classmethod
+    def text_match(cls, query: str, user=None):
+        """
+        제목 + 검색 키워드 매칭 조건
+        PostgreSQL 은 전문 검색(접두어) 또는 부분 일치, 그 외에는 부분 일치만 사용
+        """
+        substring = Q(title__icontains=query) | cls.keyword_match(query, user)
+        tsquery = cls._tsquery(query) if is_full_text_search_available() else ''
+        if not tsquery:
+            return substring
+        matches = RawSQL(
+            f"{cls._vector_sql()} @@ to_tsquery('simple'::regconfig, %s)", (tsquery,),
+            output_field=BooleanField(),
+        )
+        return Q(matches) | substring
+
+    @classmethod
+    def search_text(cls, queryset, query: str, rank=False, user=None):
+        """
+        제목 + 검색 키워드 검색
+
+        Args:
+            rank: True 면 관련도(search_rank) 어노테이션 추가 (PostgreSQL)
+                  관련도는 제목/평문 키워드 기준이며 블라인드 인덱스로만 일치한 일기는 0
+            user: 본문 블라인드 인덱스를 조회할 사용자
+        """
+        queryset = queryset.filter(cls.text_match(query, user))
+        if not rank:
+            return queryset
+
+        tsquery = cls._tsquery(query) if is_full_text_search_available() else ''
+        if not tsquery:
+            # 전문 검색을 쓸 수 없으면 관련도 없이 최신순
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset.annotate(search_rank=RawSQL(
+            f"ts_rank({cls._vector_sql()}, to_tsquery('simple'::regconfig, %s))", (tsquery,),
+            output_field=FloatField(),
+        ))
+
+    @classmethod
+    def search_keywords(cls, queryset, query: str, user=None):
+        """본문 키워드 검색 (블라인드 인덱스 / 평문 키워드는 PostgreSQL 에서 trigram 인덱스 사용)"""
+        return queryset.filter(cls.keyword_match(query, user))
+
+    @staticmethod
+    def tag_match(query: str):
+        """태그 이름 부분 일치 EXISTS 조건 (DISTINCT 불필요)"""
+        return Exists(DiaryTag.objects.filter(diary=OuterRef('pk'), tag__name__icontains=query))
+
+    @classmethod
+    def search_tags(cls, queryset, query: str):
+        return queryset.filter(cls.tag_match(query))
+
+    @classmethod
+    def search_title_or_tags(cls, queryset, query: str):
+        """제목 부분 일치 또는 태그 일치"""
+        return queryset.filter(Q(title__icontains=query) | cls.tag_match(query))
@@ -1,34 +1,72 @@
 from datetime import date, timedelta
+from django.utils import timezone
 from ..models import UserPreference
+from ..utils.preference_cache import get_snapshot, store_snapshot
+
+STREAK_FIELDS = ['current_streak', 'max_streak', 'last_diary_date', 'updated_at']
+
 
 class StreakService:
     @staticmethod
-    def update_user_streak(user):
+    def next_streak(last_diary_date, current_streak, max_streak, today):
         """
-        Update the user's streak when a diary is created.
+        Compute the streak after writing a diary today.
         Returns:
             tuple: (current_streak: int, max_streak: int)
         """
-        preference = UserPreference.get_or_create_for_user(user)
-        today = date.today()
-        
-        if preference.last_diary_date is None:
+        if last_diary_date is None:
             # First diary
-            preference.current_streak = 1
-            preference.max_streak = 1
-        elif preference.last_diary_date == today:
+            return 1, max(max_streak, 1)
+        if last_diary_date == today:
             # Already written today - no change
-            pass
-        elif preference.last_diary_date == today - timedelta(days=1):
+            return current_streak, max_streak
+        if last_diary_date == today - timedelta(days=1):
             # Written yesterday + today = consecutive
-            preference.current_streak += 1
-            if preference.current_streak > preference.max_streak:
-                preference.max_streak = preference.current_streak
-        else:
-            # Streak broken - reset to 1
-            preference.current_streak = 1
-        
+            current_streak += 1
+            return current_streak, max(max_streak, current_streak)
+        # Streak broken - reset to 1
+        return 1, max_streak
+
+    @staticmethod
+    def update_user_streak(user):
+        """
+        Update the user's streak when a diary is created.
+        Reads the cached preference snapshot and writes with a single
+        conditional UPDATE; falls back to load + save if the row is missing
+        or changed since the snapshot was taken.
+        Returns:
+            tuple: (current_streak: int, max_streak: int)
+        """
+        today = date.today()
+        snapshot = get_snapshot(user.pk)
+
+        if snapshot['exists']:
+            if snapshot['last_diary_date'] == today:
+                return snapshot['current_streak'], snapshot['max_streak']
+
+            current, maximum = StreakService.next_streak(
+                snapshot['last_diary_date'], snapshot['current_streak'], snapshot['max_streak'], today
+            )
+            updated = UserPreference.objects.filter(
+                user_id=user.pk,
+                last_diary_date=snapshot['last_diary_date'],
+                current_streak=snapshot['current_streak'],
+                max_streak=snapshot['max_streak'],
+            ).update(current_streak=current, max_streak=maximum, last_diary_date=today, updated_at=timezone.now())
+            if updated:
+                store_snapshot(user.pk, {
+                    **snapshot, 'current_streak': current, 'max_streak': maximum, 'last_diary_date': today,
+                })
+                return current, maximum
+
+        preference = UserPreference.get_or_create_for_user(user)
+        if preference.last_diary_date == today:
+            return preference.current_streak, preference.max_streak
+
+        preference.current_streak, preference.max_streak = StreakService.next_streak(
+            preference.last_diary_date, preference.current_streak, preference.max_streak, today
+        )
         preference.last_diary_date = today
-        preference.save()
-        
+        preference.save(update_fields=STREAK_FIELDS)
+
         return preference.current_streak, preference.max_streak
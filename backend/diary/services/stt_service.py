@@ -1,9 +1,11 @@
 import logging
 import time
 from django.conf import settings
-from google import genai
 from django.core.files.base import File
 
+from .gemini_client import GeminiClientError, get_gemini_client
+from ..utils.circuit_breaker import circuit_breaker
+
 logger = logging.getLogger('diary')
 
 
@@ -40,7 +42,7 @@ class STTService:
     def __init__(self):
         self.client = None
         if settings.GEMINI_API_KEY:
-            self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+            self.client = get_gemini_client()
         else:
             logger.warning("GEMINI_API_KEY not configured - STT will not work")
             
@@ -60,49 +62,16 @@ class STTService:
             return None
             
         try:
-            # Get file path
-            if hasattr(voice_file, 'path'):
-                audio_path = voice_file.path
-            elif hasattr(voice_file, 'temporary_file_path'):
-                audio_path = voice_file.temporary_file_path()
-            else:
-                # In-memory file - save temporarily
-                import tempfile
-                import os
-                
-                ext = getattr(voice_file, 'name', 'audio.wav').split('.')[-1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{ext}') as tmp:
-                    for chunk in voice_file.chunks():
-                        tmp.write(chunk)
-                    audio_path = tmp.name
+            audio_path = self._get_audio_path(voice_file)
                     
             # Prepare Prompt
             prompt_lang = self.SUPPORTED_LANGUAGES.get(language, '한국어')
             prompt = f"이 오디오 파일을 {prompt_lang}로 정확하게 받아쓰기해주세요. 텍스트만 출력하세요."
 
-            # Upload audio file
-            logger.info(f"Uploading audio file for transcription: {audio_path}")
-            audio_file_ref = self.client.files.upload(file=audio_path)
-            
-            # Wait for processing
-            max_wait = 30  # 최대 30초 대기
-            wait_time = 0
-            while audio_file_ref.state.name == "PROCESSING" and wait_time < max_wait:
-                time.sleep(1)
-                wait_time += 1
-                audio_file_ref = self.client.files.get(name=audio_file_ref.name)
-
-            if audio_file_ref.state.name == "FAILED":
-                logger.error("Gemini file processing failed")
+            response = self._run_audio_prompt(audio_path, prompt)
+            if response is None:
                 return None
             
-            # Generate transcription using Native Audio model
-            logger.info(f"Transcribing with model: {self.AUDIO_MODEL}")
-            response = self.client.models.generate_content(
-                model=self.AUDIO_MODEL,
-                contents=[prompt, audio_file_ref]
-            )
-            
             result = response.text.strip() if response.text else ""
             logger.info(f"Transcription successful. Length: {len(result)} characters")
             
@@ -121,34 +90,12 @@ class STTService:
             return None
             
         try:
-            # Get file path
-            if hasattr(audio_file, 'path'):
-                audio_path = audio_file.path
-            else:
-                import tempfile
-                ext = getattr(audio_file, 'name', 'audio.wav').split('.')[-1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{ext}') as tmp:
-                    for chunk in audio_file.chunks():
-                        tmp.write(chunk)
-                    audio_path = tmp.name
-            
-            # Upload and translate
-            audio_file_ref = self.client.files.upload(file=audio_path)
-            
-            # Wait for processing
-            max_wait = 30
-            wait_time = 0
-            while audio_file_ref.state.name == "PROCESSING" and wait_time < max_wait:
-                time.sleep(1)
-                wait_time += 1
-                audio_file_ref = self.client.files.get(name=audio_file_ref.name)
-            
+            audio_path = self._get_audio_path(audio_file)
             prompt = "Transcribe and translate this audio to English. Output only the English text."
             
-            response = self.client.models.generate_content(
-                model=self.AUDIO_MODEL,
-                contents=[prompt, audio_file_ref]
-            )
+            response = self._run_audio_prompt(audio_path, prompt)
+            if response is None:
+                return None
             
             return response.text.strip() if response.text else None
             
@@ -156,6 +103,48 @@ class STTService:
             logger.error(f"Translation failed: {e}")
             return None
 
+    @staticmethod
+    def _get_audio_path(audio_file) -> str:
+        """업로드 파일의 로컬 경로 (메모리 파일은 임시 파일로 저장)"""
+        if hasattr(audio_file, 'path'):
+            return audio_file.path
+        if hasattr(audio_file, 'temporary_file_path'):
+            return audio_file.temporary_file_path()
+
+        import tempfile
+        ext = getattr(audio_file, 'name', 'audio.wav').split('.')[-1]
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{ext}') as tmp:
+            for chunk in audio_file.chunks():
+                tmp.write(chunk)
+            return tmp.name
+
+    @circuit_breaker('stt.audio', fallback=lambda *args, **kwargs: None)
+    def _run_audio_prompt(self, audio_path: str, prompt: str):
+        """
+        오디오 업로드 → 처리 대기 → Native Audio 모델 호출
+        (차단 중에는 업로드도 하지 않고 None, 실패는 예외로 올려 차단기에 기록)
+        """
+        # Upload audio file
+        logger.info(f"Uploading audio file: {audio_path}")
+        audio_file_ref = self.client.upload_file(audio_path)
+        
+        # Wait for processing
+        max_wait = 30  # 최대 30초 대기
+        wait_time = 0
+        while audio_file_ref.state.name == "PROCESSING" and wait_time < max_wait:
+            time.sleep(1)
+            wait_time += 1
+            audio_file_ref = self.client.get_file(audio_file_ref.name)
+
+        if audio_file_ref.state.name == "FAILED":
+            raise GeminiClientError("Gemini file processing failed")
+        
+        logger.info(f"Calling audio model: {self.AUDIO_MODEL}")
+        return self.client.generate_content(
+            model=self.AUDIO_MODEL,
+            contents=[prompt, audio_file_ref]
+        )
+
     @classmethod
     def get_supported_languages(cls):
         """지원되는 주요 언어 목록을 반환합니다."""
@@ -1,10 +1,11 @@
 import logging
 from datetime import timedelta
 from django.conf import settings
-from google import genai
 
 from ..models import Diary, DiarySummary
 from .chat_service import ChatService
+from .gemini_client import get_gemini_client
+from ..utils.ai_cache import get_ai_cache
 from ..utils.retry_utils import ai_retry_policy
 
 logger = logging.getLogger(__name__)
@@ -15,10 +16,31 @@ class SummaryService:
     주간/월간 일기를 모아서 요약하고 저장합니다.
     """
     
+    # 스타일별 요약 프롬프트
+    SUMMARY_STYLE_PROMPTS = {
+        'default': """다음 일기 내용을 3줄로 간결하게 요약해주세요.
+- 핵심 내용과 감정을 포함해주세요.
+- 일기의 분위기를 유지해주세요.
+- 요약만 반환하고 다른 설명은 하지 마세요.""",
+        
+        'short': """다음 일기 내용을 한 문장으로 아주 간결하게 요약해주세요.
+- 가장 중요한 핵심만 포함해주세요.
+- 요약만 반환하세요.""",
+        
+        'bullet': """다음 일기 내용의 핵심 포인트를 불릿 형식으로 정리해주세요.
+- 3-5개의 핵심 포인트
+- 각 포인트는 간결하게
+- "• " 기호로 시작하세요."""
+    }
+    
+    # 프롬프트를 바꾸면 올려서 이전 캐시 결과를 무효화
+    SUMMARY_PROMPT_VERSION = 1
+    TITLE_PROMPT_VERSION = 1
+
     @staticmethod
     def _get_client():
-        """Gemini Client 인스턴스 반환"""
-        return genai.Client(api_key=settings.GEMINI_API_KEY)
+        """공유 Gemini 게이트웨이 반환"""
+        return get_gemini_client()
     
     @staticmethod
     def generate_summary(user, period_type, start_date, end_date):
@@ -107,16 +129,22 @@ class SummaryService:
         
         # Retry 적용을 위해 try-except 제거 (상위에서 처리하거나 Retry가 잡음)
         client = SummaryService._get_client()
-        response = client.models.generate_content(
+        response = client.generate_content(
             model=settings.GEMINI_TEXT_MODEL,
             contents=prompt
         )
         return response.text.strip()
 
+    @staticmethod
+    def _summary_operation(style):
+        if style not in SummaryService.SUMMARY_STYLE_PROMPTS:
+            style = 'default'
+        return f'summary:{style}'
+
     @staticmethod
     def summarize_diary(content: str, style: str = 'default') -> dict:
         """
-        단일 일기 내용을 요약합니다.
+        단일 일기 내용을 요약합니다. (같은 내용+스타일은 AI 결과 캐시 재사용)
         """
         logger.debug(f"Summarizing diary content with style: {style}")
         
@@ -129,66 +157,75 @@ class SummaryService:
                 'error': '요약하기에 내용이 너무 짧습니다.'
             }
         
-        # 스타일별 프롬프트 설정
-        style_prompts = {
-            'default': """다음 일기 내용을 3줄로 간결하게 요약해주세요.
-- 핵심 내용과 감정을 포함해주세요.
-- 일기의 분위기를 유지해주세요.
-- 요약만 반환하고 다른 설명은 하지 마세요.""",
-            
-            'short': """다음 일기 내용을 한 문장으로 아주 간결하게 요약해주세요.
-- 가장 중요한 핵심만 포함해주세요.
-- 요약만 반환하세요.""",
-            
-            'bullet': """다음 일기 내용의 핵심 포인트를 불릿 형식으로 정리해주세요.
-- 3-5개의 핵심 포인트
-- 각 포인트는 간결하게
-- "• " 기호로 시작하세요."""
-        }
-        
-        prompt_instruction = style_prompts.get(style, style_prompts['default'])
+        prompt_instruction = SummaryService.SUMMARY_STYLE_PROMPTS.get(
+            style, SummaryService.SUMMARY_STYLE_PROMPTS['default']
+        )
         
         if not settings.GEMINI_API_KEY:
             return {'error': 'Configuration Error'}
 
-        try:
-            client = SummaryService._get_client()
-            response = client.models.generate_content(
+        def _summarize():
+            response = SummaryService._get_client().generate_content(
                 model=settings.GEMINI_TEXT_MODEL,
                 contents=f"{prompt_instruction}\n\n일기 내용:\n{content}"
             )
-            summary = response.text.strip()
-            return {
-                'summary': summary,
-                'original_length': len(content),
-                'summary_length': len(summary),
-                'style': style
-            }
+            return response.text.strip()
+
+        try:
+            summary, cached = get_ai_cache().get_or_compute(
+                SummaryService._summary_operation(style), settings.GEMINI_TEXT_MODEL,
+                SummaryService.SUMMARY_PROMPT_VERSION, content, _summarize,
+            )
+            return SummaryService._summary_result(content, summary, style, cached)
             
         except Exception as e:
             logger.error(f"Gemini API error during summarization: {e}")
             return {'error': str(e)}
 
+    @staticmethod
+    def lookup_cached_summary(content: str, style: str = 'default'):
+        """캐시된 요약 결과 (없으면 None, API 호출 없음)"""
+        summary, hit = get_ai_cache().get(
+            SummaryService._summary_operation(style), settings.GEMINI_TEXT_MODEL,
+            SummaryService.SUMMARY_PROMPT_VERSION, content,
+        )
+        return SummaryService._summary_result(content, summary, style, True) if hit else None
+
+    @staticmethod
+    def _summary_result(content, summary, style, cached):
+        return {
+            'summary': summary,
+            'original_length': len(content),
+            'summary_length': len(summary),
+            'style': style,
+            'cached': cached,
+        }
+
     @staticmethod
     def suggest_title(content: str) -> str:
         """
-        일기 내용을 기반으로 제목을 제안합니다.
+        일기 내용을 기반으로 제목을 제안합니다. (같은 내용은 AI 결과 캐시 재사용)
         """
         if not content or len(content.strip()) < 10:
             return "오늘의 일기"
         
-        try:
-            client = SummaryService._get_client()
+        def _suggest():
             prompt = f"""일기 내용을 보고 적절한 제목을 제안해주세요. 
 내용: {content[:500]}
 규칙: 제목만 반환하세요. 15자 이내로 작성하세요. 다른 말은 하지 마세요."""
             
-            response = client.models.generate_content(
+            response = SummaryService._get_client().generate_content(
                 model=settings.GEMINI_TEXT_MODEL,
                 contents=prompt
             )
-            title = response.text.strip()
-            return title.strip('"\'')
+            return response.text.strip().strip('"\'')
+
+        try:
+            # 제목은 앞 500자만 보므로 키도 같은 범위로
+            title, _ = get_ai_cache().get_or_compute(
+                'title', settings.GEMINI_TEXT_MODEL, SummaryService.TITLE_PROMPT_VERSION, content[:500], _suggest,
+            )
+            return title
             
         except Exception as e:
             logger.error(f"Error suggesting title: {e}")
@@ -231,7 +268,7 @@ User's Diaries:
         
         try:
             client = SummaryService._get_client()
-            response = client.models.generate_content(
+            response = client.generate_content(
                 model=settings.GEMINI_TEXT_MODEL,
                 contents=system_prompt
             )
@@ -1,32 +1,56 @@
-from django.utils import timezone
-from ..models import UserPreference, DiaryImage, Diary
+from ..models import Diary
+from ..utils import rate_limit
 from datetime import date
 
 class UserTierService:
-    @staticmethod
-    def check_image_generation_limit(user):
+    IMAGE_DAILY_LIMIT = 2
+    IMAGE_DAILY_LIMIT_PREMIUM = 10
+
+    @classmethod
+    def check_image_generation_limit(cls, user):
         """
-        Check if the user has reached their daily image generation limit.
+        Check if the user has reached their daily image generation limit (does not consume).
         Returns:
             tuple: (is_allowed: bool, details: dict)
         """
-        today = timezone.now().date()
-        generated_count = DiaryImage.objects.filter(
-            diary__user=user,
-            created_at__date=today
-        ).count()
+        allowed, remaining, limit = rate_limit.check_daily_quota(
+            user.id, 'image_gen', cls.IMAGE_DAILY_LIMIT, cls.IMAGE_DAILY_LIMIT_PREMIUM
+        )
+        return cls._image_limit_result(allowed, limit - remaining, limit)
+
+    @classmethod
+    def consume_image_generation_quota(cls, user, day=None):
+        """
+        Check and consume one image generation in a single atomic call
+        (tier is cached in the quota key, so no DB read after the first request of the day).
+        Returns:
+            tuple: (is_allowed: bool, details: dict)
+        """
+        result = rate_limit.consume_daily_quota(
+            user.id, 'image_gen', cls.IMAGE_DAILY_LIMIT, cls.IMAGE_DAILY_LIMIT_PREMIUM, day=day
+        )
+        return cls._image_limit_result(result.allowed, result.limit - result.remaining, result.limit)
 
-        pref = UserPreference.get_or_create_for_user(user)
-        limit = 10 if pref.is_premium else 2
+    @classmethod
+    def refund_image_generation_quota(cls, user, day=None):
+        """
+        Give back a consumed generation when the request could not be queued or produced no image
+        (pass the day the generation was charged to, so a job finishing after midnight refunds the right day)
+        """
+        return rate_limit.refund_daily_quota(
+            user.id, 'image_gen', default_limit=cls.IMAGE_DAILY_LIMIT, premium_limit=cls.IMAGE_DAILY_LIMIT_PREMIUM,
+            day=day,
+        )
 
-        if generated_count >= limit:
+    @staticmethod
+    def _image_limit_result(allowed, current, limit):
+        if not allowed:
             return False, {
                 'limit': limit,
-                'current': generated_count,
+                'current': current,
                 'message': f"하루 생성 한도({limit}장)를 초과했습니다."
             }
-        
-        return True, {'limit': limit, 'current': generated_count}
+        return True, {'limit': limit, 'current': current}
 
     @staticmethod
     def check_daily_diary_limit(user):
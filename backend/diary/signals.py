@@ -1,31 +1,182 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Diary
-from .services.chat_service import ChatService
+from django.utils import timezone
+from .cache_utils import TAGS_BUCKET, date_buckets, report_buckets, schedule_cache_invalidation
+from .models import Diary, DiaryImage, Tag, UserPreference
+from .services.aggregate_service import EmotionAggregateService
+import logging
 import threading
 
+logger = logging.getLogger('diary')
+
+# 일별 감정 집계에 영향을 주는 필드
+AGGREGATE_FIELDS = {'user', 'user_id', 'created_at', 'emotion', 'emotion_score'}
+
+# 리포트 캐시(AI 인사이트)에 영향을 주는 필드
+REPORT_FIELDS = AGGREGATE_FIELDS | {'content'}
+
+# 임베딩 입력에 포함되는 필드
+EMBEDDING_FIELDS = {'title', 'content', 'emotion'}
+
+
+@receiver(pre_save, sender=Diary)
+def capture_aggregate_snapshot(sender, instance, update_fields=None, **kwargs):
+    """
+    저장 전 DB 상의 감정/날짜 값을 기록해 두었다가 post_save 에서 집계 차이를 반영
+    본문(암호문)이 바뀌었는지도 기록 (리포트 캐시 무효화용)
+    (update_fields 에 관련 필드가 없으면 조회 생략)
+    """
+    instance._aggregate_snapshot = None
+    instance._aggregate_skip = False
+    instance._content_changed = False
+
+    if update_fields is not None:
+        instance._aggregate_skip = not AGGREGATE_FIELDS.intersection(update_fields)
+        if not REPORT_FIELDS.intersection(update_fields):
+            return
+
+    if instance.pk and not instance._state.adding:
+        check_content = update_fields is None or 'content' in update_fields
+        fields = ['user_id', 'created_at', 'emotion', 'emotion_score'] + (['content'] if check_content else [])
+        old = Diary.objects.filter(pk=instance.pk).values(*fields).first()
+        if old:
+            if not instance._aggregate_skip:
+                instance._aggregate_snapshot = EmotionAggregateService.snapshot(
+                    old['user_id'], old['created_at'], old['emotion'], old['emotion_score']
+                )
+            instance._content_changed = check_content and old['content'] != instance.content
+
+
 @receiver(post_save, sender=Diary)
-def create_diary_embedding(sender, instance, created, **kwargs):
+def update_emotion_aggregate(sender, instance, created, **kwargs):
+    """일기 생성/수정 시 일별 감정 집계 갱신"""
+    if getattr(instance, '_aggregate_skip', False):
+        return
+    old = None if created else getattr(instance, '_aggregate_snapshot', None)
+    EmotionAggregateService.diary_changed(old, EmotionAggregateService.snapshot_for(instance))
+
+
+@receiver(post_delete, sender=Diary)
+def remove_emotion_aggregate(sender, instance, **kwargs):
+    """일기 삭제 시 일별 감정 집계 차감"""
+    EmotionAggregateService.apply_delta(EmotionAggregateService.snapshot_for(instance), -1)
+
+
+@receiver(post_save, sender=Diary)
+def invalidate_diary_cache_buckets(sender, instance, created, **kwargs):
     """
-    일기가 저장/수정될 때 비동기(스레드)로 임베딩 업데이트
-    Docker 환경이나 Celery가 아닌 경우를 대비해 Threading 사용
-    (프로덕션에서는 Celery 권장)
+    일기 생성/수정 시 리포트/캘린더/히트맵 캐시 무효화
+    - pre_save 스냅샷(이전 날짜)과 저장 후 날짜가 속한 연/월/주 버킷만 무효화
+    - 본문만 바뀐 수정은 리포트(AI 인사이트) 버킷만 무효화, 제목만 수정 등은 캐시에 영향 없음
     """
-    def _update():
+    if getattr(instance, '_content_changed', False):
+        schedule_cache_invalidation(instance.user_id, report_buckets(timezone.localdate(instance.created_at)))
+    if getattr(instance, '_aggregate_skip', False):
+        return
+    old = None if created else getattr(instance, '_aggregate_snapshot', None)
+    new = EmotionAggregateService.snapshot_for(instance)
+    if old == new:
+        return
+    for snapshot in {old, new} - {None}:
+        schedule_cache_invalidation(snapshot[0], date_buckets(snapshot[1]))
+
+
+@receiver(post_delete, sender=Diary)
+def invalidate_deleted_diary_cache_buckets(sender, instance, **kwargs):
+    """일기 삭제 시 해당 날짜 버킷과 태그 사용 현황 캐시 무효화"""
+    snapshot = EmotionAggregateService.snapshot_for(instance)
+    buckets = {TAGS_BUCKET} | (date_buckets(snapshot[1]) if snapshot else set())
+    schedule_cache_invalidation(instance.user_id, buckets)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_cache(sender, instance, **kwargs):
+    """태그 생성/수정/삭제 시 인기 태그 캐시 무효화"""
+    schedule_cache_invalidation(instance.user_id, {TAGS_BUCKET})
+
+
+@receiver(post_save, sender=Diary)
+@receiver(post_delete, sender=Diary)
+def invalidate_decrypted_content(sender, instance, **kwargs):
+    """일기 저장/삭제 시 복호화 캐시에서 해당 일기 제거"""
+    from .utils.decryption_cache import get_decryption_cache
+    get_decryption_cache().invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserPreference)
+def reset_cached_quota_tier(sender, instance, created, update_fields=None, **kwargs):
+    """설정 저장 시 할당량 키에 저장된 티어 한도 초기화 (다음 요청에서 프리미엄 여부 재조회)"""
+    if created or (update_fields is not None and 'is_premium' not in update_fields):
+        return
+    from .utils.rate_limit import reset_quota_tier
+    try:
+        reset_quota_tier(instance.user_id)
+    except Exception as e:
+        logger.warning(f"Failed to reset quota tier for user {instance.user_id}: {e}")
+
+
+@receiver(post_save, sender=UserPreference)
+def write_through_preference_snapshot(sender, instance, **kwargs):
+    """설정 저장 시 요청 메모/공유 캐시의 설정 스냅샷을 새 값으로 갱신"""
+    from .utils.preference_cache import write_through
+    try:
+        write_through(instance)
+    except Exception as e:
+        logger.warning(f"Failed to update preference snapshot for user {instance.user_id}: {e}")
+
+
+@receiver(post_delete, sender=UserPreference)
+def forget_preference_snapshot(sender, instance, **kwargs):
+    from .utils.preference_cache import forget
+    try:
+        forget(instance.user_id)
+    except Exception as e:
+        logger.warning(f"Failed to drop preference snapshot for user {instance.user_id}: {e}")
+
+
+@receiver(post_save, sender=DiaryImage)
+@receiver(post_delete, sender=DiaryImage)
+def refresh_diary_image_summary(sender, instance, **kwargs):
+    """이미지 추가/삭제 시 일기의 이미지 수 / 대표 이미지 갱신 (목록 조회용 비정규화)"""
+    DiaryImage.refresh_diary_summary(instance.diary_id)
+
+
+@receiver(post_save, sender=Diary)
+def create_diary_embedding(sender, instance, created, update_fields=None, **kwargs):
+    """
+    일기가 저장/수정될 때 임베딩 대기열에 등록
+    (임베딩 전용 Celery 워커가 배치로 처리, 웹 워커에서는 모델을 로드하지 않음)
+    """
+    if update_fields is not None and not EMBEDDING_FIELDS.intersection(update_fields):
+        return
+
+    from .services.embedding_service import EmbeddingService, get_batch_config
+
+    diary_id = instance.id
+    if not get_batch_config()['ENABLED']:
+        # 배치 비활성화(테스트 등): 저장 흐름 안에서 동기 처리
         try:
-            ChatService.update_diary_embedding(instance)
+            EmbeddingService.embed_diaries([diary_id])
         except Exception as e:
-            print(f"Error updating embedding for diary {instance.id}: {e}")
+            logger.error(f"Error updating embedding for diary {diary_id}: {e}")
+        return
+
+    transaction.on_commit(lambda: EmbeddingService.enqueue(diary_id))
+
+def _index_filled_content(diary, plain_content):
+    """STT 로 채운 본문을 검색 대상으로 등록 (블라인드 인덱스 / 설정 시 평문 키워드)"""
+    from .services.blind_index_service import BlindIndexService, stores_plaintext_keywords
+    try:
+        BlindIndexService.index_diary(diary, plain_content)
+        if stores_plaintext_keywords():
+            from .services.analysis_service import NounExtractor
+            diary.search_keywords = NounExtractor().extract_nouns(plain_content)
+            Diary.objects.filter(pk=diary.pk).update(search_keywords=diary.search_keywords)
+    except Exception as e:
+        logger.error(f"Search index update failed for diary {diary.id}: {e}")
 
-    # Main Thread 블로킹 방지를 위해 별도 스레드 실행
-    from django.conf import settings
-    
-    if getattr(settings, 'IS_TESTING', False):
-        print("DEBUG: Running signal synchronously")
-        _update()
-    else:
-        print("DEBUG: Running signal in thread")
-        threading.Thread(target=_update).start()
 
 @receiver(post_save, sender=Diary)
 def trigger_stt(sender, instance, created, **kwargs):
@@ -43,14 +194,18 @@ def trigger_stt(sender, instance, created, **kwargs):
                 stt_service = STTService()
                 text = stt_service.transcribe(instance.voice_file)
                 
+                filled = False
                 if text:
                     instance.transcription = text
                     # 음성 일기인 경우, 본문이 비어있으면 채워넣기 (선택 사항)
                     if not instance.content:
                         instance.encrypt_content(text)
+                        filled = True
                 
                 instance.is_transcribing = False
-                instance.save(update_fields=['transcription', 'is_transcribing', 'content', 'is_encrypted'])
+                instance.save(update_fields=['transcription', 'is_transcribing', 'content', 'is_encrypted', 'updated_at'])
+                if filled:
+                    _index_filled_content(instance, text)
                 
             except Exception as e:
                 print(f"Error transcribing diary {instance.id}: {e}")
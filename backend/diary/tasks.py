@@ -131,7 +131,7 @@ def send_username_email_async(username: str, email: str):
 @shared_task(bind=True, max_retries=2)
 def generate_pdf_async(self, user_id: int, diary_ids: list, filename: str):
     """
-    비동기 PDF 생성
+    비동기 PDF 생성 (선택한 일기만)
     
     Args:
         user_id: 사용자 ID
@@ -141,87 +141,24 @@ def generate_pdf_async(self, user_id: int, diary_ids: list, filename: str):
     Returns:
         str: 생성된 파일 경로
     """
-    from django.contrib.auth import get_user_model
     from .models import Diary
-    from reportlab.lib.pagesizes import A4
-    from reportlab.pdfgen import canvas
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.lib import colors
+    from .encryption import decrypt_diaries
+    from .services.export_job_service import render_diaries_pdf
     import os
-    import io
-    
-    User = get_user_model()
     
     try:
-        user = User.objects.get(id=user_id)
-        diaries = Diary.objects.filter(id__in=diary_ids, user=user).order_by('-created_at')
+        diaries = list(Diary.objects.filter(id__in=diary_ids, user_id=user_id).order_by('-created_at'))
         
-        if not diaries.exists():
+        if not diaries:
             logger.warning(f"[Celery] No diaries found for PDF generation")
             return None
         
-        # PDF 생성
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-        
-        # 폰트 설정 (한글 지원)
-        try:
-            pdfmetrics.registerFont(TTFont('NanumGothic', 'NanumGothic.ttf'))
-            font_name = 'NanumGothic'
-        except:
-            font_name = 'Helvetica'
-        
-        y_position = height - 50
-        
-        for diary in diaries:
-            # 새 페이지 필요 체크
-            if y_position < 100:
-                p.showPage()
-                y_position = height - 50
-            
-            # 제목
-            p.setFont(font_name, 14)
-            p.drawString(50, y_position, diary.title)
-            y_position -= 20
-            
-            # 날짜
-            p.setFont(font_name, 10)
-            p.setFillColor(colors.gray)
-            p.drawString(50, y_position, diary.created_at.strftime('%Y년 %m월 %d일'))
-            y_position -= 25
-            
-            # 감정
-            if diary.emotion:
-                p.drawString(50, y_position, f"감정: {diary.emotion_emoji or ''} {diary.emotion}")
-                y_position -= 20
-            
-            # 내용
-            p.setFillColor(colors.black)
-            p.setFont(font_name, 11)
-            content = diary.get_decrypted_content() or diary.content
-            
-            # 줄바꿈 처리
-            lines = content.split('\n')
-            for line in lines[:20]:  # 최대 20줄
-                if y_position < 50:
-                    p.showPage()
-                    y_position = height - 50
-                p.drawString(50, y_position, line[:80])  # 80자 제한
-                y_position -= 15
-            
-            y_position -= 30  # 일기 간격
-        
-        p.save()
-        
-        # 파일 저장
         pdf_dir = os.path.join(settings.MEDIA_ROOT, 'exports')
         os.makedirs(pdf_dir, exist_ok=True)
-        
         filepath = os.path.join(pdf_dir, filename)
-        with open(filepath, 'wb') as f:
-            f.write(buffer.getvalue())
+        
+        # 본문 일괄 복호화 후 전체 내용 렌더링
+        render_diaries_pdf(filepath, zip(diaries, decrypt_diaries(diaries)), total=len(diaries))
         
         logger.info(f"[Celery] PDF generated: {filepath}")
         return filepath
@@ -232,56 +169,54 @@ def generate_pdf_async(self, user_id: int, diary_ids: list, filename: str):
 
 
 @shared_task
-def migrate_encryption_key(target_version=None, batch_size=100):
+def generate_pdf_export(job_id: int):
+    """PDF 내보내기 작업 실행 (ExportJob, pdf 큐)"""
+    from .services.export_job_service import ExportJobService
+    
+    job = ExportJobService.run_pdf_job(job_id)
+    return {'job_id': job.pk, 'status': job.status, 'file_size': job.file_size}
+
+
+@shared_task
+def restore_backup_task(job_id: int):
+    """백업 복원 작업 실행 (ExportJob, restore 큐 / 재실행 시 체크포인트부터 이어서 복원)"""
+    from .services.restore_service import RestoreService
+    
+    job = RestoreService.run_job(job_id)
+    return {'job_id': job.pk, 'status': job.status, 'restored': job.checkpoint.get('counts')}
+
+
+@shared_task(bind=True)
+def migrate_encryption_key(self, target_version=None, batch_size=500, rows_per_second=None,
+                           start_id=None, end_id=None, resume=True):
     """
     [Phase 2] Key Rotation Migration Task
     오래된 버전의 암호화 키로 잠긴 일기들을 최신 키로 재암호화합니다.
-    """
-    from .models import Diary
-    from django.conf import settings
-    from django.db import transaction
-    import time
     
-    current_version = getattr(settings, 'CURRENT_ENCRYPTION_VERSION', 1)
-    if target_version is None:
-        target_version = current_version
-        
-    logger.info(f"Starting encryption migration to version {target_version}")
+    - id 키셋 페이지네이션 + bulk_update (KeyRotationService)
+    - 체크포인트에서 재개, rows_per_second 스로틀링
+    - start_id/end_id 로 샤드 단위 병렬 실행 가능
+    """
+    from .services.key_rotation_service import KeyRotationService
     
-    # 처리할 일기 조회 (버전이 낮은 것들)
-    # 한 번에 너무 많이 가져오면 메모리 이슈 발생 -> batch 처리
-    qs = Diary.objects.filter(encryption_version__lt=target_version).order_by('id')
-    total_count = qs.count()
+    rotation = KeyRotationService(
+        target_version=target_version,
+        batch_size=batch_size,
+        rows_per_second=rows_per_second,
+        start_id=start_id,
+        end_id=end_id,
+    )
     
-    processed = 0
-    updated_count = 0
+    def _report(state):
+        # 진행률/ETA 를 Celery 결과 백엔드로 노출 (워커에서 실행될 때만)
+        if self.request.id:
+            self.update_state(state='PROGRESS', meta=state)
     
-    logger.info(f"Found {total_count} diaries to migrate.")
+    logger.info(f"[Celery] Starting encryption migration {rotation.checkpoint_key}")
+    state = rotation.run(resume=resume, progress_callback=_report)
     
-    while processed < total_count:
-        # Batch 조회
-        batch = list(qs[:batch_size])
-        if not batch:
-            break
-            
-        for diary in batch:
-            try:
-                # 1. 기존 키로 복호화 (decrypt_content는 encryption_version 참조)
-                plain_content = diary.decrypt_content()
-                
-                # 2. 최신 키로 재암호화 (encrypt_content는 최신 키 사용)
-                diary.encrypt_content(plain_content)
-                diary.save(update_fields=['content', 'is_encrypted', 'encryption_version'])
-                updated_count += 1
-            except Exception as e:
-                logger.error(f"Failed to migrate diary {diary.id}: {e}")
-        
-        processed += len(batch)
-        logger.info(f"Migrated {processed}/{total_count} diaries...")
-        time.sleep(0.1) # DB 부하 방지
-        
-    logger.info(f"Encryption migration completed. Updated {updated_count} diaries.")
-    return f"Updated {updated_count} diaries."
+    logger.info(f"[Celery] Encryption migration completed. Updated {state['updated']} diaries.")
+    return state
 
 
 @shared_task
@@ -290,37 +225,106 @@ def cleanup_old_exports(days: int = 7):
     import os
     from datetime import datetime, timedelta
     
-    export_dir = os.path.join(settings.MEDIA_ROOT, 'exports')
-    if not os.path.exists(export_dir):
-        return 0
+    from .services.export_job_service import ExportJobService
     
+    export_dir = os.path.join(settings.MEDIA_ROOT, 'exports')
     cutoff = datetime.now() - timedelta(days=days)
     deleted = 0
     
-    for filename in os.listdir(export_dir):
-        filepath = os.path.join(export_dir, filename)
-        if os.path.isfile(filepath):
-            file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-            if file_time < cutoff:
-                os.remove(filepath)
-                deleted += 1
+    if os.path.exists(export_dir):
+        for filename in os.listdir(export_dir):
+            filepath = os.path.join(export_dir, filename)
+            if os.path.isfile(filepath):
+                file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
+                if file_time < cutoff:
+                    os.remove(filepath)
+                    deleted += 1
+    
+    # 비동기 PDF 작업 결과 (오래되었거나 새 결과로 대체된 파일)
+    deleted += ExportJobService.cleanup(days)
     
     logger.info(f"[Celery] Cleaned up {deleted} old export files")
     return deleted
 
 
+# =============================================================================
+# 푸시 알림 태스크
+# =============================================================================
+
+@shared_task
+def check_push_receipts(receipts_key: str):
+    """
+    발송 후 푸시 영수증 확인 (dispatch_push 가 RECEIPT_DELAY 후 예약)
+    DeviceNotRegistered 토큰은 비활성화
+    """
+    from django.core.cache import cache
+    from .push_service import get_push_dispatcher
+    
+    ticket_tokens = cache.get(receipts_key)
+    if not ticket_tokens:
+        logger.warning(f"[Celery] Push receipts {receipts_key} expired or missing")
+        return {'checked': 0, 'errors': 0, 'deactivated': 0}
+    
+    result = get_push_dispatcher().process_receipts(ticket_tokens)
+    cache.delete(receipts_key)
+    logger.info(
+        f"[Celery] Checked {result['checked']} push receipts: "
+        f"{result['errors']} errors, {result['deactivated']} tokens deactivated"
+    )
+    return result
+
+
+@shared_task
+def plan_diary_reminders():
+    """현재 알림 시간 구간의 리마인더 샤드 예약 (Beat 가 구간마다 실행)"""
+    from .services.reminder_service import ReminderService
+    return ReminderService.plan_window()
+
+
+@shared_task
+def send_reminder_shard(run_id: str, today: str, start_time: str, end_time, start_id: int, end_id: int):
+    """사용자 id 범위 한 개의 리마인더 발송"""
+    from datetime import date, time
+    from .services.reminder_service import ReminderService
+    
+    metrics = ReminderService.send_shard(
+        run_id,
+        date.fromisoformat(today),
+        time.fromisoformat(start_time),
+        time.fromisoformat(end_time) if end_time else None,
+        start_id,
+        end_id,
+    )
+    logger.info(f"[Celery] Reminder {run_id} shard {start_id}-{end_id}: {metrics}")
+    return metrics
+
+
 # =============================================================================
 # AI 작업 태스크 (이미지, 키워드, 요약)
 # =============================================================================
 
 @shared_task
-def generate_image_task(diary_id: int):
-    """일기 이미지 생성 태스크"""
+def generate_image_task(diary_id: int, slot: str = None, quota_date: str = None):
+    """
+    일기 이미지 생성 태스크
+    요청 시 소비한 일일 할당량은 이미지가 만들어지지 않으면 반환
+
+    Args:
+        slot: 요청 시 획득한 동시 생성 슬롯 (완료 시 해제)
+        quota_date: 할당량을 소비한 날짜 (ISO, 자정을 넘겨 끝나도 이 날짜로 환불)
+    """
     from .models import Diary
     from .services.image_service import ImageGenerator
+    from .services.user_tier_service import UserTierService
+    from .utils.rate_limit import Semaphore
     
+    diary = None
+    generated = False
     try:
-        diary = Diary.objects.get(id=diary_id)
+        diary = Diary.objects.select_related('user').get(id=diary_id)
+        if slot:
+            # 큐 대기 시간만큼 줄어든 리스를 생성 시작 시점부터 다시 연장
+            Semaphore('image_gen', diary.user_id, lease=300).renew(slot)
         # 이미지가 이미 있는지 확인
         if diary.images.exists():
             return "Image already exists"
@@ -330,43 +334,98 @@ def generate_image_task(diary_id: int):
         # Note: generator.generate now returns dict {'url': ..., 'prompt': ...}
         
         if image_url:
+            generated = True
             return f"Image generated for diary {diary_id}"
         return f"Image generation failed for diary {diary_id}"
     except Exception as e:
         logger.error(f"[Celery] Image generation failed: {e}")
         return str(e)
+    finally:
+        if diary is not None:
+            if not generated:
+                UserTierService.refund_image_generation_quota(diary.user, day=quota_date)
+            if slot:
+                Semaphore('image_gen', diary.user_id).release(slot)
+
+# =============================================================================
+# 임베딩 배치 태스크 (embedding 큐 전용 워커에서 실행)
+# =============================================================================
+
+@shared_task
+def embed_pending_diaries():
+    """Redis 대기열에 모인 일기들을 배치로 임베딩"""
+    from .services.embedding_service import EmbeddingService
+
+    count = EmbeddingService.drain_pending()
+    logger.info(f"[Celery] Embedded {count} pending diaries")
+    return count
+
+
+@shared_task
+def embed_diaries_task(diary_ids: list):
+    """지정한 일기들을 한 번에 임베딩 (Redis 대기열을 쓸 수 없을 때)"""
+    from .services.embedding_service import EmbeddingService
+
+    return EmbeddingService.embed_diaries(diary_ids)
+
 
 @shared_task
 def extract_keywords_task(diary_id: int):
     """키워드 추출 및 태그 저장 태스크 (Auto-tagging)"""
+    result = extract_keywords_batch_task([diary_id])
+    keywords = result.get(diary_id)
+    if keywords is None:
+        return "Content too short"
+    if not keywords:
+        return "No keywords found"
+    return keywords
+
+
+@shared_task
+def extract_keywords_batch_task(diary_ids: list):
+    """
+    여러 일기의 키워드를 한 번의 encode 로 추출하여 태그 저장
+
+    Returns:
+        dict: {diary_id: keywords} (본문이 너무 짧은 일기는 제외)
+    """
+    from .cache_utils import TAGS_BUCKET, schedule_cache_invalidation
+    from .encryption import decrypt_diaries
     from .models import Diary, Tag, DiaryTag
     from .services.analysis_service import KeywordExtractor
     
     try:
-        diary = Diary.objects.get(id=diary_id)
-        content = diary.decrypt_content()
-        if not content or len(content) < 10:
-            return "Content too short"
-            
+        diaries = list(Diary.objects.filter(id__in=diary_ids))
+        targets = [
+            (diary, content)
+            for diary, content in zip(diaries, decrypt_diaries(diaries))
+            if content and len(content) >= 10
+        ]
+        if not targets:
+            return {}
+
         extractor = KeywordExtractor()
-        keywords = extractor.extract_keywords(content, top_n=5)
-        
-        if not keywords:
-            return "No keywords found"
-            
-        for keyword in keywords:
-            tag, _ = Tag.objects.get_or_create(
-                user=diary.user,
-                name=keyword,
-                defaults={'color': '#6366F1'}
+        keyword_lists = extractor.extract_keywords_batch([content for _, content in targets], top_n=5)
+
+        result = {}
+        for (diary, _), keywords in zip(targets, keyword_lists):
+            result[diary.id] = keywords
+            tags = [
+                Tag.objects.get_or_create(user_id=diary.user_id, name=keyword, defaults={'color': '#6366F1'})[0]
+                for keyword in keywords
+            ]
+            DiaryTag.objects.bulk_create(
+                [DiaryTag(diary=diary, tag=tag) for tag in tags],
+                ignore_conflicts=True,
             )
-            DiaryTag.objects.get_or_create(diary=diary, tag=tag)
-            
-        logger.info(f"[Celery] Auto-tagged diary {diary_id} with {keywords}")
-        return keywords
+            logger.info(f"[Celery] Auto-tagged diary {diary.id} with {keywords}")
+        # bulk_create 는 시그널이 없으므로 인기 태그 캐시를 직접 무효화
+        for user_id in {diary.user_id for diary, _ in targets}:
+            schedule_cache_invalidation(user_id, {TAGS_BUCKET})
+        return result
     except Exception as e:
         logger.error(f"[Celery] Auto-tagging failed: {e}")
-        return str(e)
+        return {}
 
 
 @shared_task(bind=True, max_retries=2, default_retry_delay=30)
@@ -395,8 +454,11 @@ def analyze_emotion_task(self, diary_id: int):
         if not content or len(content) < 10:
             return {"status": "content_too_short"}
         
-        analyzer = EmotionAnalyzer()
-        result = analyzer.analyze(content)
+        # 같은 내용의 분석 결과가 캐시에 있으면 API 클라이언트 없이 바로 저장
+        result = EmotionAnalyzer.lookup_cached(content)
+        if result is None:
+            analyzer = EmotionAnalyzer()
+            result = analyzer.analyze(content)
         
         # 결과 저장
         diary.emotion = result['emotion']
@@ -404,7 +466,10 @@ def analyze_emotion_task(self, diary_id: int):
         diary.emotion_analyzed_at = timezone.now()
         diary.save(update_fields=['emotion', 'emotion_score', 'emotion_analyzed_at'])
         
-        logger.info(f"[Celery] Emotion analyzed for diary {diary_id}: {result['emotion']}")
+        logger.info(
+            f"[Celery] Emotion analyzed for diary {diary_id}: {result['emotion']}"
+            f"{' (cached)' if result.get('cached') else ''}"
+        )
         return result
         
     except Diary.DoesNotExist:
@@ -437,6 +502,12 @@ def generate_summary_task(self, diary_id: int, style: str = 'default'):
         if not content or len(content) < 50:
             return {"status": "content_too_short"}
         
+        # 같은 내용+스타일의 요약이 캐시에 있으면 바로 반환
+        cached = SummaryService.lookup_cached_summary(content, style=style)
+        if cached is not None:
+            logger.info(f"[Celery] Summary cache hit for diary {diary_id}")
+            return cached
+        
         result = SummaryService.summarize_diary(content, style=style)
         
         if 'error' not in result:
@@ -0,0 +1,188 @@
+# diary/tests/test_ai_cache.py
+"""
+AI 결과 캐시 테스트
+- 키: 공백만 다른 입력은 같은 키, operation/model/prompt_version 별로 분리
+- 로컬 LRU → 공유 캐시(암호화) 순서로 조회, 실패/대체 응답은 저장하지 않음
+- 바이트 상한 제거, 적중 태그/지표
+- 감정 분석 / 요약 태스크: 적중 시 API 호출 없이 바로 처리
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from diary.emotion_service import EmotionAnalyzer
+from diary.models import Diary
+from diary.services.summary_service import SummaryService
+from diary.tasks import analyze_emotion_task, generate_summary_task
+from diary.utils.ai_cache import AIResultCache, get_ai_cache, track_hits
+
+CONTENT = '오늘은 친구와 한강에서 산책을 했다. 바람이 시원해서 기분이 좋았다.'
+
+
+@pytest.fixture
+def ai_cache():
+    return AIResultCache({'LOCAL_MAX_BYTES': 64 * 1024})
+
+
+@pytest.fixture
+def gemini(settings):
+    settings.GEMINI_API_KEY = 'test-key'
+    client = MagicMock()
+    client.generate_content.return_value = MagicMock(
+        text='{"emotion": "happy", "score": 80, "reason": "산책이 즐거웠다."}'
+    )
+    with patch('diary.emotion_service.get_gemini_client', return_value=client), \
+            patch('diary.services.summary_service.get_gemini_client', return_value=client):
+        yield client
+
+
+class TestKeys:
+
+    def test_whitespace_only_changes_share_key(self, ai_cache):
+        assert ai_cache.make_key('emotion', 'm', 1, f"  {CONTENT}\n") == \
+            ai_cache.make_key('emotion', 'm', 1, CONTENT.replace(' ', '  '))
+
+    def test_operation_model_and_prompt_version_separate_keys(self, ai_cache):
+        keys = {
+            ai_cache.make_key('emotion', 'm', 1, CONTENT),
+            ai_cache.make_key('summary:short', 'm', 1, CONTENT),
+            ai_cache.make_key('emotion', 'other-model', 1, CONTENT),
+            ai_cache.make_key('emotion', 'm', 2, CONTENT),
+        }
+        assert len(keys) == 4
+
+
+class TestLookup:
+
+    def test_compute_once_then_hit(self, ai_cache):
+        compute = MagicMock(return_value={'emotion': 'happy'})
+
+        assert ai_cache.get_or_compute('emotion', 'm', 1, CONTENT, compute) == ({'emotion': 'happy'}, False)
+        assert ai_cache.get_or_compute('emotion', 'm', 1, CONTENT, compute) == ({'emotion': 'happy'}, True)
+        assert compute.call_count == 1
+
+    def test_failures_not_cached(self, ai_cache):
+        with pytest.raises(ValueError):
+            ai_cache.get_or_compute('title', 'm', 1, CONTENT, MagicMock(side_effect=ValueError('down')))
+
+        assert ai_cache.get('title', 'm', 1, CONTENT) == (None, False)
+
+    def test_shared_tier_is_encrypted_and_refills_local(self, ai_cache):
+        ai_cache.set('summary:default', 'm', 1, CONTENT, '한강 산책으로 기분 좋은 하루')
+        stored = cache.get(ai_cache.make_key('summary:default', 'm', 1, CONTENT))
+        assert '한강' not in str(stored)
+
+        ai_cache.clear()
+        assert ai_cache.get('summary:default', 'm', 1, CONTENT) == ('한강 산책으로 기분 좋은 하루', True)
+        assert ai_cache.get('summary:default', 'm', 1, CONTENT) == ('한강 산책으로 기분 좋은 하루', True)
+
+        stats = ai_cache.stats()['operations']['summary']
+        assert (stats['shared_hits'], stats['hits']) == (1, 1)
+
+    def test_local_lru_evicts_by_size(self):
+        ai_cache = AIResultCache({'LOCAL_MAX_BYTES': 2000})
+
+        for i in range(10):
+            ai_cache.set('title', 'm', 1, f"{CONTENT} {i}", '가' * 100)
+
+        stats = ai_cache.stats()
+        assert stats['bytes'] <= 2000
+        assert stats['evictions'] > 0
+        assert stats['entries'] < 10
+
+    def test_oversized_result_not_stored(self):
+        ai_cache = AIResultCache({'MAX_ENTRY_BYTES': 100})
+
+        ai_cache.set('summary:default', 'm', 1, CONTENT, '요약' * 100)
+
+        assert ai_cache.get('summary:default', 'm', 1, CONTENT) == (None, False)
+
+    def test_disabled(self):
+        ai_cache = AIResultCache({'ENABLED': False})
+        compute = MagicMock(return_value='제목')
+
+        ai_cache.get_or_compute('title', 'm', 1, CONTENT, compute)
+        ai_cache.get_or_compute('title', 'm', 1, CONTENT, compute)
+
+        assert compute.call_count == 2
+
+    def test_track_hits(self, ai_cache):
+        with track_hits() as tracker:
+            ai_cache.get_or_compute('title', 'm', 1, CONTENT, lambda: '제목')
+        assert tracker.cached is False
+
+        with track_hits() as tracker:
+            ai_cache.get_or_compute('title', 'm', 1, CONTENT, lambda: '제목')
+        assert tracker.cached is True
+
+
+class TestServices:
+
+    def test_emotion_resave_reuses_result(self, gemini):
+        hits = get_ai_cache().stats()['operations'].get('emotion', {}).get('hits', 0)
+        first = EmotionAnalyzer().analyze(CONTENT)
+        second = EmotionAnalyzer().analyze(f"{CONTENT}\n\n")
+
+        assert (first['emotion'], first['cached']) == ('happy', False)
+        assert (second['emotion'], second['cached']) == ('happy', True)
+        assert gemini.generate_content.call_count == 1
+        assert get_ai_cache().stats()['operations']['emotion']['hits'] == hits + 1
+
+    def test_emotion_fallback_not_cached(self, gemini):
+        gemini.generate_content.side_effect = ConnectionError('down')
+
+        result = EmotionAnalyzer().analyze(CONTENT)
+
+        assert 'Fallback' in result['reason']
+        assert EmotionAnalyzer.lookup_cached(CONTENT) is None
+
+    def test_summary_and_title_cached_per_style(self, gemini):
+        gemini.generate_content.return_value = MagicMock(text='"산책한 날"')
+
+        assert SummaryService.summarize_diary(CONTENT, 'short')['cached'] is False
+        assert SummaryService.summarize_diary(CONTENT, 'short')['cached'] is True
+        assert SummaryService.summarize_diary(CONTENT, 'bullet')['cached'] is False
+        assert SummaryService.suggest_title(CONTENT) == SummaryService.suggest_title(CONTENT) == '산책한 날'
+        assert gemini.generate_content.call_count == 3
+
+    @pytest.mark.django_db
+    def test_suggest_title_view_tags_hit(self, gemini, api_client):
+        gemini.generate_content.return_value = MagicMock(text='산책한 날')
+        api_client.force_authenticate(user=User.objects.create_user(username='titleuser', password='testpass123'))
+
+        responses = [api_client.post('/api/suggest-title/', {'content': CONTENT}) for _ in range(2)]
+
+        assert [r.json()['cached'] for r in responses] == [False, True]
+
+
+@pytest.mark.django_db
+class TestTasks:
+
+    @pytest.fixture
+    def diary(self, db):
+        user = User.objects.create_user(username='aicache', password='testpass123')
+        diary = Diary(user=user, title='산책')
+        diary.encrypt_content(CONTENT * 2)
+        diary.save()
+        return diary
+
+    def test_emotion_task_short_circuits_on_hit(self, diary, settings):
+        get_ai_cache().set('emotion', settings.GEMINI_TEXT_MODEL, EmotionAnalyzer.PROMPT_VERSION, CONTENT * 2,
+                           {'emotion': 'peaceful', 'emotion_label': '평온', 'score': 70, 'reason': ''})
+
+        with patch('diary.emotion_service.EmotionAnalyzer.__init__') as init:
+            result = analyze_emotion_task(diary.id)
+
+        init.assert_not_called()
+        assert result['cached'] is True
+        diary.refresh_from_db()
+        assert (diary.emotion, diary.emotion_score) == ('peaceful', 70)
+
+    def test_summary_task_short_circuits_on_hit(self, diary, gemini):
+        gemini.generate_content.return_value = MagicMock(text='산책한 날')
+        assert generate_summary_task(diary.id)['cached'] is False
+
+        assert generate_summary_task(diary.id)['cached'] is True
+        assert gemini.generate_content.call_count == 1
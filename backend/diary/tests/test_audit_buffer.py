@@ -0,0 +1,90 @@
+# diary/tests/test_audit_buffer.py
+"""
+감사 로그 버퍼 테스트
+- 크기 기준 플러시 (bulk_create)
+- 링 버퍼 초과 시 drop 카운트
+- 미들웨어 연동
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from diary.models import AuditLog
+from diary.utils.audit_buffer import AuditLogBuffer
+
+User = get_user_model()
+
+
+def _record(user, resource='diary-list'):
+    return {
+        'user_id': user.pk,
+        'action': 'READ',
+        'resource': resource,
+        'ip_address': '127.0.0.1',
+        'status': 'SUCCESS',
+        'details': {},
+    }
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='audituser', password='testpass123')
+
+
+@pytest.mark.django_db
+class TestAuditLogBuffer:
+
+    def test_flush_writes_in_batches(self, user):
+        buffer = AuditLogBuffer(capacity=100, batch_size=3, flush_interval=60)
+        # 플러셔 스레드 없이 수동 플러시로 검증
+        buffer._ensure_worker = lambda: None
+
+        for i in range(7):
+            buffer.enqueue(**_record(user, resource=f'r{i}'))
+
+        assert AuditLog.objects.count() == 0
+        assert buffer.flush() == 7
+        assert AuditLog.objects.count() == 7
+
+        stats = buffer.stats()
+        assert stats['flushed'] == 7
+        assert stats['pending'] == 0
+        assert stats['dropped'] == 0
+
+    def test_ring_buffer_drops_oldest(self, user):
+        buffer = AuditLogBuffer(capacity=3, batch_size=10, flush_interval=60)
+        buffer._ensure_worker = lambda: None
+
+        for i in range(5):
+            buffer.enqueue(**_record(user, resource=f'r{i}'))
+
+        assert buffer.stats()['dropped'] == 2
+        buffer.flush()
+        resources = set(AuditLog.objects.values_list('resource', flat=True))
+        assert resources == {'r2', 'r3', 'r4'}
+
+    def test_write_failure_is_counted(self, user):
+        buffer = AuditLogBuffer(capacity=10, batch_size=10, flush_interval=60)
+        buffer._ensure_worker = lambda: None
+        buffer.enqueue(**_record(user), unknown_field='x')
+
+        assert buffer.flush() == 0
+        assert buffer.stats()['failed'] == 1
+
+    def test_disabled_buffer_writes_immediately(self, user):
+        buffer = AuditLogBuffer(enabled=False)
+        buffer.enqueue(**_record(user))
+        assert AuditLog.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_middleware_records_sensitive_request(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    client.get('/api/diaries/')
+
+    log = AuditLog.objects.get(user=user)
+    assert log.action == 'READ'
+    assert log.resource == 'diary-list'
+    assert log.details['status_code'] == 200
@@ -0,0 +1,169 @@
+# diary/tests/test_blind_index.py
+"""
+블라인드 인덱스 테스트
+- 작성/수정 시 HMAC 인덱스 생성 (평문 키워드 미저장)
+- AND/OR 검색
+- 증분 갱신
+- 키 로테이션 시 재계산
+- 평문 키워드 없이 작성한 일기도 통합 검색 / 채팅 키워드 검색에서 찾음
+"""
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+import diary.encryption as encryption
+from diary.models import Diary, DiaryBlindIndex
+from diary.services.blind_index_service import BlindIndexService
+from diary.services.chat_service import ChatService
+from diary.services.key_rotation_service import KeyRotationService
+from diary.services.search_service import DiarySearchService
+from diary.signals import _index_filled_content
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def word_tokens():
+    """형태소 분석기 대신 단어 단위 토큰 사용 (결정적 테스트)"""
+    with patch('diary.services.analysis_service.NounExtractor.extract_nouns', return_value=''):
+        yield
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='blinduser', password='testpass123')
+
+
+def _create(user, content):
+    diary = Diary(user=user, title='제목')
+    diary.encrypt_content(content)
+    diary.save()
+    BlindIndexService.index_diary(diary, content)
+    return diary
+
+
+def _matching_ids(user, query, mode='and'):
+    qs = BlindIndexService.search(Diary.objects.filter(user=user), user, query, mode)
+    return sorted(qs.values_list('id', flat=True))
+
+
+@pytest.mark.django_db
+class TestBlindIndexService:
+
+    def test_and_or_search(self, user):
+        both = _create(user, 'apple banana')
+        apple = _create(user, 'apple cherry')
+
+        assert _matching_ids(user, 'apple banana') == [both.id]
+        assert _matching_ids(user, 'banana cherry', mode='or') == [both.id, apple.id]
+        assert _matching_ids(user, 'durian') == []
+
+    def test_hash_is_per_user(self, user):
+        other = User.objects.create_user(username='other', password='testpass123')
+
+        mine = BlindIndexService.hash_tokens(user.pk, {'apple'})['apple']
+        theirs = BlindIndexService.hash_tokens(other.pk, {'apple'})['apple']
+
+        assert mine != theirs
+        assert 'apple' not in mine
+
+    def test_incremental_update(self, user):
+        diary = _create(user, 'apple banana')
+        kept = DiaryBlindIndex.objects.get(
+            diary=diary, token_hash=BlindIndexService.hash_tokens(user.pk, {'apple'})['apple']
+        )
+
+        BlindIndexService.index_diary(diary, 'apple cherry')
+
+        assert DiaryBlindIndex.objects.filter(diary=diary).count() == 2
+        assert DiaryBlindIndex.objects.filter(pk=kept.pk).exists()
+        assert _matching_ids(user, 'banana') == []
+        assert _matching_ids(user, 'cherry') == [diary.id]
+
+
+@pytest.mark.django_db
+class TestBlindIndexApi:
+
+    def test_create_indexes_without_plaintext_keywords(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(reverse('diary-list'), {'title': '하루', 'content': 'walked the dog'}, format='json')
+
+        diary = Diary.objects.get(pk=response.data['id'])
+        assert not diary.search_keywords
+        assert DiaryBlindIndex.objects.filter(diary=diary).count() == 3
+
+        search = api_client.get(reverse('diary-list'), {'content_search': 'dog', 'exact_match': 'true'})
+        results = search.data.get('results', search.data)
+        assert [d['id'] for d in results] == [diary.id]
+
+    def test_created_diary_found_by_text_and_chat_search(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('diary-list'), {'title': '하루', 'content': 'walked the dog'}, format='json')
+        diary = Diary.objects.get(pk=response.data['id'])
+        assert not diary.search_keywords
+
+        qs = Diary.objects.filter(user=user)
+        assert list(DiarySearchService.search_text(qs, 'dog', user=user)) == [diary]
+        assert ChatService._keyword_only_search(user, ['dog']) == [diary]
+
+        search = api_client.get(reverse('diary-list'), {'q': 'dog', 'exact_match': 'true'})
+        results = search.data.get('results', search.data)
+        assert [d['id'] for d in results] == [diary.id]
+
+    def test_edit_reindexes_content(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        diary_id = api_client.post(reverse('diary-list'), {'title': '하루', 'content': 'walked the dog'}, format='json').data['id']
+
+        api_client.patch(reverse('diary-detail', args=[diary_id]), {'content': 'fed the cat'}, format='json')
+
+        qs = Diary.objects.filter(user=user)
+        assert list(DiarySearchService.search_text(qs, 'cat', user=user)) == [Diary.objects.get(pk=diary_id)]
+        assert not DiarySearchService.search_text(qs, 'dog', user=user).exists()
+
+    def test_stt_filled_content_is_indexed(self, user):
+        diary = Diary.objects.create(user=user, title='음성 일기')
+        diary.encrypt_content('walked the dog')
+
+        _index_filled_content(diary, 'walked the dog')
+
+        assert ChatService._keyword_only_search(user, ['dog']) == [diary]
+
+    def test_plaintext_keywords_kept_without_encryption_key(self, api_client, user, settings):
+        settings.DIARY_ENCRYPTION_KEYS = {}
+        settings.DIARY_ENCRYPTION_KEY = None
+        encryption._encryption_service = None
+        try:
+            api_client.force_authenticate(user=user)
+            with patch('diary.services.analysis_service.NounExtractor.extract_nouns', return_value='dog'):
+                response = api_client.post(reverse('diary-list'), {'title': '하루', 'content': 'walked the dog'}, format='json')
+
+            diary = Diary.objects.get(pk=response.data['id'])
+            assert diary.search_keywords
+            assert list(DiarySearchService.search_text(Diary.objects.filter(user=user), 'dog', user=user)) == [diary]
+        finally:
+            encryption._encryption_service = None
+
+
+@pytest.mark.django_db
+def test_key_rotation_rehashes_index(settings, user):
+    settings.DIARY_ENCRYPTION_KEYS = {
+        1: 'key-v1-for-encryption-32bytes!!!',
+        2: 'key-v2-for-encryption-32bytes!!!',
+    }
+    settings.CURRENT_ENCRYPTION_VERSION = 1
+    encryption._encryption_service = None
+    cache.clear()
+    try:
+        diary = _create(user, 'apple banana')
+
+        settings.CURRENT_ENCRYPTION_VERSION = 2
+        encryption._encryption_service = None
+        KeyRotationService().run()
+
+        assert set(DiaryBlindIndex.objects.filter(diary=diary).values_list('key_version', flat=True)) == {2}
+        assert _matching_ids(user, 'apple banana') == [diary.id]
+    finally:
+        encryption._encryption_service = None
@@ -0,0 +1,174 @@
+# diary/tests/test_cache_utils.py
+"""
+사용자별 버전 캐시 네임스페이스 테스트
+- 캐시 키에 사용자 버전 포함, invalidate_user_cache 는 버전 증가 1회
+- cached_user_view: 쿼리 파라미터별 캐시, 오류 응답은 캐시하지 않음
+- 일기 변경 시 이전/새 날짜의 연/월/주 버킷만 무효화, 태그 변경 시 인기 태그 캐시 무효화
+- 본문만 바뀐 수정은 리포트(AI 인사이트) 주 버킷만 무효화
+"""
+from datetime import date, datetime, timezone as dt_timezone
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from diary.cache_utils import (
+    VERSION_KEY, date_buckets, get_cache_key, invalidate_user_cache, month_bucket, range_buckets, week_bucket,
+    year_bucket,
+)
+from diary.models import Diary, Tag
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='cacheuser', password='testpass123')
+
+
+class TestVersionedKeys:
+
+    def test_key_contains_user_version(self):
+        key = get_cache_key('calendar', 7, 2026, 10)
+        version = cache.get(VERSION_KEY.format(user_id=7))
+        assert key == f'calendar:7:v{version}:2026:10'
+
+    def test_invalidate_changes_every_key_of_user_only(self):
+        before = [get_cache_key('heatmap', 7, 2019), get_cache_key('annual_report', 7, 2020)]
+        other = get_cache_key('heatmap', 8, 2019)
+
+        invalidate_user_cache(7)
+
+        assert get_cache_key('heatmap', 7, 2019) != before[0]
+        assert get_cache_key('annual_report', 7, 2020) != before[1]
+        assert get_cache_key('heatmap', 8, 2019) == other
+
+    def test_invalidate_without_version_key(self):
+        invalidate_user_cache(9)
+        assert cache.get(VERSION_KEY.format(user_id=9)) is not None
+
+
+@pytest.mark.django_db
+class TestCachedUserView:
+
+    def test_calendar_cached_per_month(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        with patch('diary.services.report_service.ReportService.get_calendar_data',
+                   side_effect=lambda u, y, m: {'year': y, 'month': m}) as mocked:
+            api_client.get('/api/reports/calendar/?year=2019&month=3')
+            response = api_client.get('/api/reports/calendar/?year=2019&month=3')
+            other = api_client.get('/api/reports/calendar/?year=2019&month=4')
+
+        assert response.data == {'year': 2019, 'month': 3}
+        assert other.data == {'year': 2019, 'month': 4}
+        assert mocked.call_count == 2
+
+    def test_error_response_not_cached(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        assert api_client.get('/api/reports/calendar/?year=abc').status_code == 400
+        with patch('diary.services.report_service.ReportService.get_calendar_data', return_value={'ok': True}):
+            assert api_client.get('/api/reports/calendar/?year=abc').status_code == 400
+
+    def test_popular_tags_invalidated_on_tag_create(self, api_client, user, django_capture_on_commit_callbacks):
+        api_client.force_authenticate(user=user)
+        assert api_client.get('/api/tags/popular/').data['tags'] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post('/api/tags/', {'name': '산책'})
+
+        assert [tag['name'] for tag in api_client.get('/api/tags/popular/').data['tags']] == ['산책']
+        assert Tag.objects.filter(user=user).count() == 1
+
+
+@pytest.mark.django_db
+class TestDateBucketInvalidation:
+    """일기 날짜가 속한 연/월/주 버킷만 무효화"""
+
+    @pytest.fixture
+    def old_diary(self, user):
+        diary = Diary.objects.create(user=user, title='작년 일기', content='내용', emotion='happy')
+        Diary.objects.filter(pk=diary.pk).update(created_at=datetime(2019, 3, 5, 12, tzinfo=dt_timezone.utc))
+        diary.refresh_from_db()
+        return diary
+
+    @staticmethod
+    def _keys(user):
+        return {
+            'heatmap_2019': get_cache_key('heatmap', user.id, 2019, buckets=[year_bucket(2019)]),
+            'heatmap_2020': get_cache_key('heatmap', user.id, 2020, buckets=[year_bucket(2020)]),
+            'calendar_2019_3': get_cache_key('calendar', user.id, 2019, 3, buckets=[month_bucket(2019, 3)]),
+            'calendar_2019_4': get_cache_key('calendar', user.id, 2019, 4, buckets=[month_bucket(2019, 4)]),
+            'report_2019_w10': get_cache_key('report', user.id, 'week', buckets=[week_bucket(date(2019, 3, 5))]),
+        }
+
+    def test_range_buckets(self):
+        assert range_buckets(date(2026, 10, 1), date(2026, 10, 8)) == ['w2026-40', 'w2026-41']
+        assert range_buckets(date(2026, 1, 31), date(2026, 4, 30)) == ['m2026-1', 'm2026-2', 'm2026-3', 'm2026-4']
+        assert range_buckets(date(2019, 6, 1), date(2022, 1, 1)) == ['y2019', 'y2020', 'y2021', 'y2022']
+        assert date_buckets(date(2019, 3, 5)) == {'y2019', 'm2019-3', 'w2019-10'}
+
+    def test_editing_old_diary_touches_only_its_buckets(self, user, old_diary, django_capture_on_commit_callbacks):
+        before = self._keys(user)
+
+        old_diary.emotion = 'sad'
+        with django_capture_on_commit_callbacks(execute=True):
+            old_diary.save()
+
+        after = self._keys(user)
+        assert after['heatmap_2019'] != before['heatmap_2019']
+        assert after['calendar_2019_3'] != before['calendar_2019_3']
+        assert after['heatmap_2020'] == before['heatmap_2020']
+        assert after['calendar_2019_4'] == before['calendar_2019_4']
+
+    def test_moving_diary_date_touches_old_and_new_buckets(self, user, old_diary, django_capture_on_commit_callbacks):
+        before = self._keys(user)
+
+        old_diary.created_at = datetime(2020, 1, 10, 12, tzinfo=dt_timezone.utc)
+        with django_capture_on_commit_callbacks(execute=True):
+            old_diary.save()
+
+        after = self._keys(user)
+        assert after['heatmap_2019'] != before['heatmap_2019']
+        assert after['heatmap_2020'] != before['heatmap_2020']
+        assert after['calendar_2019_4'] == before['calendar_2019_4']
+
+    def test_content_only_edit_keeps_cache(self, user, old_diary, django_capture_on_commit_callbacks):
+        before = self._keys(user)
+
+        old_diary.title = '제목만 수정'
+        with django_capture_on_commit_callbacks(execute=True):
+            old_diary.save()
+
+        assert self._keys(user) == before
+
+    def test_body_edit_touches_only_report_bucket(self, user, old_diary, django_capture_on_commit_callbacks):
+        before = self._keys(user)
+
+        old_diary.encrypt_content('본문만 수정')
+        with django_capture_on_commit_callbacks(execute=True):
+            old_diary.save(update_fields=['content', 'is_encrypted'])
+
+        after = self._keys(user)
+        assert after['report_2019_w10'] != before['report_2019_w10']
+        assert {k: v for k, v in after.items() if k != 'report_2019_w10'} == \
+            {k: v for k, v in before.items() if k != 'report_2019_w10'}
+
+    def test_delete_invalidates_cached_annual_report(self, api_client, user, old_diary,
+                                                     django_capture_on_commit_callbacks):
+        api_client.force_authenticate(user=user)
+        with patch('diary.services.report_service.ReportService.get_annual_report',
+                   return_value={'total': 0}) as mocked:
+            api_client.get('/api/reports/annual/?year=2019')
+            api_client.get('/api/reports/annual/?year=2020')
+            with django_capture_on_commit_callbacks(execute=True):
+                old_diary.delete()
+            api_client.get('/api/reports/annual/?year=2019')
+            api_client.get('/api/reports/annual/?year=2020')
+
+        assert [call.args[1] for call in mocked.call_args_list] == [2019, 2020, 2019]
@@ -8,16 +8,15 @@ from diary.services.chat_service import ChatService
 from diary.models import Diary
 
 class TestChatService:
-    @patch('diary.services.chat_service.genai')
+    @patch('diary.services.chat_service.get_gemini_client')
     @patch('diary.services.chat_service.SentenceTransformer')
-    def test_generate_chat_response_success(self, mock_transformer, mock_genai):
+    def test_generate_chat_response_success(self, mock_transformer, mock_get_client):
         """채팅 응답 생성 성공 케이스"""
-        # Mocking Models
-        mock_model = MagicMock()
-        mock_response = MagicMock()
-        mock_response.text = "네, 그랬군요."
-        mock_model.generate_content.return_value = mock_response
-        mock_genai.GenerativeModel.return_value = mock_model
+        # Mocking Gemini gateway (streaming)
+        mock_client = mock_get_client.return_value
+        mock_chunk = MagicMock()
+        mock_chunk.text = "네, 그랬군요."
+        mock_client.generate_content_stream.return_value = [mock_chunk]
         
         # Mock Embedding
         mock_encoder = MagicMock()
@@ -42,16 +41,16 @@ class TestChatService:
                 assert response == "네, 그랬군요."
                 
                 # History가 프롬프트에 포함되었는지 확인 (간접적 검증)
-                args, _ = mock_model.generate_content.call_args
-                prompt = args[0][0]['parts'][0]
+                _, kwargs = mock_client.generate_content_stream.call_args
+                prompt = kwargs['contents']
                 assert "안녕" in prompt
                 assert "반가워요" in prompt
 
-    @patch('diary.services.chat_service.genai')
-    def test_generate_chat_response_api_error(self, mock_genai):
+    @patch('diary.services.chat_service.get_gemini_client')
+    def test_generate_chat_response_api_error(self, mock_get_client):
         """API 에러 발생 시 예외 처리"""
         with patch('diary.services.chat_service.SentenceTransformer'):
-            mock_genai.GenerativeModel.side_effect = Exception("API Error")
+            mock_get_client.return_value.generate_content_stream.side_effect = Exception("API Error")
             
             service = ChatService()
             user = MagicMock()
@@ -64,14 +63,13 @@ class TestChatService:
                 
                 assert "Sorry" in response or "죄송합니다" in response
 
-    @patch('diary.services.chat_service.genai')
-    def test_generate_reflection_question_success(self, mock_genai):
+    @patch('diary.services.chat_service.get_gemini_client')
+    def test_generate_reflection_question_success(self, mock_get_client):
         """회고 질문 생성 성공 케이스"""
-        mock_model = MagicMock()
+        mock_client = mock_get_client.return_value
         mock_response = MagicMock()
         mock_response.text = "오늘 하루는 어땠나요?"
-        mock_model.generate_content.return_value = mock_response
-        mock_genai.GenerativeModel.return_value = mock_model
+        mock_client.generate_content.return_value = mock_response
         
         diary = MagicMock(spec=Diary)
         diary.title = "테스트 일기"
@@ -84,14 +82,14 @@ class TestChatService:
             question = ChatService.generate_reflection_question(diary)
             
             assert question == "오늘 하루는 어땠나요?"
-            mock_model.generate_content.assert_called_once()
-            args, _ = mock_model.generate_content.call_args
-            assert "테스트 일기" in args[0]
+            mock_client.generate_content.assert_called_once()
+            _, kwargs = mock_client.generate_content.call_args
+            assert "테스트 일기" in kwargs['contents']
 
-    @patch('diary.services.chat_service.genai')
-    def test_generate_reflection_question_failure(self, mock_genai):
+    @patch('diary.services.chat_service.get_gemini_client')
+    def test_generate_reflection_question_failure(self, mock_get_client):
         """회고 질문 생성 실패 시 None 반환"""
-        mock_genai.GenerativeModel.side_effect = Exception("API Error")
+        mock_get_client.return_value.generate_content.side_effect = Exception("API Error")
         
         diary = MagicMock(spec=Diary)
         
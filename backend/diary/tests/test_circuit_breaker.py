@@ -0,0 +1,254 @@
+# diary/tests/test_circuit_breaker.py
+"""
+분산 서킷 브레이커 테스트 (프로세스 로컬 / Redis Lua 백엔드 공통)
+- 오류율 윈도우: 최소 호출 수 이후 실패 비율로 차단, 느린 호출 비율로 차단
+- half-open: 탐색 호출 하나만 통과, 성공 시 닫힘 / 실패 시 다시 열림
+- 데코레이터: 차단 중에만 fallback, 그 밖의 예외는 전파
+- Gemini 게이트웨이: 차단 중에는 대기열/호출 없이 바로 CircuitOpenError
+"""
+import asyncio
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.conf import settings
+
+from diary.services.gemini_client import DEFAULT_GEMINI_GATEWAY, GeminiClient, GeminiOverloadedError
+from diary.utils.circuit_breaker import (
+    CLOSED, FAILURE, HALF_OPEN, IGNORE, OPEN, SUCCESS,
+    CircuitBreaker, CircuitOpenError, _LocalBackend, _RedisBackend, circuit_breaker,
+)
+
+
+def _redis_backend():
+    import redis
+    try:
+        redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5).ping()
+    except Exception:
+        pytest.skip('Redis 서버 없음')
+    return _RedisBackend(redis.from_url(settings.REDIS_URL))
+
+
+@pytest.fixture(params=['locmem', 'redis'])
+def backend(request, settings):
+    backend = _LocalBackend() if request.param == 'locmem' else _redis_backend()
+    settings.CIRCUIT_BREAKER = {
+        'BACKEND': request.param, 'KEY_PREFIX': f"cbtest:{uuid.uuid4().hex}",
+        'MIN_CALLS': 4, 'FAILURE_RATE': 0.5, 'SLOW_CALL_THRESHOLD': 0.05, 'SLOW_CALL_RATE': 0.5,
+        'OPEN_TIMEOUT': 0.1,
+    }
+    with patch('diary.utils.circuit_breaker.get_backend', return_value=backend):
+        yield backend
+
+
+def _name():
+    return f"test:{uuid.uuid4().hex}"
+
+
+def _trip(breaker):
+    for _ in range(breaker.options['MIN_CALLS']):
+        breaker.record(FAILURE)
+    assert breaker.snapshot()['state'] == OPEN
+
+
+class TestErrorRateWindow:
+
+    def test_trips_on_failure_rate_after_min_calls(self, backend):
+        breaker = CircuitBreaker(_name())
+
+        for outcome in (FAILURE, FAILURE, FAILURE):
+            assert breaker.record(outcome) == CLOSED
+        assert breaker.record(SUCCESS) == OPEN
+
+        allowed, probe, retry = breaker.allow()
+        assert (allowed, probe) == (False, False)
+        assert 0 < retry <= 0.1
+
+    def test_stays_closed_below_failure_rate(self, backend):
+        breaker = CircuitBreaker(_name())
+
+        for outcome in (SUCCESS, FAILURE, SUCCESS, SUCCESS, FAILURE, SUCCESS):
+            breaker.record(outcome)
+
+        snapshot = breaker.snapshot()
+        assert snapshot['state'] == CLOSED
+        assert (snapshot['calls'], snapshot['failures'], snapshot['failure_rate']) == (6, 2, 0.333)
+
+    def test_ignored_outcomes_not_counted(self, backend):
+        breaker = CircuitBreaker(_name())
+
+        for _ in range(10):
+            breaker.record(IGNORE)
+
+        assert breaker.snapshot()['calls'] == 0
+
+    def test_trips_on_slow_calls(self, backend):
+        breaker = CircuitBreaker(_name())
+
+        for _ in range(4):
+            breaker.record(SUCCESS, latency=0.2)
+
+        snapshot = breaker.snapshot()
+        assert snapshot['state'] == OPEN
+        # 차단되면 윈도우는 비워짐
+        assert snapshot['calls'] == 0
+
+
+class TestHalfOpen:
+
+    def test_single_probe_then_close_on_success(self, backend):
+        breaker = CircuitBreaker(_name())
+        _trip(breaker)
+        time.sleep(0.15)
+
+        allowed, probe, _ = breaker.allow()
+        assert (allowed, probe) == (True, True)
+        assert breaker.allow()[0] is False
+
+        assert breaker.record(SUCCESS, probe=True) == CLOSED
+        assert breaker.allow() == (True, False, 0)
+
+    def test_probe_failure_reopens(self, backend):
+        breaker = CircuitBreaker(_name())
+        _trip(breaker)
+        time.sleep(0.15)
+
+        _, probe, _ = breaker.allow()
+        assert breaker.record(FAILURE, probe=probe) == OPEN
+        assert breaker.allow()[0] is False
+
+    def test_ignored_probe_releases_slot(self, backend):
+        breaker = CircuitBreaker(_name())
+        _trip(breaker)
+        time.sleep(0.15)
+
+        _, probe, _ = breaker.allow()
+        assert breaker.record(IGNORE, probe=probe) == HALF_OPEN
+        assert breaker.allow()[:2] == (True, True)
+
+    def test_concurrent_callers_get_one_probe(self, backend):
+        breaker = CircuitBreaker(_name())
+        _trip(breaker)
+        time.sleep(0.15)
+
+        barrier = threading.Barrier(20)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(breaker.allow()[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) == 1
+
+
+class TestDecorator:
+
+    def test_fallback_only_when_open(self, backend):
+        calls = []
+
+        @circuit_breaker(_name(), fallback=lambda value: f"fallback:{value}")
+        def call(value):
+            calls.append(value)
+            raise ValueError('upstream down')
+
+        for i in range(4):
+            with pytest.raises(ValueError):
+                call(i)
+
+        assert call(9) == 'fallback:9'
+        assert calls == [0, 1, 2, 3]
+
+    def test_ignored_exceptions_do_not_trip(self, backend):
+        name = _name()
+
+        @circuit_breaker(name, ignore=(KeyError,))
+        def call():
+            raise KeyError('bad input')
+
+        for _ in range(6):
+            with pytest.raises(KeyError):
+                call()
+
+        assert CircuitBreaker(name).snapshot()['state'] == CLOSED
+
+    def test_nested_open_circuit_not_counted_by_outer(self, backend):
+        inner = CircuitBreaker(_name())
+        outer_name = _name()
+        _trip(inner)
+
+        @circuit_breaker(outer_name)
+        def call():
+            with inner.guard():
+                pass
+
+        for _ in range(6):
+            with pytest.raises(CircuitOpenError):
+                call()
+
+        snapshot = CircuitBreaker(outer_name).snapshot()
+        assert (snapshot['state'], snapshot['calls']) == (CLOSED, 0)
+
+    def test_nested_open_circuit_uses_outer_fallback(self, backend):
+        inner = CircuitBreaker(_name())
+        _trip(inner)
+
+        @circuit_breaker(_name(), fallback=lambda: 'fallback')
+        def call():
+            with inner.guard():
+                return 'upstream'
+
+        assert call() == 'fallback'
+
+    def test_async_without_fallback_raises(self, backend):
+        @circuit_breaker(_name())
+        async def call():
+            raise ConnectionError('down')
+
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                asyncio.run(call())
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(call())
+
+
+class TestGateway:
+
+    def test_open_circuit_short_circuits_calls(self, backend):
+        model = f"model-{uuid.uuid4().hex}"
+        gateway = GeminiClient(config=DEFAULT_GEMINI_GATEWAY)
+        gateway._client = MagicMock()
+        gateway._client.models.generate_content.side_effect = ConnectionError('down')
+
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                gateway.generate_content(model, 'x')
+
+        with pytest.raises(CircuitOpenError):
+            gateway.generate_content(model, 'x')
+
+        stats = gateway.stats()['models'][model]
+        assert (stats['calls'], stats['short_circuited']) == (4, 1)
+        assert gateway._client.models.generate_content.call_count == 4
+        assert gateway.stats()['in_flight'] == 0
+
+    def test_local_backpressure_not_counted(self, backend):
+        model = f"model-{uuid.uuid4().hex}"
+        gateway = GeminiClient(config={**DEFAULT_GEMINI_GATEWAY, 'MAX_CONCURRENCY': 1, 'MAX_QUEUE': 0})
+        gateway._client = MagicMock()
+        gateway._limiter.acquire(model, 0)
+
+        for _ in range(6):
+            with pytest.raises(GeminiOverloadedError):
+                gateway.generate_content(model, 'x')
+
+        gateway._limiter.release(model)
+        gateway.generate_content(model, 'x')
+        assert gateway.stats()['models'][model]['short_circuited'] == 0
@@ -0,0 +1,114 @@
+# diary/tests/test_decryption_cache.py
+"""
+복호화 캐시 테스트
+- LRU 적중/무효화
+- 암호문 변경 감지
+- 바이트 상한 / TTL
+- 요청 단위 메모
+"""
+import pytest
+from unittest.mock import MagicMock
+from django.contrib.auth import get_user_model
+
+from diary.models import Diary
+from diary.utils.decryption_cache import (
+    DecryptedContentCache,
+    DecryptionMemoMiddleware,
+    get_decryption_cache,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='cacheuser', password='testpass123')
+
+
+@pytest.fixture
+def diary(user):
+    diary = Diary(user=user, title='캐시 테스트')
+    diary.encrypt_content('비밀 내용')
+    diary.save()
+    return diary
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    get_decryption_cache().clear()
+    yield
+    get_decryption_cache().clear()
+
+
+def _fake_diary(pk=1, content='token-aaaa', version=1):
+    return MagicMock(pk=pk, version=version, encryption_version=1, content=content)
+
+
+class TestDecryptedContentCache:
+
+    def test_hit_after_first_decrypt(self):
+        cache = DecryptedContentCache()
+        decrypt = MagicMock(return_value='plain')
+        diary = _fake_diary()
+
+        assert cache.get_or_decrypt(diary, decrypt) == 'plain'
+        assert cache.get_or_decrypt(diary, decrypt) == 'plain'
+        assert decrypt.call_count == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_changed_ciphertext_is_a_miss(self):
+        cache = DecryptedContentCache()
+        cache.get_or_decrypt(_fake_diary(content='token-aaaa'), lambda: 'old')
+
+        assert cache.get_or_decrypt(_fake_diary(content='token-bbbb'), lambda: 'new') == 'new'
+
+    def test_byte_cap_evicts_oldest(self):
+        cache = DecryptedContentCache(max_bytes=200)
+        for pk in range(1, 6):
+            cache.get_or_decrypt(_fake_diary(pk=pk), lambda: 'x' * 50)
+
+        stats = cache.stats()
+        assert stats['bytes'] <= 200
+        assert stats['evictions'] > 0
+
+    def test_ttl_expiry(self):
+        cache = DecryptedContentCache(ttl=-1)
+        decrypt = MagicMock(return_value='plain')
+        diary = _fake_diary()
+
+        cache.get_or_decrypt(diary, decrypt)
+        cache.get_or_decrypt(diary, decrypt)
+        assert decrypt.call_count == 2
+
+    def test_request_memo(self):
+        cache = DecryptedContentCache(enabled=True)
+        decrypt = MagicMock(return_value='plain')
+        diary = _fake_diary()
+
+        def view(request):
+            cache.get_or_decrypt(diary, decrypt)
+            cache.clear()  # LRU 가 비어도 같은 요청 안에서는 메모 사용
+            cache.get_or_decrypt(diary, decrypt)
+            return 'ok'
+
+        assert DecryptionMemoMiddleware(view)(MagicMock()) == 'ok'
+        assert decrypt.call_count == 1
+        assert cache.stats()['memo_hits'] == 1
+
+
+@pytest.mark.django_db
+class TestDiaryDecryptCache:
+
+    def test_decrypt_content_is_cached(self, diary):
+        assert diary.decrypt_content() == '비밀 내용'
+        assert diary.decrypt_content() == '비밀 내용'
+        assert get_decryption_cache().stats()['hits'] >= 1
+
+    def test_save_invalidates(self, diary):
+        diary.decrypt_content()
+        diary.encrypt_content('새 내용')
+        diary.save()
+
+        reloaded = Diary.objects.get(pk=diary.pk)
+        assert reloaded.decrypt_content() == '새 내용'
@@ -0,0 +1,98 @@
+# diary/tests/test_embedding_batch.py
+"""
+임베딩 배치 처리 테스트
+- 여러 일기를 한 번의 encode 호출로 처리
+- 내용 해시가 같으면 건너뜀
+- Redis 대기열 등록/디바운스
+"""
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+from django.contrib.auth import get_user_model
+
+from diary.models import Diary, DiaryEmbedding
+from diary.services.embedding_service import EmbeddingService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def model():
+    mock_model = MagicMock()
+    mock_model.encode.side_effect = lambda texts: np.full((len(texts), 384), 0.2)
+    with patch('diary.services.chat_service.get_embedding_model', return_value=mock_model):
+        yield mock_model
+
+
+@pytest.fixture
+def diaries(db, model):
+    user = User.objects.create_user(username='embedder', password='testpass123')
+    result = []
+    for i in range(3):
+        diary = Diary(user=user, title=f'일기 {i}', emotion='happy')
+        diary.encrypt_content(f'비밀 내용 {i}')
+        diary.save()
+        result.append(diary)
+    model.encode.reset_mock()
+    return result
+
+
+@pytest.mark.django_db
+class TestEmbedDiaries:
+
+    def test_save_creates_embedding_from_plaintext(self, diaries):
+        embedding = DiaryEmbedding.objects.get(diary=diaries[0])
+        text = EmbeddingService.build_text('일기 0', '비밀 내용 0', 'happy')
+
+        assert embedding.content_hash == EmbeddingService.content_hash(text)
+
+    def test_unchanged_diaries_are_skipped(self, diaries, model):
+        assert EmbeddingService.embed_diaries([d.id for d in diaries]) == 0
+        model.encode.assert_not_called()
+
+    def test_changed_diaries_encoded_in_one_call(self, diaries, model):
+        Diary.objects.filter(id__in=[diaries[0].id, diaries[2].id]).update(emotion='sad')
+
+        assert EmbeddingService.embed_diaries([d.id for d in diaries]) == 2
+        assert model.encode.call_count == 1
+        assert len(model.encode.call_args[0][0]) == 2
+        assert DiaryEmbedding.objects.count() == 3
+
+    def test_update_fields_without_text_skip_embedding(self, diaries, model):
+        diaries[0].is_transcribing = True
+        diaries[0].save(update_fields=['is_transcribing'])
+
+        model.encode.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestEmbeddingQueue:
+
+    def test_enqueue_debounces_batch_task(self, settings):
+        settings.EMBEDDING_BATCH = {'ENABLED': True, 'MAX_WAIT_MS': 200}
+        client = MagicMock()
+        client.set.side_effect = [True, False]
+
+        with patch.object(EmbeddingService, '_redis', return_value=client), \
+             patch('diary.tasks.embed_pending_diaries.apply_async') as apply_async:
+            EmbeddingService.enqueue(1)
+            EmbeddingService.enqueue(2)
+
+        assert client.sadd.call_count == 2
+        apply_async.assert_called_once_with(countdown=0.2)
+
+    def test_drain_pending_batches_ids(self, settings, diaries, model):
+        settings.EMBEDDING_BATCH = {'MAX_ITEMS': 2}
+        Diary.objects.filter(id__in=[d.id for d in diaries]).update(emotion='calm')
+        client = MagicMock()
+        client.spop.side_effect = [
+            [str(diaries[0].id).encode(), str(diaries[1].id).encode()],
+            [str(diaries[2].id).encode()],
+            [],
+        ]
+
+        with patch.object(EmbeddingService, '_redis', return_value=client):
+            assert EmbeddingService.drain_pending() == 3
+
+        assert model.encode.call_count == 2
+        client.spop.assert_called_with('embedding:pending', 2)
@@ -0,0 +1,100 @@
+# diary/tests/test_emotion_aggregate.py
+"""
+일별 감정 집계 테스트
+- 일기 생성/수정/삭제 시 증분 갱신
+- rebuild_aggregates 명령어
+- 리포트/캘린더가 집계를 사용
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from diary.models import Diary, DailyEmotionAggregate
+from diary.services.report_service import ReportService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='agguser', password='testpass123')
+
+
+def _aggregates(user):
+    return {
+        (row.emotion, row.count, row.score_sum)
+        for row in DailyEmotionAggregate.objects.filter(user=user)
+    }
+
+
+@pytest.mark.django_db
+class TestEmotionAggregateSignals:
+
+    def test_create_increments(self, user):
+        Diary.objects.create(user=user, title='a', content='x', emotion='happy', emotion_score=80)
+        Diary.objects.create(user=user, title='b', content='x', emotion='happy', emotion_score=60)
+        Diary.objects.create(user=user, title='c', content='x')
+
+        assert _aggregates(user) == {('happy', 2, 140), ('', 1, 0)}
+
+    def test_emotion_update_moves_count(self, user):
+        diary = Diary.objects.create(user=user, title='a', content='x')
+
+        diary.emotion = 'sad'
+        diary.emotion_score = 40
+        diary.save(update_fields=['emotion', 'emotion_score'])
+
+        assert _aggregates(user) == {('sad', 1, 40)}
+
+    def test_unrelated_update_is_ignored(self, user):
+        diary = Diary.objects.create(user=user, title='a', content='x', emotion='sad')
+        diary.title = 'b'
+        diary.save(update_fields=['title'])
+
+        assert _aggregates(user) == {('sad', 1, 0)}
+
+    def test_delete_decrements(self, user):
+        diary = Diary.objects.create(user=user, title='a', content='x', emotion='love', emotion_score=10)
+        diary.delete()
+
+        assert not DailyEmotionAggregate.objects.filter(user=user).exists()
+
+    def test_rebuild_command(self, user):
+        Diary.objects.create(user=user, title='a', content='x', emotion='happy', emotion_score=70)
+        Diary.objects.create(user=user, title='b', content='x', emotion='tired', emotion_score=30)
+        DailyEmotionAggregate.objects.filter(user=user).delete()
+
+        call_command('rebuild_aggregates', user=user.id)
+
+        assert _aggregates(user) == {('happy', 1, 70), ('tired', 1, 30)}
+
+
+@pytest.mark.django_db
+class TestReportsUseAggregates:
+
+    def test_calendar_reads_aggregates(self, user):
+        diary = Diary.objects.create(user=user, title='a', content='x', emotion='happy')
+        today = timezone.localdate()
+
+        result = ReportService.get_calendar_data(user, today.year, today.month)
+
+        day = result['days'][today.strftime('%Y-%m-%d')]
+        assert day['count'] == 1
+        assert day['emotion'] == 'happy'
+        assert day['diary_ids'] == [diary.id]
+
+    def test_annual_report_counts(self, user):
+        for emotion in ['happy', 'happy', 'sad']:
+            Diary.objects.create(user=user, title='a', content='x', emotion=emotion)
+        today = timezone.localdate()
+
+        result = ReportService.get_annual_report(user, today.year)
+
+        assert result['total_diaries'] == 3
+        month = result['monthly_stats'][today.month - 1]
+        assert month['count'] == 3
+        assert month['dominant_emotion'] == 'happy'
+        assert result['emotion_stats'][0] == {
+            'emotion': 'happy', 'label': '행복', 'count': 2, 'percentage': 67,
+        }
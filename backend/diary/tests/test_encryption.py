@@ -133,3 +133,66 @@ class EncryptionServiceSingletonTest(TestCase):
             # version=2 (최신)로 시도 -> 실패 -> Fallback Loop -> V1으로 성공
             decrypted_fallback = service_v2.decrypt(encrypted_v1, version=2)
             self.assertEqual(decrypted_fallback, original_content)
+
+
+class BulkEncryptionTest(TestCase):
+    """encrypt_many / decrypt_many 테스트"""
+
+    KEYS = {
+        'DIARY_ENCRYPTION_KEYS': {
+            1: 'key-v1-for-encryption-32bytes!!!',
+            2: 'key-v2-for-encryption-32bytes!!!',
+        },
+        'CURRENT_ENCRYPTION_VERSION': 2,
+    }
+
+    def test_round_trip_mixed_versions(self):
+        """키 버전이 섞여 있어도 입력 순서대로 복호화"""
+        with override_settings(**self.KEYS):
+            service = DiaryEncryptionService()
+            v1 = service.encrypt_many(['a', 'b'], version=1)
+            v2 = service.encrypt_many(['c'])
+
+            result = service.decrypt_many([(v1[0], 1), (v2[0], 2), (v1[1], 1), ('', 1)])
+
+        self.assertEqual(result, ['a', 'c', 'b', ''])
+
+    def test_per_item_error_does_not_abort(self):
+        """깨진 항목은 EncryptionError 로 반환되고 나머지는 정상 처리"""
+        with override_settings(**self.KEYS):
+            service = DiaryEncryptionService()
+            token = service.encrypt_many(['정상'])[0]
+
+            result = service.decrypt_many([(token, 2), ('not-a-token', 2)])
+
+        self.assertEqual(result[0], '정상')
+        self.assertIsInstance(result[1], EncryptionError)
+
+    def test_wrong_version_recovers_with_fallback(self):
+        """저장된 버전이 틀려도 다른 키로 복구"""
+        with override_settings(**self.KEYS):
+            service = DiaryEncryptionService()
+            token = service.encrypt_many(['복구'], version=1)[0]
+
+            self.assertEqual(service.decrypt_many([(token, 2)]), ['복구'])
+
+    def test_large_batch_uses_process_pool(self):
+        """임계값 이상이면 프로세스 풀로 분할 처리해도 결과 동일"""
+        with override_settings(ENCRYPTION_PARALLEL_THRESHOLD=4, ENCRYPTION_MAX_WORKERS=2, **self.KEYS):
+            service = DiaryEncryptionService()
+            texts = [f'일기 {i}' for i in range(10)]
+            tokens = service.encrypt_many(texts)
+
+            self.assertEqual(service.decrypt_many([(t, 2) for t in tokens]), texts)
+
+    def test_process_pool_reused_across_batches(self):
+        """프로세스 풀은 호출마다 새로 만들지 않고 재사용"""
+        from diary import encryption
+        with override_settings(ENCRYPTION_PARALLEL_THRESHOLD=4, ENCRYPTION_MAX_WORKERS=2, **self.KEYS):
+            service = DiaryEncryptionService()
+            service.encrypt_many([f'일기 {i}' for i in range(10)])
+            pool = encryption._process_pool
+            service.encrypt_many([f'일기 {i}' for i in range(10)])
+
+            self.assertIsNotNone(pool)
+            self.assertIs(encryption._process_pool, pool)
@@ -0,0 +1,201 @@
+# diary/tests/test_export_job.py
+"""
+비동기 PDF 내보내기 작업 테스트
+- 작업 생성 / 진행 중 작업 재사용 / fingerprint 결과 캐시
+- 청크 단위 렌더링과 진행률
+- Range 다운로드
+- 오래된/대체된 결과 정리
+"""
+import os
+
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+
+from diary.models import Diary, ExportJob
+from diary.services.export_job_service import ExportJobService
+from diary.utils.http_range import parse_range
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='pdfjobuser', password='testpass123')
+
+
+@pytest.fixture
+def diaries(user):
+    return [
+        Diary.objects.create(user=user, title=f'PDF 일기 {i}', content=f'내용 {i}\n' * 20)
+        for i in range(5)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def export_dir(settings, tmp_path):
+    settings.EXPORT_JOB = {'DIR': str(tmp_path / 'jobs'), 'CHUNK_SIZE': 2, 'STALE_SECONDS': 1800}
+    return tmp_path / 'jobs'
+
+
+def _request(user, django_capture_on_commit_callbacks):
+    with patch('diary.tasks.generate_pdf_export.delay') as mock_delay, \
+            django_capture_on_commit_callbacks(execute=True):
+        job, created = ExportJobService.request_pdf(user)
+    return job, created, mock_delay
+
+
+class TestParseRange:
+
+    def test_ranges(self):
+        assert parse_range(None, 100) is None
+        assert parse_range('bytes=0-9', 100) == (0, 9)
+        assert parse_range('bytes=90-', 100) == (90, 99)
+        assert parse_range('bytes=-10', 100) == (90, 99)
+        assert parse_range('bytes=50-500', 100) == (50, 99)
+
+    def test_unsatisfiable(self):
+        assert parse_range('bytes=100-', 100) is False
+        assert parse_range('bytes=-0', 100) is False
+
+
+@pytest.mark.django_db
+class TestExportJobService:
+
+    def test_request_creates_and_reuses_pending_job(self, user, diaries, django_capture_on_commit_callbacks):
+        job, created, mock_delay = _request(user, django_capture_on_commit_callbacks)
+        again, created_again, mock_delay_again = _request(user, django_capture_on_commit_callbacks)
+
+        assert created is True
+        mock_delay.assert_called_once_with(job.id)
+        assert job.total == 5
+        assert again.id == job.id
+        assert created_again is False
+        mock_delay_again.assert_not_called()
+
+    def test_run_renders_pdf_with_progress(self, user, diaries, django_capture_on_commit_callbacks):
+        from diary.services import export_job_service
+
+        job, _, _ = _request(user, django_capture_on_commit_callbacks)
+        reported = []
+        render = export_job_service.render_diaries_pdf
+
+        def spy_render(*args, **kwargs):
+            callback = kwargs['progress_callback']
+            kwargs['progress_callback'] = lambda n: (reported.append(n), callback(n))
+            return render(*args, **kwargs)
+
+        with patch.object(export_job_service, 'render_diaries_pdf', spy_render):
+            job = ExportJobService.run_pdf_job(job.id)
+
+        assert reported == [2, 4]  # CHUNK_SIZE 마다 진행률 기록
+        assert job.status == ExportJob.Status.COMPLETED
+        assert job.progress == 100
+        assert job.processed == 5
+        with open(job.file_path, 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+        assert job.file_size == os.path.getsize(job.file_path)
+
+    def test_long_content_spans_pages(self, user, django_capture_on_commit_callbacks):
+        Diary.objects.create(user=user, title='긴 일기', content='긴 문장입니다. ' * 3000)
+        job, _, _ = _request(user, django_capture_on_commit_callbacks)
+
+        job = ExportJobService.run_pdf_job(job.id)
+
+        assert job.status == ExportJob.Status.COMPLETED
+        assert job.file_size > 0
+
+    def test_completed_artifact_is_cached_until_data_changes(self, user, diaries, django_capture_on_commit_callbacks):
+        job, _, _ = _request(user, django_capture_on_commit_callbacks)
+        ExportJobService.run_pdf_job(job.id)
+
+        cached, created, mock_delay = _request(user, django_capture_on_commit_callbacks)
+        assert (cached.id, created) == (job.id, False)
+        mock_delay.assert_not_called()
+
+        Diary.objects.create(user=user, title='새 일기', content='새 내용')
+        fresh, created, _ = _request(user, django_capture_on_commit_callbacks)
+        assert created is True
+        assert fresh.fingerprint != job.fingerprint
+
+    def test_emotion_analysis_invalidates_cached_artifact(self, user, diaries, django_capture_on_commit_callbacks):
+        from diary.tasks import analyze_emotion_task
+
+        diaries[0].encrypt_content('감정 분석 전 일기')
+        diaries[0].save()
+        job, _, _ = _request(user, django_capture_on_commit_callbacks)
+        ExportJobService.run_pdf_job(job.id)
+
+        result = {'emotion': 'sad', 'emotion_label': '슬픔', 'score': 40, 'reason': '', 'cached': True}
+        with patch('diary.emotion_service.EmotionAnalyzer.lookup_cached', return_value=result):
+            analyze_emotion_task(diaries[0].id)
+
+        fresh, created, _ = _request(user, django_capture_on_commit_callbacks)
+        assert created is True
+        assert fresh.fingerprint != job.fingerprint
+
+    def test_failed_job_is_recorded(self, user, diaries, django_capture_on_commit_callbacks):
+        job, _, _ = _request(user, django_capture_on_commit_callbacks)
+
+        with patch('diary.services.export_job_service.render_diaries_pdf', side_effect=RuntimeError('boom')):
+            with pytest.raises(RuntimeError):
+                ExportJobService.run_pdf_job(job.id)
+
+        job.refresh_from_db()
+        assert job.status == ExportJob.Status.FAILED
+        assert 'boom' in job.error
+
+    def test_cleanup_keeps_latest_artifact(self, user, diaries, django_capture_on_commit_callbacks):
+        old, _, _ = _request(user, django_capture_on_commit_callbacks)
+        old = ExportJobService.run_pdf_job(old.id)
+        Diary.objects.create(user=user, title='새 일기', content='새 내용')
+        new, _, _ = _request(user, django_capture_on_commit_callbacks)
+        new = ExportJobService.run_pdf_job(new.id)
+
+        deleted = ExportJobService.cleanup(days=7)
+
+        assert deleted == 1
+        assert not ExportJob.objects.filter(pk=old.pk).exists()
+        assert not os.path.exists(old.file_path)
+        assert os.path.exists(new.file_path)
+
+
+@pytest.mark.django_db
+class TestExportJobViews:
+
+    def test_create_poll_and_download(self, api_client, user, diaries, django_capture_on_commit_callbacks):
+        api_client.force_authenticate(user=user)
+
+        with patch('diary.tasks.generate_pdf_export.delay'), \
+                django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post('/api/export/pdf-jobs/')
+        assert response.status_code == 202
+        job_id = response.data['id']
+        assert response.data['download_url'] is None
+
+        pending = api_client.get(f'/api/export/pdf-jobs/{job_id}/download/')
+        assert pending.status_code == 409
+
+        ExportJobService.run_pdf_job(job_id)
+        status_response = api_client.get(f'/api/export/pdf-jobs/{job_id}/')
+        assert status_response.data['status'] == 'completed'
+        assert status_response.data['progress'] == 100
+        assert status_response.data['download_url'].endswith(f'/api/export/pdf-jobs/{job_id}/download/')
+
+        full = api_client.get(f'/api/export/pdf-jobs/{job_id}/download/')
+        body = b''.join(full.streaming_content)
+        assert full.status_code == 200
+        assert full['Accept-Ranges'] == 'bytes'
+
+        partial = api_client.get(f'/api/export/pdf-jobs/{job_id}/download/', HTTP_RANGE='bytes=0-9')
+        assert partial.status_code == 206
+        assert partial['Content-Range'] == f'bytes 0-9/{len(body)}'
+        assert b''.join(partial.streaming_content) == body[:10]
+
+        invalid = api_client.get(f'/api/export/pdf-jobs/{job_id}/download/', HTTP_RANGE=f'bytes={len(body)}-')
+        assert invalid.status_code == 416
+
+    def test_other_users_job_is_not_visible(self, api_client, user, diaries, django_capture_on_commit_callbacks):
+        job, _, _ = _request(user, django_capture_on_commit_callbacks)
+        other = User.objects.create_user(username='otherpdf', password='testpass123')
+        api_client.force_authenticate(user=other)
+
+        assert api_client.get(f'/api/export/pdf-jobs/{job.id}/').status_code == 404
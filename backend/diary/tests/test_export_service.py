@@ -144,3 +144,131 @@ class TestExportDataIntegrity:
         
         # 감정 데이터가 포함되어 있는지 확인
         assert result is not None
+
+
+@pytest.mark.django_db
+class TestStreamingExport:
+    """스트리밍 JSON/CSV 내보내기 테스트"""
+    
+    def test_stream_json_matches_export_json(self, test_user, sample_diaries):
+        """스트리밍 JSON 이 export_json 과 같은 일기 목록을 가짐"""
+        import json
+        
+        streamed = json.loads(b''.join(ExportService.stream_json(test_user, chunk_size=2)))
+        expected = ExportService.export_json(test_user)
+        
+        assert streamed['total_diaries'] == 5
+        assert streamed['diaries'] == expected['diaries']
+    
+    def test_stream_json_empty(self, test_user):
+        import json
+        
+        streamed = json.loads(b''.join(ExportService.stream_json(test_user)))
+        
+        assert streamed['diaries'] == []
+        assert streamed['total_diaries'] == 0
+    
+    def test_decrypts_in_chunks(self, test_user, sample_diaries):
+        """청크 단위로 복호화 (전체 목록을 한 번에 복호화하지 않음)"""
+        from diary.services import export_service
+        
+        with patch.object(export_service, 'decrypt_diaries', wraps=export_service.decrypt_diaries) as mock_decrypt:
+            list(ExportService.stream_csv(test_user, chunk_size=2))
+        
+        assert [len(call.args[0]) for call in mock_decrypt.call_args_list] == [2, 2, 1]
+    
+    def test_stream_csv_rows(self, test_user, sample_diaries):
+        import csv
+        import io
+        
+        text = b''.join(ExportService.stream_csv(test_user)).decode('utf-8-sig')
+        rows = list(csv.reader(io.StringIO(text)))
+        
+        assert rows[0][0] == 'ID'
+        assert len(rows) == 6
+        assert {row[1] for row in rows[1:]} == {d.title for d in sample_diaries}
+    
+    def test_gzip_stream_roundtrip(self):
+        import gzip
+        from diary.services.export_service import gzip_stream
+        
+        chunks = [f'line {i}\n'.encode('utf-8') for i in range(1000)]
+        compressed = list(gzip_stream(iter(chunks), flush_bytes=1024))
+        
+        assert gzip.decompress(b''.join(compressed)) == b''.join(chunks)
+        # 첫 조각은 즉시 flush 되어 바로 전송 가능
+        assert len(compressed) > 2
+    
+    def test_view_streams_gzip(self, api_client, test_user, sample_diaries):
+        import gzip
+        import json
+        
+        api_client.force_authenticate(user=test_user)
+        response = api_client.get('/api/export/json/?gzip=1')
+        
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Encoding'] == 'gzip'
+        data = json.loads(gzip.decompress(b''.join(response.streaming_content)))
+        assert data['total_diaries'] == 5
+    
+    def test_csv_view_streams(self, api_client, test_user, sample_diaries):
+        api_client.force_authenticate(user=test_user)
+        response = api_client.get('/api/export/csv/')
+        
+        assert response.status_code == 200
+        assert response.streaming
+        assert 'attachment' in response['Content-Disposition']
+        assert b''.join(response.streaming_content).decode('utf-8-sig').count('\n') == 6
+    
+    @staticmethod
+    def _fail_after_first_chunk():
+        """첫 청크만 복호화하고 이후 청크에서 실패하는 decrypt_diaries"""
+        from diary.services import export_service
+        
+        real = export_service.decrypt_diaries
+        calls = []
+        
+        def decrypt(chunk):
+            calls.append(chunk)
+            if len(calls) > 1:
+                raise RuntimeError('key revoked')
+            return real(chunk)
+        
+        return patch.object(export_service, 'decrypt_diaries', side_effect=decrypt)
+    
+    def test_stream_json_marks_failure_mid_stream(self, test_user, sample_diaries):
+        """도중 실패 시 배열을 닫고 error 표시 (잘린 파일이 정상 파일로 보이지 않음)"""
+        import json
+        from diary.services.export_service import STREAM_ERROR_MESSAGE
+        
+        with self._fail_after_first_chunk():
+            streamed = json.loads(b''.join(ExportService.stream_json(test_user, chunk_size=2)))
+        
+        assert streamed['total_diaries'] == 2
+        assert len(streamed['diaries']) == 2
+        assert streamed['error'] == STREAM_ERROR_MESSAGE
+    
+    def test_stream_csv_marks_failure_mid_stream(self, test_user, sample_diaries):
+        import csv
+        import io
+        from diary.services.export_service import STREAM_ERROR_MESSAGE
+        
+        with self._fail_after_first_chunk():
+            text = b''.join(ExportService.stream_csv(test_user, chunk_size=2)).decode('utf-8-sig')
+        rows = list(csv.reader(io.StringIO(text)))
+        
+        assert len(rows) == 4
+        assert rows[-1] == ['ERROR', STREAM_ERROR_MESSAGE]
+    
+    def test_view_returns_500_when_first_chunk_fails(self, api_client, test_user, sample_diaries):
+        """첫 청크 조회/복호화 실패는 스트리밍 전에 오류 응답"""
+        api_client.force_authenticate(user=test_user)
+        
+        with patch('diary.services.export_service.decrypt_diaries', side_effect=RuntimeError('key revoked')):
+            json_response = api_client.get('/api/export/json/')
+            csv_response = api_client.get('/api/export/csv/?gzip=1')
+        
+        assert json_response.status_code == 500
+        assert csv_response.status_code == 500
+        assert not json_response.streaming
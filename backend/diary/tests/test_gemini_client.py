@@ -0,0 +1,207 @@
+# diary/tests/test_gemini_client.py
+"""
+Gemini 게이트웨이 테스트
+- 프로세스 전체 / 모델별 동시 호출 상한
+- 대기열 상한(backpressure)과 대기 시간 초과 시 즉시 거절
+- 지연/오류/타임아웃 지표
+- async 변형: 타임아웃, 스트리밍 중 슬롯 유지
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from diary.services.gemini_client import (
+    DEFAULT_GEMINI_GATEWAY, GeminiClient, GeminiOverloadedError, GeminiTimeoutError,
+)
+
+
+def _gateway(**overrides):
+    gateway = GeminiClient(config={**DEFAULT_GEMINI_GATEWAY, **overrides})
+    gateway._client = MagicMock()
+    return gateway
+
+
+def _track_concurrency(gateway, delay=0.05):
+    """generate_content 호출 중 최대 동시 실행 수 기록"""
+    state = {'current': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def generate_content(model, contents, config=None):
+        with lock:
+            state['current'] += 1
+            state['max'] = max(state['max'], state['current'])
+        time.sleep(delay)
+        with lock:
+            state['current'] -= 1
+        return contents
+
+    gateway._client.models.generate_content.side_effect = generate_content
+    return state
+
+
+def _run_threads(func, count):
+    errors = []
+
+    def worker(index):
+        try:
+            func(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class TestConcurrencyLimits:
+
+    def test_process_wide_cap(self):
+        gateway = _gateway(MAX_CONCURRENCY=2, MODEL_CONCURRENCY=8)
+        state = _track_concurrency(gateway)
+
+        errors = _run_threads(lambda i: gateway.generate_content(f'model-{i % 3}', 'hi'), 8)
+
+        assert errors == []
+        assert state['max'] == 2
+        assert gateway.stats()['in_flight'] == 0
+
+    def test_per_model_cap(self):
+        gateway = _gateway(MAX_CONCURRENCY=8, MODEL_LIMITS={'image': 1})
+        state = _track_concurrency(gateway)
+
+        _run_threads(lambda i: gateway.generate_content('image', 'draw'), 4)
+
+        assert state['max'] == 1
+        assert gateway.stats()['models']['image']['calls'] == 4
+
+
+class TestBackpressure:
+
+    @staticmethod
+    def _hold_slot(gateway):
+        started, finish = threading.Event(), threading.Event()
+
+        def generate_content(model, contents, config=None):
+            started.set()
+            finish.wait(2)
+
+        gateway._client.models.generate_content.side_effect = generate_content
+        holder = threading.Thread(target=gateway.generate_content, args=('text', 'hold'))
+        holder.start()
+        started.wait(2)
+        return holder, finish
+
+    def test_full_queue_rejects_immediately(self):
+        gateway = _gateway(MAX_CONCURRENCY=1, MAX_QUEUE=0)
+        holder, finish = self._hold_slot(gateway)
+
+        started = time.monotonic()
+        with pytest.raises(GeminiOverloadedError):
+            gateway.generate_content('text', 'rejected')
+        assert time.monotonic() - started < 0.5
+
+        finish.set()
+        holder.join()
+        assert gateway.stats()['models']['text']['rejected'] == 1
+
+    def test_queue_timeout(self):
+        gateway = _gateway(MAX_CONCURRENCY=1, MAX_QUEUE=4, QUEUE_TIMEOUT=0.05)
+        holder, finish = self._hold_slot(gateway)
+
+        with pytest.raises(GeminiOverloadedError):
+            gateway.generate_content('text', 'waits too long')
+
+        finish.set()
+        holder.join()
+        stats = gateway.stats()
+        assert stats['queued'] == 0
+        assert stats['max_queued'] == 1
+
+
+class TestMetrics:
+
+    def test_errors_and_timeouts_counted(self):
+        gateway = _gateway()
+        gateway._client.models.generate_content.side_effect = [TimeoutError('slow'), ValueError('bad'), 'ok']
+
+        for _ in range(2):
+            with pytest.raises(Exception):
+                gateway.generate_content('text', 'x')
+        gateway.generate_content('text', 'x')
+
+        stats = gateway.stats()['models']['text']
+        assert (stats['calls'], stats['errors'], stats['timeouts']) == (3, 2, 1)
+        assert gateway.stats()['in_flight'] == 0
+
+    def test_stream_holds_slot_until_consumed(self):
+        gateway = _gateway(MAX_CONCURRENCY=1)
+        gateway._client.models.generate_content_stream.return_value = iter(['a', 'b'])
+
+        stream = gateway.generate_content_stream('text', 'x')
+        assert next(stream) == 'a'
+        assert gateway.stats()['in_flight'] == 1
+        assert list(stream) == ['b']
+        assert gateway.stats()['in_flight'] == 0
+
+
+class TestAsync:
+
+    def test_async_call_and_timeout(self):
+        gateway = _gateway(TIMEOUT=0.05)
+
+        async def generate_content(model, contents, config=None):
+            if contents == 'slow':
+                await asyncio.sleep(1)
+            return contents
+
+        gateway._client.aio.models.generate_content = generate_content
+
+        assert asyncio.run(gateway.agenerate_content('text', 'fast')) == 'fast'
+        with pytest.raises(GeminiTimeoutError):
+            asyncio.run(gateway.agenerate_content('text', 'slow'))
+
+        stats = gateway.stats()
+        assert stats['models']['text']['timeouts'] == 1
+        assert stats['in_flight'] == 0
+
+    def test_async_waiters_respect_cap(self):
+        gateway = _gateway(MAX_CONCURRENCY=2)
+        state = {'current': 0, 'max': 0}
+
+        async def generate_content(model, contents, config=None):
+            state['current'] += 1
+            state['max'] = max(state['max'], state['current'])
+            await asyncio.sleep(0.02)
+            state['current'] -= 1
+
+        gateway._client.aio.models.generate_content = generate_content
+
+        async def main():
+            await asyncio.gather(*(gateway.agenerate_content('text', i) for i in range(6)))
+
+        asyncio.run(main())
+        assert state['max'] == 2
+
+    def test_async_stream(self):
+        gateway = _gateway()
+
+        async def chunks():
+            for text in ('a', 'b'):
+                yield text
+
+        async def generate_content_stream(model, contents, config=None):
+            return chunks()
+
+        gateway._client.aio.models.generate_content_stream = generate_content_stream
+
+        async def consume():
+            return [chunk async for chunk in gateway.agenerate_content_stream('text', 'x')]
+
+        assert asyncio.run(consume()) == ['a', 'b']
+        assert gateway.stats()['models']['text']['calls'] == 1
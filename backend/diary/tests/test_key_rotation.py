@@ -0,0 +1,92 @@
+# diary/tests/test_key_rotation.py
+"""
+키 로테이션 엔진 테스트
+- 키셋 페이지네이션 + bulk_update
+- 실패 행이 있어도 종료
+- 체크포인트 재개 / id 범위 샤드
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+
+import diary.encryption as encryption
+from diary.models import Diary
+from diary.services.key_rotation_service import KeyRotationService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def two_keys(settings):
+    settings.DIARY_ENCRYPTION_KEYS = {
+        1: 'key-v1-for-encryption-32bytes!!!',
+        2: 'key-v2-for-encryption-32bytes!!!',
+    }
+    settings.CURRENT_ENCRYPTION_VERSION = 2
+    encryption._encryption_service = None
+    cache.clear()
+    yield
+    encryption._encryption_service = None
+
+
+@pytest.fixture
+def v1_diaries(db, two_keys):
+    user = User.objects.create_user(username='rotator', password='testpass123')
+    service = encryption.get_encryption_service()
+    texts = [f'일기 {i}' for i in range(7)]
+    tokens = service.encrypt_many(texts, version=1)
+    return [
+        Diary.objects.create(user=user, title=text, content=token, encryption_version=1)
+        for text, token in zip(texts, tokens)
+    ]
+
+
+def _plain(diary):
+    diary.refresh_from_db()
+    return encryption.get_encryption_service().decrypt(diary.content, version=diary.encryption_version)
+
+
+@pytest.mark.django_db
+class TestKeyRotationService:
+
+    def test_rotates_all_rows(self, v1_diaries):
+        state = KeyRotationService(batch_size=3).run()
+
+        assert state['updated'] == 7
+        assert state['done'] is True
+        assert not Diary.objects.filter(encryption_version=1).exists()
+        assert [_plain(d) for d in v1_diaries] == [d.title for d in v1_diaries]
+
+    def test_failed_row_does_not_loop_forever(self, v1_diaries):
+        Diary.objects.filter(id=v1_diaries[2].id).update(content='broken-token')
+
+        state = KeyRotationService(batch_size=2).run()
+
+        assert state['failed'] == 1
+        assert state['updated'] == 6
+        assert state['processed'] == 7
+
+    def test_resume_from_checkpoint(self, v1_diaries):
+        rotation = KeyRotationService(batch_size=2)
+        cache.set(rotation.checkpoint_key, {
+            'target_version': 2, 'last_id': v1_diaries[3].id,
+            'processed': 4, 'updated': 4, 'failed': 0, 'done': False,
+        })
+
+        state = rotation.run()
+
+        assert state['processed'] == 7
+        assert Diary.objects.filter(encryption_version=1).count() == 4
+
+    def test_shard_ranges_cover_all_ids(self, v1_diaries):
+        ranges = KeyRotationService.shard_ranges(3)
+
+        assert len(ranges) == 3
+        assert ranges[0][0] == v1_diaries[0].id
+        assert ranges[-1][1] == v1_diaries[-1].id
+
+    def test_command_rotates(self, v1_diaries):
+        call_command('rotate_encryption_key', batch_size=2)
+
+        assert not Diary.objects.filter(encryption_version=1).exists()
@@ -0,0 +1,78 @@
+# diary/tests/test_keyword_extractor.py
+"""
+벡터화 키워드 추출 테스트
+- 여러 문서를 한 번의 encode 로 처리
+- n-gram 임베딩 캐시 재사용
+- 메모리 맵 캐시 로드
+"""
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+from diary.services.analysis_service import KeywordExtractor, ngram_candidates
+from diary.utils.ngram_cache import NgramEmbeddingCache
+
+
+def _encode(texts):
+    return np.array([
+        [1.0 if 'apple' in t else 0.0, 1.0 if 'banana' in t else 0.0, 0.1]
+        for t in texts
+    ])
+
+
+@pytest.fixture
+def model():
+    mock_model = MagicMock()
+    mock_model.encode.side_effect = _encode
+    with patch('diary.services.analysis_service.get_sentence_transformer_model', return_value=mock_model), \
+         patch('diary.utils.ngram_cache._ngram_cache', NgramEmbeddingCache()):
+        yield mock_model
+
+
+class TestKeywordExtractorBatch:
+
+    def test_ngram_candidates(self):
+        assert ngram_candidates('Apple pie, apple tart') == [
+            'apple', 'pie', 'tart', 'apple pie', 'pie apple', 'apple tart'
+        ]
+
+    def test_batch_uses_single_encode(self, model):
+        texts = ['I really like apple today', 'banana is my favorite', 'short']
+
+        results = KeywordExtractor().extract_keywords_batch(texts, top_n=1, keyphrase_ngram_range=(1, 1))
+
+        assert results == [['apple'], ['banana'], []]
+        assert model.encode.call_count == 1
+
+    def test_cached_candidates_are_not_reencoded(self, model):
+        extractor = KeywordExtractor()
+        extractor.extract_keywords('I really like apple today')
+        model.encode.reset_mock()
+
+        extractor.extract_keywords('I really like apple today')
+
+        assert model.encode.call_args[0][0] == ['I really like apple today']
+
+    def test_single_api_matches_batch(self, model):
+        assert KeywordExtractor().extract_keywords('banana is my favorite', top_n=1) == ['banana']
+
+
+class TestNgramEmbeddingCache:
+
+    def test_lru_eviction(self):
+        cache = NgramEmbeddingCache(max_entries=2)
+        cache.put_many(['a', 'b', 'c'], np.eye(3, dtype=np.float32))
+
+        found, missing = cache.get_many(['a', 'b', 'c'])
+        assert missing == ['a']
+        assert set(found) == {'b', 'c'}
+
+    def test_memmap_roundtrip(self, tmp_path):
+        NgramEmbeddingCache.write_memmap(str(tmp_path), ['사과', '바나나'], [[3.0, 4.0], [0.0, 2.0]])
+
+        cache = NgramEmbeddingCache(path=str(tmp_path))
+        found, missing = cache.get_many(['사과', '포도'])
+
+        assert missing == ['포도']
+        np.testing.assert_allclose(found['사과'], [0.6, 0.8], rtol=1e-6)
+        assert cache.stats()['memmap_terms'] == 2
@@ -0,0 +1,110 @@
+# diary/tests/test_list_serializer.py
+"""
+일기 목록 경량 Serializer 테스트
+- 기본 응답에서 본문/음성/회고 필드 제외
+- ?fields= 필드 선택과 컬럼 프로젝션
+- 이미지 추가/삭제 시 image_count / thumbnail_url 갱신
+"""
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from diary.models import Diary, DiaryImage
+from diary.serializers import DiaryListSerializer
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='listuser', password='testpass123')
+
+
+@pytest.fixture
+def diary(user):
+    return Diary.objects.bulk_create([
+        Diary(user=user, title='목록 일기', content='가' * 200, is_encrypted=False, emotion='happy')
+    ])[0]
+
+
+class TestFieldSelection:
+
+    def test_default_fields_exclude_preview(self):
+        fields = DiaryListSerializer.select_fields(None)
+        assert 'preview' not in fields
+        assert 'content' not in fields
+
+    def test_requested_fields_keep_id_and_ignore_unknown(self):
+        assert DiaryListSerializer.select_fields('title, preview, content') == ['id', 'title', 'preview']
+
+    def test_columns_for_fields(self):
+        columns = DiaryListSerializer.columns_for(['id', 'title', 'emotion_emoji', 'tags'])
+        assert columns == ['created_at', 'emotion', 'id', 'title']
+        assert 'content' in DiaryListSerializer.columns_for(['preview'])
+
+
+@pytest.mark.django_db
+class TestImageSummary:
+
+    def test_image_signals_update_summary(self, diary):
+        first = DiaryImage.objects.create(diary=diary, image_url='https://example.com/1.png')
+        DiaryImage.objects.create(diary=diary, image_url='https://example.com/2.png')
+        diary.refresh_from_db()
+        assert diary.image_count == 2
+        assert diary.thumbnail_url == 'https://example.com/2.png'
+
+        DiaryImage.objects.exclude(pk=first.pk).delete()
+        diary.refresh_from_db()
+        assert (diary.image_count, diary.thumbnail_url) == (1, 'https://example.com/1.png')
+
+
+@pytest.mark.django_db
+class TestDiaryListAPI:
+
+    def test_list_is_compact(self, api_client, user, diary):
+        DiaryImage.objects.create(diary=diary, image_url='https://example.com/1.png')
+        api_client.force_authenticate(user=user)
+
+        item = api_client.get('/api/diaries/').data['results'][0]
+
+        assert 'content' not in item
+        assert 'images' not in item
+        assert 'transcription' not in item
+        assert item['image_count'] == 1
+        assert item['thumbnail_url'] == 'https://example.com/1.png'
+        assert item['emotion_emoji'] == '😊'
+
+    def test_fields_param_projects_columns(self, api_client, user, diary, django_assert_max_num_queries):
+        api_client.force_authenticate(user=user)
+
+        with django_assert_max_num_queries(3):  # 인증 사용자 + 일기 목록 (태그 프리페치 없음)
+            response = api_client.get('/api/diaries/?fields=title,preview')
+
+        item = response.data['results'][0]
+        assert set(item) == {'id', 'title', 'preview'}
+        assert item['preview'] == '가' * DiaryListSerializer.PREVIEW_LENGTH + '...'
+
+    def test_preview_does_not_query_per_row(self, api_client, user, django_assert_max_num_queries):
+        """preview 복호화(캐시 키에 version 사용)가 일기마다 지연 로딩 쿼리를 만들지 않음"""
+        for i in range(5):
+            encrypted = Diary(user=user, title=f'암호화 일기 {i}')
+            encrypted.encrypt_content('나' * 50)
+            encrypted.save()
+        api_client.force_authenticate(user=user)
+
+        with django_assert_max_num_queries(3):  # 개수 + 일기 목록 (일기 수와 무관)
+            response = api_client.get('/api/diaries/?fields=id,title,preview')
+
+        assert [item['preview'] for item in response.data['results']] == ['나' * 50] * 5
+
+    def test_retrieve_keeps_full_serializer(self, api_client, user, diary):
+        api_client.force_authenticate(user=user)
+        data = api_client.get(f'/api/diaries/{diary.id}/').data
+        assert 'content' in data
+        assert 'images' in data
+
+
+@pytest.mark.django_db
+def test_benchmark_list_serializer_command(capsys):
+    call_command('benchmark_list_serializer', rows=20, repeat=1)
+
+    assert 'rows/sec' in capsys.readouterr().out
+    assert not User.objects.filter(username='__list_benchmark__').exists()
@@ -0,0 +1,89 @@
+# diary/tests/test_model_server.py
+"""
+모델 서버 테스트
+- HTTP encode / health
+- 동시 요청 마이크로 배칭
+- RemoteEncoder 의 SentenceTransformer 호환 반환 형태
+"""
+import threading
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from diary.utils.model_server import (
+    ModelServer,
+    ModelServerError,
+    RemoteEncoder,
+    check_model_server_health,
+    get_remote_encoder,
+)
+
+
+def _fake_model(dim=4):
+    model = MagicMock()
+    model.encode.side_effect = lambda texts: np.array([[float(len(t))] * dim for t in texts])
+    return model
+
+
+@pytest.fixture
+def server():
+    server = ModelServer(
+        port=0,
+        models={'embedding': _fake_model(), 'keyword': _fake_model()},
+        preload=False,
+        max_wait_ms=50,
+    )
+    server.start()
+    yield server
+    server.stop()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.port}"
+
+
+class TestModelServer:
+
+    def test_encode_list_and_single(self, server):
+        encoder = RemoteEncoder('embedding', _url(server))
+
+        vectors = encoder.encode(['ab', 'abcd'])
+        single = encoder.encode('abc')
+
+        assert vectors.shape == (2, 4)
+        assert vectors[1][0] == 4.0
+        assert single.shape == (4,)
+
+    def test_concurrent_requests_are_batched(self, server):
+        encoder = RemoteEncoder('keyword', _url(server))
+        results = {}
+
+        def call(i):
+            results[i] = encoder.encode(['x' * (i + 1)])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = check_model_server_health(_url(server))['models']['keyword']
+        assert stats['requests'] == 8
+        assert stats['batches'] < 8
+        assert all(results[i][0][0] == float(i + 1) for i in range(8))
+
+    def test_unknown_model_is_error(self, server):
+        with pytest.raises(ModelServerError):
+            RemoteEncoder('unknown', _url(server)).encode(['text'])
+
+    def test_unreachable_server(self):
+        with pytest.raises(ModelServerError):
+            check_model_server_health('http://127.0.0.1:1', timeout=0.5)
+
+    def test_in_process_fallback_without_url(self, settings):
+        settings.MODEL_SERVER = {'URL': ''}
+        assert get_remote_encoder('embedding') is None
+
+        settings.MODEL_SERVER = {'URL': 'http://model-server:8500'}
+        assert isinstance(get_remote_encoder('embedding'), RemoteEncoder)
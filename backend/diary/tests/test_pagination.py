@@ -0,0 +1,158 @@
+# diary/tests/test_pagination.py
+"""
+키셋(커서) 페이지네이션 테스트
+- (created_at, id) 커서로 중복/누락 없이 순회 (작성 시각이 같은 일기 포함)
+- 키셋은 cursor/page_size 를 넘길 때만 (opt-in), 파라미터가 없으면 기존 응답 유지
+- page 파라미터로 기존 페이지 번호 방식 유지
+- 채팅 세션 / 태그 일기 / 관리자 목록
+"""
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+from diary.models import ChatSession, Diary, DiaryTag, Tag
+from diary.paginations import KeysetPagination
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='pageuser', password='testpass123')
+
+
+@pytest.fixture
+def diaries(user):
+    created = Diary.objects.bulk_create([
+        Diary(user=user, title=f'일기 {i}', content=f'내용 {i}', is_encrypted=False)
+        for i in range(7)
+    ])
+    # 작성 시각이 같은 일기가 페이지 경계에 걸리도록 일부를 같은 시각으로 맞춤
+    same_time = timezone.now()
+    Diary.objects.filter(id__in=[d.id for d in created[2:5]]).update(created_at=same_time)
+    return created
+
+
+def _walk(client, url, key='results'):
+    ids, pages = [], 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        ids.extend(item['id'] for item in response.data[key])
+        url = response.data['next']
+        pages += 1
+    return ids, pages
+
+
+class TestKeysetCursor:
+
+    def test_cursor_round_trip(self):
+        paginator = KeysetPagination()
+        now = timezone.now()
+        cursor = paginator.encode_cursor([now, 42])
+        assert paginator.decode_cursor(cursor) == [now.isoformat(), 42]
+
+
+@pytest.mark.django_db
+class TestDiaryListPagination:
+
+    def test_cursor_pages_cover_all_diaries_once(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+
+        ids, pages = _walk(api_client, '/api/diaries/?page_size=2')
+
+        expected = list(
+            Diary.objects.filter(user=user).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        assert ids == expected
+        assert pages == 4
+
+    def test_cursor_page_omits_count(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+        first = api_client.get('/api/diaries/?page_size=3')
+        assert 'count' not in first.data
+        assert 'cursor=' in first.data['next']
+
+    def test_page_param_keeps_page_number_mode(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get('/api/diaries/?page=2&page_size=3')
+
+        assert response.status_code == 200
+        assert response.data['count'] == 7
+        assert len(response.data['results']) == 3
+        assert 'page=3' in response.data['next']
+
+    def test_no_params_keeps_page_number_response(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get('/api/diaries/')
+
+        assert response.data['count'] == 7
+        assert response.data['previous'] is None
+        assert len(response.data['results']) == 7
+
+    def test_invalid_cursor_returns_404(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+        assert api_client.get('/api/diaries/?cursor=not-a-cursor').status_code == 404
+
+
+@pytest.mark.django_db
+class TestOtherListPagination:
+
+    def test_tag_diaries(self, api_client, user, diaries):
+        tag = Tag.objects.create(user=user, name='산책')
+        DiaryTag.objects.bulk_create([DiaryTag(diary=diary, tag=tag) for diary in diaries])
+        api_client.force_authenticate(user=user)
+
+        ids, pages = _walk(api_client, f'/api/tags/{tag.id}/diaries/?page_size=3', key='diaries')
+
+        assert sorted(ids) == sorted(d.id for d in diaries)
+        assert len(set(ids)) == 7
+        assert pages == 3
+
+    def test_tag_diaries_without_params_returns_all(self, api_client, user, diaries):
+        tag = Tag.objects.create(user=user, name='산책')
+        DiaryTag.objects.bulk_create([DiaryTag(diary=diary, tag=tag) for diary in diaries])
+        api_client.force_authenticate(user=user)
+
+        full = api_client.get(f'/api/tags/{tag.id}/diaries/')
+        paged = api_client.get(f'/api/tags/{tag.id}/diaries/?page_size=3')
+
+        assert (len(full.data['diaries']), full.data['diary_count'], full.data['next']) == (7, 7, None)
+        assert (len(paged.data['diaries']), paged.data['diary_count']) == (3, 7)
+
+    def test_chat_sessions(self, api_client, user):
+        sessions = [ChatSession.objects.create(user=user, title=f'대화 {i}') for i in range(5)]
+        api_client.force_authenticate(user=user)
+
+        ids, _ = _walk(api_client, '/api/chat/sessions/?page_size=2', key='sessions')
+
+        assert ids == [s.id for s in reversed(sessions)]
+
+    def test_chat_sessions_without_params_returns_all(self, api_client, user):
+        for i in range(25):
+            ChatSession.objects.create(user=user, title=f'대화 {i}')
+        api_client.force_authenticate(user=user)
+
+        full = api_client.get('/api/chat/sessions/')
+        paged = api_client.get('/api/chat/sessions/?page_size=10')
+
+        assert (len(full.data['sessions']), full.data['count'], full.data['next']) == (25, 25, None)
+        assert (len(paged.data['sessions']), paged.data['count']) == (10, 25)
+
+    def test_admin_recent_diaries_uses_limit(self, api_client, user, diaries):
+        admin = User.objects.create_superuser(username='pageadmin', password='testpass123')
+        api_client.force_authenticate(user=admin)
+
+        ids, pages = _walk(api_client, '/api/admin/diaries/recent/?limit=4', key='diaries')
+
+        assert len(set(ids)) == 7
+        assert pages == 2
+
+
+@pytest.mark.django_db
+def test_benchmark_pagination_command(capsys):
+    call_command('benchmark_pagination', diaries=60, pages=[1, 3], page_size=10, repeat=1)
+
+    assert 'keyset ms' in capsys.readouterr().out
+    assert not User.objects.filter(username='__pagination_benchmark__').exists()
@@ -0,0 +1,155 @@
+# diary/tests/test_preference_cache.py
+"""
+사용자 설정 조회 캐시 테스트
+- 요청 단위 메모: 한 요청 안에서 설정 객체는 한 번만 조회
+- 설정 스냅샷: read-through, 저장 시 write-through, 삭제 시 제거
+- 스트릭 갱신: 스냅샷 기준 조건부 UPDATE 1회
+"""
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diary.models import UserPreference
+from diary.services.streak_service import StreakService
+from diary.utils import preference_cache
+from diary.utils.preference_cache import get_snapshot
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='prefuser', password='testpass123')
+
+
+@pytest.fixture
+def memo():
+    token = preference_cache._request_memo.set({})
+    yield
+    preference_cache._request_memo.reset(token)
+
+
+def _preference_queries(ctx):
+    return [q['sql'] for q in ctx.captured_queries if 'diary_userpreference' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestRequestMemo:
+
+    def test_loaded_once_per_request(self, user, memo, django_assert_num_queries):
+        first = UserPreference.get_or_create_for_user(user)
+        with django_assert_num_queries(0):
+            assert UserPreference.get_or_create_for_user(user) is first
+
+    def test_outside_request_not_memoized(self, user):
+        UserPreference.get_or_create_for_user(user)
+        with CaptureQueriesContext(connection) as ctx:
+            UserPreference.get_or_create_for_user(user)
+        assert len(_preference_queries(ctx)) == 1
+
+
+@pytest.mark.django_db
+class TestSnapshot:
+
+    def test_missing_row_returns_defaults_without_creating(self, user):
+        snapshot = get_snapshot(user.id)
+
+        assert snapshot['exists'] is False
+        assert snapshot['is_premium'] is False
+        assert snapshot['current_streak'] == 0
+        assert not UserPreference.objects.filter(user=user).exists()
+
+    def test_read_through_then_cached(self, user, django_assert_num_queries):
+        UserPreference.objects.create(user=user, is_premium=True)
+        cache.clear()
+
+        with django_assert_num_queries(1):
+            assert get_snapshot(user.id)['is_premium'] is True
+        with django_assert_num_queries(0):
+            assert get_snapshot(user.id)['is_premium'] is True
+
+    def test_save_writes_through_and_delete_drops(self, user):
+        preference = UserPreference.get_or_create_for_user(user)
+        assert get_snapshot(user.id)['auto_emotion_analysis'] is True
+
+        preference.auto_emotion_analysis = False
+        preference.save()
+        assert get_snapshot(user.id)['auto_emotion_analysis'] is False
+
+        preference.delete()
+        assert get_snapshot(user.id)['exists'] is False
+
+    def test_deferred_save_drops_snapshot(self, user):
+        UserPreference.objects.create(user=user)
+        get_snapshot(user.id)
+
+        preference = UserPreference.objects.only('id', 'user_id', 'theme').get(user=user)
+        preference.theme = 'dark'
+        preference.save(update_fields=['theme'])
+
+        assert cache.get(preference_cache.SNAPSHOT_KEY.format(user_id=user.id)) is None
+
+
+@pytest.mark.django_db
+class TestStreak:
+
+    def test_next_streak(self):
+        today = date(2026, 10, 17)
+        assert StreakService.next_streak(None, 0, 0, today) == (1, 1)
+        assert StreakService.next_streak(today - timedelta(days=1), 4, 4, today) == (5, 5)
+        assert StreakService.next_streak(today - timedelta(days=3), 4, 6, today) == (1, 6)
+        assert StreakService.next_streak(today, 2, 6, today) == (2, 6)
+
+    def test_cached_snapshot_updates_with_one_query(self, user, memo):
+        UserPreference.objects.create(user=user, current_streak=3, max_streak=3,
+                                      last_diary_date=date.today() - timedelta(days=1))
+        get_snapshot(user.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert StreakService.update_user_streak(user) == (4, 4)
+
+        assert len(_preference_queries(ctx)) == 1
+        assert get_snapshot(user.id)['last_diary_date'] == date.today()
+        preference = UserPreference.objects.get(user=user)
+        assert (preference.current_streak, preference.last_diary_date) == (4, date.today())
+
+    def test_stale_snapshot_falls_back_to_fresh_row(self, user):
+        UserPreference.objects.create(user=user, current_streak=3, max_streak=3,
+                                      last_diary_date=date.today() - timedelta(days=1))
+        get_snapshot(user.id)
+        # 시그널 없이 바뀐 행 (스냅샷은 오래된 값)
+        UserPreference.objects.filter(user=user).update(current_streak=7, max_streak=7)
+
+        assert StreakService.update_user_streak(user) == (8, 8)
+        assert get_snapshot(user.id)['current_streak'] == 8
+
+    def test_first_diary_creates_preference(self, user):
+        assert StreakService.update_user_streak(user) == (1, 1)
+        assert StreakService.update_user_streak(user) == (1, 1)
+        assert UserPreference.objects.get(user=user).last_diary_date == date.today()
+
+
+@pytest.mark.django_db
+class TestCreatePath:
+
+    def test_diary_create_touches_preference_once(self, api_client, user):
+        UserPreference.objects.create(user=user, current_streak=1, max_streak=1,
+                                      last_diary_date=date.today() - timedelta(days=1))
+        api_client.force_authenticate(user=user)
+        api_client.get('/api/preferences/streak/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post('/api/diaries/', {'title': '오늘', 'content': '산책을 했다.'}, format='json')
+
+        assert response.status_code == 201
+        assert len(_preference_queries(ctx)) == 1
+        assert api_client.get('/api/preferences/streak/').data['current_streak'] == 2
@@ -0,0 +1,210 @@
+# diary/tests/test_push_dispatcher.py
+"""
+푸시 대량 발송기 테스트 (로컬 가짜 Expo 서버)
+- gzip 본문 + 배치 분할 + 동시 전송
+- 티켓/영수증의 DeviceNotRegistered 토큰 비활성화
+- check_push_receipts 태스크
+"""
+import gzip
+import importlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+import diary.push_service as push_service
+from diary.models import PushToken
+
+
+class FakeExpo:
+    """보낸 메시지/영수증 요청을 기록하는 Expo 서버"""
+
+    def __init__(self, dead_tokens=(), dead_receipts=(), send_statuses=()):
+        self.dead_tokens = set(dead_tokens)
+        self.dead_receipts = set(dead_receipts)
+        self.send_statuses = list(send_statuses)  # 발송 요청에 순서대로 돌려줄 오류 상태 코드
+        self.send_attempts = 0
+        self.batches = []
+        self.receipt_requests = []
+        self.encodings = set()
+        self._lock = threading.Lock()
+
+        expo = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers['Content-Length']))
+                if self.headers.get('Content-Encoding') == 'gzip':
+                    raw = gzip.decompress(raw)
+                payload = json.loads(raw)
+                with expo._lock:
+                    if not self.path.endswith('/getReceipts'):
+                        expo.send_attempts += 1
+                        if expo.send_statuses:
+                            self.send_response(expo.send_statuses.pop(0))
+                            self.send_header('Content-Length', '0')
+                            self.end_headers()
+                            return
+                    expo.encodings.add(self.headers.get('Content-Encoding'))
+                    if self.path.endswith('/getReceipts'):
+                        expo.receipt_requests.append(payload['ids'])
+                        body = {'data': {tid: expo._receipt(tid) for tid in payload['ids']}}
+                    else:
+                        expo.batches.append(payload)
+                        body = {'data': [expo._ticket(m['to']) for m in payload]}
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _ticket(self, token):
+        if token in self.dead_tokens:
+            return {'status': 'error', 'message': 'not registered', 'details': {'error': 'DeviceNotRegistered'}}
+        return {'status': 'ok', 'id': f"ticket-{token}"}
+
+    def _receipt(self, ticket_id):
+        if ticket_id in self.dead_receipts:
+            return {'status': 'error', 'details': {'error': 'DeviceNotRegistered'}}
+        return {'status': 'ok'}
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def dispatcher_factory():
+    # 다른 테스트가 requests 를 모킹한 채로 reload 했을 수 있으므로 실제 모듈로 다시 로드
+    importlib.reload(push_service)
+    servers = []
+
+    def factory(**kwargs):
+        expo = FakeExpo(
+            kwargs.pop('dead_tokens', ()),
+            kwargs.pop('dead_receipts', ()),
+            kwargs.pop('send_statuses', ()),
+        )
+        servers.append(expo)
+        dispatcher = push_service.PushDispatcher(
+            send_url=f"{expo.url}/--/api/v2/push/send",
+            receipts_url=f"{expo.url}/--/api/v2/push/getReceipts",
+            **{'batch_size': 10, 'concurrency': 4, 'rate_limit': 0, **kwargs},
+        )
+        return expo, dispatcher
+
+    yield factory
+    for expo in servers:
+        expo.stop()
+
+
+@pytest.fixture
+def tokens(db):
+    user = User.objects.create_user(username='pushdispatch', password='testpass123')
+    PushToken.objects.bulk_create([
+        PushToken(user=user, token=f'ExponentPushToken[{i}]', device_type='ios')
+        for i in range(35)
+    ])
+    return [f'ExponentPushToken[{i}]' for i in range(35)]
+
+
+@pytest.mark.django_db
+class TestPushDispatcher:
+
+    def test_dispatch_batches_gzip_concurrently(self, dispatcher_factory, tokens):
+        expo, dispatcher = dispatcher_factory()
+
+        result = dispatcher.dispatch(
+            push_service.build_message(token, '제목', '내용') for token in tokens
+        )
+
+        assert result['sent'] == 35
+        assert result['failed'] == 0
+        assert sorted(len(batch) for batch in expo.batches) == [5, 10, 10, 10]
+        assert expo.encodings == {'gzip'}
+        assert result['ticket_tokens']['ticket-ExponentPushToken[7]'] == 'ExponentPushToken[7]'
+
+    def test_ticket_errors_deactivate_tokens(self, dispatcher_factory, tokens):
+        expo, dispatcher = dispatcher_factory(dead_tokens=tokens[:3])
+
+        result = dispatcher.dispatch(
+            push_service.build_message(token, '제목', '내용') for token in tokens
+        )
+
+        assert result['sent'] == 32
+        assert result['failed'] == 3
+        assert result['deactivated'] == 3
+        assert PushToken.objects.filter(is_active=False).count() == 3
+
+    def test_receipts_chunked_and_processed(self, dispatcher_factory, tokens):
+        dead = f'ticket-{tokens[5]}'
+        expo, dispatcher = dispatcher_factory(dead_receipts=[dead])
+        ticket_tokens = {f'ticket-{token}': token for token in tokens}
+
+        with patch.object(push_service, 'RECEIPT_CHUNK_SIZE', 20):
+            result = dispatcher.process_receipts(ticket_tokens)
+
+        assert [len(ids) for ids in expo.receipt_requests] == [20, 15]
+        assert result == {'checked': 35, 'errors': 1, 'deactivated': 1}
+        assert not PushToken.objects.get(token=tokens[5]).is_active
+
+    def test_retries_only_rejected_sends(self, dispatcher_factory, tokens):
+        """429/503 은 재시도, 502 는 이미 전달됐을 수 있으므로 재전송하지 않음"""
+        expo, dispatcher = dispatcher_factory(send_statuses=[503])
+        result = dispatcher.dispatch(push_service.build_message(token, '제목', '내용') for token in tokens[:10])
+
+        assert expo.send_attempts == 2
+        assert result['sent'] == 10
+
+        expo, dispatcher = dispatcher_factory(send_statuses=[502])
+        result = dispatcher.dispatch(push_service.build_message(token, '제목', '내용') for token in tokens[:10])
+
+        assert expo.send_attempts == 1
+        assert result['sent'] == 0
+        assert expo.batches == []
+
+    def test_rate_limit_spaces_batches(self, dispatcher_factory, tokens):
+        import time
+
+        expo, dispatcher = dispatcher_factory(rate_limit=100)
+        started = time.monotonic()
+        dispatcher.dispatch(push_service.build_message(token, '제목', '내용') for token in tokens * 4)
+
+        # 버킷 초기량 100 이후 나머지 40개는 약 0.4초 대기
+        assert time.monotonic() - started >= 0.3
+
+
+@pytest.mark.django_db
+class TestDispatchPush:
+
+    def test_dispatch_push_schedules_receipt_check(self, dispatcher_factory, tokens, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        expo, dispatcher = dispatcher_factory(dead_receipts=[f'ticket-{tokens[0]}'])
+
+        with patch.object(push_service, 'get_push_dispatcher', return_value=dispatcher), \
+                patch('diary.tasks.check_push_receipts.apply_async') as mock_apply:
+            result = push_service.dispatch_push(iter(tokens), '리마인더', '일기를 써보세요')
+
+            assert result['sent'] == 35
+            key = result['receipts_key']
+            assert mock_apply.call_args[0][0] == (key,)
+
+            from diary.tasks import check_push_receipts
+            outcome = check_push_receipts(key)
+
+        assert outcome['deactivated'] == 1
+        assert cache.get(key) is None
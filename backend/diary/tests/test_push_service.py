@@ -174,7 +174,7 @@ class TestSendPushToUser:
                     )
     
     def test_send_to_user_multiple_devices(self, test_user, mock_requests):
-        """여러 기기에 푸시 전송"""
+        """여러 기기에 푸시 전송 (한 번의 배치 요청)"""
         with patch.dict(sys.modules, {'requests': mock_requests}):
             import importlib
             import diary.push_service as push_service
@@ -190,7 +190,10 @@ class TestSendPushToUser:
                     ]
                     mock_push_token.objects.filter.return_value = mock_queryset
                     
-                    mock_send_push.return_value = {'data': {'status': 'ok'}}
+                    session_post = mock_requests.Session.return_value.post
+                    session_post.return_value.json.return_value = {
+                        'data': [{'status': 'ok', 'id': f'ticket-{i}'} for i in range(3)]
+                    }
                     
                     results = push_service.send_push_to_user(
                         user_id=test_user.id,
@@ -199,7 +202,8 @@ class TestSendPushToUser:
                     )
                     
                     assert len(results) == 3
-                    assert mock_send_push.call_count == 3
+                    session_post.assert_called_once()
+                    mock_send_push.assert_not_called()
     
     def test_send_to_user_no_tokens(self, test_user, mock_requests):
         """등록된 토큰이 없는 경우"""
@@ -224,6 +228,25 @@ class TestSendPushToUser:
                     mock_send_push.assert_not_called()
 
 
+def _bulk_queryset(tokens):
+    """values_list(...).iterator() 로 토큰을 돌려주는 queryset 모킹"""
+    mock_queryset = MagicMock()
+    mock_queryset.values_list.return_value.iterator.return_value = iter(tokens)
+    return mock_queryset
+
+
+def _ok_tickets(*args, **kwargs):
+    """요청 본문(gzip) 의 메시지 수만큼 ok 티켓 응답"""
+    import gzip
+    import json
+    messages = json.loads(gzip.decompress(kwargs['data']))
+    response = MagicMock()
+    response.json.return_value = {
+        'data': [{'status': 'ok', 'id': f"ticket-{m['to']}"} for m in messages]
+    }
+    return response
+
+
 @pytest.mark.django_db
 class TestSendBulkPush:
     """일괄 푸시 전송 테스트"""
@@ -235,17 +258,14 @@ class TestSendBulkPush:
             import diary.push_service as push_service
             importlib.reload(push_service)
             
-            with patch.object(push_service, 'PushToken') as mock_push_token:
-                mock_queryset = MagicMock()
-                mock_queryset.values_list.return_value = [
+            with patch.object(push_service, 'PushToken') as mock_push_token, \
+                    patch('diary.tasks.check_push_receipts.apply_async') as mock_receipts:
+                mock_push_token.objects.filter.return_value = _bulk_queryset([
                     'ExponentPushToken[device1]',
                     'ExponentPushToken[device2]'
-                ]
-                mock_push_token.objects.filter.return_value = mock_queryset
-                
-                mock_response = MagicMock()
-                mock_response.raise_for_status = MagicMock()
-                mock_requests.post.return_value = mock_response
+                ])
+                session_post = mock_requests.Session.return_value.post
+                session_post.side_effect = _ok_tickets
                 
                 count = push_service.send_bulk_push(
                     user_ids=[1, 2, 3],
@@ -254,7 +274,8 @@ class TestSendBulkPush:
                 )
                 
                 assert count == 2
-                mock_requests.post.assert_called_once()
+                session_post.assert_called_once()
+                mock_receipts.assert_called_once()
     
     def test_bulk_push_no_tokens(self, test_user, mock_requests):
         """토큰이 없는 경우"""
@@ -263,10 +284,9 @@ class TestSendBulkPush:
             import diary.push_service as push_service
             importlib.reload(push_service)
             
-            with patch.object(push_service, 'PushToken') as mock_push_token:
-                mock_queryset = MagicMock()
-                mock_queryset.values_list.return_value = []
-                mock_push_token.objects.filter.return_value = mock_queryset
+            with patch.object(push_service, 'PushToken') as mock_push_token, \
+                    patch('diary.tasks.check_push_receipts.apply_async') as mock_receipts:
+                mock_push_token.objects.filter.return_value = _bulk_queryset([])
                 
                 count = push_service.send_bulk_push(
                     user_ids=[1, 2, 3],
@@ -275,7 +295,8 @@ class TestSendBulkPush:
                 )
                 
                 assert count == 0
-                mock_requests.post.assert_not_called()
+                mock_requests.Session.return_value.post.assert_not_called()
+                mock_receipts.assert_not_called()
     
     def test_bulk_push_batch_size(self, test_user, mock_requests):
         """100개 이상일 때 배치 처리"""
@@ -284,15 +305,12 @@ class TestSendBulkPush:
             import diary.push_service as push_service
             importlib.reload(push_service)
             
-            with patch.object(push_service, 'PushToken') as mock_push_token:
+            with patch.object(push_service, 'PushToken') as mock_push_token, \
+                    patch('diary.tasks.check_push_receipts.apply_async'):
                 tokens = [f'ExponentPushToken[device{i}]' for i in range(150)]
-                mock_queryset = MagicMock()
-                mock_queryset.values_list.return_value = tokens
-                mock_push_token.objects.filter.return_value = mock_queryset
-                
-                mock_response = MagicMock()
-                mock_response.raise_for_status = MagicMock()
-                mock_requests.post.return_value = mock_response
+                mock_push_token.objects.filter.return_value = _bulk_queryset(tokens)
+                session_post = mock_requests.Session.return_value.post
+                session_post.side_effect = _ok_tickets
                 
                 count = push_service.send_bulk_push(
                     user_ids=[1],
@@ -301,7 +319,7 @@ class TestSendBulkPush:
                 )
                 
                 assert count == 150
-                assert mock_requests.post.call_count == 2
+                assert session_post.call_count == 2
 
 
 class TestNotifyFunctions:
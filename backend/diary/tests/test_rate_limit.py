@@ -0,0 +1,242 @@
+# diary/tests/test_rate_limit.py
+"""
+원자적 요청 제한 테스트 (프로세스 로컬 / Redis Lua 백엔드 공통)
+- 일일 할당량: 확인+소비 한 번에, 티어 한도는 키에 저장 (DB 조회 1회), 환불/티어 초기화
+- 이미지 생성 태스크: 이미지가 만들어지지 않으면 할당량 반환
+- 슬라이딩 윈도우 / 토큰 버킷
+- 리스 세마포어: 만료된 리스 회수, 갱신
+- 동시 요청 스트레스: 한도 초과 허용 없음
+"""
+import threading
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+
+from diary.models import Diary, DiaryImage, UserPreference
+from diary.tasks import generate_image_task
+from diary.utils import rate_limit
+from diary.utils.rate_limit import Semaphore, _LocalBackend, _RedisBackend
+
+
+def _redis_backend():
+    import redis
+    try:
+        redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5).ping()
+    except Exception:
+        pytest.skip('Redis 서버 없음')
+    return _RedisBackend(redis.from_url(settings.REDIS_URL))
+
+
+@pytest.fixture(params=['locmem', 'redis'])
+def backend(request, settings):
+    backend = _LocalBackend() if request.param == 'locmem' else _redis_backend()
+    settings.RATE_LIMIT = {'BACKEND': request.param, 'KEY_PREFIX': f"rltest:{uuid.uuid4().hex}"}
+    with patch('diary.utils.rate_limit.get_backend', return_value=backend):
+        yield backend
+
+
+def _run_concurrently(func, threads=20):
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(func())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+class TestDailyQuota:
+
+    def test_consume_until_limit_and_cache_tier(self, backend):
+        with patch('diary.utils.rate_limit._is_premium', return_value=False) as tier:
+            results = [rate_limit.consume_daily_quota(1, 'image_gen', 2, 10) for _ in range(3)]
+
+        assert [r.allowed for r in results] == [True, True, False]
+        assert [r.remaining for r in results] == [1, 0, 0]
+        assert tier.call_count == 1
+        assert rate_limit.check_daily_quota(1, 'image_gen', 2, 10) == (False, 0, 2)
+
+    def test_refund_and_tier_reset(self, backend):
+        with patch('diary.utils.rate_limit._is_premium', return_value=False):
+            rate_limit.consume_daily_quota(1, 'image_gen', 1, 3)
+        rate_limit.refund_daily_quota(1, 'image_gen')
+        with patch('diary.utils.rate_limit._is_premium', return_value=True):
+            assert rate_limit.check_daily_quota(1, 'image_gen', 1, 3) == (True, 1, 1)
+            rate_limit.reset_quota_tier(1)
+            assert rate_limit.check_daily_quota(1, 'image_gen', 1, 3) == (True, 3, 3)
+
+    def test_refund_after_tier_reset_reloads_limit(self, backend):
+        with patch('diary.utils.rate_limit._is_premium', return_value=False):
+            rate_limit.consume_daily_quota(1, 'image_gen', 1, 3)
+            rate_limit.reset_quota_tier(1)
+
+            assert rate_limit.refund_daily_quota(1, 'image_gen') is False
+            assert rate_limit.refund_daily_quota(1, 'image_gen', default_limit=1, premium_limit=3) is True
+            assert rate_limit.check_daily_quota(1, 'image_gen', 1, 3) == (True, 1, 1)
+
+    def test_no_over_admission_under_concurrency(self, backend):
+        with patch('diary.utils.rate_limit._is_premium', return_value=False):
+            results = _run_concurrently(lambda: rate_limit.consume_daily_quota(7, 'image_gen', 5, 10).allowed)
+
+        assert results.count(True) == 5
+
+
+class TestWindows:
+
+    def test_sliding_window(self, backend):
+        results = [rate_limit.consume('chat', 1, limit=3, window=0.3) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert 0 < results[-1].retry_after <= 0.3
+        time.sleep(0.35)
+        assert rate_limit.consume('chat', 1, limit=3, window=0.3).allowed
+
+    def test_token_bucket_refills(self, backend):
+        results = [rate_limit.consume('push', 1, limit=2, window=0.2, mode='token_bucket') for _ in range(3)]
+
+        assert [r.allowed for r in results] == [True, True, False]
+        time.sleep(0.15)  # 0.1초당 토큰 1개
+        assert rate_limit.consume('push', 1, limit=2, window=0.2, mode='token_bucket').allowed
+
+    def test_sliding_window_concurrency(self, backend):
+        results = _run_concurrently(lambda: rate_limit.consume('burst', 1, limit=4, window=10).allowed)
+        assert results.count(True) == 4
+
+
+class TestSemaphore:
+
+    def test_acquire_release(self, backend):
+        semaphore = Semaphore('image_gen', 1, limit=1, lease=10)
+
+        assert semaphore.acquire('a')
+        assert not semaphore.acquire('b')
+        semaphore.release('a')
+        assert semaphore.acquire('b')
+        assert semaphore.count() == 1
+
+    def test_expired_lease_is_reclaimed(self, backend):
+        semaphore = Semaphore('image_gen', 1, limit=1, lease=0.1)
+
+        assert semaphore.acquire('a')
+        assert semaphore.renew('a')
+        time.sleep(0.15)
+        assert not semaphore.renew('a')
+        assert semaphore.acquire('b')
+
+    def test_no_over_admission_under_concurrency(self, backend):
+        semaphore = Semaphore('image_gen', 2, limit=2, lease=10)
+        results = _run_concurrently(lambda: semaphore.acquire(uuid.uuid4().hex))
+        assert results.count(True) == 2
+
+    def test_context_manager(self, backend):
+        with rate_limit.ConcurrentLimitContext(3, 'stt'):
+            with pytest.raises(rate_limit.ConcurrentLimitError):
+                with rate_limit.ConcurrentLimitContext(3, 'stt'):
+                    pass
+        assert rate_limit.check_concurrent_limit(3, 'stt') == (True, None)
+
+
+@pytest.mark.django_db
+class TestGenerateImageLimits:
+
+    @pytest.fixture
+    def user(self):
+        return User.objects.create_user(username='quotauser', password='testpass123')
+
+    @pytest.fixture
+    def diary(self, user):
+        return Diary.objects.bulk_create([
+            Diary(user=user, title='이미지 일기', content='바다를 보며 산책했다. ' * 10, is_encrypted=False)
+        ])[0]
+
+    def test_daily_quota_consumed_per_request(self, api_client, backend, user, diary):
+        api_client.force_authenticate(user=user)
+        release = lambda diary_id, slot, quota_date: rate_limit.release_concurrent_slot(user.id, 'image_gen', slot)
+
+        with patch('diary.views.diary_views.generate_image_task.delay', side_effect=release):
+            codes = [api_client.post(f'/api/diaries/{diary.id}/generate-image/').status_code for _ in range(3)]
+
+        assert codes == [202, 202, 429]
+
+    def test_premium_change_resets_cached_tier(self, api_client, backend, user, diary):
+        api_client.force_authenticate(user=user)
+        release = lambda diary_id, slot, quota_date: rate_limit.release_concurrent_slot(user.id, 'image_gen', slot)
+
+        with patch('diary.views.diary_views.generate_image_task.delay', side_effect=release):
+            for _ in range(2):
+                api_client.post(f'/api/diaries/{diary.id}/generate-image/')
+            preference = UserPreference.get_or_create_for_user(user)
+            preference.is_premium = True
+            preference.save()
+            response = api_client.post(f'/api/diaries/{diary.id}/generate-image/')
+
+        assert response.status_code == 202
+
+    def test_one_generation_in_flight(self, api_client, backend, user, diary):
+        api_client.force_authenticate(user=user)
+
+        with patch('diary.views.diary_views.generate_image_task.delay'):
+            first = api_client.post(f'/api/diaries/{diary.id}/generate-image/')
+            second = api_client.post(f'/api/diaries/{diary.id}/generate-image/')
+
+        assert first.status_code == 202
+        assert second.status_code == 429
+        assert rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10)[1] == 1
+
+    def _consume(self, user):
+        assert rate_limit.consume_daily_quota(user.id, 'image_gen', 2, 10).allowed
+        return rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10)[1]
+
+    def test_task_refunds_quota_when_generation_fails(self, backend, user, diary):
+        remaining = self._consume(user)
+
+        with patch('diary.services.image_service.ImageGenerator') as generator:
+            generator.return_value.generate.side_effect = RuntimeError('upstream down')
+            assert generate_image_task(diary.id) == 'upstream down'
+
+        assert rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10)[1] == remaining + 1
+
+    def test_task_refunds_quota_when_image_exists(self, backend, user, diary):
+        DiaryImage.objects.create(diary=diary, image_url='https://example.com/a.png')
+        remaining = self._consume(user)
+
+        with patch('diary.services.image_service.ImageGenerator') as generator:
+            assert generate_image_task(diary.id) == 'Image already exists'
+
+        generator.assert_not_called()
+        assert rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10)[1] == remaining + 1
+
+    def test_task_keeps_quota_when_image_generated(self, backend, user, diary):
+        remaining = self._consume(user)
+
+        with patch('diary.services.image_service.ImageGenerator') as generator:
+            generator.return_value.generate.return_value = {'url': 'https://example.com/a.png', 'prompt': ''}
+            generate_image_task(diary.id)
+
+        assert rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10)[1] == remaining
+
+    def test_task_refunds_the_day_it_was_charged(self, backend, user, diary):
+        """자정 전에 소비하고 자정 이후 실패한 작업은 소비한 날의 할당량을 반환"""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+        assert rate_limit.consume_daily_quota(user.id, 'image_gen', 2, 10, day=yesterday).allowed
+        today_before = rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10)
+
+        with patch('diary.services.image_service.ImageGenerator') as generator:
+            generator.return_value.generate.side_effect = RuntimeError('upstream down')
+            generate_image_task(diary.id, None, yesterday)
+
+        assert rate_limit.check_daily_quota(user.id, 'image_gen', 2, 10) == today_before
+        assert rate_limit.consume_daily_quota(user.id, 'image_gen', 2, 10, day=yesterday).remaining == 1
@@ -0,0 +1,137 @@
+# diary/tests/test_reminder_service.py
+"""
+일기 리마인더 파이프라인 테스트
+- 알림 시간 구간 계산
+- 오늘 일기를 쓴 사용자 제외
+- 사용자 id 범위 샤드 계획 / 중복 계획 방지
+- 실행 지표 누적
+"""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+
+from diary.models import PushToken, UserPreference
+from diary.services.reminder_service import ReminderService
+
+TODAY = date(2026, 10, 17)
+
+
+def _now(hour, minute):
+    return timezone.make_aware(datetime(2026, 10, 17, hour, minute))
+
+
+def _user(name, reminder_time=time(21, 5), last_diary_date=None, token=True, enabled=True):
+    user = User.objects.create_user(username=name, password='testpass123')
+    UserPreference.objects.create(
+        user=user,
+        daily_reminder_enabled=enabled,
+        daily_reminder_time=reminder_time,
+        last_diary_date=last_diary_date,
+    )
+    if token:
+        PushToken.objects.create(user=user, token=f'ExponentPushToken[{name}]', device_type='ios')
+    return user
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestReminderWindow:
+
+    def test_window_bucket(self):
+        run_id, today, start, end = ReminderService.window(_now(21, 7), minutes=15)
+
+        assert run_id == '202610172100'
+        assert today == TODAY
+        assert (start, end) == (time(21, 0), time(21, 15))
+
+    def test_last_window_runs_until_midnight(self):
+        _, _, start, end = ReminderService.window(_now(23, 59), minutes=15)
+
+        assert start == time(23, 45)
+        assert end is None
+
+
+@pytest.mark.django_db
+class TestReminderShard:
+
+    def _send(self, users):
+        ids = [u.id for u in users]
+        with patch('diary.push_service.dispatch_push') as mock_dispatch:
+            mock_dispatch.return_value = {'sent': 1, 'failed': 0, 'deactivated': 0, 'receipts_key': None}
+            metrics = ReminderService.send_shard(
+                'run', TODAY, time(21, 0), time(21, 15), min(ids), max(ids),
+            )
+            tokens = list(mock_dispatch.call_args[0][0])
+        return metrics, tokens
+
+    def test_only_users_without_diary_today(self):
+        due = _user('due', last_diary_date=TODAY - timedelta(days=1))
+        never = _user('never')
+        wrote = _user('wrote', last_diary_date=TODAY)
+        no_token = _user('notoken', token=False)
+        other_time = _user('later', reminder_time=time(21, 30))
+        disabled = _user('off', enabled=False)
+
+        metrics, tokens = self._send([due, never, wrote, no_token, other_time, disabled])
+
+        assert sorted(tokens) == ['ExponentPushToken[due]', 'ExponentPushToken[never]']
+        assert metrics['scanned'] == 4
+        assert metrics['skipped'] == 1
+        assert metrics['notified'] == 2
+
+    def test_metrics_accumulate_across_shards(self):
+        ReminderService.record_metrics('run', {'scanned': 3, 'skipped': 1, 'notified': 2, 'sent': 2})
+        ReminderService.record_metrics('run', {'scanned': 5, 'skipped': 0, 'notified': 5, 'sent': 4, 'failed': 1})
+
+        metrics = ReminderService.get_metrics('run')
+
+        assert metrics['scanned'] == 8
+        assert metrics['notified'] == 7
+        assert metrics['sent'] == 6
+        assert metrics['failed'] == 1
+        assert metrics['shards_done'] == 2
+
+
+@pytest.mark.django_db
+class TestReminderPlan:
+
+    def test_plan_splits_by_user_id_and_spreads(self, settings):
+        settings.REMINDER = {'WINDOW_MINUTES': 15, 'SHARD_SIZE': 2, 'SPREAD_SECONDS': 600}
+        users = [_user(f'u{i}') for i in range(5)]
+        _user('later', reminder_time=time(22, 0))
+
+        with patch('diary.tasks.send_reminder_shard.apply_async') as mock_apply:
+            result = ReminderService.plan_window(_now(21, 2))
+
+        assert result['shards'] == 3
+        ranges = [call.args[0][-2:] for call in mock_apply.call_args_list]
+        assert ranges[0][0] == users[0].id
+        assert ranges[-1][1] == users[-1].id
+        assert [call.kwargs['countdown'] for call in mock_apply.call_args_list] == [0, 200, 400]
+
+    def test_window_planned_once(self):
+        _user('u1')
+
+        with patch('diary.tasks.send_reminder_shard.apply_async') as mock_apply:
+            first = ReminderService.plan_window(_now(21, 0))
+            second = ReminderService.plan_window(_now(21, 5))
+
+        assert first['shards'] == 1
+        assert second['duplicate'] is True
+        assert mock_apply.call_count == 1
+
+    def test_empty_window(self):
+        with patch('diary.tasks.send_reminder_shard.apply_async') as mock_apply:
+            result = ReminderService.plan_window(_now(3, 0))
+
+        assert result['shards'] == 0
+        mock_apply.assert_not_called()
@@ -0,0 +1,203 @@
+# diary/tests/test_restore.py
+"""
+백업 복원 테스트
+- 스트리밍 JSON 파서 (폴백 파서 블록 경계)
+- 청크 단위 bulk 복원 / 중복 갱신 / 검증 실패 항목 건너뜀
+- 체크포인트에서 이어서 복원
+- 큰 파일은 복원 작업으로 처리
+"""
+import io
+import json
+
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from diary.models import Diary, DiaryTemplate, ExportJob, Tag, UserPreference
+from diary.services.restore_service import BackupFormatError, RestoreService
+from diary.utils import json_stream
+
+
+def _backup(diaries=(), tags=(), templates=(), preferences=None):
+    return {
+        'metadata': {'username': 'restoreuser', 'version': '1.0'},
+        'tags': list(tags),
+        'diaries': list(diaries),
+        'templates': list(templates),
+        'preferences': preferences or {},
+    }
+
+
+def _diary(i, **extra):
+    return {
+        'title': f'복원 일기 {i}',
+        'content': f'내용 {i}',
+        'emotion': 'happy',
+        'emotion_score': 70,
+        'created_at': f'2025-01-{i + 1:02d}T09:00:00+09:00',
+        **extra,
+    }
+
+
+def _file(data):
+    return io.BytesIO(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='restoreuser', password='testpass123')
+
+
+@pytest.fixture(autouse=True)
+def job_dir(settings, tmp_path):
+    settings.EXPORT_JOB = {'DIR': str(tmp_path / 'jobs'), 'CHUNK_SIZE': 2, 'STALE_SECONDS': 1800}
+    settings.RESTORE = {'CHUNK_SIZE': 2, 'SYNC_MAX_BYTES': 1024 * 1024}
+    return tmp_path / 'jobs'
+
+
+class TestJsonStream:
+
+    def test_reads_across_block_boundaries(self, monkeypatch):
+        monkeypatch.setattr(json_stream, 'ijson', None)
+        monkeypatch.setattr(json_stream, 'READ_BLOCK_SIZE', 7)
+        data = {'metadata': {'version': '1.0'}, 'skip': [1, [2, 3], {'a': '가나다'}],
+                'diaries': [{'title': '한글 제목', 'n': 12345}, {'title': 't2', 'n': 1.5}]}
+        fileobj = io.BytesIO(b'\xef\xbb\xbf' + json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+        assert json_stream.read_value(fileobj, 'metadata') == {'version': '1.0'}
+        assert list(json_stream.iter_array(fileobj, 'diaries')) == data['diaries']
+        assert list(json_stream.iter_array(fileobj, 'missing')) == []
+        assert json_stream.read_value(fileobj, 'missing', 'default') == 'default'
+
+    def test_truncated_file_raises(self, monkeypatch):
+        monkeypatch.setattr(json_stream, 'ijson', None)
+        with pytest.raises(json_stream.JSONStreamError):
+            list(json_stream.iter_array(io.BytesIO(b'{"diaries": [{"title": "a"}, {"ti'), 'diaries'))
+
+
+@pytest.mark.django_db
+class TestRestoreService:
+
+    def test_restores_all_sections_in_chunks(self, user):
+        data = _backup(
+            diaries=[_diary(i) for i in range(5)] + [{'title': ''}, _diary(9, emotion_score=500)],
+            tags=[{'name': '여행', 'color': '#FF0000'}, {'name': '운동', 'color': 'red'}],
+            templates=[{'name': '감사 일기', 'content': '오늘 감사한 일', 'category': 'gratitude'},
+                       {'title': '이전 형식', 'content': '본문'}],
+            preferences={'theme': 'dark', 'notification_enabled': False, 'reminder_time': '21:30'},
+        )
+
+        with patch('diary.tasks.extract_keywords_batch_task.delay'):
+            counts = RestoreService.restore(user, _file(data))
+
+        assert counts == {'tags': 2, 'diaries': 6, 'updated': 0, 'templates': 2, 'skipped': 1}
+        diary = Diary.objects.get(user=user, title='복원 일기 0')
+        assert diary.created_at.isoformat().startswith('2025-01-01T00:00:00')
+        assert Diary.objects.get(user=user, title='복원 일기 9').emotion_score is None
+        assert Tag.objects.get(user=user, name='운동').color == '#6366F1'
+        assert set(DiaryTemplate.objects.filter(user=user).values_list('name', flat=True)) == {'감사 일기', '이전 형식'}
+        pref = UserPreference.objects.get(user=user)
+        assert (pref.theme, pref.push_enabled, str(pref.daily_reminder_time)) == ('dark', False, '21:30:00')
+
+    def test_duplicates_update_existing_rows(self, user):
+        data = _backup(diaries=[_diary(0), _diary(1)], tags=[{'name': '여행'}])
+        with patch('diary.tasks.extract_keywords_batch_task.delay'):
+            RestoreService.restore(user, _file(data))
+            counts = RestoreService.restore(user, _file(_backup(
+                diaries=[_diary(0, emotion='sad'), _diary(2)], tags=[{'name': '여행'}],
+            )))
+
+        assert counts['diaries'] == 1
+        assert counts['updated'] == 1
+        assert Diary.objects.filter(user=user).count() == 3
+        assert Diary.objects.get(user=user, title='복원 일기 0').emotion == 'sad'
+        assert Tag.objects.filter(user=user).count() == 1
+
+    def test_overwrite_replaces_existing_data(self, user):
+        Diary.objects.create(user=user, title='기존 일기', content='기존 내용')
+        with patch('diary.tasks.extract_keywords_batch_task.delay'):
+            RestoreService.restore(user, _file(_backup(diaries=[_diary(0)])), overwrite=True)
+
+        assert list(Diary.objects.filter(user=user).values_list('title', flat=True)) == ['복원 일기 0']
+
+    def test_invalid_backup_is_rejected(self, user):
+        with pytest.raises(BackupFormatError):
+            RestoreService.restore(user, _file({'diaries': []}))
+        with pytest.raises(BackupFormatError):
+            RestoreService.restore(user, io.BytesIO(b'not json'))
+
+    def test_job_resumes_from_checkpoint(self, user, job_dir, django_capture_on_commit_callbacks):
+        data = _backup(diaries=[_diary(i) for i in range(5)], tags=[{'name': '여행'}])
+        upload = SimpleUploadedFile('backup.json', json.dumps(data).encode('utf-8'))
+        with patch('diary.tasks.restore_backup_task.delay') as mock_delay, \
+                django_capture_on_commit_callbacks(execute=True):
+            job = RestoreService.create_job(user, upload)
+        mock_delay.assert_called_once_with(job.id)
+
+        # 두 번째 일기 청크에서 실패
+        original = RestoreService._restore_diaries
+        calls = []
+
+        def flaky(self, items):
+            calls.append(len(items))
+            if len(calls) == 2:
+                raise RuntimeError('worker lost')
+            return original(self, items)
+
+        with patch('diary.tasks.extract_keywords_batch_task.delay'):
+            with patch.object(RestoreService, '_restore_diaries', flaky):
+                with pytest.raises(RuntimeError):
+                    RestoreService.run_job(job.id)
+
+            job.refresh_from_db()
+            assert job.status == ExportJob.Status.FAILED
+            assert job.checkpoint['section'] == 'diaries'
+            assert job.checkpoint['offset'] == 2
+            assert Diary.objects.filter(user=user).count() == 2
+
+            job = RestoreService.run_job(job.id)
+
+        assert job.status == ExportJob.Status.COMPLETED
+        assert job.progress == 100
+        assert job.processed == job.total == 6
+        assert job.checkpoint['counts']['diaries'] == 5
+        assert Diary.objects.filter(user=user).count() == 5
+        assert not list(job_dir.iterdir())  # 업로드 파일 삭제
+
+
+@pytest.mark.django_db
+class TestRestoreViews:
+
+    def test_small_upload_restores_inline(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        upload = SimpleUploadedFile('backup.json', json.dumps(_backup(diaries=[_diary(0)])).encode('utf-8'))
+
+        with patch('diary.tasks.extract_keywords_batch_task.delay'):
+            response = api_client.post('/api/export/restore/', {'file': upload}, format='multipart')
+
+        assert response.status_code == 200
+        assert response.data['restored']['diaries'] == 1
+
+    def test_large_upload_creates_job(self, api_client, user, settings, django_capture_on_commit_callbacks):
+        settings.RESTORE = {'CHUNK_SIZE': 2, 'SYNC_MAX_BYTES': 10}
+        api_client.force_authenticate(user=user)
+        upload = SimpleUploadedFile('backup.json', json.dumps(_backup(diaries=[_diary(0)])).encode('utf-8'))
+
+        with patch('diary.tasks.restore_backup_task.delay'), \
+                django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post('/api/export/restore/', {'file': upload}, format='multipart')
+        assert response.status_code == 202
+        assert response.data['kind'] == 'restore'
+
+        with patch('diary.tasks.extract_keywords_batch_task.delay'):
+            RestoreService.run_job(response.data['id'])
+        job_response = api_client.get(f"/api/export/restore-jobs/{response.data['id']}/")
+        assert job_response.data['status'] == 'completed'
+        assert job_response.data['restored']['diaries'] == 1
+        assert api_client.get(f"/api/export/pdf-jobs/{response.data['id']}/").status_code == 404
+
+    def test_invalid_backup_returns_400(self, api_client, user):
+        api_client.force_authenticate(user=user)
+        response = api_client.post('/api/export/restore/', {'data': {'diaries': []}}, format='json')
+        assert response.status_code == 400
@@ -0,0 +1,93 @@
+# diary/tests/test_search_service.py
+"""
+일기 검색 서비스 테스트 (SQLite 폴백 경로)
+- 제목/키워드/태그 검색
+- 태그 EXISTS 검색의 중복 제거
+- 접두어 tsquery 생성
+- 벤치마크 명령어
+"""
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from diary.models import Diary, DiaryTag, Tag
+from diary.services.search_service import DiarySearchService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='searcher', password='testpass123')
+
+
+@pytest.fixture
+def diaries(user):
+    walk = Diary.objects.create(user=user, title='주말 산책', content='', is_encrypted=False,
+                                search_keywords='공원 산책 강아지')
+    coffee = Diary.objects.create(user=user, title='카페', content='', is_encrypted=False,
+                                  search_keywords='커피 친구')
+    for name in ('산책', '산책로'):
+        tag = Tag.objects.create(user=user, name=name)
+        DiaryTag.objects.create(diary=walk, tag=tag)
+    return walk, coffee
+
+
+@pytest.mark.django_db
+class TestDiarySearchService:
+
+    def test_search_text_matches_title_and_keywords(self, diaries):
+        walk, coffee = diaries
+        qs = Diary.objects.all()
+
+        assert list(DiarySearchService.search_text(qs, '커피')) == [coffee]
+        assert list(DiarySearchService.search_text(qs, '주말')) == [walk]
+
+    def test_tag_search_has_no_duplicates(self, diaries):
+        walk, _ = diaries
+
+        assert list(DiarySearchService.search_tags(Diary.objects.all(), '산책')) == [walk]
+
+    def test_relevance_annotation_falls_back(self, diaries):
+        qs = DiarySearchService.search_text(Diary.objects.all(), '산책', rank=True)
+
+        assert [d.search_rank for d in qs] == [0.0]
+
+    def test_prefix_tsquery_from_nouns(self):
+        with patch('diary.services.analysis_service.NounExtractor.extract_nouns', return_value='산책 공원'):
+            assert DiarySearchService._tsquery('공원에서 산책했다') == '산책:* & 공원:*'
+
+    def test_tsquery_strips_operators(self):
+        with patch('diary.services.analysis_service.NounExtractor.extract_nouns', return_value=''):
+            assert DiarySearchService._tsquery("coffee & (tea)!") == 'coffee:* & tea:*'
+
+
+@pytest.mark.django_db
+class TestDiaryListSearch:
+
+    def test_q_exact_match_with_relevance(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('diary-list'), {'q': '커피', 'exact_match': 'true', 'sort': 'relevance'})
+
+        assert response.status_code == 200
+        results = response.data.get('results', response.data)
+        assert [d['title'] for d in results] == ['카페']
+
+    def test_content_search_by_tag(self, api_client, user, diaries):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('diary-list'), {'content_search': '산책'})
+
+        results = response.data.get('results', response.data)
+        assert [d['title'] for d in results] == ['주말 산책']
+
+
+@pytest.mark.django_db
+def test_benchmark_search_command(capsys):
+    call_command('benchmark_search', sizes=[30], repeat=1)
+
+    assert 'optimized ms' in capsys.readouterr().out
+    assert not User.objects.filter(username='__search_benchmark__').exists()
@@ -1,5 +1,5 @@
 from django.test import TestCase
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from django.core.files.uploadedfile import SimpleUploadedFile
 from diary.services.stt_service import STTService
 import os
@@ -17,37 +17,36 @@ class STTServiceTest(TestCase):
         # Mock file path
         self.voice_file.path = '/tmp/test.m4a'
 
-    @patch('diary.services.stt_service.genai')
-    def test_transcribe_success(self, mock_genai):
-        # Mock configure
-        mock_genai.configure = MagicMock()
+    def test_transcribe_success(self):
+        # Mock gateway client
+        mock_client = MagicMock()
+        self.service.client = mock_client
         
         # Mock upload_file return value
         mock_file = MagicMock()
         mock_file.state.name = "ACTIVE"
         mock_file.name = "files/123"
-        mock_genai.upload_file.return_value = mock_file
-        mock_genai.get_file.return_value = mock_file
+        mock_client.upload_file.return_value = mock_file
+        mock_client.get_file.return_value = mock_file
         
-        # Mock GenerativeModel
-        mock_model = MagicMock()
+        # Mock generate_content
         mock_response = MagicMock()
         mock_response.text = "This is a transcribed text."
-        mock_model.generate_content.return_value = mock_response
-        mock_genai.GenerativeModel.return_value = mock_model
+        mock_client.generate_content.return_value = mock_response
         
         # Execute
         result = self.service.transcribe(self.voice_file)
         
         # Assert
         self.assertEqual(result, "This is a transcribed text.")
-        mock_genai.upload_file.assert_called_once()
-        mock_model.generate_content.assert_called_once()
+        mock_client.upload_file.assert_called_once()
+        mock_client.generate_content.assert_called_once()
         
-    @patch('diary.services.stt_service.genai')
-    def test_transcribe_failure(self, mock_genai):
+    def test_transcribe_failure(self):
         # Mock upload failure
-        mock_genai.upload_file.side_effect = Exception("Upload failed")
+        mock_client = MagicMock()
+        mock_client.upload_file.side_effect = Exception("Upload failed")
+        self.service.client = mock_client
         
         result = self.service.transcribe(self.voice_file)
         self.assertIsNone(result)
@@ -0,0 +1,110 @@
+# diary/tests/test_swr_cache.py
+"""
+Stale-while-revalidate 캐시 테스트
+- soft TTL 이후 오래된 값 반환 + 락을 잡은 요청 하나만 재계산
+- 동시 미스는 한 번만 계산 (나머지는 락 보유자의 결과 사용)
+- XFetch 확률적 조기 갱신
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from diary.utils.swr_cache import (
+    DEFAULT_SWR, Uncacheable, _lock_key, _should_refresh, get_or_compute,
+)
+
+CONFIG = {**DEFAULT_SWR, 'BACKGROUND': False, 'BETA': 0, 'WAIT_TIMEOUT': 2.0, 'WAIT_INTERVAL': 0.01}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _store(key, value, expires_in):
+    cache.set(key, {'value': value, 'expires_at': time.time() + expires_in, 'delta': 0.1}, 600)
+
+
+class TestGetOrCompute:
+
+    def test_miss_computes_and_fresh_hit_reuses(self):
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+
+        assert get_or_compute('swr:a', compute, 60, CONFIG) == 1
+        assert get_or_compute('swr:a', compute, 60, CONFIG) == 1
+        assert len(calls) == 1
+
+    def test_stale_value_served_then_refreshed(self):
+        _store('swr:b', 'old', expires_in=-1)
+
+        assert get_or_compute('swr:b', lambda: 'new', 60, CONFIG) == 'old'
+        assert get_or_compute('swr:b', lambda: 'newer', 60, CONFIG) == 'new'
+
+    def test_stale_value_without_lock_does_not_recompute(self):
+        _store('swr:c', 'old', expires_in=-1)
+        cache.add(_lock_key('swr:c'), 'other', 30)
+
+        def compute():
+            raise AssertionError('락 보유자만 재계산해야 함')
+
+        assert get_or_compute('swr:c', compute, 60, CONFIG) == 'old'
+
+    def test_uncacheable_result_is_returned_not_stored(self):
+        def compute():
+            raise Uncacheable('error response')
+
+        assert get_or_compute('swr:d', compute, 60, CONFIG) == 'error response'
+        assert cache.get('swr:d') is None
+        assert cache.get(_lock_key('swr:d')) is None
+
+    def test_background_refresh_runs_in_thread(self):
+        _store('swr:e', 'old', expires_in=-1)
+        with patch('diary.utils.swr_cache.threading.Thread') as thread:
+            assert get_or_compute('swr:e', lambda: 'new', 60, {**CONFIG, 'BACKGROUND': True}) == 'old'
+        thread.return_value.start.assert_called_once()
+
+    def test_disabled_acts_as_plain_ttl_cache(self):
+        _store('swr:f', 'old', expires_in=-1)
+        assert get_or_compute('swr:f', lambda: 'new', 60, {**CONFIG, 'ENABLED': False}) == 'new'
+
+
+class TestCoalescing:
+
+    def test_concurrent_misses_compute_once(self):
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        def worker():
+            results.append(get_or_compute('swr:dogpile', compute, 60, CONFIG))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ['value'] * 8
+
+
+class TestXFetch:
+
+    def test_early_refresh_probability(self):
+        entry = {'value': 1, 'expires_at': 100.0, 'delta': 5.0}
+
+        assert _should_refresh(entry, beta=1.0, now=101.0)            # soft TTL 경과
+        assert not _should_refresh(entry, beta=0, now=99.0)           # 조기 갱신 비활성화
+        with patch('diary.utils.swr_cache.random.random', return_value=0.5):
+            # 99 + 5 * ln2 ≈ 102.5 >= 100 → 갱신 / 50 + 3.5 < 100 → 유지
+            assert _should_refresh(entry, beta=1.0, now=99.0)
+            assert not _should_refresh(entry, beta=1.0, now=50.0)
@@ -0,0 +1,286 @@
+"""
+AI 결과 캐시 (감정 분석 / 요약 / 제목 제안 / 회고 질문)
+- 키: (operation, model, prompt_version, 정규화한 입력의 해시) - 같은 입력이면 같은 결과를 재사용
+- 1단계: 프로세스 로컬 LRU (바이트 상한 + TTL)
+- 2단계: 공유 캐시 (Django cache / Redis, TTL) - 웹/Celery 워커 간 공유
+- 실제 AI 응답만 저장 (실패/대체 응답은 저장하지 않음)
+
+보안: 결과에 일기 내용이 담길 수 있으므로 공유 캐시에는 일기 암호화 키로 암호화해 저장하고,
+키 해시도 일기 암호화 키에서 파생한 HMAC 을 사용합니다 (짧은 문장의 해시 대조 방지).
+"""
+import contextvars
+import hashlib
+import hmac
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_AI_CACHE = {
+    'ENABLED': True,
+    'KEY_PREFIX': 'ai_result',
+    'TTL': 7 * 24 * 3600,                 # 공유 캐시 보관 시간 (초)
+    'LOCAL_MAX_BYTES': 4 * 1024 * 1024,   # 프로세스 로컬 LRU 상한
+    'LOCAL_TTL': 600,                     # 프로세스 로컬 보관 시간 (초)
+    'MAX_ENTRY_BYTES': 64 * 1024,         # 이보다 큰 결과는 저장하지 않음
+}
+
+HMAC_PURPOSE = 'ai-result-cache'
+
+_WHITESPACE = re.compile(r'\s+')
+
+# track_hits() 블록 안의 조회 결과 (응답 태그용, 블록 밖에서는 None)
+_tracker = contextvars.ContextVar('ai_cache_tracker', default=None)
+
+
+def get_ai_cache_config() -> dict:
+    return {**DEFAULT_AI_CACHE, **getattr(settings, 'AI_RESULT_CACHE', {})}
+
+
+def normalize_text(text) -> str:
+    """공백/유니코드 정규화 (내용 변경 없는 재저장이 같은 키가 되도록)"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', str(text or ''))).strip()
+
+
+class _HitTracker:
+    __slots__ = ('lookups',)
+
+    def __init__(self):
+        self.lookups = []
+
+    @property
+    def cached(self) -> bool:
+        """블록 안의 AI 결과가 모두 캐시에서 나왔는지 (조회가 없었으면 False)"""
+        return bool(self.lookups) and all(self.lookups)
+
+
+@contextmanager
+def track_hits():
+    """
+    블록 안의 get_or_compute 적중 여부 기록 (서비스 반환값을 바꾸지 않고 응답에 태그)
+
+    Usage:
+        with track_hits() as tracker:
+            title = SummaryService.suggest_title(content)
+        response['cached'] = tracker.cached
+    """
+    tracker = _HitTracker()
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+class _OperationStats:
+    __slots__ = ('hits', 'shared_hits', 'misses', 'stores')
+
+    def __init__(self):
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def as_dict(self):
+        total = self.hits + self.shared_hits + self.misses
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate': round((self.hits + self.shared_hits) / total, 3) if total else 0.0,
+        }
+
+
+class AIResultCache:
+    """
+    AI 결과 2단계 캐시
+
+    Usage:
+        result, cached = get_ai_cache().get_or_compute(
+            'summary:default', settings.GEMINI_TEXT_MODEL, 1, content, lambda: call_gemini(content)
+        )
+    """
+
+    def __init__(self, config=None):
+        self.config = {**DEFAULT_AI_CACHE, **(config or {})}
+        self.enabled = self.config['ENABLED']
+
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = defaultdict(_OperationStats)
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # 키
+    # ------------------------------------------------------------------
+    def make_key(self, operation, model, prompt_version, text) -> str:
+        normalized = normalize_text(text).encode('utf-8')
+        secret = self._hmac_key()
+        if secret is None:
+            digest = hashlib.sha256(normalized).hexdigest()
+        else:
+            digest = hmac.new(secret, normalized, hashlib.sha256).hexdigest()
+        return f"{self.config['KEY_PREFIX']}:{operation}:{model}:v{prompt_version}:{digest}"
+
+    @staticmethod
+    def _hmac_key():
+        from ..encryption import get_encryption_service
+        service = get_encryption_service()
+        if not service.is_enabled:
+            return None
+        return service.derive_key(HMAC_PURPOSE)
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def get(self, operation, model, prompt_version, text):
+        """Returns: (value, hit) - 없으면 (None, False)"""
+        if not self.enabled:
+            return None, False
+        key = self.make_key(operation, model, prompt_version, text)
+
+        value = self._get_local(key)
+        if value is not None:
+            self._count(operation, 'hits')
+            return value, True
+
+        value = self._get_shared(key)
+        if value is not None:
+            self._count(operation, 'shared_hits')
+            self._set_local(key, value)
+            return value, True
+
+        return None, False
+
+    def set(self, operation, model, prompt_version, text, value):
+        if not self.enabled or value is None:
+            return
+        key = self.make_key(operation, model, prompt_version, text)
+        payload = json.dumps(value, ensure_ascii=False)
+        if len(payload.encode('utf-8')) > self.config['MAX_ENTRY_BYTES']:
+            return
+        self._set_local(key, value)
+        self._set_shared(key, payload)
+        self._count(operation, 'stores')
+
+    def get_or_compute(self, operation, model, prompt_version, text, compute):
+        """
+        캐시에 있으면 반환, 없으면 compute() 결과를 저장하고 반환
+        (compute 가 예외를 던지면 저장하지 않고 그대로 전파)
+
+        Returns:
+            tuple: (value, cached: bool)
+        """
+        value, hit = self.get(operation, model, prompt_version, text)
+        if not hit:
+            if self.enabled:
+                self._count(operation, 'misses')
+            value = compute()
+            self.set(operation, model, prompt_version, text, value)
+        tracker = _tracker.get()
+        if tracker is not None:
+            tracker.lookups.append(hit)
+        return value, hit
+
+    def clear(self):
+        """프로세스 로컬 항목만 비움 (공유 캐시는 TTL 로 만료)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            operations = {name: stats.as_dict() for name, stats in self._stats.items()}
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.config['LOCAL_MAX_BYTES'],
+                'evictions': self.evictions,
+                'operations': operations,
+            }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+    def _count(self, operation, field):
+        # 지표는 operation 의 종류 단위로 집계 (예: 'summary:bullet' -> 'summary')
+        with self._lock:
+            stats = self._stats[operation.split(':', 1)[0]]
+            setattr(stats, field, getattr(stats, field) + 1)
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _set_local(self, key, value):
+        size = sys.getsizeof(key) + len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        if size > self.config['LOCAL_MAX_BYTES']:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.config['LOCAL_TTL'], size)
+            self._bytes += size
+            while self._bytes > self.config['LOCAL_MAX_BYTES'] and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _get_shared(self, key):
+        from ..encryption import get_encryption_service
+        try:
+            stored = cache.get(key)
+            if stored is None:
+                return None
+            version, token = stored
+            return json.loads(get_encryption_service().decrypt(token, version=version))
+        except Exception as e:
+            # 키 폐기/손상/캐시 장애는 miss 로 처리
+            logger.warning(f"[AICache] Shared cache read failed: {e}")
+            return None
+
+    def _set_shared(self, key, payload):
+        from ..encryption import get_encryption_service
+        service = get_encryption_service()
+        try:
+            cache.set(key, (service.latest_version, service.encrypt(payload)), timeout=self.config['TTL'])
+        except Exception as e:
+            logger.warning(f"[AICache] Shared cache write failed: {e}")
+
+
+_ai_cache = None
+_ai_cache_lock = threading.Lock()
+
+
+def get_ai_cache() -> AIResultCache:
+    """프로세스 전역 AI 결과 캐시 (싱글톤)"""
+    global _ai_cache
+    if _ai_cache is None:
+        with _ai_cache_lock:
+            if _ai_cache is None:
+                _ai_cache = AIResultCache(get_ai_cache_config())
+    return _ai_cache
@@ -0,0 +1,189 @@
+"""
+감사 로그 버퍼링 유틸리티
+- 요청마다 INSERT 하지 않고 프로세스 내 링 버퍼에 적재
+- 백그라운드 플러셔가 크기/시간 기준으로 bulk_create
+- 버퍼가 가득 차면 가장 오래된 레코드부터 버리고 drop 카운트 증가
+- 프로세스 종료 시(atexit) 남은 레코드 플러시
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BUFFER_SETTINGS = {
+    'ENABLED': True,
+    'CAPACITY': 10000,       # 링 버퍼 최대 크기 (초과 시 오래된 것부터 버림)
+    'BATCH_SIZE': 200,       # 한 번에 bulk_create 할 최대 레코드 수
+    'FLUSH_INTERVAL': 2.0,   # 최대 플러시 지연 (초)
+}
+
+
+class AuditLogBuffer:
+    """
+    AuditLog 레코드를 모아서 일괄 저장하는 링 버퍼
+
+    enqueue()는 락 안에서 deque.append 만 수행하므로 요청 경로에서
+    DB 왕복이 발생하지 않습니다.
+    """
+
+    def __init__(self, capacity=10000, batch_size=200, flush_interval=2.0, enabled=True):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+
+        self._queue = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._worker = None
+        self._pid = None
+
+        # 통계
+        self._enqueued = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._failed = 0
+        self._last_flush_at = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def enqueue(self, **fields):
+        """감사 로그 레코드(AuditLog 필드 dict)를 버퍼에 추가"""
+        if not self.enabled:
+            # 버퍼 비활성화 (테스트 등): 즉시 저장
+            self._write([fields])
+            return
+
+        with self._lock:
+            if len(self._queue) >= self.capacity:
+                # deque(maxlen)이 가장 오래된 레코드를 밀어냄
+                self._dropped += 1
+            self._queue.append(fields)
+            self._enqueued += 1
+            should_wake = len(self._queue) >= self.batch_size
+
+        self._ensure_worker()
+        if should_wake:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """버퍼에 쌓인 레코드를 모두 저장하고 저장된 개수를 반환"""
+        written = 0
+        # 플러셔 스레드와 atexit 플러시가 동시에 돌지 않도록 직렬화
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    break
+                written += self._write(batch)
+        return written
+
+    def stats(self) -> dict:
+        """모니터링용 통계"""
+        with self._lock:
+            pending = len(self._queue)
+        return {
+            'enabled': self.enabled,
+            'pending': pending,
+            'capacity': self.capacity,
+            'enqueued': self._enqueued,
+            'flushed': self._flushed,
+            'dropped': self._dropped,
+            'failed': self._failed,
+            'last_flush_at': self._last_flush_at,
+        }
+
+    def shutdown(self):
+        """플러셔 종료 후 남은 레코드 저장 (atexit)"""
+        self._stopped.set()
+        self._wakeup.set()
+        worker = self._worker
+        if worker is not None and worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout=self.flush_interval + 1)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush audit logs on exit: {e}")
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+    def _drain(self, limit):
+        with self._lock:
+            count = min(limit, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _write(self, records) -> int:
+        from ..models import AuditLog
+
+        try:
+            AuditLog.objects.bulk_create(
+                [AuditLog(**fields) for fields in records],
+                batch_size=self.batch_size,
+            )
+        except Exception as e:
+            self._failed += len(records)
+            logger.error(f"Failed to write {len(records)} audit logs: {e}")
+            return 0
+
+        self._flushed += len(records)
+        self._last_flush_at = time.time()
+        return len(records)
+
+    def _ensure_worker(self):
+        """플러셔 스레드를 지연 시작 (fork 이후 자식 프로세스에서도 재시작)"""
+        pid = os.getpid()
+        if self._worker is not None and self._pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._pid == pid and self._worker.is_alive():
+                return
+            self._pid = pid
+            self._stopped.clear()
+            self._worker = threading.Thread(
+                target=self._run, name='audit-log-flusher', daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                # 스레드 전용 DB 커넥션이 만료/단절된 경우 정리
+                close_old_connections()
+                self.flush()
+            except Exception as e:
+                logger.error(f"Audit log flusher error: {e}")
+
+
+_audit_buffer = None
+_audit_buffer_lock = threading.Lock()
+
+
+def get_audit_buffer() -> AuditLogBuffer:
+    """프로세스 전역 감사 로그 버퍼 (싱글톤)"""
+    global _audit_buffer
+    if _audit_buffer is None:
+        with _audit_buffer_lock:
+            if _audit_buffer is None:
+                config = {**DEFAULT_BUFFER_SETTINGS, **getattr(settings, 'AUDIT_LOG_BUFFER', {})}
+                _audit_buffer = AuditLogBuffer(
+                    capacity=config['CAPACITY'],
+                    batch_size=config['BATCH_SIZE'],
+                    flush_interval=config['FLUSH_INTERVAL'],
+                    enabled=config['ENABLED'],
+                )
+                atexit.register(_audit_buffer.shutdown)
+    return _audit_buffer
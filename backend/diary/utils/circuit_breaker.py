@@ -0,0 +1,475 @@
+"""
+분산 서킷 브레이커
+- 차단기 상태를 Redis 에 두고 Lua 스크립트로 원자적으로 전이 (모든 워커가 공유)
+- 오류율 윈도우: 최근 WINDOW 초의 호출 중 실패/느린 호출 비율로 차단 (연속 실패 횟수가 아님)
+- 느린 호출(SLOW_CALL_THRESHOLD 초 이상)도 비율이 넘으면 차단 (지연 기반)
+- OPEN_TIMEOUT 이 지나면 half-open: 탐색 호출 몇 개만 통과시키고 결과로 닫거나 다시 연다
+- @circuit_breaker(name, fallback=...) 데코레이터: 차단 중에는 바로 대체 응답
+
+Redis 장애 시(및 DEBUG/테스트) 같은 의미의 프로세스 로컬 백엔드를 사용합니다.
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CIRCUIT_BREAKER = {
+    'BACKEND': 'redis',           # redis | locmem
+    'KEY_PREFIX': 'cb',
+    'WINDOW': 60,                 # 오류율 계산 윈도우 (초)
+    'BUCKETS': 6,                 # 윈도우를 나누는 버킷 수 (버킷 단위로 오래된 기록 제거)
+    'MIN_CALLS': 10,              # 윈도우 안의 호출이 이보다 적으면 차단하지 않음
+    'FAILURE_RATE': 0.5,          # 실패 비율 임계값
+    'SLOW_CALL_THRESHOLD': 20.0,  # 느린 호출 기준 (초)
+    'SLOW_CALL_RATE': 0.8,        # 느린 호출 비율 임계값
+    'OPEN_TIMEOUT': 30,           # 차단 후 half-open 탐색까지 (초)
+    'HALF_OPEN_PROBES': 1,        # half-open 상태에서 동시에 허용하는 탐색 호출 수
+    'PROBE_LEASE': 60,            # 탐색 호출이 결과를 보고하지 않으면 이 시간 뒤 다시 탐색 허용 (초)
+    'OVERRIDES': {},              # 차단기 이름별 설정 덮어쓰기
+}
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# 결과 보고 종류 (ignore: 상태/윈도우에 반영하지 않고 탐색 슬롯만 반납)
+SUCCESS, FAILURE, IGNORE = 'success', 'failure', 'ignore'
+
+
+def get_circuit_breaker_config() -> dict:
+    return {**DEFAULT_CIRCUIT_BREAKER, **getattr(settings, 'CIRCUIT_BREAKER', {})}
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 호출하지 않음"""
+
+    def __init__(self, name, retry_after=0.0):
+        super().__init__(f"Circuit '{name}' is open (retry after {retry_after:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+# =============================================================================
+# Redis 백엔드
+# =============================================================================
+
+# 호출 허용 여부: KEYS[1]=hash(state, opened_at, probes, probe_until)
+# ARGV: open_timeout_ms, max_probes, probe_lease_ms, ttl_ms / 반환: {allowed, state, retry_ms}
+_ALLOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local s = redis.call('HMGET', KEYS[1], 'state', 'opened_at', 'probes', 'probe_until')
+local state = s[1] or 'closed'
+if state == 'closed' then return {1, state, 0} end
+local probes = tonumber(s[3]) or 0
+local probe_until = tonumber(s[4]) or 0
+if state == 'open' then
+    local reopen = (tonumber(s[2]) or 0) + tonumber(ARGV[1])
+    if now < reopen then return {0, state, reopen - now} end
+    state = 'half_open'
+    probes = 0
+    redis.call('HSET', KEYS[1], 'state', state, 'probes', 0)
+end
+if probes > 0 and now >= probe_until then probes = 0 end
+if probes >= tonumber(ARGV[2]) then return {0, state, math.max(0, probe_until - now)} end
+redis.call('HSET', KEYS[1], 'probes', probes + 1, 'probe_until', now + tonumber(ARGV[3]))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {1, state, 0}
+"""
+
+# 결과 보고: KEYS[1]=상태 hash, KEYS[2]=윈도우 hash(버킷:c|f|s -> 횟수)
+# ARGV: outcome, slow(0|1), probe(0|1), window_ms, bucket_ms, min_calls, failure_rate, slow_rate, ttl_ms
+_RECORD_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local outcome, slow, probe = ARGV[1], ARGV[2] == '1', ARGV[3] == '1'
+if state == 'half_open' and probe then
+    if outcome == 'ignore' then
+        local probes = tonumber(redis.call('HGET', KEYS[1], 'probes')) or 0
+        redis.call('HSET', KEYS[1], 'probes', math.max(0, probes - 1))
+        return state
+    end
+    if outcome == 'failure' or slow then
+        redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now, 'probes', 0)
+        redis.call('PEXPIRE', KEYS[1], ARGV[9])
+        return 'open'
+    end
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 'closed'
+end
+if state ~= 'closed' or outcome == 'ignore' then return state end
+local window, bucket_ms = tonumber(ARGV[4]), tonumber(ARGV[5])
+local bucket = math.floor(now / bucket_ms)
+redis.call('HINCRBY', KEYS[2], bucket .. ':c', 1)
+if outcome == 'failure' then redis.call('HINCRBY', KEYS[2], bucket .. ':f', 1) end
+if slow then redis.call('HINCRBY', KEYS[2], bucket .. ':s', 1) end
+redis.call('PEXPIRE', KEYS[2], window)
+local oldest = bucket - math.floor(window / bucket_ms) + 1
+local totals = {c = 0, f = 0, s = 0}
+local data = redis.call('HGETALL', KEYS[2])
+for i = 1, #data, 2 do
+    local b, kind = string.match(data[i], '^(%-?%d+):(%a)$')
+    if tonumber(b) < oldest then
+        redis.call('HDEL', KEYS[2], data[i])
+    else
+        totals[kind] = totals[kind] + tonumber(data[i + 1])
+    end
+end
+if totals.c >= tonumber(ARGV[6]) and
+        (totals.f / totals.c >= tonumber(ARGV[7]) or totals.s / totals.c >= tonumber(ARGV[8])) then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now, 'probes', 0)
+    redis.call('PEXPIRE', KEYS[1], ARGV[9])
+    redis.call('DEL', KEYS[2])
+    return 'open'
+end
+return state
+"""
+
+# 상태 조회 (지표용, 변경 없음): ARGV: open_timeout_ms, window_ms, bucket_ms
+# 반환: {state, retry_ms, calls, failures, slow}
+_SNAPSHOT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local s = redis.call('HMGET', KEYS[1], 'state', 'opened_at')
+local state = s[1] or 'closed'
+local retry = 0
+if state == 'open' then retry = math.max(0, (tonumber(s[2]) or 0) + tonumber(ARGV[1]) - now) end
+local oldest = math.floor(now / tonumber(ARGV[3])) - math.floor(tonumber(ARGV[2]) / tonumber(ARGV[3])) + 1
+local totals = {c = 0, f = 0, s = 0}
+local data = redis.call('HGETALL', KEYS[2])
+for i = 1, #data, 2 do
+    local b, kind = string.match(data[i], '^(%-?%d+):(%a)$')
+    if tonumber(b) >= oldest then totals[kind] = totals[kind] + tonumber(data[i + 1]) end
+end
+return {state, retry, totals.c, totals.f, totals.s}
+"""
+
+
+class _RedisBackend:
+
+    def __init__(self, client):
+        self.client = client
+        self._allow = client.register_script(_ALLOW_SCRIPT)
+        self._record = client.register_script(_RECORD_SCRIPT)
+        self._snapshot = client.register_script(_SNAPSHOT_SCRIPT)
+
+    def allow(self, keys, options):
+        allowed, state, retry = self._allow(keys=keys[:1], args=[
+            _ms(options['OPEN_TIMEOUT']), options['HALF_OPEN_PROBES'], _ms(options['PROBE_LEASE']), _ttl_ms(options),
+        ])
+        return bool(allowed), _str(state), int(retry) / 1000
+
+    def record(self, keys, options, outcome, slow, probe):
+        return _str(self._record(keys=keys, args=[
+            outcome, int(slow), int(probe), _ms(options['WINDOW']), _bucket_ms(options),
+            options['MIN_CALLS'], options['FAILURE_RATE'], options['SLOW_CALL_RATE'], _ttl_ms(options),
+        ]))
+
+    def snapshot(self, keys, options):
+        state, retry, calls, failures, slow = self._snapshot(keys=keys, args=[
+            _ms(options['OPEN_TIMEOUT']), _ms(options['WINDOW']), _bucket_ms(options),
+        ])
+        return _str(state), int(retry) / 1000, int(calls), int(failures), int(slow)
+
+    def reset(self, keys):
+        self.client.delete(*keys)
+
+
+def _ms(seconds):
+    return int(seconds * 1000)
+
+
+def _bucket_ms(options):
+    return max(1, _ms(options['WINDOW']) // options['BUCKETS'])
+
+
+def _ttl_ms(options):
+    # 상태 키 정리용 (열린 상태가 TTL 로 사라져도 닫힘으로 돌아갈 뿐)
+    return _ms(max(options['WINDOW'], options['OPEN_TIMEOUT'], options['PROBE_LEASE']) * 10)
+
+
+def _str(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# =============================================================================
+# 프로세스 로컬 백엔드 (DEBUG/테스트, Redis 장애 시 대체)
+# =============================================================================
+
+class _LocalBackend:
+    """_RedisBackend 와 같은 상태 전이를 threading.Lock 으로 보장 (프로세스 간 공유 안 됨)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}   # key -> {'state', 'opened_at', 'probes', 'probe_until'}
+        self._windows = {}  # key -> {bucket: [calls, failures, slow]}
+
+    def _window_totals(self, key, options, now, prune=False):
+        bucket_ms = _bucket_ms(options)
+        oldest = int(now // bucket_ms) - _ms(options['WINDOW']) // bucket_ms + 1
+        window = self._windows.get(key, {})
+        if prune:
+            for bucket in [b for b in window if b < oldest]:
+                del window[bucket]
+        totals = [0, 0, 0]
+        for bucket, counts in window.items():
+            if bucket >= oldest:
+                totals = [a + b for a, b in zip(totals, counts)]
+        return totals
+
+    def allow(self, keys, options):
+        now = time.monotonic() * 1000
+        with self._lock:
+            entry = self._states.get(keys[0])
+            if entry is None or entry['state'] == CLOSED:
+                return True, CLOSED, 0.0
+            if entry['state'] == OPEN:
+                reopen = entry['opened_at'] + _ms(options['OPEN_TIMEOUT'])
+                if now < reopen:
+                    return False, OPEN, (reopen - now) / 1000
+                entry.update(state=HALF_OPEN, probes=0)
+            if entry['probes'] > 0 and now >= entry['probe_until']:
+                entry['probes'] = 0
+            if entry['probes'] >= options['HALF_OPEN_PROBES']:
+                return False, HALF_OPEN, max(0.0, entry['probe_until'] - now) / 1000
+            entry.update(probes=entry['probes'] + 1, probe_until=now + _ms(options['PROBE_LEASE']))
+            return True, HALF_OPEN, 0.0
+
+    def record(self, keys, options, outcome, slow, probe):
+        now = time.monotonic() * 1000
+        state_key, window_key = keys
+        with self._lock:
+            entry = self._states.get(state_key) or {'state': CLOSED}
+            if entry['state'] == HALF_OPEN and probe:
+                if outcome == IGNORE:
+                    entry['probes'] = max(0, entry['probes'] - 1)
+                    return HALF_OPEN
+                if outcome == FAILURE or slow:
+                    entry.update(state=OPEN, opened_at=now, probes=0)
+                    return OPEN
+                self._states.pop(state_key, None)
+                self._windows.pop(window_key, None)
+                return CLOSED
+            if entry['state'] != CLOSED or outcome == IGNORE:
+                return entry['state']
+
+            counts = self._windows.setdefault(window_key, {}).setdefault(int(now // _bucket_ms(options)), [0, 0, 0])
+            counts[0] += 1
+            counts[1] += outcome == FAILURE
+            counts[2] += bool(slow)
+            calls, failures, slow_calls = self._window_totals(window_key, options, now, prune=True)
+            if calls >= options['MIN_CALLS'] and (
+                    failures / calls >= options['FAILURE_RATE'] or slow_calls / calls >= options['SLOW_CALL_RATE']):
+                self._states[state_key] = {'state': OPEN, 'opened_at': now, 'probes': 0, 'probe_until': 0}
+                self._windows.pop(window_key, None)
+                return OPEN
+            return CLOSED
+
+    def snapshot(self, keys, options):
+        now = time.monotonic() * 1000
+        with self._lock:
+            entry = self._states.get(keys[0]) or {'state': CLOSED}
+            retry = 0.0
+            if entry['state'] == OPEN:
+                retry = max(0.0, entry['opened_at'] + _ms(options['OPEN_TIMEOUT']) - now) / 1000
+            calls, failures, slow = self._window_totals(keys[1], options, now)
+            return entry['state'], retry, calls, failures, slow
+
+    def reset(self, keys):
+        with self._lock:
+            self._states.pop(keys[0], None)
+            self._windows.pop(keys[1], None)
+
+
+_local_backend = _LocalBackend()
+_redis_backend = None
+
+
+def get_backend():
+    """설정에 따른 백엔드 (Redis 연결 실패 시 프로세스 로컬 백엔드)"""
+    global _redis_backend
+    if get_circuit_breaker_config()['BACKEND'] != 'redis':
+        return _local_backend
+    if _redis_backend is None:
+        import redis
+        _redis_backend = _RedisBackend(redis.from_url(settings.REDIS_URL))
+    return _redis_backend
+
+
+def _call(method, *args):
+    try:
+        return getattr(get_backend(), method)(*args)
+    except Exception as e:
+        if get_backend() is _local_backend:
+            raise
+        # Redis 장애: 호출 경로를 막지 않고 프로세스 로컬 차단기로 대체
+        logger.warning(f"[CircuitBreaker] Redis unavailable, using local breaker: {e}")
+        return getattr(_local_backend, method)(*args)
+
+
+# =============================================================================
+# 공개 API
+# =============================================================================
+
+class CircuitBreaker:
+    """
+    이름별 차단기 (상태는 백엔드에 있으므로 같은 이름이면 모든 워커가 공유)
+
+    Usage:
+        breaker = get_breaker('gemini:gemini-3-flash-preview:generate_content')
+        with breaker.guard():
+            call_api()
+    """
+
+    _OPTION_KEYS = ('WINDOW', 'BUCKETS', 'MIN_CALLS', 'FAILURE_RATE', 'SLOW_CALL_THRESHOLD',
+                    'SLOW_CALL_RATE', 'OPEN_TIMEOUT', 'HALF_OPEN_PROBES', 'PROBE_LEASE')
+
+    def __init__(self, name, **overrides):
+        config = get_circuit_breaker_config()
+        self.name = name
+        self.options = {
+            **{key: config[key] for key in self._OPTION_KEYS},
+            **config['OVERRIDES'].get(name, {}),
+            **overrides,
+        }
+        prefix = config['KEY_PREFIX']
+        self._keys = [f"{prefix}:{name}", f"{prefix}:{name}:w"]
+
+    def allow(self):
+        """Returns: (allowed, probe 여부, retry_after 초)"""
+        allowed, state, retry = _call('allow', self._keys, self.options)
+        return allowed, allowed and state == HALF_OPEN, retry
+
+    def record(self, outcome, latency=None, probe=False):
+        """호출 결과 보고 (latency 가 None 이면 느린 호출 판정 안 함)"""
+        slow = latency is not None and latency >= self.options['SLOW_CALL_THRESHOLD']
+        state = _call('record', self._keys, self.options, outcome, slow, probe)
+        if state == OPEN and outcome != IGNORE:
+            logger.error(f"[CircuitBreaker] '{self.name}' is open")
+        return state
+
+    @contextmanager
+    def guard(self, ignore=(), measure_latency=True):
+        """
+        허용되지 않으면 CircuitOpenError, 블록의 예외는 실패로 보고
+        (ignore 예외는 실패로 세지 않음 - 예: 로컬 backpressure, 입력 검증 오류)
+        블록 안의 다른 브레이커가 던진 CircuitOpenError 도 실패로 세지 않음 (호출 자체가 없었음)
+        """
+        allowed, probe, retry = self.allow()
+        if not allowed:
+            raise CircuitOpenError(self.name, retry)
+        started = time.monotonic()
+        try:
+            yield
+        except CircuitOpenError:
+            self.record(IGNORE, probe=probe)
+            raise
+        except ignore:
+            self.record(IGNORE, probe=probe)
+            raise
+        except Exception:
+            self.record(FAILURE, probe=probe)
+            raise
+        except BaseException:
+            # GeneratorExit / 취소: 결과를 알 수 없으므로 탐색 슬롯만 반납
+            self.record(IGNORE, probe=probe)
+            raise
+        self.record(SUCCESS, latency=time.monotonic() - started if measure_latency else None, probe=probe)
+
+    def snapshot(self) -> dict:
+        state, retry, calls, failures, slow = _call('snapshot', self._keys, self.options)
+        return {
+            'state': state,
+            'retry_after': round(retry, 1),
+            'calls': calls,
+            'failures': failures,
+            'slow_calls': slow,
+            'failure_rate': round(failures / calls, 3) if calls else 0.0,
+            'slow_call_rate': round(slow / calls, 3) if calls else 0.0,
+        }
+
+    def reset(self):
+        _call('reset', self._keys)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, **overrides) -> CircuitBreaker:
+    """이름별 차단기 (프로세스 안에서 재사용, 지표 조회 대상으로 등록)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(name, **overrides)
+    return breaker
+
+
+def breaker_stats() -> dict:
+    """이 프로세스가 사용한 차단기들의 공유 상태"""
+    stats = {}
+    for name, breaker in list(_breakers.items()):
+        try:
+            stats[name] = breaker.snapshot()
+        except Exception as e:
+            stats[name] = {'error': str(e)}
+    return stats
+
+
+def reset_breakers():
+    """등록된 모든 차단기를 닫힘으로 초기화 (운영 중 수동 복구 / 테스트 격리)"""
+    for breaker in list(_breakers.values()):
+        breaker.reset()
+
+
+def circuit_breaker(name, fallback=None, ignore=(), **overrides):
+    """
+    서킷 브레이커 데코레이터 (동기/async 함수 모두 지원)
+
+    Args:
+        name: 차단기 이름 (같은 이름은 상태 공유)
+        fallback: 차단 중일 때 원래 인자로 호출할 대체 함수 (None 이면 CircuitOpenError 전파)
+        ignore: 실패로 세지 않을 예외 타입
+
+    차단 중(또는 내부에서 다른 차단기가 열려 CircuitOpenError 가 올라온 경우)에만 fallback 을 사용하고,
+    그 밖의 예외는 실패로 기록한 뒤 그대로 전파합니다.
+
+    Usage:
+        @circuit_breaker('stt.transcribe', fallback=lambda self, *args, **kwargs: None)
+        def transcribe(self, voice_file, language='ko'): ...
+    """
+    def _fallback(error, args, kwargs):
+        if fallback is None:
+            raise error
+        logger.warning(f"[CircuitBreaker] {error}; using fallback for {name}")
+        return fallback(*args, **kwargs)
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    with get_breaker(name, **overrides).guard(ignore):
+                        return await func(*args, **kwargs)
+                except CircuitOpenError as e:
+                    return _fallback(e, args, kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                with get_breaker(name, **overrides).guard(ignore):
+                    return func(*args, **kwargs)
+            except CircuitOpenError as e:
+                return _fallback(e, args, kwargs)
+        return wrapper
+
+    return decorator
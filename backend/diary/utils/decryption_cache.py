@@ -0,0 +1,195 @@
+"""
+복호화된 일기 본문 캐시
+- 프로세스 로컬 LRU (바이트 상한 + TTL)
+- 요청 단위 메모 (한 요청에서 같은 일기를 두 번 복호화하지 않음)
+- 저장/삭제 시그널로 명시적 무효화
+
+보안: 평문은 프로세스 메모리에만 보관하며 공유 캐시(Redis)에는 절대 저장하지 않습니다.
+"""
+import contextvars
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'MAX_BYTES': 16 * 1024 * 1024,  # 16MB
+    'TTL': 300,                     # 5분
+}
+
+# 요청 단위 메모 (DecryptionMemoMiddleware 가 요청마다 새 dict 설정)
+_request_memo = contextvars.ContextVar('diary_decryption_memo', default=None)
+
+# 암호문 꼬리(HMAC 부분) 길이: 같은 키로도 내용이 바뀌면 달라지므로 검증용 태그로 사용
+_TAG_LENGTH = 32
+
+
+def _cache_key(diary):
+    return (diary.pk, diary.version, diary.encryption_version)
+
+
+def _tag(ciphertext):
+    return ciphertext[-_TAG_LENGTH:] if ciphertext else ''
+
+
+class DecryptedContentCache:
+    """
+    (diary_id, version, encryption_version) 키의 LRU 캐시
+
+    version 이 올라가지 않는 경로(STT 본문 채우기, queryset.update 등)에서도
+    오래된 평문을 돌려주지 않도록 암호문 태그가 다르면 miss 로 처리합니다.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, ttl=300, enabled=True):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+
+        self._entries = OrderedDict()  # key -> (plaintext, tag, expires_at, size)
+        self._keys_by_id = {}          # diary_id -> set(key)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.memo_hits = 0
+        self.evictions = 0
+
+    def get_or_decrypt(self, diary, decrypt):
+        """캐시에 있으면 반환, 없으면 decrypt() 결과를 캐시에 넣고 반환"""
+        if not self.enabled or diary.pk is None:
+            return decrypt()
+
+        key = _cache_key(diary)
+        tag = _tag(diary.content)
+
+        memo = _request_memo.get()
+        if memo is not None:
+            cached = memo.get(key)
+            if cached is not None and cached[1] == tag:
+                self.memo_hits += 1
+                return cached[0]
+
+        plaintext = self._get(key, tag)
+        if plaintext is None:
+            self.misses += 1
+            plaintext = decrypt()
+            self._set(key, tag, plaintext)
+        else:
+            self.hits += 1
+
+        if memo is not None:
+            memo[key] = (plaintext, tag)
+        return plaintext
+
+    def invalidate(self, diary_id):
+        """해당 일기의 모든 버전 엔트리 제거"""
+        with self._lock:
+            for key in self._keys_by_id.pop(diary_id, ()):
+                self._remove(key)
+
+        memo = _request_memo.get()
+        if memo:
+            for key in [k for k in memo if k[0] == diary_id]:
+                del memo[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'memo_hits': self.memo_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal (호출자가 self._lock 을 잡지 않은 상태에서 진입)
+    # ------------------------------------------------------------------
+    def _get(self, key, tag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            plaintext, cached_tag, expires_at, _ = entry
+            if cached_tag != tag or expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return plaintext
+
+    def _set(self, key, tag, plaintext):
+        size = sys.getsizeof(plaintext)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (plaintext, tag, time.monotonic() + self.ttl, size)
+            self._keys_by_id.setdefault(key[0], set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[3]
+        keys = self._keys_by_id.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[key[0]]
+
+
+class DecryptionMemoMiddleware:
+    """요청마다 복호화 메모를 새로 열고 응답 후 폐기"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_memo.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_memo.reset(token)
+
+
+_decryption_cache = None
+_decryption_cache_lock = threading.Lock()
+
+
+def get_decryption_cache() -> DecryptedContentCache:
+    """프로세스 전역 복호화 캐시 (싱글톤)"""
+    global _decryption_cache
+    if _decryption_cache is None:
+        with _decryption_cache_lock:
+            if _decryption_cache is None:
+                config = {**DEFAULT_CACHE_SETTINGS, **getattr(settings, 'DECRYPTION_CACHE', {})}
+                _decryption_cache = DecryptedContentCache(
+                    max_bytes=config['MAX_BYTES'],
+                    ttl=config['TTL'],
+                    enabled=config['ENABLED'],
+                )
+    return _decryption_cache
@@ -0,0 +1,77 @@
+"""
+HTTP Range 요청을 지원하는 파일 다운로드 응답
+- Range 헤더가 없으면 전체 파일 (200)
+- 'bytes=start-end' / 'bytes=start-' / 'bytes=-suffix' 단일 구간 지원 (206)
+- 범위를 벗어나면 416
+"""
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    Range 헤더 -> (start, end) (end 포함)
+
+    Returns:
+        None: 헤더가 없거나 해석할 수 없음 (전체 전송)
+        False: 만족할 수 없는 범위 (416)
+    """
+    match = _RANGE_PATTERN.match((header or '').strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # 마지막 N 바이트
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(READ_BLOCK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def ranged_file_response(request, path, content_type, filename):
+    """Range 헤더를 처리하는 첨부 파일 응답"""
+    size = os.path.getsize(path)
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(path, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,151 @@
+"""
+대용량 JSON 백업 파일 점진 파싱
+- 최상위 객체의 한 키 값만 읽거나 (read_value), 배열 항목을 하나씩 생성 (iter_array)
+- ijson 이 설치되어 있으면 사용, 없으면 json.JSONDecoder.raw_decode 기반 폴백 파서 사용
+  (어느 쪽이든 메모리에는 현재 항목과 읽기 버퍼만 유지)
+
+파일 객체는 바이너리 모드여야 하며, 호출마다 처음부터 다시 읽습니다.
+"""
+import codecs
+import json
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - 선택 의존성
+    ijson = None
+
+READ_BLOCK_SIZE = 64 * 1024
+
+_MISSING = object()
+_WHITESPACE = ' \t\r\n'
+
+
+class JSONStreamError(ValueError):
+    """백업 파일을 JSON 으로 해석할 수 없음"""
+    pass
+
+
+class _Reader:
+    """바이너리 파일을 UTF-8 로 읽으며 JSON 값을 하나씩 디코딩하는 버퍼"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.fileobj.read(READ_BLOCK_SIZE)
+        if not data:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(b'', final=True)
+        else:
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(data)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (파일 끝이면 '')"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise JSONStreamError(f"expected '{char}' in backup file")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나 디코딩 (버퍼 끝에서 잘린 값이면 더 읽고 재시도)"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if not self._fill():
+                    raise JSONStreamError(str(e)) from e
+                continue
+            # 숫자는 버퍼 끝에서 잘려도 디코딩되므로 끝에 닿으면 더 읽어서 확인
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def items(self):
+        """현재 위치의 배열 항목을 하나씩 생성"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise JSONStreamError("expected ',' or ']' in array")
+
+    def seek_key(self, key) -> bool:
+        """최상위 객체에서 key 의 값 직전까지 이동 (다른 키의 값은 건너뜀)"""
+        self.expect('{')
+        if self.peek() == '}':
+            return False
+        while True:
+            name = self.value()
+            self.expect(':')
+            if name == key:
+                return True
+            if self.peek() == '[':
+                # 큰 배열도 항목 단위로 건너뜀
+                for _ in self.items():
+                    pass
+            else:
+                self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return False
+            if char != ',':
+                raise JSONStreamError("expected ',' or '}' in object")
+
+
+def read_value(fileobj, key, default=None):
+    """최상위 객체의 key 값 (없으면 default)"""
+    fileobj.seek(0)
+    if ijson is not None:
+        try:
+            for value in ijson.items(fileobj, key, use_float=True):
+                return value
+        except ijson.JSONError as e:
+            raise JSONStreamError(str(e)) from e
+        return default
+
+    reader = _Reader(fileobj)
+    if not reader.seek_key(key):
+        return default
+    return reader.value()
+
+
+def iter_array(fileobj, key):
+    """최상위 객체의 key 배열 항목을 하나씩 생성 (키가 없거나 배열이 아니면 빈 결과)"""
+    fileobj.seek(0)
+    if ijson is not None:
+        try:
+            yield from ijson.items(fileobj, f'{key}.item', use_float=True)
+        except ijson.JSONError as e:
+            raise JSONStreamError(str(e)) from e
+        return
+
+    reader = _Reader(fileobj)
+    if not reader.seek_key(key) or reader.peek() != '[':
+        return
+    yield from reader.items()
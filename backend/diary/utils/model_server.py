@@ -0,0 +1,302 @@
+"""
+SentenceTransformer 모델 서버 (사이드카)
+- 임베딩/키워드 모델을 한 프로세스에서 한 번만 로드 (부팅 시 미리 로드)
+- 여러 호출자의 동시 encode 요청을 짧은 시간(MAX_WAIT_MS) 모아 한 번에 encode
+- 로컬 HTTP 인터페이스: POST /encode, GET /health
+- RemoteEncoder: SentenceTransformer.encode 와 같은 모양으로 서버를 호출하는 클라이언트
+
+MODEL_SERVER['URL'] 이 비어 있으면 기존처럼 프로세스 내에서 모델을 직접 로드합니다. (테스트/개발)
+"""
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 모델 별칭 -> SentenceTransformer 모델 이름
+MODEL_NAMES = {
+    'embedding': 'all-MiniLM-L6-v2',
+    'keyword': 'paraphrase-multilingual-MiniLM-L12-v2',
+}
+
+DEFAULT_MODEL_SERVER = {
+    'URL': '',            # 예: http://model-server:8500 (비어 있으면 프로세스 내 로드)
+    'TIMEOUT': 10,        # 클라이언트 요청 타임아웃 (초)
+    'MAX_BATCH': 64,      # 서버가 한 번에 encode 할 최대 텍스트 수
+    'MAX_WAIT_MS': 10,    # 서버가 동시 요청을 모으는 시간
+}
+
+
+class ModelServerError(Exception):
+    """모델 서버 호출 실패"""
+    pass
+
+
+def get_model_server_config() -> dict:
+    return {**DEFAULT_MODEL_SERVER, **getattr(settings, 'MODEL_SERVER', {})}
+
+
+def load_sentence_transformer(alias):
+    from sentence_transformers import SentenceTransformer
+    logger.info(f"Loading SentenceTransformer model '{MODEL_NAMES[alias]}' for {alias}")
+    return SentenceTransformer(MODEL_NAMES[alias])
+
+
+# =============================================================================
+# 서버
+# =============================================================================
+
+class _EncodeRequest:
+    __slots__ = ('texts', 'event', 'result', 'error')
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class EncodeBatcher:
+    """
+    한 모델에 대한 마이크로 배처
+    첫 요청이 들어온 뒤 max_wait 동안(또는 max_batch 개가 찰 때까지) 모은 요청을
+    하나의 model.encode 호출로 처리하고 결과를 요청별로 나눠 돌려줍니다.
+    """
+
+    def __init__(self, model, max_batch=64, max_wait_ms=10):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='model-batcher', daemon=True)
+        self._thread.start()
+
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+
+    def encode(self, texts, timeout=None):
+        request = _EncodeRequest(list(texts))
+        self._queue.put(request)
+        if not request.event.wait(timeout):
+            raise ModelServerError('encode timed out')
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stats(self) -> dict:
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'texts': self.texts,
+            'avg_batch_size': round(self.texts / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                vectors = np.atleast_2d(np.asarray(self.model.encode(texts)))
+                offset = 0
+                for request in batch:
+                    request.result = vectors[offset:offset + len(request.texts)]
+                    offset += len(request.texts)
+            except Exception as e:
+                logger.error(f"[ModelServer] encode failed for batch of {len(texts)}: {e}")
+                for request in batch:
+                    request.error = ModelServerError(str(e))
+            finally:
+                self.requests += len(batch)
+                self.batches += 1
+                self.texts += len(texts)
+                for request in batch:
+                    request.event.set()
+
+
+class ModelServer:
+    """
+    모델을 보유하고 HTTP 로 encode 를 제공하는 서버
+
+    Args:
+        models: {별칭: 모델} 직접 주입 (테스트용). 없으면 MODEL_NAMES 전체 로드
+        preload: True 면 서버 시작 전에 모든 모델을 로드
+    """
+
+    def __init__(self, host='127.0.0.1', port=8500, models=None, preload=True,
+                 max_batch=64, max_wait_ms=10, loader=load_sentence_transformer):
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._loader = loader
+        self._batchers = {}
+        self._lock = threading.Lock()
+        self.started_at = None
+        self.httpd = None
+
+        for alias, model in (models or {}).items():
+            self._batchers[alias] = EncodeBatcher(model, max_batch, max_wait_ms)
+        if preload:
+            for alias in MODEL_NAMES:
+                self.get_batcher(alias)
+
+    def get_batcher(self, alias) -> EncodeBatcher:
+        if alias not in self._batchers:
+            if alias not in MODEL_NAMES:
+                raise KeyError(alias)
+            with self._lock:
+                if alias not in self._batchers:
+                    model = self._loader(alias)
+                    self._batchers[alias] = EncodeBatcher(model, self.max_batch, self.max_wait_ms)
+        return self._batchers[alias]
+
+    def health(self) -> dict:
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.monotonic() - self.started_at, 1) if self.started_at else 0,
+            'models': {alias: batcher.stats() for alias, batcher in self._batchers.items()},
+        }
+
+    def _bind(self):
+        self.httpd = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.started_at = time.monotonic()
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 (실제 바인딩된 포트 반환)"""
+        self._bind()
+        threading.Thread(target=self.httpd.serve_forever, name='model-server', daemon=True).start()
+        return self.port
+
+    def serve_forever(self):
+        self._bind()
+        logger.info(f"[ModelServer] Listening on {self.host}:{self.port}")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+def _make_handler(server):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, server.health())
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/encode':
+                self._send(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                batcher = server.get_batcher(payload.get('model', 'embedding'))
+                vectors = batcher.encode(payload['texts'])
+            except KeyError as e:
+                self._send(400, {'error': f'unknown model or missing field: {e}'})
+            except ModelServerError as e:
+                self._send(500, {'error': str(e)})
+            except (ValueError, TypeError) as e:
+                self._send(400, {'error': str(e)})
+            else:
+                self._send(200, {'embeddings': vectors.tolist()})
+
+        def log_message(self, format, *args):
+            logger.debug(f"[ModelServer] {format % args}")
+
+    return Handler
+
+
+# =============================================================================
+# 클라이언트
+# =============================================================================
+
+class RemoteEncoder:
+    """
+    모델 서버를 호출하는 SentenceTransformer 호환 인코더
+    - encode(str) -> 1차원 배열, encode(list) -> 2차원 배열
+    """
+
+    def __init__(self, alias, base_url, timeout=10):
+        self.alias = alias
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def encode(self, sentences, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else [str(s) for s in sentences]
+        if not texts:
+            return np.empty((0, 0))
+
+        body = json.dumps({'model': self.alias, 'texts': texts}).encode('utf-8')
+        request = urllib.request.Request(
+            f"{self.base_url}/encode",
+            data=body,
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                vectors = np.asarray(json.loads(response.read())['embeddings'])
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+            raise ModelServerError(f"model server request failed: {e}") from e
+
+        return vectors[0] if single else vectors
+
+
+def check_model_server_health(base_url=None, timeout=2) -> dict:
+    """모델 서버 /health 결과 반환 (실패 시 ModelServerError)"""
+    base_url = (base_url or get_model_server_config()['URL']).rstrip('/')
+    try:
+        with urllib.request.urlopen(f"{base_url}/health", timeout=timeout) as response:
+            return json.loads(response.read())
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise ModelServerError(f"model server unreachable: {e}") from e
+
+
+def get_remote_encoder(alias):
+    """MODEL_SERVER['URL'] 이 설정되어 있으면 RemoteEncoder, 아니면 None (프로세스 내 로드)"""
+    config = get_model_server_config()
+    if not config['URL']:
+        return None
+    return RemoteEncoder(alias, config['URL'], timeout=config['TIMEOUT'])
@@ -0,0 +1,151 @@
+"""
+키워드 후보(n-gram) 임베딩 캐시
+- 프로세스 로컬 LRU (정규화된 float32 벡터)
+- 선택: 디스크의 메모리 맵 행렬(vectors.f32) + 어휘 인덱스(vocab.json) 를 읽기 전용으로 사용
+  (manage.py build_ngram_cache 로 생성, 여러 워커가 OS 페이지 캐시를 공유)
+
+조회 순서: LRU -> 메모리 맵 -> miss (호출자가 encode 후 put_many)
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NGRAM_CACHE = {
+    'MAX_ENTRIES': 50000,
+    'PATH': '',  # 메모리 맵 디렉토리 (비어 있으면 LRU 만 사용)
+}
+
+VECTORS_FILE = 'vectors.f32'
+VOCAB_FILE = 'vocab.json'
+
+
+def normalize_rows(matrix):
+    """행 단위 L2 정규화 (내적 = 코사인 유사도)"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class NgramEmbeddingCache:
+
+    def __init__(self, max_entries=50000, path=''):
+        self.max_entries = max_entries
+        self.path = path
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._vocab = {}
+        self._matrix = None
+
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self._open_memmap(path)
+
+    def _open_memmap(self, path):
+        vocab_path = os.path.join(path, VOCAB_FILE)
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        if not (os.path.exists(vocab_path) and os.path.exists(vectors_path)):
+            return
+        try:
+            with open(vocab_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            self._matrix = np.memmap(
+                vectors_path, dtype=np.float32, mode='r',
+                shape=(len(meta['terms']), meta['dim']),
+            )
+            self._vocab = {term: i for i, term in enumerate(meta['terms'])}
+            logger.info(f"Opened n-gram embedding memmap with {len(self._vocab)} terms")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to open n-gram embedding memmap at {path}: {e}")
+            self._vocab, self._matrix = {}, None
+
+    def get_many(self, terms):
+        """
+        Returns:
+            (found: {term: vector}, missing: [term])
+        """
+        found, missing = {}, []
+        with self._lock:
+            for term in terms:
+                vector = self._lru.get(term)
+                if vector is not None:
+                    self._lru.move_to_end(term)
+                    found[term] = vector
+                    continue
+                index = self._vocab.get(term)
+                if index is not None:
+                    found[term] = self._matrix[index]
+                    continue
+                missing.append(term)
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, terms, vectors):
+        """정규화된 벡터를 LRU 에 추가 (용량 초과 시 오래된 항목 제거)"""
+        with self._lock:
+            for term, vector in zip(terms, vectors):
+                self._lru[term] = vector
+                self._lru.move_to_end(term)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._lru),
+            'memmap_terms': len(self._vocab),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+    @staticmethod
+    def write_memmap(path, terms, vectors):
+        """어휘/벡터를 메모리 맵 파일로 저장 (기존 파일은 원자적으로 교체)"""
+        vectors = normalize_rows(vectors)
+        os.makedirs(path, exist_ok=True)
+
+        vectors_tmp = os.path.join(path, VECTORS_FILE + '.tmp')
+        matrix = np.memmap(vectors_tmp, dtype=np.float32, mode='w+', shape=vectors.shape)
+        matrix[:] = vectors
+        matrix.flush()
+        del matrix
+
+        vocab_tmp = os.path.join(path, VOCAB_FILE + '.tmp')
+        with open(vocab_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'dim': int(vectors.shape[1]), 'terms': list(terms)}, f, ensure_ascii=False)
+
+        os.replace(vectors_tmp, os.path.join(path, VECTORS_FILE))
+        os.replace(vocab_tmp, os.path.join(path, VOCAB_FILE))
+
+
+_ngram_cache = None
+_ngram_cache_lock = threading.Lock()
+
+
+def get_ngram_cache() -> NgramEmbeddingCache:
+    """프로세스 전역 n-gram 임베딩 캐시 (싱글톤)"""
+    global _ngram_cache
+    if _ngram_cache is None:
+        with _ngram_cache_lock:
+            if _ngram_cache is None:
+                config = {**DEFAULT_NGRAM_CACHE, **getattr(settings, 'KEYWORD_NGRAM_CACHE', {})}
+                _ngram_cache = NgramEmbeddingCache(
+                    max_entries=config['MAX_ENTRIES'],
+                    path=config['PATH'],
+                )
+    return _ngram_cache
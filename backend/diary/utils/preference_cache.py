@@ -0,0 +1,118 @@
+"""
+사용자 설정(UserPreference) 조회 캐시
+- 요청 단위 메모: 한 요청 안에서 같은 사용자의 설정 객체는 한 번만 조회
+- 자주 읽는 필드 스냅샷(프리미엄 여부, 스트릭, 자동 분석/알림 설정)을 공유 캐시에 read-through 로 보관
+- 설정 저장 시그널에서 스냅샷을 새 값으로 덮어쓰고(write-through), 삭제 시 제거
+"""
+import contextvars
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+HOT_FIELDS = (
+    'is_premium',
+    'current_streak',
+    'max_streak',
+    'last_diary_date',
+    'auto_emotion_analysis',
+    'push_enabled',
+    'emotion_trend_alert',
+)
+
+SNAPSHOT_KEY = 'pref_snapshot:{user_id}'
+
+# 요청 단위 메모 (PreferenceMemoMiddleware 가 요청마다 새 dict 설정): user_id -> UserPreference
+_request_memo = contextvars.ContextVar('diary_preference_memo', default=None)
+
+
+class PreferenceMemoMiddleware:
+    """요청마다 설정 메모를 새로 열고 응답 후 폐기"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_memo.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_memo.reset(token)
+
+
+def get_memoized(user_id):
+    """이번 요청에서 이미 조회한 설정 객체 (없거나 요청 밖이면 None)"""
+    memo = _request_memo.get()
+    return memo.get(user_id) if memo is not None else None
+
+
+def memoize(preference):
+    memo = _request_memo.get()
+    if memo is not None:
+        memo[preference.user_id] = preference
+
+
+def _snapshot_key(user_id):
+    return SNAPSHOT_KEY.format(user_id=user_id)
+
+
+def _ttl():
+    return getattr(settings, 'CACHE_TTL', {}).get('preference', 3600)
+
+
+def _default_snapshot():
+    from diary.models import UserPreference
+    return {field: UserPreference._meta.get_field(field).get_default() for field in HOT_FIELDS}
+
+
+def snapshot_of(preference) -> dict:
+    return {**{field: getattr(preference, field) for field in HOT_FIELDS}, 'exists': preference.pk is not None}
+
+
+def get_snapshot(user_id) -> dict:
+    """
+    자주 읽는 설정 필드 조회 (요청 메모 → 공유 캐시 → DB 순)
+
+    설정 행이 없으면 기본값과 'exists': False 를 반환하며, 행을 만들지는 않습니다.
+    """
+    preference = get_memoized(user_id)
+    if preference is not None:
+        return snapshot_of(preference)
+
+    key = _snapshot_key(user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        from diary.models import UserPreference
+        row = UserPreference.objects.filter(user_id=user_id).values(*HOT_FIELDS).first()
+        snapshot = {**row, 'exists': True} if row else {**_default_snapshot(), 'exists': False}
+        cache.set(key, snapshot, _ttl())
+    return snapshot
+
+
+def store_snapshot(user_id, snapshot: dict):
+    """
+    queryset.update 등 시그널 없이 바꾼 값을 스냅샷에 반영
+    (이번 요청의 메모 객체는 오래된 값이므로 버림)
+    """
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.pop(user_id, None)
+    cache.set(_snapshot_key(user_id), snapshot, _ttl())
+
+
+def write_through(preference):
+    """저장된 설정 객체로 메모/스냅샷 갱신 (지연 로딩 필드가 있으면 스냅샷 삭제)"""
+    memo = _request_memo.get()
+    if memo is not None and preference.user_id in memo:
+        memo[preference.user_id] = preference
+    if preference.get_deferred_fields() & set(HOT_FIELDS):
+        cache.delete(_snapshot_key(preference.user_id))
+    else:
+        cache.set(_snapshot_key(preference.user_id), snapshot_of(preference), _ttl())
+
+
+def forget(user_id):
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.pop(user_id, None)
+    cache.delete(_snapshot_key(user_id))
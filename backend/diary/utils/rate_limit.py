@@ -1,17 +1,39 @@
 """
 Rate Limiting 유틸리티
-- 동시 작업 제한
-- 일일 할당량 체크
-- 작업 타입별 제한 관리
+- 원자적 확인+소비 (Redis Lua 스크립트, 개발/테스트는 프로세스 로컬 대체 구현)
+- 고정 윈도우 / 슬라이딩 윈도우 / 토큰 버킷
+- 일일 할당량 (사용자 티어별 한도를 할당량 키에 함께 저장해 DB 조회는 하루 1회)
+- 리스 갱신을 지원하는 세마포어 (동시 작업 제한, 만료된 리스는 자동 회수)
 """
 import logging
-from django.core.cache import cache
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
 from django.utils import timezone
 from rest_framework.exceptions import Throttled
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_RATE_LIMIT = {
+    'BACKEND': 'redis',   # redis | locmem (locmem: 프로세스 로컬, DEBUG/테스트용)
+    'KEY_PREFIX': 'rl',
+}
+
+# 일일 할당량 작업 유형 (티어 변경 시 저장된 한도 초기화 대상)
+QUOTA_TASK_TYPES = ('image_gen',)
+
+LimitResult = namedtuple('LimitResult', ['allowed', 'remaining', 'limit', 'retry_after'])
+
+
+def get_rate_limit_config() -> dict:
+    return {**DEFAULT_RATE_LIMIT, **getattr(settings, 'RATE_LIMIT', {})}
+
+
 class ConcurrentLimitError(Throttled):
     """동시 작업 제한 초과 에러"""
     default_detail = '다른 작업이 진행 중입니다. 완료 후 다시 시도해주세요.'
@@ -24,116 +46,417 @@ class DailyQuotaExceededError(Throttled):
     default_code = 'daily_quota_exceeded'
 
 
-def check_concurrent_limit(user_id, task_type='image_gen', max_concurrent=1):
+# =============================================================================
+# Redis 백엔드 (Lua 스크립트로 확인과 소비를 한 번에 수행)
+# =============================================================================
+
+# 고정 윈도우 할당량: KEYS[1]=hash(used, limit) / ARGV: cost, limit('' 이면 저장된 값 사용), ttl_ms
+# cost > 0: 소비, cost = 0: 조회, cost < 0: 환불 / 한도를 모르면 {-1} 반환
+_QUOTA_SCRIPT = """
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit'))
+if not limit then
+    limit = tonumber(ARGV[2])
+    if not limit then return {-1, 0, 0} end
+    redis.call('HSET', KEYS[1], 'limit', limit)
+    redis.call('PEXPIRE', KEYS[1], ARGV[3])
+end
+local used = tonumber(redis.call('HGET', KEYS[1], 'used')) or 0
+local cost = tonumber(ARGV[1])
+if cost == 0 then
+    return {used < limit and 1 or 0, used, limit}
+end
+if cost < 0 then
+    used = math.max(0, used + cost)
+    redis.call('HSET', KEYS[1], 'used', used)
+    return {1, used, limit}
+end
+if used + cost > limit then return {0, used, limit} end
+used = redis.call('HINCRBY', KEYS[1], 'used', cost)
+return {1, used, limit}
+"""
+
+# 슬라이딩 윈도우: KEYS[1]=zset(score=ms) / ARGV: limit, window_ms, cost, member
+_SLIDING_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local limit, window, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local used = redis.call('ZCARD', KEYS[1])
+if used + cost > limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local retry = oldest[2] and (tonumber(oldest[2]) + window - now) or window
+    return {0, used, retry}
+end
+for i = 1, cost do
+    redis.call('ZADD', KEYS[1], now, ARGV[4] .. ':' .. i)
+end
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, used + cost, 0}
+"""
+
+# 토큰 버킷: KEYS[1]=hash(tokens, ts) / ARGV: capacity, refill_per_ms, cost
+_TOKEN_BUCKET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local capacity, rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry = math.ceil((cost - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+return {allowed, tostring(tokens), retry}
+"""
+
+# 세마포어: KEYS[1]=zset(holder, score=리스 만료 ms) / ARGV: action(acquire|renew|release|count), holder, limit, lease_ms
+_SEMAPHORE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local action, holder = ARGV[1], ARGV[2]
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if action == 'count' then
+    return redis.call('ZCARD', KEYS[1])
+end
+if action == 'release' then
+    redis.call('ZREM', KEYS[1], holder)
+    return redis.call('ZCARD', KEYS[1])
+end
+local lease = tonumber(ARGV[4])
+local held = redis.call('ZSCORE', KEYS[1], holder)
+if action == 'renew' and not held then return -1 end
+if not held and redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then return -1 end
+redis.call('ZADD', KEYS[1], now + lease, holder)
+redis.call('PEXPIRE', KEYS[1], lease)
+return redis.call('ZCARD', KEYS[1])
+"""
+
+
+class _RedisBackend:
+
+    def __init__(self, client):
+        self.client = client
+        self._quota = client.register_script(_QUOTA_SCRIPT)
+        self._sliding = client.register_script(_SLIDING_SCRIPT)
+        self._bucket = client.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._semaphore = client.register_script(_SEMAPHORE_SCRIPT)
+
+    def quota(self, key, cost, limit, ttl):
+        status, used, stored = self._quota(keys=[key], args=[cost, '' if limit is None else limit, int(ttl * 1000)])
+        return int(status), int(used), int(stored)
+
+    def sliding(self, key, limit, window, cost):
+        allowed, used, retry = self._sliding(
+            keys=[key], args=[limit, int(window * 1000), cost, uuid.uuid4().hex]
+        )
+        return bool(allowed), int(used), int(retry) / 1000
+
+    def token_bucket(self, key, capacity, window, cost):
+        allowed, tokens, retry = self._bucket(keys=[key], args=[capacity, capacity / (window * 1000), cost])
+        return bool(allowed), float(tokens), int(retry) / 1000
+
+    def semaphore(self, key, action, holder, limit=0, lease=0):
+        return int(self._semaphore(keys=[key], args=[action, holder, limit, int(lease * 1000)]))
+
+    def delete_field(self, key, field):
+        self.client.hdel(key, field)
+
+
+# =============================================================================
+# 프로세스 로컬 백엔드 (DEBUG/테스트, Redis 장애 시 대체)
+# =============================================================================
+
+class _LocalBackend:
+    """_RedisBackend 와 같은 의미를 threading.Lock 으로 보장 (프로세스 간 공유 안 됨)"""
+
+    MAX_KEYS = 10000  # 넘으면 만료된 키 정리
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (value, expires_at)
+
+    def _get(self, key, default, now):
+        value, expires_at = self._data.get(key, (None, 0))
+        return value if value is not None and expires_at > now else default
+
+    def _set(self, key, value, expires_at, now):
+        self._data[key] = (value, expires_at)
+        if len(self._data) > self.MAX_KEYS:
+            self._data = {k: v for k, v in self._data.items() if v[1] > now}
+
+    def quota(self, key, cost, limit, ttl):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._get(key, None, now)
+            if entry is None or 'limit' not in entry:
+                if limit is None:
+                    return -1, 0, 0
+                entry = {'used': (entry or {}).get('used', 0), 'limit': limit}
+                self._set(key, entry, now + ttl, now)
+            used, limit = entry['used'], entry['limit']
+            if cost == 0:
+                return int(used < limit), used, limit
+            if cost < 0:
+                entry['used'] = max(0, used + cost)
+                return 1, entry['used'], limit
+            if used + cost > limit:
+                return 0, used, limit
+            entry['used'] = used + cost
+            return 1, entry['used'], limit
+
+    def sliding(self, key, limit, window, cost):
+        now = time.monotonic()
+        with self._lock:
+            stamps = [t for t in self._get(key, [], now) if t > now - window]
+            if len(stamps) + cost > limit:
+                self._set(key, stamps, now + window, now)
+                return False, len(stamps), (stamps[0] + window - now) if stamps else window
+            stamps.extend([now] * cost)
+            self._set(key, stamps, now + window, now)
+            return True, len(stamps), 0
+
+    def token_bucket(self, key, capacity, window, cost):
+        now = time.monotonic()
+        rate = capacity / window
+        with self._lock:
+            tokens, ts = self._get(key, (capacity, now), now)
+            tokens = min(capacity, tokens + max(0, now - ts) * rate)
+            allowed = tokens >= cost
+            retry = 0 if allowed else (cost - tokens) / rate
+            if allowed:
+                tokens -= cost
+            self._set(key, (tokens, now), now + window + 1, now)
+            return allowed, tokens, retry
+
+    def semaphore(self, key, action, holder, limit=0, lease=0):
+        now = time.monotonic()
+        with self._lock:
+            holders = {h: exp for h, exp in self._get(key, {}, now).items() if exp > now}
+            if action == 'count':
+                result = len(holders)
+            elif action == 'release':
+                holders.pop(holder, None)
+                result = len(holders)
+            elif (action == 'renew' and holder not in holders) or \
+                    (holder not in holders and len(holders) >= limit):
+                result = -1
+            else:
+                holders[holder] = now + lease
+                result = len(holders)
+            self._set(key, holders, max(holders.values(), default=now), now)
+            return result
+
+    def delete_field(self, key, field):
+        with self._lock:
+            entry = self._get(key, None, time.monotonic())
+            if entry:
+                entry.pop(field, None)
+
+
+_local_backend = _LocalBackend()
+_redis_backend = None
+
+
+def get_backend():
+    """설정에 따른 백엔드 (Redis 연결 실패 시 프로세스 로컬 백엔드)"""
+    global _redis_backend
+    if get_rate_limit_config()['BACKEND'] != 'redis':
+        return _local_backend
+    if _redis_backend is None:
+        import redis
+        _redis_backend = _RedisBackend(redis.from_url(settings.REDIS_URL))
+    return _redis_backend
+
+
+def _call(method, *args):
+    try:
+        return getattr(get_backend(), method)(*args)
+    except Exception as e:
+        if get_backend() is _local_backend:
+            raise
+        # Redis 장애: 요청을 막지 않고 프로세스 로컬 제한으로 대체
+        logger.warning(f"[RateLimit] Redis unavailable, using local limiter: {e}")
+        return getattr(_local_backend, method)(*args)
+
+
+def _key(*parts):
+    return ':'.join([get_rate_limit_config()['KEY_PREFIX'], *[str(p) for p in parts]])
+
+
+# =============================================================================
+# 공개 API
+# =============================================================================
+
+def consume(name, identity, limit, window, mode='sliding', cost=1):
     """
-    동시 작업 제한 체크
-    
+    요청 한도 확인 + 소비 (원자적)
+
     Args:
-        user_id: 사용자 ID
-        task_type: 작업 유형 (image_gen, emotion_analysis 등)
-        max_concurrent: 최대 동시 작업 수
-    
+        name: 제한 이름 (예: 'chat')
+        identity: 사용자 ID 등
+        limit: window 초 동안 허용 횟수 (토큰 버킷은 버킷 용량)
+        window: 윈도우 (초)
+        mode: 'sliding' | 'token_bucket'
+        cost: 소비량
+
+    Returns:
+        LimitResult(allowed, remaining, limit, retry_after)
+    """
+    key = _key(mode, name, identity)
+    if mode == 'token_bucket':
+        allowed, tokens, retry = _call('token_bucket', key, limit, window, cost)
+        return LimitResult(allowed, int(tokens), limit, retry)
+    if mode == 'sliding':
+        allowed, used, retry = _call('sliding', key, limit, window, cost)
+        return LimitResult(allowed, max(0, limit - used), limit, retry)
+    raise ValueError(f"Unknown rate limit mode: {mode}")
+
+
+def _quota_key(user_id, task_type, day=None):
+    """일일 할당량 키 (day: 할당량 날짜 date 또는 ISO 문자열, 기본: 오늘)"""
+    day = day or timezone.localdate()
+    return _key('quota', task_type, user_id, day if isinstance(day, str) else day.isoformat())
+
+
+def _is_premium(user_id):
+    from diary.utils.preference_cache import get_snapshot
+    return get_snapshot(user_id)['is_premium']
+
+
+def _quota(user_id, task_type, cost, default_limit, premium_limit, day=None):
+    """일일 할당량 스크립트 호출 (저장된 한도가 없을 때만 티어 조회)"""
+    key = _quota_key(user_id, task_type, day)
+    ttl = 2 * 24 * 3600  # 날짜가 키에 포함되므로 정리용
+    status, used, limit = _call('quota', key, cost, None, ttl)
+    if status == -1:
+        tier_limit = premium_limit if _is_premium(user_id) else default_limit
+        status, used, limit = _call('quota', key, cost, tier_limit, ttl)
+    return bool(status), used, limit
+
+
+def consume_daily_quota(user_id, task_type='image_gen', default_limit=2, premium_limit=10, cost=1, day=None):
+    """
+    일일 할당량 확인 + 소비 (한도를 넘으면 소비하지 않음)
+    day 를 지정하면 그 날짜의 할당량을 소비 (환불 시 같은 day 를 넘겨 같은 키로 반환)
+
+    Returns:
+        LimitResult(allowed, remaining, limit, retry_after=다음 자정까지 초)
+    """
+    allowed, used, limit = _quota(user_id, task_type, cost, default_limit, premium_limit, day)
+    if not allowed:
+        logger.info(f"Daily quota exceeded for user {user_id}, task {task_type}. Used: {used}/{limit}")
+    now = timezone.localtime()
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return LimitResult(allowed, max(0, limit - used), limit, (midnight - now).total_seconds())
+
+
+def refund_daily_quota(user_id, task_type='image_gen', cost=1, default_limit=None, premium_limit=None, day=None):
+    """
+    소비한 할당량 되돌리기 (작업 요청/실행 실패 시)
+    티어 변경으로 저장된 한도가 지워졌으면 한도를 다시 조회한 뒤 반환
+    day: 소비한 날짜 (자정을 넘겨 끝난 작업도 소비한 날의 키로 반환, 기본: 오늘)
+
+    Returns:
+        bool: 반환 여부
+    """
+    key = _quota_key(user_id, task_type, day)
+    status, _, _ = _call('quota', key, -cost, None, 2 * 24 * 3600)
+    if status == -1 and default_limit is not None:
+        tier_limit = premium_limit if _is_premium(user_id) else default_limit
+        status, _, _ = _call('quota', key, -cost, tier_limit, 2 * 24 * 3600)
+    if status == -1:
+        logger.warning(f"Quota refund dropped for user {user_id}, task {task_type}: stored limit missing")
+        return False
+    return True
+
+
+def reset_quota_tier(user_id):
+    """저장된 티어 한도 초기화 (프리미엄 변경 시, 다음 요청에서 다시 조회)"""
+    for task_type in QUOTA_TASK_TYPES:
+        _call('delete_field', _quota_key(user_id, task_type), 'limit')
+
+
+class Semaphore:
+    """
+    리스 기반 분산 세마포어
+    - acquire/renew/release 모두 원자적, 리스가 만료된 보유자는 다음 호출에서 자동 회수
+    - 오래 걸리는 작업은 renew() 로 리스 연장
+
+    Usage:
+        slot = Semaphore('image_gen', user_id, limit=1, lease=300)
+        if slot.acquire(holder): ...
+    """
+
+    def __init__(self, name, identity, limit=1, lease=300):
+        self.key = _key('sem', name, identity)
+        self.limit = limit
+        self.lease = lease
+
+    def acquire(self, holder) -> bool:
+        return _call('semaphore', self.key, 'acquire', holder, self.limit, self.lease) >= 0
+
+    def renew(self, holder) -> bool:
+        return _call('semaphore', self.key, 'renew', holder, self.limit, self.lease) >= 0
+
+    def release(self, holder):
+        _call('semaphore', self.key, 'release', holder)
+
+    def count(self) -> int:
+        return _call('semaphore', self.key, 'count', '')
+
+
+def check_concurrent_limit(user_id, task_type='image_gen', max_concurrent=1):
+    """
+    동시 작업 제한 체크 (조회만, 실제 제한은 acquire_concurrent_slot)
+
     Returns:
         tuple: (allowed: bool, message: str | None)
     """
-    key = f"concurrent:{task_type}:{user_id}"
-    current = cache.get(key, 0)
-    
-    if current >= max_concurrent:
+    if Semaphore(task_type, user_id, max_concurrent).count() >= max_concurrent:
         logger.warning(f"Concurrent limit exceeded for user {user_id}, task {task_type}")
         return False, f"다른 {_get_task_name(task_type)}이 진행 중입니다. 완료 후 다시 시도해주세요."
-    
     return True, None
 
 
-def acquire_concurrent_slot(user_id, task_type='image_gen', timeout=300):
+def acquire_concurrent_slot(user_id, task_type='image_gen', timeout=300, max_concurrent=1, holder=None):
     """
-    동시 작업 슬롯 획득
-    
-    Args:
-        user_id: 사용자 ID
-        task_type: 작업 유형
-        timeout: 슬롯 타임아웃 (초)
-    
+    동시 작업 슬롯 획득 (확인 + 획득을 한 번에)
+
     Returns:
-        bool: 슬롯 획득 성공 여부
+        str | None: 슬롯 보유자 토큰 (release_concurrent_slot 에 전달), 실패 시 None
     """
-    key = f"concurrent:{task_type}:{user_id}"
-    current = cache.get(key, 0)
-    cache.set(key, current + 1, timeout=timeout)
-    logger.debug(f"Acquired slot for user {user_id}, task {task_type}. Current: {current + 1}")
-    return True
+    holder = holder or uuid.uuid4().hex
+    if Semaphore(task_type, user_id, max_concurrent, timeout).acquire(holder):
+        return holder
+    return None
 
 
-def release_concurrent_slot(user_id, task_type='image_gen'):
-    """
-    동시 작업 슬롯 해제
-    
-    Args:
-        user_id: 사용자 ID
-        task_type: 작업 유형
-    """
-    key = f"concurrent:{task_type}:{user_id}"
-    current = cache.get(key, 0)
-    if current > 0:
-        cache.set(key, current - 1, timeout=300)
-    logger.debug(f"Released slot for user {user_id}, task {task_type}. Current: {max(0, current - 1)}")
+def release_concurrent_slot(user_id, task_type='image_gen', holder=''):
+    """동시 작업 슬롯 해제"""
+    Semaphore(task_type, user_id).release(holder)
 
 
 def check_daily_quota(user_id, task_type='image_gen', default_limit=2, premium_limit=10):
     """
-    일일 할당량 체크
-    
-    Args:
-        user_id: 사용자 ID
-        task_type: 작업 유형
-        default_limit: 기본 사용자 일일 한도
-        premium_limit: 프리미엄 사용자 일일 한도
-    
+    일일 할당량 체크 (소비하지 않음)
+
     Returns:
         tuple: (allowed: bool, remaining: int, limit: int)
     """
-    from diary.models import UserPreference
-    
-    # 사용자 티어 확인
-    try:
-        pref = UserPreference.objects.get(user_id=user_id)
-        is_premium = pref.is_premium
-    except UserPreference.DoesNotExist:
-        is_premium = False
-    
-    limit = premium_limit if is_premium else default_limit
-    
-    # 오늘 사용량 확인
-    today = timezone.now().date().isoformat()
-    key = f"quota:{task_type}:{user_id}:{today}"
-    used = cache.get(key, 0)
-    
-    remaining = max(0, limit - used)
-    allowed = remaining > 0
-    
-    if not allowed:
-        logger.info(f"Daily quota exceeded for user {user_id}, task {task_type}. Used: {used}/{limit}")
-    
-    return allowed, remaining, limit
+    allowed, used, limit = _quota(user_id, task_type, 0, default_limit, premium_limit)
+    return allowed, max(0, limit - used), limit
 
 
-def increment_daily_usage(user_id, task_type='image_gen'):
-    """
-    일일 사용량 증가
-    
-    Args:
-        user_id: 사용자 ID
-        task_type: 작업 유형
-    """
-    today = timezone.now().date().isoformat()
-    key = f"quota:{task_type}:{user_id}:{today}"
-    
-    try:
-        cache.incr(key)
-    except ValueError:
-        # 키가 없으면 생성
-        cache.set(key, 1, timeout=86400)  # 24시간
+def increment_daily_usage(user_id, task_type='image_gen', default_limit=2, premium_limit=10):
+    """일일 사용량 증가 (consume_daily_quota 권장)"""
+    return consume_daily_quota(user_id, task_type, default_limit, premium_limit).allowed
 
 
 def _get_task_name(task_type):
@@ -150,32 +473,32 @@ def _get_task_name(task_type):
 class ConcurrentLimitContext:
     """
     컨텍스트 매니저로 동시 작업 제한 관리
-    
+
     Usage:
-        with ConcurrentLimitContext(user_id, 'image_gen'):
-            # 작업 수행
+        with ConcurrentLimitContext(user_id, 'image_gen') as slot:
+            # 작업 수행 (오래 걸리면 slot.renew())
             generate_image(...)
     """
-    
+
     def __init__(self, user_id, task_type='image_gen', max_concurrent=1, timeout=300):
         self.user_id = user_id
         self.task_type = task_type
-        self.max_concurrent = max_concurrent
-        self.timeout = timeout
+        self.semaphore = Semaphore(task_type, user_id, max_concurrent, timeout)
+        self.holder = uuid.uuid4().hex
         self.slot_acquired = False
-    
+
     def __enter__(self):
-        allowed, message = check_concurrent_limit(
-            self.user_id, self.task_type, self.max_concurrent
-        )
-        if not allowed:
-            raise ConcurrentLimitError(detail=message)
-        
-        acquire_concurrent_slot(self.user_id, self.task_type, self.timeout)
+        if not self.semaphore.acquire(self.holder):
+            raise ConcurrentLimitError(
+                detail=f"다른 {_get_task_name(self.task_type)}이 진행 중입니다. 완료 후 다시 시도해주세요."
+            )
         self.slot_acquired = True
         return self
-    
+
+    def renew(self):
+        return self.semaphore.renew(self.holder)
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.slot_acquired:
-            release_concurrent_slot(self.user_id, self.task_type)
+            self.semaphore.release(self.holder)
         return False  # 예외를 다시 발생시킴
@@ -0,0 +1,155 @@
+"""
+Stale-while-revalidate 캐시 헬퍼
+- 값과 함께 soft TTL(신선 기간)을 저장하고, 캐시 자체는 hard TTL 동안 유지
+- soft TTL 이 지나면 오래된 값을 바로 반환하고 짧은 락을 잡은 요청 하나만 백그라운드에서 재계산
+- XFetch 확률적 조기 갱신: 만료 직전에 계산 시간에 비례한 확률로 미리 재계산
+- 캐시 미스 시 락을 잡지 못한 요청은 잠시 기다렸다가 락 보유자가 채운 값을 사용 (dogpile 방지)
+"""
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SWR = {
+    'ENABLED': True,
+    'STALE_TTL': 3600,      # soft TTL 이후 오래된 값을 제공할 수 있는 시간 (hard TTL = soft + STALE_TTL)
+    'LOCK_TTL': 30,         # 재계산 락 유지 시간 (재계산이 이보다 오래 걸리면 다른 요청이 재시도)
+    'WAIT_TIMEOUT': 3.0,    # 미스 시 락 보유자의 결과를 기다리는 최대 시간 (초)
+    'WAIT_INTERVAL': 0.05,
+    'BETA': 1.0,            # XFetch 계수 (클수록 일찍 갱신, 0 이면 조기 갱신 안 함)
+    'BACKGROUND': True,     # False 면 요청 안에서 재계산 (테스트)
+}
+
+
+def get_swr_config() -> dict:
+    return {**DEFAULT_SWR, **getattr(settings, 'CACHE_SWR', {})}
+
+
+class Uncacheable(Exception):
+    """compute() 결과를 캐시하지 않고 그대로 돌려줄 때 (예: 오류 응답)"""
+
+    def __init__(self, result):
+        super().__init__('uncacheable result')
+        self.result = result
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _acquire(key, lock_ttl):
+    token = uuid.uuid4().hex
+    return token if cache.add(_lock_key(key), token, lock_ttl) else None
+
+
+def _release(key, token):
+    if cache.get(_lock_key(key)) == token:
+        cache.delete(_lock_key(key))
+
+
+def _compute_and_store(key, compute, ttl, config):
+    """compute() 실행 후 (값, soft 만료 시각, 계산 시간) 저장"""
+    started = time.time()
+    value = compute()
+    delta = time.time() - started
+    entry = {'value': value, 'expires_at': time.time() + ttl, 'delta': delta}
+    cache.set(key, entry, ttl + config['STALE_TTL'])
+    return value
+
+
+def _should_refresh(entry, beta, now=None):
+    """
+    XFetch: now - delta * beta * ln(rand) >= expires_at 이면 갱신
+    (soft TTL 이 지났으면 항상 갱신)
+    """
+    now = now if now is not None else time.time()
+    if now >= entry['expires_at']:
+        return True
+    if beta <= 0 or not entry.get('delta'):
+        return False
+    return now - entry['delta'] * beta * math.log(random.random() or 1e-12) >= entry['expires_at']
+
+
+def _refresh(key, compute, ttl, config, token):
+    try:
+        _compute_and_store(key, compute, ttl, config)
+    except Uncacheable:
+        pass
+    except Exception as e:
+        logger.error(f"[SWR] Background refresh failed for {key}: {e}")
+    finally:
+        _release(key, token)
+
+
+def _refresh_in_background(key, compute, ttl, config, token):
+    def run():
+        try:
+            _refresh(key, compute, ttl, config, token)
+        finally:
+            # 스레드 전용 DB 연결 정리
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_or_compute(key, compute, ttl, config=None):
+    """
+    SWR 캐시 조회
+
+    Args:
+        key: 캐시 키
+        compute: 값을 계산하는 함수 (Uncacheable 을 던지면 캐시하지 않고 result 반환)
+        ttl: soft TTL (초)
+
+    Returns:
+        캐시된 값(오래된 값 포함) 또는 새로 계산한 값
+    """
+    config = config or get_swr_config()
+    entry = cache.get(key)
+
+    if not config['ENABLED']:
+        # 일반 TTL 캐시로 동작 (오래된 값 제공/락 없음)
+        if entry is not None and time.time() < entry['expires_at']:
+            return entry['value']
+        try:
+            return _compute_and_store(key, compute, ttl, config)
+        except Uncacheable as e:
+            return e.result
+
+    if entry is not None:
+        if _should_refresh(entry, config['BETA']):
+            token = _acquire(key, config['LOCK_TTL'])
+            if token:
+                if config['BACKGROUND']:
+                    _refresh_in_background(key, compute, ttl, config, token)
+                else:
+                    _refresh(key, compute, ttl, config, token)
+        return entry['value']
+
+    # 캐시 미스: 락을 잡은 요청만 계산, 나머지는 결과를 기다림
+    token = _acquire(key, config['LOCK_TTL'])
+    if token is None:
+        deadline = time.monotonic() + config['WAIT_TIMEOUT']
+        while time.monotonic() < deadline:
+            time.sleep(config['WAIT_INTERVAL'])
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['value']
+        logger.warning(f"[SWR] Timed out waiting for {key}, computing without lock")
+
+    try:
+        return _compute_and_store(key, compute, ttl, config)
+    except Uncacheable as e:
+        return e.result
+    finally:
+        if token:
+            _release(key, token)
@@ -15,6 +15,7 @@ from datetime import timedelta
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
 from ..models import Diary, DiaryImage, Tag
+from ..paginations import AdminKeysetPagination
 
 User = get_user_model()
 
@@ -277,13 +278,15 @@ class AdminRecentDiariesView(APIView):
         description="최근 작성된 일기의 메타데이터 목록을 반환합니다.",
         parameters=[
             OpenApiParameter('limit', OpenApiTypes.INT, description='항목 수 제한'),
+            OpenApiParameter('cursor', OpenApiTypes.STR, description='다음 페이지 커서 (응답의 next)'),
         ],
         responses={200: OpenApiTypes.OBJECT}
     )
     def get(self, request):
-        limit = int(request.query_params.get('limit', 50))
-        
-        diaries = Diary.objects.select_related('user').order_by('-created_at')[:limit]
+        paginator = AdminKeysetPagination()
+        diaries = paginator.paginate_queryset(
+            Diary.objects.select_related('user').order_by('-created_at', '-id'), request, view=self
+        )
         
         result = []
         for diary in diaries:
@@ -302,6 +305,7 @@ class AdminRecentDiariesView(APIView):
         return Response({
             'count': len(result),
             'diaries': result,
+            'next': paginator.get_next_link(),
         })
 
 
@@ -325,6 +329,7 @@ class AdminModerationView(APIView):
             OpenApiParameter('type', OpenApiTypes.STR, description="조회 유형 ('flags' 또는 'reports')"),
             OpenApiParameter('status', OpenApiTypes.STR, description="처리 상태 ('pending', 'reviewed', 'resolved')"),
             OpenApiParameter('limit', OpenApiTypes.INT, description='항목 수 제한'),
+            OpenApiParameter('cursor', OpenApiTypes.STR, description='다음 페이지 커서 (응답의 next)'),
         ],
         responses={200: OpenApiTypes.OBJECT}
     )
@@ -333,7 +338,6 @@ class AdminModerationView(APIView):
         
         mod_type = request.query_params.get('type', 'flags')
         status = request.query_params.get('status', 'pending')
-        limit = int(request.query_params.get('limit', 50))
         
         if mod_type == 'flags':
             # 자동 감지된 유해 콘텐츠
@@ -344,7 +348,10 @@ class AdminModerationView(APIView):
             elif status == 'reviewed':
                 queryset = queryset.filter(reviewed=True)
             
-            queryset = queryset.order_by('-detected_at')[:limit]
+            paginator = AdminKeysetPagination(ordering=('-detected_at', '-id'))
+            queryset = paginator.paginate_queryset(
+                queryset.order_by('-detected_at', '-id'), request, view=self
+            )
             
             result = []
             for flag in queryset:
@@ -374,7 +381,10 @@ class AdminModerationView(APIView):
             if status in ['pending', 'reviewing', 'resolved', 'dismissed']:
                 queryset = queryset.filter(status=status)
             
-            queryset = queryset.order_by('-created_at')[:limit]
+            paginator = AdminKeysetPagination()
+            queryset = paginator.paginate_queryset(
+                queryset.order_by('-created_at', '-id'), request, view=self
+            )
             
             result = []
             for report in queryset:
@@ -400,6 +410,7 @@ class AdminModerationView(APIView):
             'count': len(result),
             'type': mod_type,
             'items': result,
+            'next': paginator.get_next_link(),
         })
     
     @extend_schema(
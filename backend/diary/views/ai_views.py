@@ -10,6 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from ..services.summary_service import SummaryService
+from ..utils.ai_cache import track_hits
 from config.throttling import AIImageGenerationThrottle
 
 
@@ -41,7 +42,8 @@ class SummarizeView(APIView):
                 "summary": "좋은 아침으로 시작한 하루. 친구와 만남...",
                 "original_length": 500,
                 "summary_length": 150,
-                "style": "default"
+                "style": "default",
+                "cached": false  // 같은 내용의 이전 AI 결과를 재사용했는지
             }
         
         사용자는 응답을 받은 후:
@@ -75,7 +77,8 @@ class SummarizeView(APIView):
                 'summary': result['summary'],
                 'original_length': result['original_length'],
                 'summary_length': result['summary_length'],
-                'style': result['style']
+                'style': result['style'],
+                'cached': result.get('cached', False),
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -107,7 +110,8 @@ class SuggestTitleView(APIView):
         
         Response:
             {
-                "suggested_title": "오랜만의 친구와의 만남"
+                "suggested_title": "오랜만의 친구와의 만남",
+                "cached": false  // 같은 내용의 이전 AI 결과를 재사용했는지
             }
         """
         content = request.data.get('content', '').strip()
@@ -119,10 +123,12 @@ class SuggestTitleView(APIView):
             )
         
         try:
-            title = SummaryService.suggest_title(content)
+            with track_hits() as tracker:
+                title = SummaryService.suggest_title(content)
             
             return Response({
-                'suggested_title': title
+                'suggested_title': title,
+                'cached': tracker.cached,
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
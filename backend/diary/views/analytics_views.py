@@ -11,6 +11,7 @@ from rest_framework.decorators import action
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 
+from ..cache_utils import cached_user_view, recent_buckets
 from ..services.analysis_service import EmotionTrendAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,8 @@ class AnalyticsViewSet(GenericViewSet):
     permission_classes = [IsAuthenticated]
 
     @action(detail=False, methods=['get'], url_path='emotion-trend')
+    @cached_user_view('emotion_trend', ttl='analytics', params={'days': 7},
+                      buckets=lambda p: recent_buckets(max(int(p['days']), 7)))
     def emotion_trend(self, request):
         """
         감정 트렌드 분석 결과를 반환합니다.
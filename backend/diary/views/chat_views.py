@@ -5,7 +5,9 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from ..services.chat_service import ChatService
 from ..models import ChatSession, ChatMessage, Diary
+from ..paginations import KeysetPagination
 
+from django.core.handlers.asgi import ASGIRequest
 from django.http import StreamingHttpResponse
 import logging
 import secrets
@@ -29,8 +31,11 @@ class ChatAIView(APIView):
         history = request.data.get('history', [])
         
         try:
-            # Generator 반환
-            response_generator = ChatService.generate_chat_response(request.user, message, history)
+            # Generator 반환 (ASGI 에서는 async generator 로 스트리밍해 워커 스레드를 점유하지 않음)
+            if isinstance(request._request, ASGIRequest):
+                response_generator = ChatService.generate_chat_response_async(request.user, message, history)
+            else:
+                response_generator = ChatService.generate_chat_response(request.user, message, history)
             
             # StreamingResponse 반환
             return StreamingHttpResponse(
@@ -60,22 +65,34 @@ class ChatSessionViewSet(viewsets.ViewSet):
         ).prefetch_related('messages')
     
     def list(self, request):
-        """세션 목록 조회"""
-        sessions = self.get_queryset(request)
+        """
+        세션 목록 조회 (최근 생성 순)
+        ?cursor= / ?page_size= 키셋 페이지네이션, ?page= 페이지 번호 방식, 파라미터가 없으면 전체 목록
+        """
+        queryset = self.get_queryset(request).order_by('-created_at', '-id')
+        paginator = KeysetPagination()
+        if paginator.is_requested(request):
+            sessions = paginator.paginate_queryset(queryset, request, view=self)
+            total = queryset.count()
+        else:
+            sessions = list(queryset)
+            total = len(sessions)
         
         result = []
         for session in sessions:
-            last_message = session.messages.last()
+            # prefetch 된 메시지 사용 (세션마다 추가 쿼리 없음)
+            messages = list(session.messages.all())
+            last_message = messages[-1] if messages else None
             result.append({
                 'id': session.id,
                 'title': session.title,
                 'created_at': session.created_at.isoformat(),
                 'updated_at': session.updated_at.isoformat(),
-                'message_count': session.messages.count(),
+                'message_count': len(messages),
                 'last_message_preview': last_message.content[:50] if last_message else None,
             })
         
-        return Response({'count': len(result), 'sessions': result})
+        return Response({'count': total, 'sessions': result, 'next': paginator.get_next_link()})
     
     def create(self, request):
         """새 채팅 세션 생성"""
@@ -11,7 +11,7 @@
 """
 import logging
 from datetime import timedelta, datetime, date
-from django.db.models import Count, Q, Avg, F
+from django.db.models import Count, Q, Avg, F, Prefetch
 from django.utils import timezone
 from django.core.cache import cache
 from django.conf import settings
@@ -22,18 +22,21 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
 
-from ..models import Diary, DiaryEmbedding, DiaryImage, UserPreference
-from ..serializers import DiarySerializer, DiaryImageSerializer
+from ..models import Diary, DiaryEmbedding, DiaryImage, DiaryTag, UserPreference
+from ..serializers import DiarySerializer, DiaryImageSerializer, DiaryListSerializer
 from ..services.image_service import ImageGenerator
 from ..services.summary_service import SummaryService
 from ..services.analysis_service import KeywordExtractor, EmotionTrendAnalyzer
+from ..services.search_service import DiarySearchService
+from ..services.blind_index_service import BlindIndexService
 from ..services.chat_service import ChatService
 from ..services.user_tier_service import UserTierService
 from ..services.streak_service import StreakService
-from ..paginations import StandardResultsSetPagination
+from ..paginations import KeysetPagination
 from ..messages import ERROR_INVALID_YEAR, ERROR_INVALID_YEAR_MONTH
-from ..cache_utils import invalidate_user_cache
+from ..cache_utils import cached_user_view, recent_buckets
 from ..tasks import generate_image_task
+from ..utils.rate_limit import ConcurrentLimitError, acquire_concurrent_slot, release_concurrent_slot
 
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 from ..schema_examples import (
@@ -49,9 +52,10 @@ logger = logging.getLogger(__name__)
 @extend_schema_view(
     list=extend_schema(
         summary="일기 목록 조회",
-        description="사용자의 일기 목록을 조회합니다. 검색, 필터링, 페이징을 지원합니다.",
+        description="사용자의 일기 목록을 조회합니다. 검색, 필터링, 페이징을 지원합니다. "
+                    "본문은 포함하지 않으며 fields 파라미터로 응답 필드를 선택합니다 (예: fields=id,title,preview).",
         responses={
-            200: DiarySerializer,
+            200: DiaryListSerializer,
             400: OpenApiResponse(description="잘못된 파라미터", examples=[EXAMPLE_400_BAD_REQUEST]),
             401: OpenApiResponse(description="인증 실패", examples=[EXAMPLE_401_UNAUTHORIZED]),
             429: OpenApiResponse(description="요청 한도 초과", examples=[EXAMPLE_429_THROTTLED]),
@@ -117,6 +121,8 @@ class DiaryViewSet(viewsets.ModelViewSet):
     """
     serializer_class = DiarySerializer
     permission_classes = [IsAuthenticated]
+    # 무한 스크롤: ?cursor= / ?page_size= 키셋 페이지네이션, 그 밖에는 페이지 번호 방식 (count/previous)
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -131,7 +137,7 @@ class DiaryViewSet(viewsets.ModelViewSet):
         """
         queryset = Diary.objects.filter(user=self.request.user)
         
-        # 키워드 검색 (제목) - DB 레벨
+        # 키워드 검색 (제목) - DB 레벨 (PostgreSQL: trigram GIN 인덱스)
         search = self.request.query_params.get('search', None)
         if search:
             queryset = queryset.filter(
@@ -164,9 +170,9 @@ class DiaryViewSet(viewsets.ModelViewSet):
         # 태그 필터
         tag = self.request.query_params.get('tag', None)
         if tag:
-            queryset = queryset.filter(diary_tags__tag__name__icontains=tag).distinct()
+            queryset = DiarySearchService.search_tags(queryset, tag)
         
-        return queryset.order_by('-created_at').select_related('user').prefetch_related('images', 'diary_tags__tag')
+        return queryset.order_by('-created_at', '-id').select_related('user').prefetch_related('images', 'diary_tags__tag')
     
     def list(self, request, *args, **kwargs):
         """
@@ -174,46 +180,60 @@ class DiaryViewSet(viewsets.ModelViewSet):
         
         본문 검색은 암호화되어 있어 DB에서 직접 검색 불가.
         queryset을 가져온 후 Python에서 복호화하여 필터링.
+        
+        목록은 DiaryListSerializer (본문 제외) 로 응답하며 ?fields= 로 필드를 선택하고
+        선택한 필드에 필요한 컬럼만 조회합니다. (본문 앞부분은 fields 에 preview 포함)
         """
         queryset = self.filter_queryset(self.get_queryset())
         
         # [Optimized] 본문 검색 (태그 기반 or 키워드 필드)
         content_search = request.query_params.get('content_search', None)
         exact_match = request.query_params.get('exact_match', 'false').lower() == 'true'
+        order_by = ('-created_at', '-id')
         
         if content_search:
             if exact_match:
-                # [Feature: Option A] Exact Match using search_keywords field
-                # 단순 포함 검색이지만, 명사 키워드 필드를 대상으로 하여 정확도 높임
-                queryset = queryset.filter(search_keywords__icontains=content_search)
+                # [Feature: Option A] Exact Match - 본문 명사 블라인드 인덱스 (복호화 없이 인덱스만 조회)
+                # match=or 이면 토큰 중 하나만 포함해도 일치
+                match_mode = 'or' if request.query_params.get('match') == 'or' else 'and'
+                queryset = BlindIndexService.search(queryset, request.user, content_search, match_mode)
             else:
-                # [Legacy/Hybrid] 태그 이름에 검색어가 포함된 일기 검색
-                queryset = queryset.filter(diary_tags__tag__name__icontains=content_search).distinct()
+                # [Legacy/Hybrid] 태그 이름에 검색어가 포함된 일기 검색 (EXISTS, DISTINCT 없음)
+                queryset = DiarySearchService.search_tags(queryset, content_search)
         
         # [Optimized] 통합 검색 (제목 + 본문)
         q = request.query_params.get('q', None)
         if q:
-            from django.db.models import Q
             if exact_match:
-                 queryset = queryset.filter(
-                    Q(title__icontains=q) | 
-                    Q(search_keywords__icontains=q)
-                ).distinct()
+                # 제목 + 본문 키워드 검색 (블라인드 인덱스, PostgreSQL: 제목 tsvector 접두어 매칭 + 관련도)
+                relevance = request.query_params.get('sort') == 'relevance'
+                queryset = DiarySearchService.search_text(queryset, q, rank=relevance, user=request.user)
+                if relevance:
+                    order_by = ('-search_rank', '-created_at')
             else:
-                queryset = queryset.filter(
-                    Q(title__icontains=q) | 
-                    Q(diary_tags__tag__name__icontains=q)
-                ).distinct()
+                queryset = DiarySearchService.search_title_or_tags(queryset, q)
             
-        # 정렬 및 최적화
-        queryset = queryset.order_by('-created_at').select_related('user').prefetch_related('images', 'diary_tags__tag')
+        # 정렬 및 컬럼 프로젝션 (본문/음성/회고 컬럼과 이미지 조인 제외)
+        fields = DiaryListSerializer.select_fields(request.query_params.get('fields'))
+        queryset = (
+            queryset.order_by(*order_by)
+            .select_related(None)
+            .prefetch_related(None)
+            .only(*DiaryListSerializer.columns_for(fields))
+        )
+        if 'tags' in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch('diary_tags', queryset=DiaryTag.objects.select_related('tag').only(
+                    'diary_id', 'tag__id', 'tag__name', 'tag__color'
+                ))
+            )
         
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            serializer = DiaryListSerializer(page, many=True, fields=fields)
             return self.get_paginated_response(serializer.data)
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = DiaryListSerializer(queryset, many=True, fields=fields)
         return Response(serializer.data)
 
     def retrieve(self, request, *args, **kwargs):
@@ -268,7 +288,7 @@ class DiaryViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """
         새로운 일기 항목을 생성할 때 현재 사용자를 자동으로 할당합니다.
-        생성 후 관련 캐시를 무효화합니다.
+        (관련 캐시는 signals 에서 일기 날짜 버킷 단위로 무효화)
         
         [하루 1개 제한] 오늘 날짜에 이미 일기가 있으면 생성을 차단합니다.
         """
@@ -285,7 +305,6 @@ class DiaryViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
         instance = serializer.instance
         self._generate_reflection_if_needed(instance)
-        invalidate_user_cache(self.request.user.id)
         
         # [Service] 스트릭 업데이트
         StreakService.update_user_streak(self.request.user)
@@ -339,7 +358,7 @@ class DiaryViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         """
-        일기 수정 시 관련 캐시를 무효화하고 버전을 증가시킵니다.
+        일기 수정 시 버전을 증가시킵니다. (캐시 무효화는 signals 에서 처리)
         """
         # Atomic Version Increment
         instance = serializer.instance
@@ -350,7 +369,6 @@ class DiaryViewSet(viewsets.ModelViewSet):
         instance.refresh_from_db()
         
         self._generate_reflection_if_needed(instance)
-        invalidate_user_cache(self.request.user.id)
     
     def _generate_reflection_if_needed(self, instance):
         """회고 질문이 없고 내용이 충분하면 비동기(혹은 동기)로 생성"""
@@ -368,11 +386,9 @@ class DiaryViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """
-        일기 삭제 시 관련 캐시를 무효화합니다.
+        일기 삭제 (관련 캐시는 signals 에서 일기 날짜 버킷 단위로 무효화)
         """
-        user_id = instance.user.id
         instance.delete()
-        invalidate_user_cache(user_id)
 
 
 
@@ -426,17 +442,10 @@ class DiaryViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
             
+        slot = None
+        consumed = False
         try:
-            # [Service] 사용자 등급 및 일일 제한 확인
-            is_allowed, details = UserTierService.check_image_generation_limit(request.user)
-            
-            if not is_allowed:
-                 return Response(
-                    {'error': 'Daily image generation limit exceeded.', **details},
-                    status=status.HTTP_429_TOO_MANY_REQUESTS
-                )
-
-            # 본문 길이 검증 (복호화 후 확인)
+            # 본문 길이 검증 (복호화 후 확인, 할당량 소비 전)
             content = diary.decrypt_content()
             if not content or len(content.strip()) < 50:
                 return Response(
@@ -444,8 +453,29 @@ class DiaryViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+            # 사용자당 동시 생성 1건 (리스 만료 시 자동 해제, 태스크가 끝나면 해제)
+            slot = acquire_concurrent_slot(request.user.id, 'image_gen', timeout=300)
+            if slot is None:
+                return Response(
+                    {'error': ConcurrentLimitError.default_detail},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+
+            # [Service] 사용자 등급별 일일 한도 확인 + 소비 (원자적)
+            # 소비한 날짜를 태스크에 넘겨 자정 이후 실패해도 같은 날짜로 환불
+            quota_date = timezone.localdate().isoformat()
+            is_allowed, details = UserTierService.consume_image_generation_quota(request.user, day=quota_date)
+            
+            if not is_allowed:
+                release_concurrent_slot(request.user.id, 'image_gen', slot)
+                return Response(
+                    {'error': 'Daily image generation limit exceeded.', **details},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+            consumed = True
+
             # 비동기 태스크 실행
-            generate_image_task.delay(diary.id)
+            generate_image_task.delay(diary.id, slot, quota_date)
             
             # 즉시 응답 (Processing)
             return Response(
@@ -454,6 +484,11 @@ class DiaryViewSet(viewsets.ModelViewSet):
             )
             
         except Exception as e:
+            # 태스크 등록 실패: 슬롯/할당량 반환
+            if slot:
+                release_concurrent_slot(request.user.id, 'image_gen', slot)
+            if consumed:
+                UserTierService.refund_image_generation_quota(request.user, day=quota_date)
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -528,6 +563,8 @@ class DiaryViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'], url_path='emotion-trend')
+    @cached_user_view('diary_emotion_trend', ttl='analytics', params={'days': 7},
+                      buckets=lambda p: recent_buckets(max(int(p['days']), 7)))
     def emotion_trend(self, request):
         """
         감정 트렌드 분석 API
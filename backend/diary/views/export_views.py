@@ -4,14 +4,21 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.utils import timezone
-from django.http import HttpResponse
-from diary.models import Diary, DiaryTag, UserPreference, DiaryTemplate
-from diary.serializers import DiarySerializer, TagSerializer, UserPreferenceSerializer, DiaryTemplateSerializer
+from django.shortcuts import get_object_or_404
+from diary.models import ExportJob
+from diary.serializers import (
+    DiarySerializer, TagSerializer, UserPreferenceSerializer, DiaryTemplateSerializer, ExportJobSerializer
+)
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _wants_gzip(request) -> bool:
+    return request.query_params.get('gzip', '').lower() in ('1', 'true')
+
+
 class ExportViewSet(viewsets.ViewSet):
     """
     데이터 내보내기 및 가져오기 ViewSet
@@ -21,20 +28,17 @@ class ExportViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='json')
     def export_json(self, request):
         """
-        사용자의 모든 데이터를 JSON 형식으로 내보냅니다.
+        사용자의 모든 데이터를 JSON 형식으로 내보냅니다. (스트리밍, ?gzip=1 이면 gzip 압축)
         """
         from ..services.export_service import ExportService
         try:
-            data = ExportService.export_json(request.user)
-            
-            response = HttpResponse(
-                json.dumps(data, ensure_ascii=False, indent=2),
-                content_type='application/json'
-            )
             timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"diary_backup_{timestamp}.json"
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
+            return ExportService.streaming_response(
+                ExportService.stream_json(request.user),
+                'application/json',
+                f"diary_backup_{timestamp}.json",
+                compress=_wants_gzip(request),
+            )
         except Exception as e:
             logger.error(f"JSON export failed: {e}")
             return Response({"error": "Failed to export JSON"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -42,11 +46,11 @@ class ExportViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='csv')
     def export_csv(self, request):
         """
-        사용자의 모든 일기를 CSV 형식으로 내보냅니다.
+        사용자의 모든 일기를 CSV 형식으로 내보냅니다. (스트리밍, ?gzip=1 이면 gzip 압축)
         """
         from ..services.export_service import ExportService
         try:
-            return ExportService.export_csv(request.user)
+            return ExportService.export_csv(request.user, compress=_wants_gzip(request))
         except Exception as e:
             logger.error(f"CSV export failed: {e}")
             return Response({"error": "Failed to export CSV"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -54,7 +58,8 @@ class ExportViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='pdf')
     def export_pdf(self, request):
         """
-        사용자의 모든 일기를 PDF 파일로 내보냅니다.
+        사용자의 모든 일기를 PDF 파일로 내보냅니다. (요청 안에서 동기 생성)
+        일기가 많으면 POST pdf-jobs/ 비동기 작업을 사용하세요.
         """
         from ..services.export_service import ExportService
         try:
@@ -63,11 +68,54 @@ class ExportViewSet(viewsets.ViewSet):
             logger.error(f"PDF export failed: {e}")
             return Response({"error": "Failed to export PDF"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['post'], url_path='pdf-jobs', url_name='pdf-jobs')
+    def create_pdf_job(self, request):
+        """
+        PDF 내보내기 작업 생성 (pdf 워커가 비동기로 생성)
+        데이터가 바뀌지 않았으면 기존 결과를 바로 돌려줍니다.
+        """
+        from ..services.export_job_service import ExportJobService
+        job, created = ExportJobService.request_pdf(request.user)
+        serializer = ExportJobSerializer(job, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path=r'pdf-jobs/(?P<job_id>\d+)', url_name='pdf-job')
+    def pdf_job(self, request, job_id=None):
+        """
+        PDF 내보내기 작업 상태/진행률 조회
+        """
+        job = get_object_or_404(ExportJob, pk=job_id, user=request.user, kind=ExportJob.Kind.PDF)
+        return Response(ExportJobSerializer(job, context={'request': request}).data)
+
+    @action(detail=False, methods=['get'], url_path=r'pdf-jobs/(?P<job_id>\d+)/download', url_name='pdf-job-download')
+    def download_pdf_job(self, request, job_id=None):
+        """
+        완료된 PDF 다운로드 (Range 요청 지원)
+        """
+        import os
+        from ..utils.http_range import ranged_file_response
+        
+        job = get_object_or_404(ExportJob, pk=job_id, user=request.user, kind=ExportJob.Kind.PDF)
+        if job.status != ExportJob.Status.COMPLETED:
+            return Response({'error': '아직 생성 중인 작업입니다.', 'status': job.status},
+                            status=status.HTTP_409_CONFLICT)
+        if not os.path.exists(job.file_path):
+            return Response({'error': '내보내기 파일이 만료되었습니다. 다시 요청해주세요.'},
+                            status=status.HTTP_410_GONE)
+        
+        filename = f"diary_export_{job.created_at.strftime('%Y%m%d_%H%M%S')}.pdf"
+        return ranged_file_response(request, job.file_path, 'application/pdf', filename)
+
     @action(detail=False, methods=['post'], url_path='restore')
     def restore(self, request):
         """
         백업 파일에서 데이터 복원
+        - 작은 파일 / JSON 데이터: 바로 복원하여 결과 반환
+        - 큰 파일(RESTORE['SYNC_MAX_BYTES'] 초과): 복원 작업 생성 후 202 (restore-jobs/<id>/ 로 진행률 조회)
         """
+        import io
+        from ..services.restore_service import BackupFormatError, RestoreService, get_restore_config
+        
         user = request.user
         
         # 파일 또는 JSON 데이터 받기
@@ -75,90 +123,39 @@ class ExportViewSet(viewsets.ViewSet):
         backup_data = request.data.get('data')
         overwrite = str(request.data.get('overwrite', 'false')).lower() == 'true'
         
-        if backup_file:
-            try:
-                import_data = json.loads(backup_file.read().decode('utf-8'))
-            except json.JSONDecodeError:
-                return Response({'error': '올바른 JSON 파일이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
-        elif backup_data:
-            import_data = backup_data
-        else:
-            return Response({'error': '복원할 데이터가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # 메타데이터 검증
-        if 'metadata' not in import_data or 'version' not in import_data.get('metadata', {}):
-            return Response({'error': '올바른 백업 파일 형식이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        restored_counts = {
-            'diaries': 0,
-            'tags': 0,
-            'templates': 0
-        }
-        
         try:
-            from django.db import transaction
-            
-            with transaction.atomic():
-                # 1. 기존 데이터 삭제 (덮어쓰기 모드)
-                if overwrite:
-                    Diary.objects.filter(user=user).delete()
-                    DiaryTag.objects.filter(user=user).delete()
-                    DiaryTemplate.objects.filter(user=user).delete()
-                
-                # 2. 태그 복원
-                for tag_data in import_data.get('tags', []):
-                    DiaryTag.objects.get_or_create(
-                        user=user,
-                        name=tag_data.get('name'),
-                        defaults={'color': tag_data.get('color', '#6C63FF')}
-                    )
-                    restored_counts['tags'] += 1
-                
-                # 3. 일기 복원
-                for diary_data in import_data.get('diaries', []):
-                    diary, created = Diary.objects.update_or_create(
-                        user=user,
-                        title=diary_data.get('title'),
-                        created_at=diary_data.get('created_at'),
-                        defaults={
-                            'content': diary_data.get('content', ''),
-                            'emotion': diary_data.get('emotion'),
-                            'emotion_score': diary_data.get('emotion_score'),
-                        }
-                    )
-                    if created:
-                        restored_counts['diaries'] += 1
-                
-                # 4. 템플릿 복원
-                for template_data in import_data.get('templates', []):
-                    DiaryTemplate.objects.get_or_create(
-                        user=user,
-                        title=template_data.get('title'),
-                        defaults={
-                            'content': template_data.get('content', ''),
-                            'categories': template_data.get('categories', []),
-                        }
-                    )
-                    restored_counts['templates'] += 1
-                
-                # 5. 설정 복원
-                pref_data = import_data.get('preferences', {})
-                if pref_data:
-                    UserPreference.objects.update_or_create(
-                        user=user,
-                        defaults={
-                            'theme': pref_data.get('theme', 'light'),
-                            'notification_enabled': pref_data.get('notification_enabled', True),
-                            'reminder_time': pref_data.get('reminder_time'),
-                        }
-                    )
-            
-            return Response({
-                'message': '데이터가 성공적으로 복원되었습니다.',
-                'restored': restored_counts
-            })
+            if backup_file:
+                if backup_file.size > get_restore_config()['SYNC_MAX_BYTES']:
+                    job = RestoreService.create_job(user, backup_file, overwrite=overwrite)
+                    return Response(ExportJobSerializer(job, context={'request': request}).data,
+                                    status=status.HTTP_202_ACCEPTED)
+                source = backup_file
+            elif backup_data:
+                if isinstance(backup_data, str):
+                    backup_data = json.loads(backup_data)
+                source = io.BytesIO(json.dumps(backup_data).encode('utf-8'))
+            else:
+                return Response({'error': '복원할 데이터가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
             
+            restored_counts = RestoreService.restore(user, source, overwrite=overwrite)
+        except (BackupFormatError, json.JSONDecodeError) as e:
+            message = str(e) if isinstance(e, BackupFormatError) else '올바른 JSON 데이터가 아닙니다.'
+            return Response({'error': message}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
+            logger.error(f"Restore failed: {e}")
             return Response({'error': f'복원 중 오류 발생: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response({
+            'message': '데이터가 성공적으로 복원되었습니다.',
+            'restored': restored_counts
+        })
+
+    @action(detail=False, methods=['get'], url_path=r'restore-jobs/(?P<job_id>\d+)', url_name='restore-job')
+    def restore_job(self, request, job_id=None):
+        """
+        복원 작업 상태/진행률 조회
+        """
+        job = get_object_or_404(ExportJob, pk=job_id, user=request.user, kind=ExportJob.Kind.RESTORE)
+        return Response(ExportJobSerializer(job, context={'request': request}).data)
 
 
@@ -183,6 +183,22 @@ class SystemHealthView(APIView):
                 'message': str(e)
             }
         
+        # 모델 서버 상태 (설정된 경우에만)
+        from ..utils.model_server import ModelServerError, check_model_server_health, get_model_server_config
+        if get_model_server_config()['URL']:
+            try:
+                server_health = check_model_server_health()
+                health_status['components']['model_server'] = {
+                    'status': 'healthy',
+                    'message': 'Model server OK',
+                    'models': server_health.get('models', {}),
+                }
+            except ModelServerError as e:
+                health_status['components']['model_server'] = {
+                    'status': 'degraded',
+                    'message': str(e)
+                }
+        
         health_status['timestamp'] = timezone.now().isoformat()
         
         return Response(health_status)
@@ -204,12 +220,27 @@ class SystemMetricsView(APIView):
     def get(self, request):
         # 간단한 메트릭 (실제로는 APM 도구 사용 권장)
         from django.db import connection
+        from ..utils.audit_buffer import get_audit_buffer
+        from ..utils.decryption_cache import get_decryption_cache
+        from ..services.gemini_client import get_gemini_client
+        from ..utils.circuit_breaker import breaker_stats
+        from ..utils.ai_cache import get_ai_cache
         
         metrics = {
             'database': {
                 'queries_count': len(connection.queries),
                 'note': 'DEBUG 모드에서만 사용 가능'
             },
+            # 감사 로그 버퍼 (현재 워커 프로세스 기준)
+            'audit_log': get_audit_buffer().stats(),
+            # 복호화 캐시 적중률 (현재 워커 프로세스 기준)
+            'decryption_cache': get_decryption_cache().stats(),
+            # Gemini 게이트웨이 동시 호출/대기열/지연/오류 (현재 워커 프로세스 기준)
+            'gemini': get_gemini_client().stats(),
+            # AI 호출 서킷 브레이커 상태/오류율 (모든 워커 공유 상태)
+            'circuit_breakers': breaker_stats(),
+            # AI 결과 캐시 적중률 (작업별, 현재 워커 프로세스 기준)
+            'ai_cache': get_ai_cache().stats(),
             'timestamp': timezone.now().isoformat()
         }
         
@@ -12,6 +12,7 @@ from rest_framework.views import APIView
 
 from ..models import UserPreference
 from ..serializers import UserPreferenceSerializer
+from ..utils.preference_cache import get_snapshot
 
 
 class UserPreferenceView(APIView):
@@ -134,7 +135,7 @@ class ThemeView(APIView):
         
         preference = UserPreference.get_or_create_for_user(request.user)
         preference.theme = theme
-        preference.save()
+        preference.save(update_fields=['theme', 'updated_at'])
         
         theme_display = dict(UserPreference.THEME_CHOICES).get(theme, theme)
         
@@ -169,19 +170,21 @@ class StreakView(APIView):
         """
         from datetime import date, timedelta
         
-        preference = UserPreference.get_or_create_for_user(request.user)
+        # 캐시된 설정 스냅샷 사용 (설정 행이 없으면 기본값)
+        snapshot = get_snapshot(request.user.pk)
+        last_diary_date = snapshot['last_diary_date']
         today = date.today()
         
         # 스트릭이 끊겼는지 확인 (오늘 또는 어제 작성했으면 활성)
         is_streak_active = False
-        if preference.last_diary_date:
-            days_diff = (today - preference.last_diary_date).days
+        if last_diary_date:
+            days_diff = (today - last_diary_date).days
             is_streak_active = days_diff <= 1
         
         return Response({
-            'current_streak': preference.current_streak,
-            'max_streak': preference.max_streak,
-            'last_diary_date': preference.last_diary_date.isoformat() if preference.last_diary_date else None,
+            'current_streak': snapshot['current_streak'],
+            'max_streak': snapshot['max_streak'],
+            'last_diary_date': last_diary_date.isoformat() if last_diary_date else None,
             'is_streak_active': is_streak_active
         })
 
@@ -11,10 +11,11 @@ from rest_framework.decorators import action
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from django.core.cache import cache
-from django.conf import settings
 
 from ..models import Diary
+from ..cache_utils import (
+    cached_user_view, current_month, current_year, month_bucket, recent_buckets, year_bucket,
+)
 from ..messages import ERROR_INVALID_YEAR, ERROR_INVALID_YEAR_MONTH
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,8 @@ class ReportViewSet(GenericViewSet):
     permission_classes = [IsAuthenticated]
 
     @action(detail=False, methods=['get'], url_path='weekly')
+    @cached_user_view('report', params={'period': 'week'},
+                      buckets=lambda p: recent_buckets(30 if p['period'] == 'month' else 7))
     def weekly_report(self, request):
         """
         주간/월간 감정 분석 리포트를 반환합니다.
@@ -34,26 +37,17 @@ class ReportViewSet(GenericViewSet):
         """
         period = request.query_params.get('period', 'week')
         
-        # 캐시 키 생성 및 조회
-        cache_key = f"report:{request.user.id}:{period}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
         try:
             from ..services.report_service import ReportService
             result = ReportService.get_period_report(request.user, period)
-            
-            # 캐시 저장 (1시간)
-            cache_ttl = getattr(settings, 'CACHE_TTL', {}).get('report', 3600)
-            cache.set(cache_key, result, cache_ttl)
-            
             return Response(result)
         except Exception as e:
             logger.error(f"Report generation failed: {e}")
             return Response({"error": "Failed to generate report"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'], url_path='calendar')
+    @cached_user_view('calendar', params={'year': current_year, 'month': current_month},
+                      buckets=lambda p: [month_bucket(p['year'], p['month'])])
     def calendar(self, request):
         """
         캘린더 뷰를 위한 월별 일기 요약을 반환합니다.
@@ -71,26 +65,17 @@ class ReportViewSet(GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # 캐시 키 생성 및 조회
-        cache_key = f"calendar:{request.user.id}:{year}:{month}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-            
         try:
             from ..services.report_service import ReportService
             result = ReportService.get_calendar_data(request.user, year, month)
-            
-            # 캐시 저장 (30분)
-            cache_ttl = getattr(settings, 'CACHE_TTL', {}).get('calendar', 1800)
-            cache.set(cache_key, result, cache_ttl)
-            
             return Response(result)
         except Exception as e:
             logger.error(f"Calendar generation failed: {e}")
             return Response({"error": "Failed to generate calendar"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'], url_path='annual')
+    @cached_user_view('annual_report', params={'year': current_year},
+                      buckets=lambda p: [year_bucket(p['year'])])
     def annual_report(self, request):
         """
         연간 감정 리포트를 반환합니다.
@@ -115,13 +100,12 @@ class ReportViewSet(GenericViewSet):
             return Response({"error": "Failed to generate annual report"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'], url_path='heatmap')
+    @cached_user_view('heatmap', params={'year': current_year},
+                      buckets=lambda p: [year_bucket(p['year'])])
     def heatmap(self, request):
         """
         GitHub 잔디 스타일의 감정 히트맵 데이터를 반환합니다.
         """
-        from ..models import Diary
-        from collections import defaultdict
-        
         now = timezone.now()
         year = request.query_params.get('year', now.year)
         
@@ -133,12 +117,6 @@ class ReportViewSet(GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # 캐시 키 생성 및 조회
-        cache_key = f"heatmap:{request.user.id}:{year}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
         # 감정별 색상 매핑
         emotion_colors = {
             'happy': '#FFD93D',      # 노란색
@@ -152,31 +130,19 @@ class ReportViewSet(GenericViewSet):
             None: '#E8E8E8',         # 기본 (감정 없음)
         }
         
-        # 해당 연도의 일기 조회
-        diaries = Diary.objects.filter(
-            user=request.user,
-            created_at__year=year
-        ).order_by('created_at')
-        
-        # 날짜별 데이터 집계
-        date_data = defaultdict(lambda: {'count': 0, 'emotions': []})
-        
-        for diary in diaries:
-            date_str = diary.created_at.strftime('%Y-%m-%d')
-            date_data[date_str]['count'] += 1
-            if diary.emotion:
-                date_data[date_str]['emotions'].append(diary.emotion)
+        # 해당 연도의 일별 감정 집계 조회 (일기 행을 읽지 않음)
+        from ..services.aggregate_service import EmotionAggregateService
+        rows = EmotionAggregateService.get_rows(request.user, year=year)
         
         # 시각화 데이터 생성
         result_data = {}
-        for date_str, info in date_data.items():
+        total_entries = 0
+        for date, info in EmotionAggregateService.group_by_date(rows).items():
             # 가장 많이 등장한 감정 찾기
-            emotions = info['emotions']
-            dominant_emotion = None
-            if emotions:
-                dominant_emotion = max(set(emotions), key=emotions.count)
+            dominant_emotion = EmotionAggregateService.dominant(info['emotions'])
+            total_entries += info['count']
             
-            result_data[date_str] = {
+            result_data[date.strftime('%Y-%m-%d')] = {
                 'count': info['count'],
                 'emotion': dominant_emotion,
                 'color': emotion_colors.get(dominant_emotion, emotion_colors[None])
@@ -184,12 +150,9 @@ class ReportViewSet(GenericViewSet):
 
         response_data = {
             "year": year,
-            "total_entries": diaries.count(),
+            "total_entries": total_entries,
             "data": result_data
         }
         
-        # 캐시 저장 (1시간)
-        cache.set(cache_key, response_data, 3600)
-        
         return Response(response_data)
 
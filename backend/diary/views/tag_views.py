@@ -9,7 +9,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 
-from ..models import Tag, DiaryTag
+from ..cache_utils import TAGS_BUCKET, cached_user_view
+from ..models import Diary, Tag
+from ..paginations import KeysetPagination
 from ..serializers import TagSerializer
 
 
@@ -34,17 +36,27 @@ class TagViewSet(viewsets.ModelViewSet):
     def diaries(self, request, pk=None):
         """
         특정 태그가 적용된 일기 목록 조회
+        ?cursor= / ?page_size= 키셋 페이지네이션, ?page= 페이지 번호 방식, 파라미터가 없으면 전체 목록
+        (diary_count 는 항상 전체 일기 수)
         
         GET /api/tags/{id}/diaries/
         """
         tag = self.get_object()
-        diary_tags = DiaryTag.objects.filter(
-            tag=tag
-        ).select_related('diary').order_by('-diary__created_at')
+        queryset = (
+            Diary.objects.filter(user=request.user, diary_tags__tag=tag)
+            .only('id', 'title', 'emotion', 'created_at')
+            .order_by('-created_at', '-id')
+        )
+        paginator = KeysetPagination()
+        if paginator.is_requested(request):
+            diaries = paginator.paginate_queryset(queryset, request, view=self)
+            total = queryset.count()
+        else:
+            diaries = list(queryset)
+            total = len(diaries)
         
         result = []
-        for dt in diary_tags:
-            diary = dt.diary
+        for diary in diaries:
             result.append({
                 'id': diary.id,
                 'title': diary.title,
@@ -59,11 +71,13 @@ class TagViewSet(viewsets.ModelViewSet):
                 'name': tag.name,
                 'color': tag.color
             },
-            'diary_count': len(result),
-            'diaries': result
+            'diary_count': total,
+            'diaries': result,
+            'next': paginator.get_next_link(),
         })
     
     @action(detail=False, methods=['get'], url_path='popular')
+    @cached_user_view('popular_tags', buckets=lambda p: [TAGS_BUCKET])
     def popular(self, request):
         """
         자주 사용하는 태그 목록 (상위 10개)
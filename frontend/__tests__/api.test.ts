@@ -27,7 +27,8 @@ describe('diaryService', () => {
 
             const result = await diaryService.getAll();
 
-            expect(mockedAxios.get).toHaveBeenCalledWith('/api/diaries/');
+            // 목록은 본문 대신 preview 등 목록 필드만 요청
+            expect(mockedAxios.get).toHaveBeenCalledWith(expect.stringMatching(/^\/api\/diaries\/\?fields=.*preview/));
             expect(result).toEqual(mockDiaries);
         });
 
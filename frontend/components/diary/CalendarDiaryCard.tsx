@@ -29,8 +29,8 @@ export const CalendarDiaryCard: React.FC<CalendarDiaryCardProps> = ({
     const router = useRouter();
     const { colors, isDark } = useTheme();
 
-    const hasImage = diary.images && diary.images.length > 0;
-    const firstImage = hasImage ? diary.images[0] : null;
+    // 목록 응답은 thumbnail_url, 상세/로컬 데이터는 images
+    const thumbnailUrl = diary.thumbnail_url || diary.images?.[0]?.image_url || null;
 
     const handlePress = () => {
         router.push(`/diary/${diary.id}` as any);
@@ -70,9 +70,9 @@ export const CalendarDiaryCard: React.FC<CalendarDiaryCardProps> = ({
             activeOpacity={0.8}
         >
             {/* 이미지 (첫 번째 이미지만) */}
-            {firstImage && (
+            {thumbnailUrl && (
                 <Image
-                    source={{ uri: firstImage.image_url }}
+                    source={{ uri: thumbnailUrl }}
                     style={styles.image}
                     resizeMode="cover"
                 />
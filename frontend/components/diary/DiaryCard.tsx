@@ -49,7 +49,10 @@ export const DiaryCard: React.FC<DiaryCardProps> = ({ diary, onDelete }) => {
         return content.substring(0, maxLength) + '...';
     };
 
-    const hasImage = diary.images && diary.images.length > 0;
+    // 목록 응답은 thumbnail_url / image_count, 상세/로컬 데이터는 images
+    const thumbnailUrl = diary.thumbnail_url || diary.images?.[0]?.image_url;
+    const imageCount = diary.image_count ?? diary.images?.length ?? 0;
+    const hasImage = !!thumbnailUrl;
 
     return (
         <TouchableOpacity
@@ -92,19 +95,19 @@ export const DiaryCard: React.FC<DiaryCardProps> = ({ diary, onDelete }) => {
             </View>
 
             {/* 내용 */}
-            <Text style={styles.content}>{truncateContent(diary.content)}</Text>
+            <Text style={styles.content}>{truncateContent(diary.preview ?? diary.content ?? '')}</Text>
 
             {/* 이미지 프리뷰 */}
             {hasImage && (
                 <View style={styles.imageContainer}>
                     <Image
-                        source={{ uri: diary.images[0].image_url }}
+                        source={{ uri: thumbnailUrl }}
                         style={styles.image}
                         resizeMode="cover"
                     />
-                    {diary.images.length > 1 && (
+                    {imageCount > 1 && (
                         <View style={styles.imageCount}>
-                            <Text style={styles.imageCountText}>+{diary.images.length - 1}</Text>
+                            <Text style={styles.imageCountText}>+{imageCount - 1}</Text>
                         </View>
                     )}
                 </View>
@@ -1,13 +1,16 @@
 import { api } from './core';
 import { Diary, DiaryImage, Tag, CreateDiaryRequest, UpdateDiaryRequest, EmotionReport, HeatmapData } from './types';
 
+// 목록 응답 필드 (본문 대신 preview, 이미지 목록 대신 thumbnail_url / image_count)
+const LIST_FIELDS = 'id,title,preview,emotion,emotion_score,emotion_emoji,location_name,latitude,longitude,tags,image_count,thumbnail_url,created_at,updated_at,version';
+
 // ============================================================================
 // 일기 API 서비스
 // ============================================================================
 export const diaryService = {
     // 일기 목록 조회
     async getAll(): Promise<Diary[]> {
-        const response = await api.get('/api/diaries/');
+        const response = await api.get(`/api/diaries/?fields=${LIST_FIELDS}`);
         return response.data;
     },
 
@@ -22,7 +25,7 @@ export const diaryService = {
         tag?: number;              // 태그 ID로 필터
         exactMatch?: boolean;      // 정확한 단어 일치 여부 (Option A)
     }): Promise<Diary[]> {
-        const params = new URLSearchParams();
+        const params = new URLSearchParams({ fields: LIST_FIELDS });
         if (filters.search) params.append('search', filters.search);
         if (filters.contentSearch) params.append('content_search', filters.contentSearch);
         if (filters.q) params.append('q', filters.q);
@@ -32,9 +35,7 @@ export const diaryService = {
         if (filters.tag) params.append('tag', filters.tag.toString());
         if (filters.exactMatch) params.append('exact_match', 'true');
 
-        const queryString = params.toString();
-        const url = queryString ? `/api/diaries/?${queryString}` : '/api/diaries/';
-        const response = await api.get(url);
+        const response = await api.get(`/api/diaries/?${params.toString()}`);
         return response.data.results ?? response.data;
     },
 
@@ -96,7 +97,7 @@ export const diaryService = {
 
     // 특정 날짜 일기 검색
     async getByDate(date: string): Promise<Diary[]> {
-        const response = await api.get(`/api/diaries/?start_date=${date}&end_date=${date}`);
+        const response = await api.get(`/api/diaries/?start_date=${date}&end_date=${date}&fields=${LIST_FIELDS}`);
         return response.data;
     },
 
@@ -22,6 +22,10 @@ export interface Diary {
     keywords?: string[]; // 핵심 키워드
     version?: number; // Optimistic Locking
     isSyncing?: boolean; // Optimistic UI state
+    // 목록 응답 전용 (본문/이미지 목록 대신)
+    preview?: string;
+    image_count?: number;
+    thumbnail_url?: string;
 }
 
 export interface DiaryImage {